@@ -38,6 +38,7 @@ class Router(AlternateEnvironmentRouter):
         return {
             'openedx.core.djangoapps.content.block_structure.tasks.update_course_in_cache': 'lms',
             'openedx.core.djangoapps.content.block_structure.tasks.update_course_in_cache_v2': 'lms',
+            'openedx.core.djangoapps.content.publish_pipeline.tasks.run_publish_pipeline': 'lms',
         }
 
     @property
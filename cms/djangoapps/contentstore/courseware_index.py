@@ -3,16 +3,20 @@ from __future__ import absolute_import
 
 import logging
 import re
+import time
 from abc import ABCMeta, abstractmethod
-from datetime import timedelta
+from datetime import datetime, timedelta
 
 from django.conf import settings
+from django.core.cache import cache
 from django.core.urlresolvers import resolve
 from django.utils.translation import ugettext as _
 from django.utils.translation import ugettext_lazy
 from search.search_engine_base import SearchEngine
+from pytz import UTC
 from six import add_metaclass
 
+import dogstats_wrapper as dog_stats_api
 from contentstore.course_group_config import GroupConfiguration
 from course_modes.models import CourseMode
 from eventtracking import tracker
@@ -30,15 +34,19 @@ REINDEX_AGE = timedelta(0, 60)  # 60 seconds
 
 log = logging.getLogger('edx.modulestore')
 
+WHITESPACE_RE = re.compile(r"(\s|&nbsp;|//)+")
+CDATA_RE = re.compile(r"<!\[CDATA\[.*\]\]>")
+COMMENT_RE = re.compile(r"<!--.*-->")
+
 
 def strip_html_content_to_text(html_content):
     """ Gets only the textual part for html content - useful for building text to be searched """
     # Removing HTML-encoded non-breaking space characters
-    text_content = re.sub(r"(\s|&nbsp;|//)+", " ", html_to_text(html_content))
+    text_content = WHITESPACE_RE.sub(" ", html_to_text(html_content))
     # Removing HTML CDATA
-    text_content = re.sub(r"<!\[CDATA\[.*\]\]>", "", text_content)
+    text_content = CDATA_RE.sub("", text_content)
     # Removing HTML comments
-    text_content = re.sub(r"<!--.*-->", "", text_content)
+    text_content = COMMENT_RE.sub("", text_content)
 
     return text_content
 
@@ -116,7 +124,32 @@ class SearchIndexerBase(object):
         searcher.remove(cls.DOCUMENT_TYPE, result_ids)
 
     @classmethod
-    def index(cls, modulestore, structure_key, triggered_at=None, reindex_age=REINDEX_AGE):
+    def _last_indexed_cache_key(cls, normalized_structure_key):
+        """ Key of the cached time at which the structure was last indexed """
+        return u'{}.last_indexed_at.{}'.format(cls.INDEX_NAME, normalized_structure_key)
+
+    @classmethod
+    def last_indexed_at(cls, structure_key):
+        """
+        Returns the time at which the last successful indexing of the given
+        structure started, or None if it isn't known
+        """
+        return cache.get(cls._last_indexed_cache_key(cls.normalize_structure_key(structure_key)))
+
+    @classmethod
+    def reindex_age_since_last_index(cls, structure_key, triggered_at):
+        """
+        Returns the reindex_age to index the structure with at triggered_at, so
+        that all the items changed since its last successful indexing get their
+        index updated, even if some indexing in between failed or never ran
+        """
+        last_indexed_at = cls.last_indexed_at(structure_key)
+        if last_indexed_at is None or last_indexed_at > triggered_at:
+            return REINDEX_AGE
+        return triggered_at - last_indexed_at + REINDEX_AGE
+
+    @classmethod
+    def index(cls, modulestore, structure_key, triggered_at=None, reindex_age=REINDEX_AGE, batch_size=None):
         """
         Process course for indexing
 
@@ -132,6 +165,9 @@ class SearchIndexerBase(object):
             which items may need to be removed from the index
             If None, then a full reindex takes place
 
+        batch_size (int) - number of documents sent to the search engine by each
+            bulk index request, defaults to the SEARCH_INDEX_BATCH_SIZE setting
+
         Returns:
         Number of items that have been added to the index
         """
@@ -140,6 +176,11 @@ class SearchIndexerBase(object):
         if not searcher:
             return
 
+        if batch_size is None:
+            batch_size = settings.SEARCH_INDEX_BATCH_SIZE
+        indexed_at = datetime.now(UTC)
+        start_time = time.time()
+
         structure_key = cls.normalize_structure_key(structure_key)
         location_info = cls._get_location_info(structure_key)
 
@@ -154,11 +195,18 @@ class SearchIndexerBase(object):
         # list - those are ready to be destroyed
         indexed_items = set()
 
-        # items_index is a list of all the items index dictionaries.
-        # it is used to collect all indexes and index them using bulk API,
-        # instead of per item index API call.
+        # items_index is a list of the items index dictionaries which are yet
+        # to be indexed. It is used to collect indexes and index them in batches
+        # using bulk API, instead of per item index API call.
         items_index = []
 
+        def index_items():
+            """
+            Send the collected items index dictionaries to the search engine
+            """
+            searcher.index(cls.DOCUMENT_TYPE, items_index)
+            del items_index[:]
+
         def get_item_location(item):
             """
             Gets the version agnostic item location
@@ -181,10 +229,16 @@ class SearchIndexerBase(object):
             item_content_groups - content groups assigned to indexed item
             """
             is_indexable = hasattr(item, "index_dictionary")
-            item_index_dictionary = item.index_dictionary() if is_indexable else None
-            # if it's not indexable and it does not have children, then ignore
-            if not item_index_dictionary and not item.has_children:
-                return
+            if skip_index:
+                # the index dictionary of a skipped item is never used, don't build it
+                item_index_dictionary = None
+                if not is_indexable and not item.has_children:
+                    return
+            else:
+                item_index_dictionary = item.index_dictionary() if is_indexable else None
+                # if it's not indexable and it does not have children, then ignore
+                if not item_index_dictionary and not item.has_children:
+                    return
 
             item_content_groups = None
 
@@ -242,11 +296,14 @@ class SearchIndexerBase(object):
                 item_index.update(cls.supplemental_fields(item))
                 items_index.append(item_index)
                 indexed_count["count"] += 1
-                return item_content_groups
             except Exception as err:  # pylint: disable=broad-except
                 # broad exception so that index operation does not fail on one item of many
                 log.warning('Could not index item: %s - %r', item.location, err)
                 error_list.append(_('Could not index item: {}').format(item.location))
+            else:
+                if len(items_index) >= batch_size:
+                    index_items()
+                return item_content_groups
 
         try:
             with modulestore.branch_setting(ModuleStoreEnum.RevisionOption.published_only):
@@ -259,7 +316,8 @@ class SearchIndexerBase(object):
                 # Now index the content
                 for item in structure.get_children():
                     prepare_item_index(item, groups_usage_info=groups_usage_info)
-                searcher.index(cls.DOCUMENT_TYPE, items_index)
+                if items_index:
+                    index_items()
                 cls.remove_deleted_items(searcher, structure_key, indexed_items)
         except Exception as err:  # pylint: disable=broad-except
             # broad exception so that index operation does not prevent the rest of the application from working
@@ -273,8 +331,29 @@ class SearchIndexerBase(object):
         if error_list:
             raise SearchIndexingError('Error(s) present during indexing', error_list)
 
+        cache.set(cls._last_indexed_cache_key(structure_key), indexed_at, None)
+        cls._report_indexing_rate(structure_key, indexed_count["count"], time.time() - start_time)
         return indexed_count["count"]
 
+    @classmethod
+    def _report_indexing_rate(cls, structure_key, indexed_count, duration):
+        """
+        Logs and reports to datadog the number of documents indexed per second
+        """
+        documents_per_second = indexed_count / duration if duration else 0
+        log.info(
+            "Indexed %d documents of %s in %.2f seconds (%.1f documents per second)",
+            indexed_count,
+            structure_key,
+            duration,
+            documents_per_second,
+        )
+        dog_stats_api.histogram(
+            'contentstore.search_index.documents_per_second',
+            documents_per_second,
+            tags=[u'index:{}'.format(cls.INDEX_NAME)]
+        )
+
     @classmethod
     def _do_reindex(cls, modulestore, structure_key):
         """
@@ -46,7 +46,7 @@ from xmodule.modulestore import COURSE_ROOT, LIBRARY_ROOT
 from xmodule.modulestore.django import modulestore
 from xmodule.modulestore.exceptions import DuplicateCourseError, ItemNotFoundError
 from xmodule.modulestore.xml_exporter import export_course_to_xml, export_library_to_xml
-from xmodule.modulestore.xml_importer import import_course_from_xml, import_library_from_xml
+from xmodule.modulestore.xml_importer import CourseImportManager, LibraryImportManager
 
 LOGGER = get_task_logger(__name__)
 FILE_READ_CHUNK = 1024  # bytes
@@ -164,7 +164,13 @@ def update_search_index(course_id, triggered_time_isoformat):
     """ Updates course search index. """
     try:
         course_key = CourseKey.from_string(course_id)
-        CoursewareSearchIndexer.index(modulestore(), course_key, triggered_at=(_parse_time(triggered_time_isoformat)))
+        triggered_at = _parse_time(triggered_time_isoformat)
+        CoursewareSearchIndexer.index(
+            modulestore(),
+            course_key,
+            triggered_at=triggered_at,
+            reindex_age=CoursewareSearchIndexer.reindex_age_since_last_index(course_key, triggered_at),
+        )
 
     except SearchIndexingError as exc:
         LOGGER.error(u'Search indexing error for complete course %s - %s', course_id, text_type(exc))
@@ -177,7 +183,13 @@ def update_library_index(library_id, triggered_time_isoformat):
     """ Updates course search index. """
     try:
         library_key = CourseKey.from_string(library_id)
-        LibrarySearchIndexer.index(modulestore(), library_key, triggered_at=(_parse_time(triggered_time_isoformat)))
+        triggered_at = _parse_time(triggered_time_isoformat)
+        LibrarySearchIndexer.index(
+            modulestore(),
+            library_key,
+            triggered_at=triggered_at,
+            reindex_age=LibrarySearchIndexer.reindex_age_since_last_index(library_key, triggered_at),
+        )
 
     except SearchIndexingError as exc:
         LOGGER.error(u'Search indexing error for library %s - %s', library_id, text_type(exc))
@@ -381,11 +393,11 @@ def import_olx(self, user_id, course_key_string, archive_path, archive_name, lan
     if is_library:
         root_name = LIBRARY_ROOT
         courselike_module = modulestore().get_library(courselike_key)
-        import_func = import_library_from_xml
+        import_manager_class = LibraryImportManager
     else:
         root_name = COURSE_ROOT
         courselike_module = modulestore().get_course(courselike_key)
-        import_func = import_course_from_xml
+        import_manager_class = CourseImportManager
 
     # Locate the uploaded OLX archive (and download it from S3 if necessary)
     # Do everything in a try-except block to make sure everything is properly cleaned up.
@@ -503,13 +515,21 @@ def import_olx(self, user_id, course_key_string, archive_path, archive_name, lan
             u'courselike_import.time',
             tags=[u"courselike:{}".format(courselike_key)]
         ):
-            courselike_items = import_func(
+            import_manager = import_manager_class(
                 modulestore(), user.id,
                 settings.GITHUB_REPO_ROOT, [dirpath],
                 load_error_modules=False,
                 static_content_store=contentstore(),
-                target_id=courselike_key
+                target_id=courselike_key,
+                static_content_workers=settings.COURSE_IMPORT_STATIC_CONTENT_WORKERS,
             )
+            courselike_items = list(import_manager.run_imports())
+
+        # Keep the time spent in each phase of the import with the task status
+        UserTaskArtifact.objects.create(
+            status=self.status, name=u'Timings', text=json.dumps(import_manager.timings)
+        )
+        LOGGER.info(u'Course import %s: Timings %s', courselike_key, dict(import_manager.timings))
 
         new_location = courselike_items[0].location
         LOGGER.debug(u'new course at %s', new_location)
@@ -3,7 +3,7 @@ Testing indexing of the courseware as it is changed
 """
 import json
 import time
-from datetime import datetime
+from datetime import datetime, timedelta
 from unittest import skip
 from uuid import uuid4
 
@@ -16,6 +16,7 @@ from pytz import UTC
 from search.search_engine_base import SearchEngine
 
 from contentstore.courseware_index import (
+    REINDEX_AGE,
     CourseAboutSearchIndexer,
     CoursewareSearchIndexer,
     LibrarySearchIndexer,
@@ -440,6 +441,35 @@ class TestCoursewareSearchIndexer(MixedWithOptionsTestCase):
         indexed_count = self.reindex_course(store)
         self.assertEqual(indexed_count, 7)
 
+    def _test_indexing_in_batches(self, store):
+        """ Make sure that the documents are sent to the search engine in batches """
+        self.publish_item(store, self.vertical.location)
+        with patch(settings.SEARCH_ENGINE + '.index') as mock_index:
+            indexed_count = CoursewareSearchIndexer.index(store, self.course.id, batch_size=3)
+        self.assertEqual(indexed_count, 4)
+        self.assertEqual(
+            [len(args[1]) for args, __ in mock_index.call_args_list if args[0] == self.DOCUMENT_TYPE],
+            [3, 1]
+        )
+
+    def _test_reindex_age_since_last_index(self, store):
+        """ Make sure that a time based index covers the changes made since the last index """
+        self.publish_item(store, self.vertical.location)
+        before_time = datetime.now(UTC)
+        self.reindex_course(store)
+        last_indexed_at = CoursewareSearchIndexer.last_indexed_at(self.course.id)
+        self.assertGreaterEqual(last_indexed_at, before_time)
+
+        triggered_at = last_indexed_at + timedelta(hours=1)
+        self.assertEqual(
+            CoursewareSearchIndexer.reindex_age_since_last_index(self.course.id, triggered_at),
+            timedelta(hours=1) + REINDEX_AGE
+        )
+        self.assertEqual(
+            CoursewareSearchIndexer.reindex_age_since_last_index(self.course.id, before_time),
+            REINDEX_AGE
+        )
+
     def _test_course_about_property_index(self, store):
         """ Test that informational properties in the course object end up in the course_info index """
         display_name = "Help, I need somebody!"
@@ -571,6 +601,14 @@ class TestCoursewareSearchIndexer(MixedWithOptionsTestCase):
     def test_time_based_index(self, store_type):
         self._perform_test_using_store(store_type, self._test_time_based_index)
 
+    @ddt.data(*WORKS_WITH_STORES)
+    def test_indexing_in_batches(self, store_type):
+        self._perform_test_using_store(store_type, self._test_indexing_in_batches)
+
+    @ddt.data(*WORKS_WITH_STORES)
+    def test_reindex_age_since_last_index(self, store_type):
+        self._perform_test_using_store(store_type, self._test_reindex_age_since_last_index)
+
     @ddt.data(*WORKS_WITH_STORES)
     def test_exception(self, store_type):
         self._perform_test_using_store(store_type, self._test_exception)
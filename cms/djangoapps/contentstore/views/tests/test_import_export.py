@@ -17,6 +17,7 @@ from django.test.utils import override_settings
 from milestones.tests.utils import MilestonesTestCaseMixin
 from opaque_keys.edx.locator import LibraryLocator
 from path import Path as path
+from user_tasks.models import UserTaskArtifact
 
 from contentstore.tests.test_libraries import LibraryTestCase
 from contentstore.tests.utils import CourseTestCase
@@ -204,6 +205,21 @@ class ImportTestCase(CourseTestCase):
 
         self.assertEquals(resp.status_code, 200)
 
+    def test_import_timings(self):
+        """
+        Check that the time spent in each phase of the import is kept with the import task status.
+        """
+        with open(self.good_tar) as gtar:
+            args = {"name": self.good_tar, "course-data": [gtar]}
+            resp = self.client.post(self.url, args)
+        self.assertEquals(resp.status_code, 200)
+
+        timings = json.loads(UserTaskArtifact.objects.get(name=u'Timings').text)
+        self.assertEqual(
+            set(timings),
+            {u'parse', u'courselike', u'static', u'asset_metadata', u'children', u'drafts'}
+        )
+
     def test_import_in_existing_course(self):
         """
         Check that course is imported successfully in existing course and users have their access roles
@@ -353,6 +353,9 @@ else:
     COURSE_IMPORT_EXPORT_STORAGE = DEFAULT_FILE_STORAGE
 
 USER_TASKS_ARTIFACT_STORAGE = COURSE_IMPORT_EXPORT_STORAGE
+COURSE_IMPORT_STATIC_CONTENT_WORKERS = ENV_TOKENS.get(
+    'COURSE_IMPORT_STATIC_CONTENT_WORKERS', COURSE_IMPORT_STATIC_CONTENT_WORKERS
+)
 
 DATABASES = AUTH_TOKENS['DATABASES']
 
@@ -492,6 +495,7 @@ if FEATURES['ENABLE_COURSEWARE_INDEX'] or FEATURES['ENABLE_LIBRARY_INDEX']:
     SEARCH_ENGINE = "search.elastic.ElasticSearchEngine"
 
 ELASTIC_SEARCH_CONFIG = ENV_TOKENS.get('ELASTIC_SEARCH_CONFIG', [{}])
+SEARCH_INDEX_BATCH_SIZE = ENV_TOKENS.get('SEARCH_INDEX_BATCH_SIZE', SEARCH_INDEX_BATCH_SIZE)
 
 XBLOCK_SETTINGS = ENV_TOKENS.get('XBLOCK_SETTINGS', {})
 XBLOCK_SETTINGS.setdefault("VideoDescriptor", {})["licensing_enabled"] = FEATURES.get("LICENSING", False)
@@ -94,6 +94,15 @@ from lms.envs.common import (
     # django-debug-toolbar
     DEBUG_TOOLBAR_PATCH_SETTINGS,
     BLOCK_STRUCTURES_SETTINGS,
+    COURSE_PUBLISH_PIPELINE_DELAY,
+    COURSE_PUBLISH_PIPELINE_RETRY_DELAY,
+    COURSE_PUBLISH_PIPELINE_MAX_RETRIES,
+
+    # Clients of the edX REST APIs
+    EDX_API_POOL_CONNECTIONS,
+    EDX_API_POOL_MAXSIZE,
+    EDX_API_PAGINATION_WORKERS,
+    EDX_API_STALE_CACHE_TTL,
 
     # File upload defaults
     FILE_UPLOAD_STORAGE_BUCKET_NAME,
@@ -635,6 +644,9 @@ MESSAGE_STORAGE = 'django.contrib.messages.storage.session.SessionStorage'
 
 COURSE_IMPORT_EXPORT_STORAGE = 'django.core.files.storage.FileSystemStorage'
 
+# The number of threads saving the static files of an imported course to the contentstore.
+COURSE_IMPORT_STATIC_CONTENT_WORKERS = 4
+
 ##### EMBARGO #####
 EMBARGO_SITE_REDIRECT_URL = None
 
@@ -1032,6 +1044,7 @@ INSTALLED_APPS = [
     'openedx.core.djangoapps.content.course_overviews',
     'openedx.core.djangoapps.content.course_structures.apps.CourseStructuresConfig',
     'openedx.core.djangoapps.content.block_structure.apps.BlockStructureConfig',
+    'openedx.core.djangoapps.content.publish_pipeline.apps.PublishPipelineConfig',
 
     # edx-milestones service
     'milestones',
@@ -1326,6 +1339,8 @@ FILES_AND_UPLOAD_TYPE_FILTERS = {
 
 # Default to no Search Engine
 SEARCH_ENGINE = None
+# The number of documents sent to the search engine by each bulk index request
+SEARCH_INDEX_BATCH_SIZE = 500
 ELASTIC_FIELD_MAPPINGS = {
     "start_date": {
         "type": "date"
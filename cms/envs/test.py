@@ -330,6 +330,12 @@ FEATURES['ENABLE_COURSEWARE_INDEX'] = True
 FEATURES['ENABLE_LIBRARY_INDEX'] = True
 SEARCH_ENGINE = "search.tests.mock_search_engine.MockSearchEngine"
 
+# httpretty mocks API responses in the order they're requested, and its fake
+# sockets must not outlive a test, so API clients neither pool their
+# connections nor retrieve pages concurrently unless a test asks for it.
+EDX_API_POOL_CONNECTIONS = False
+EDX_API_PAGINATION_WORKERS = 1
+
 FEATURES['ENABLE_ENROLLMENT_TRACK_USER_PARTITION'] = True
 
 ########################## AUTHOR PERMISSION #######################
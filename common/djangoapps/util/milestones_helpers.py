@@ -338,6 +338,8 @@ def get_course_content_milestones(course_id, content_id, relationship, user_id=N
     Client API operation adapter/wrapper
     Uses the request cache to store all of a user's
     milestones
+    When a user_id is given without a content_id, the
+    milestones of all the content are returned
     """
     if not settings.FEATURES.get('MILESTONES_APP'):
         return []
@@ -356,6 +358,9 @@ def get_course_content_milestones(course_id, content_id, relationship, user_id=N
             user={"id": user_id}
         )
 
+    if content_id is None:
+        return list(request_cache_dict[user_id][relationship])
+
     return [m for m in request_cache_dict[user_id][relationship] if m['content_id'] == unicode(content_id)]
 
 
@@ -0,0 +1,103 @@
+"""
+Micro-benchmarks of the throughput of calc.evaluator on typical course
+expressions.
+
+Run with:
+    python -m calc.benchmark [--iterations N] [--samples N]
+
+For each expression, the following are reported in evaluations per second:
+ -parse: `evaluator` when the expression isn't cached, which includes parsing
+ -cached: `evaluator` when the expression is cached, as for repeated answers
+ -samples: `CompiledExpression.evaluate_samples`, as used by FormulaResponse,
+  counting each sample as one evaluation
+"""
+import argparse
+import random
+import timeit
+from collections import namedtuple
+
+from calc import CompiledExpression, compile_expression, evaluator, get_expression_cache
+
+# Typical expressions of numerical and formula problems, with the variables
+# they use and the ranges their samples are taken from.
+TYPICAL_EXPRESSIONS = [
+    ('number', '3.14', {}),
+    ('si_suffix', '4.7k', {}),
+    ('scientific', '6.02e23*1.5', {}),
+    ('arithmetic', '(1+2)*3/4-5', {}),
+    ('polynomial', '3*x^2+2*x-1', {'x': (1, 10)}),
+    ('rational', '(x^2-1)/(x+1)', {'x': (2, 5)}),
+    ('trigonometric', 'sin(theta)^2+cos(theta)^2', {'theta': (0, 6.28)}),
+    ('exponential', 'A*e^(-t/tau)', {'A': (1, 5), 't': (0, 10), 'tau': (1, 3)}),
+    ('physics', 'sqrt(2*g*h)', {'g': (9, 10), 'h': (1, 100)}),
+    ('circuit', 'R1||R2+R3', {'R1': (1, 10), 'R2': (1, 10), 'R3': (1, 10)}),
+    ('complex', 'abs(V/(R+i*omega*L))', {'V': (1, 5), 'R': (1, 10), 'omega': (1, 100), 'L': (0.1, 1)}),
+]
+
+BenchmarkResult = namedtuple('BenchmarkResult', ['name', 'parse', 'cached', 'samples'])
+
+
+def random_samples(ranges, num_samples):
+    """
+    Return a list of dictionaries of random values of the variables in the
+    given ranges, like FormulaResponse does.
+    """
+    return [
+        {name: random.uniform(*value_range) for name, value_range in ranges.iteritems()}
+        for _ in range(num_samples)
+    ]
+
+
+def evaluations_per_second(func, iterations, evaluations_per_call=1):
+    """
+    Return how many evaluations per second calling `func` does.
+    """
+    duration = timeit.timeit(func, number=iterations)
+    return iterations * evaluations_per_call / duration
+
+
+def run_benchmarks(iterations=100, num_samples=20):
+    """
+    Run the benchmarks of all typical expressions and return a list of
+    `BenchmarkResult`s.
+    """
+    results = []
+    for name, math_expr, ranges in TYPICAL_EXPRESSIONS:
+        samples = random_samples(ranges, num_samples)
+        variables = samples[0]
+        # Parsing is slow, so it's timed for fewer iterations.
+        parse = evaluations_per_second(
+            lambda: CompiledExpression(math_expr).evaluate(variables, {}),  # pylint: disable=cell-var-from-loop
+            max(iterations / 10, 1),
+        )
+        compile_expression(math_expr)
+        cached = evaluations_per_second(
+            lambda: evaluator(variables, {}, math_expr),  # pylint: disable=cell-var-from-loop
+            iterations,
+        )
+        samples_per_second = evaluations_per_second(
+            lambda: compile_expression(math_expr).evaluate_samples(samples, {}),  # pylint: disable=cell-var-from-loop
+            iterations,
+            num_samples,
+        )
+        results.append(BenchmarkResult(name, parse, cached, samples_per_second))
+    return results
+
+
+def main():
+    """
+    Run the benchmarks and print their results.
+    """
+    parser = argparse.ArgumentParser(description='Benchmark calc.evaluator on typical course expressions.')
+    parser.add_argument('--iterations', type=int, default=100, help='Number of times each evaluation is timed.')
+    parser.add_argument('--samples', type=int, default=20, help='Number of samples for evaluate_samples.')
+    args = parser.parse_args()
+
+    print '{:<16}{:>14}{:>14}{:>14}'.format('expression', 'parse/s', 'cached/s', 'samples/s')
+    for result in run_benchmarks(args.iterations, args.samples):
+        print '{:<16}{:>14.0f}{:>14.0f}{:>14.0f}'.format(*result)
+    print get_expression_cache().stats()
+
+
+if __name__ == '__main__':
+    main()
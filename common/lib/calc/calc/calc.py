@@ -7,6 +7,9 @@ Uses pyparsing to parse. Main function as of now is evaluator().
 import math
 import numbers
 import operator
+import re
+from collections import OrderedDict, namedtuple
+from threading import Lock
 
 import numpy
 import scipy.constants
@@ -238,38 +241,359 @@ def evaluator(variables, functions, math_expr, case_sensitive=False):
      python numbers.
     -Unary functions are passed as a dictionary from string to function.
     """
-    # No need to go further.
-    if math_expr.strip() == "":
-        return float('nan')
+    all_variables, all_functions = add_defaults(variables, functions, case_sensitive)
+    if has_valid_names(math_expr, all_variables, all_functions, case_sensitive):
+        compiled = compile_expression(math_expr, case_sensitive)
+    else:
+        # Don't let input with undefined names displace cached expressions.
+        compiled = CompiledExpression(math_expr, case_sensitive)
+    return compiled.evaluate_with_defaults(all_variables, all_functions)
 
-    # Parse the tree.
-    math_interpreter = ParseAugmenter(math_expr, case_sensitive)
-    math_interpreter.parse_algebra()
 
-    # Get our variables together.
-    all_variables, all_functions = add_defaults(variables, functions, case_sensitive)
+# Names in an expression: words that aren't part of a number (e.g. the
+# exponent in '1e5' or the suffix in '5k').
+NAME_PATTERN = re.compile(r'(?<![\w.])[a-zA-Z_][a-zA-Z0-9_]*')
 
-    # ...and check them
-    math_interpreter.check_variables(all_variables, all_functions)
 
-    # Create a recursion to evaluate the tree.
-    if case_sensitive:
-        casify = lambda x: x
-    else:
-        casify = lambda x: x.lower()  # Lowercase for case insens.
-
-    evaluate_actions = {
-        'number': eval_number,
-        'variable': lambda x: all_variables[casify(x[0])],
-        'function': lambda x: all_functions[casify(x[0])](x[1]),
-        'atom': eval_atom,
-        'power': eval_power,
-        'parallel': eval_parallel,
-        'product': eval_product,
-        'sum': eval_sum
-    }
-
-    return math_interpreter.reduce_tree(evaluate_actions)
+def has_valid_names(math_expr, all_variables, all_functions, case_sensitive=False):
+    """
+    Return whether all names in the expression are defined variables or
+    functions, without parsing the expression.
+
+    This is a quick check, meant to keep invalid input out of the
+    expression cache. Expressions that pass it may still fail to parse.
+    """
+    for name in NAME_PATTERN.findall(math_expr):
+        if not case_sensitive:
+            name = name.lower()
+        if name not in all_variables and name not in all_functions:
+            get_expression_cache().record('invalid_names')
+            return False
+    return True
+
+
+# Maximum number of compiled expressions kept by the expression cache.
+COMPILED_EXPRESSION_CACHE_SIZE = 1024
+
+ExpressionCacheStats = namedtuple('ExpressionCacheStats', ['hits', 'misses', 'evictions', 'invalid_names', 'size'])
+
+
+class ExpressionCache(object):
+    """
+    Least-recently-used cache of compiled expressions, keyed by their text
+    and case sensitivity.
+
+    Stats hooks are functions that are called with the name of each event
+    counted by the cache ('hit', 'miss', 'eviction' or 'invalid_names'),
+    e.g. to send metrics.
+    """
+    def __init__(self, max_size=COMPILED_EXPRESSION_CACHE_SIZE):
+        self.max_size = max_size
+        self.stats_hooks = []
+        self._compiled_expressions = OrderedDict()
+        self._counts = dict.fromkeys(['hit', 'miss', 'eviction', 'invalid_names'], 0)
+        self._lock = Lock()
+
+    def get(self, math_expr, case_sensitive=False):
+        """
+        Return the compiled expression, compiling it if it isn't cached.
+        """
+        key = (math_expr, case_sensitive)
+        with self._lock:
+            compiled = self._compiled_expressions.pop(key, None)
+            if compiled is not None:
+                self._compiled_expressions[key] = compiled
+        if compiled is not None:
+            self.record('hit')
+            return compiled
+
+        self.record('miss')
+        compiled = CompiledExpression(math_expr, case_sensitive)
+        evicted = 0
+        with self._lock:
+            self._compiled_expressions[key] = compiled
+            while len(self._compiled_expressions) > self.max_size:
+                self._compiled_expressions.popitem(last=False)
+                evicted += 1
+        for _ in range(evicted):
+            self.record('eviction')
+        return compiled
+
+    def record(self, event):
+        """
+        Count the event and call the stats hooks with it.
+        """
+        with self._lock:
+            self._counts[event] += 1
+        for hook in self.stats_hooks:
+            hook(event)
+
+    def stats(self):
+        """
+        Return the counters of the cache as an `ExpressionCacheStats`.
+        """
+        with self._lock:
+            return ExpressionCacheStats(
+                hits=self._counts['hit'],
+                misses=self._counts['miss'],
+                evictions=self._counts['eviction'],
+                invalid_names=self._counts['invalid_names'],
+                size=len(self._compiled_expressions),
+            )
+
+    def clear(self):
+        """
+        Remove all compiled expressions and reset the counters.
+        """
+        with self._lock:
+            self._compiled_expressions.clear()
+            for event in self._counts:
+                self._counts[event] = 0
+
+
+_expression_cache = ExpressionCache()  # pylint: disable=invalid-name
+
+
+def get_expression_cache():
+    """
+    Return the process-wide `ExpressionCache`.
+    """
+    return _expression_cache
+
+
+def compile_expression(math_expr, case_sensitive=False):
+    """
+    Return a `CompiledExpression` for the given expression.
+
+    Compiled expressions are cached by their text and case sensitivity, so
+    that expressions which are evaluated repeatedly (e.g. instructor
+    answers) are only parsed once.
+    """
+    return get_expression_cache().get(math_expr, case_sensitive)
+
+
+class NotVectorizable(Exception):
+    """
+    Indicate that an expression can't be evaluated for all samples at once.
+    """
+    pass
+
+
+class CompiledExpression(object):
+    """
+    A math expression that is parsed once and can then be evaluated many times.
+
+    Parsing builds a tree of nested functions, each of which takes the
+    dictionaries of variables and functions and returns the value of its
+    node. The tree is evaluated either for a single set of variables, like
+    `evaluator`, or for many sets of variables at once, with NumPy arrays of
+    their values.
+    """
+    def __init__(self, math_expr, case_sensitive=False):
+        """
+        Parse the given expression.
+
+        Raise a `pyparsing.ParseException` if the expression is invalid.
+        """
+        self.math_expr = math_expr
+        self.case_sensitive = case_sensitive
+
+        if math_expr.strip() == "":
+            # No need to go further.
+            self.variables_used = set()
+            self.functions_used = set()
+            self._math_interpreter = None
+            self._evaluate_tree = lambda variables, functions: float('nan')
+            return
+
+        math_interpreter = ParseAugmenter(math_expr, case_sensitive)
+        math_interpreter.parse_algebra()
+        self.variables_used = math_interpreter.variables_used
+        self.functions_used = math_interpreter.functions_used
+        self._math_interpreter = math_interpreter
+        self._evaluate_tree = self._compile_node(math_interpreter.tree)
+
+    def evaluate(self, variables, functions):
+        """
+        Evaluate the expression with the given variables and functions.
+
+        See `evaluator` for the arguments.
+        """
+        return self.evaluate_with_defaults(*add_defaults(variables, functions, self.case_sensitive))
+
+    def evaluate_with_defaults(self, all_variables, all_functions):
+        """
+        Evaluate the expression with dictionaries of variables and functions
+        that already include the defaults, as returned by `add_defaults`.
+        """
+        self._check_variables(all_variables, all_functions)
+        return self._evaluate_tree(all_variables, all_functions)
+
+    def evaluate_samples(self, variables_list, functions):
+        """
+        Evaluate the expression once for each dictionary of variables in the
+        given list, and return the list of results.
+
+        The samples are evaluated together, with NumPy arrays of the values
+        of each variable, whenever the expression supports it. Otherwise,
+        e.g. if a function can't be applied to arrays or a floating point
+        error occurs, each sample is evaluated separately, which gives the
+        same results (and errors) as calling `evaluator` for each sample.
+        """
+        # Equivalent to calling `add_defaults` for each sample.
+        default_variables, all_functions = add_defaults({}, functions, self.case_sensitive)
+        samples = []
+        for variables in variables_list:
+            all_variables = dict(default_variables)
+            all_variables.update(variables if self.case_sensitive else lower_dict(variables))
+            self._check_variables(all_variables, all_functions)
+            samples.append(all_variables)
+
+        if len(samples) > 1:
+            try:
+                return self._evaluate_vectorized(samples, all_functions)
+            except (NotVectorizable, ArithmeticError, TypeError, ValueError):
+                pass
+        return [self._evaluate_tree(all_variables, all_functions) for all_variables in samples]
+
+    def _check_variables(self, all_variables, all_functions):
+        """
+        Check that all of the variables and functions used are defined.
+        """
+        if self._math_interpreter is not None:
+            self._math_interpreter.check_variables(all_variables, all_functions)
+
+    def _evaluate_vectorized(self, samples, all_functions):
+        """
+        Evaluate the expression for all samples at once.
+        """
+        vectorized_variables = dict(samples[0])
+        for varname in self.variables_used:
+            varname = self._casify(varname)
+            values = [sample_variables[varname] for sample_variables in samples]
+            if any(not isinstance(value, numbers.Number) for value in values):
+                raise NotVectorizable()
+            vectorized_variables[varname] = numpy.array(values)
+
+        with numpy.errstate(all='raise'):
+            result = self._evaluate_tree(vectorized_variables, all_functions)
+        if isinstance(result, numpy.ndarray) and result.shape == (len(samples),):
+            return result.tolist()
+        if isinstance(result, numbers.Number):
+            # The result doesn't depend on the samples.
+            return [result] * len(samples)
+        raise NotVectorizable()
+
+    def _casify(self, name):
+        """
+        Return the name as it appears in the dictionaries of variables and
+        functions.
+        """
+        return name if self.case_sensitive else name.lower()
+
+    def _compile_node(self, node):
+        """
+        Return a function of the variables and functions dictionaries that
+        evaluates the given node of the parse tree.
+        """
+        node_name = node.getName()
+        if node_name == 'number':
+            value = eval_number(node)
+            return lambda variables, functions: value
+
+        if node_name == 'variable':
+            varname = self._casify(node[0])
+            return lambda variables, functions: variables[varname]
+
+        if node_name == 'function':
+            funcname = self._casify(node[0])
+            evaluate_argument = self._compile_node(node[1])
+            return lambda variables, functions: functions[funcname](evaluate_argument(variables, functions))
+
+        # Ignore parentheses, and any operators, which are handled below.
+        children = [self._compile_node(child) for child in node if isinstance(child, ParseResults)]
+        operators = [child for child in node if not isinstance(child, ParseResults)]
+
+        if node_name == 'atom':
+            return children[0]
+
+        if node_name == 'power':
+            return _compile_power(children)
+
+        if node_name == 'parallel':
+            return _compile_parallel(children)
+
+        if node_name == 'product':
+            return _compile_operation(1.0, children, [operator.mul] + [
+                operator.mul if token == '*' else operator.truediv for token in operators
+            ])
+
+        if node_name == 'sum':
+            # Allow a leading + or -.
+            if len(operators) < len(children):
+                operators = ['+'] + operators
+            return _compile_operation(0.0, children, [
+                operator.add if token == '+' else operator.sub for token in operators
+            ])
+
+        raise Exception(u"Unknown branch name '{}'".format(node_name))  # pragma: no cover
+
+
+def _compile_power(children):
+    """
+    Return a function which exponentiates the values of the given children,
+    right to left. See `eval_power`.
+    """
+    if len(children) == 1:
+        return children[0]
+
+    def evaluate(variables, functions):
+        """
+        Exponentiate the values, right to left.
+        """
+        values = [child(variables, functions) for child in children]
+        return reduce(lambda a, b: b ** a, reversed(values))
+    return evaluate
+
+
+def _compile_parallel(children):
+    """
+    Return a function which combines the values of the given children with
+    the parallel resistors operator. See `eval_parallel`.
+    """
+    if len(children) == 1:
+        return children[0]
+
+    def evaluate(variables, functions):
+        """
+        Combine the values with the parallel resistors operator.
+        """
+        values = [child(variables, functions) for child in children]
+        if any(isinstance(value, numpy.ndarray) for value in values):
+            if any(numpy.any(value == 0) for value in values):
+                raise NotVectorizable()
+            return 1. / sum(1. / value for value in values)
+        return eval_parallel(values)
+    return evaluate
+
+
+def _compile_operation(initial_value, children, operations):
+    """
+    Return a function which accumulates the values of the given children
+    onto the initial value, using the given operation for each child.
+    See `eval_sum` and `eval_product`.
+    """
+    steps = zip(operations, children)
+
+    def evaluate(variables, functions):
+        """
+        Accumulate the values of the children.
+        """
+        result = initial_value
+        for operation, child in steps:
+            result = operation(result, child(variables, functions))
+        return result
+    return evaluate
 
 
 class ParseAugmenter(object):
@@ -5,6 +5,7 @@ Unit tests for calc.py
 import unittest
 import numpy
 import calc
+from calc import benchmark
 from pyparsing import ParseException
 
 # numpy's default behavior when it evaluates a function outside its domain
@@ -559,3 +560,110 @@ class EvaluatorTest(unittest.TestCase):
             calc.evaluator({'r1': 5}, {}, "r1+r2")
         with self.assertRaisesRegexp(calc.UndefinedVariable, 'r1 r3'):
             calc.evaluator(variables, {}, "r1*r3", case_sensitive=True)
+
+
+class CompiledExpressionTest(unittest.TestCase):
+    """
+    Run tests for calc.compile_expression and calc.CompiledExpression
+    """
+    SAMPLES = [{'x': 1.5, 'y': -2.0}, {'x': 0.25, 'y': 3.0}, {'x': 7.0, 'y': 0.5}]
+
+    def assert_same_as_evaluator(self, math_expr, samples=None, case_sensitive=False):
+        """
+        Check that evaluating the samples at once gives the same results as
+        calling `evaluator` for each sample.
+        """
+        samples = samples or self.SAMPLES
+        results = calc.compile_expression(math_expr, case_sensitive).evaluate_samples(samples, {})
+        self.assertEqual(len(results), len(samples))
+        for result, variables in zip(results, samples):
+            expected = calc.evaluator(variables, {}, math_expr, case_sensitive)
+            if numpy.isnan(expected):
+                self.assertTrue(numpy.isnan(result))
+            else:
+                self.assertAlmostEqual(result, expected, delta=abs(expected) * 1e-12)
+
+    def test_vectorized_expressions(self):
+        for math_expr in ['x', '-x+y', 'x*y/2', 'x^2^0.5', 'sin(x)*cos(y)+sqrt(x)', 'x||2*x', '3.5k*x', 'e^(i*x)']:
+            self.assert_same_as_evaluator(math_expr)
+
+    def test_constant_expression(self):
+        self.assertEqual(calc.compile_expression('2*pi').evaluate_samples(self.SAMPLES, {}), [2 * numpy.pi] * 3)
+
+    def test_fallback_to_each_sample(self):
+        # `fact` can't be applied to arrays, `arccot` branches on its input,
+        # and a zero input of the parallel operator gives NaN.
+        for math_expr in ['fact(y^2)', 'arccot(y)', 'x||(y-3)']:
+            self.assert_same_as_evaluator(math_expr, [{'x': 1.0, 'y': -2.0}, {'x': 2.0, 'y': 3.0}])
+
+    def test_errors_match_evaluator(self):
+        samples = [{'x': 1.0}, {'x': 0.0}]
+        with self.assertRaises(ZeroDivisionError):
+            calc.compile_expression('1/x').evaluate_samples(samples, {})
+        with self.assertRaisesRegexp(ValueError, 'fractional power'):
+            calc.compile_expression('(x-0.5)^0.5').evaluate_samples(samples, {})
+        with self.assertRaisesRegexp(calc.UndefinedVariable, 'z'):
+            calc.compile_expression('x+z').evaluate_samples(samples, {})
+
+    def test_empty_expression(self):
+        results = calc.compile_expression('  ').evaluate_samples(self.SAMPLES, {})
+        self.assertTrue(all(numpy.isnan(result) for result in results))
+
+    def test_case_sensitivity(self):
+        samples = [{'x': 1.0, 'X': 2.0}, {'x': 3.0, 'X': 4.0}]
+        self.assertEqual(calc.compile_expression('X', case_sensitive=True).evaluate_samples(samples, {}), [2.0, 4.0])
+        self.assert_same_as_evaluator('x+X', samples, case_sensitive=True)
+
+    def test_compiled_expressions_are_cached(self):
+        compiled = calc.compile_expression('x+y')
+        self.assertIs(calc.compile_expression('x+y'), compiled)
+        self.assertIsNot(calc.compile_expression('x+y', case_sensitive=True), compiled)
+
+
+class ExpressionCacheTest(unittest.TestCase):
+    """
+    Run tests for calc.ExpressionCache and the pre-validation of names
+    """
+    def setUp(self):
+        super(ExpressionCacheTest, self).setUp()
+        calc.get_expression_cache().clear()
+        self.addCleanup(calc.get_expression_cache().clear)
+
+    def test_least_recently_used_eviction(self):
+        cache = calc.ExpressionCache(max_size=2)
+        events = []
+        cache.stats_hooks.append(events.append)
+
+        first = cache.get('x+1')
+        cache.get('x+2')
+        self.assertIs(cache.get('x+1'), first)
+        cache.get('x+3')
+        self.assertIs(cache.get('x+1'), first)
+        cache.get('x+2')
+
+        self.assertEqual(events, ['miss', 'miss', 'hit', 'miss', 'eviction', 'hit', 'miss', 'eviction'])
+        self.assertEqual(cache.stats(), calc.ExpressionCacheStats(
+            hits=2, misses=4, evictions=2, invalid_names=0, size=2,
+        ))
+
+    def test_has_valid_names(self):
+        all_variables, all_functions = calc.add_defaults({'R1': 1}, {}, case_sensitive=False)
+        for math_expr in ['2.5e-3', '5k+R1', 'sin(r1)^2', 'pi*1E5', '']:
+            self.assertTrue(calc.has_valid_names(math_expr, all_variables, all_functions))
+        for math_expr in ['x', 'R1*foo(2)', '3*e5']:
+            self.assertFalse(calc.has_valid_names(math_expr, all_variables, all_functions))
+
+    def test_invalid_names_are_not_cached(self):
+        with self.assertRaises(calc.UndefinedVariable):
+            calc.evaluator({}, {}, 'x+1')
+        calc.evaluator({'x': 1}, {}, 'x+1')
+        calc.evaluator({'x': 2}, {}, 'x+1')
+
+        stats = calc.get_expression_cache().stats()
+        self.assertEqual((stats.hits, stats.misses, stats.invalid_names, stats.size), (1, 1, 1, 1))
+
+    def test_benchmarks(self):
+        results = benchmark.run_benchmarks(iterations=1, num_samples=2)
+        self.assertEqual(len(results), len(benchmark.TYPICAL_EXPRESSIONS))
+        for result in results:
+            self.assertTrue(all(value > 0 for value in result[1:]))
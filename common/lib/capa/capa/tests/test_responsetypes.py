@@ -500,6 +500,21 @@ class FormulaResponseTest(ResponseTest):
         input_formula = "x + y"
         self.assert_grade(problem, input_formula, "incorrect")
 
+    def test_student_answers_not_cached(self):
+        """
+        Test that only the expected answer enters the expression cache
+        """
+        sample_dict = {'x': (-10, 10)}
+        problem = self.build_problem(sample_dict=sample_dict, num_samples=10, tolerance=0.01, answer="2*x")
+        calc.get_expression_cache().clear()
+
+        self.assert_grade(problem, "x + x", "correct")
+        self.assert_grade(problem, "x * 2", "correct")
+        self.assert_grade(problem, "x", "incorrect")
+
+        stats = calc.get_expression_cache().stats()
+        self.assertEqual((stats.size, stats.hits, stats.misses), (1, 2, 1))
+
     def test_hint(self):
         """
         Test the hint-giving functionality of FormulaResponse
@@ -6,6 +6,7 @@ In this way, courses can be served up via either SplitMongoModuleStore or MongoM
 """
 
 import logging
+from collections import defaultdict
 from contextlib import contextmanager
 import itertools
 import functools
@@ -338,6 +339,24 @@ class MixedModuleStore(ModuleStoreDraftAndPublished, ModuleStoreWriteBase):
                     libraries[library_id] = library
         return libraries.values()
 
+    def prefetch_structures(self, course_keys):
+        """
+        Loads the published structures of the given courses into the structure
+        cache of the modulestores which have one.
+
+        Returns the number of structures which weren't cached yet.
+        """
+        store_course_keys = defaultdict(list)
+        for course_key in course_keys:
+            store = self._get_modulestore_for_courselike(course_key)
+            if hasattr(store, 'prefetch_structures'):
+                store_course_keys[store].append(course_key)
+
+        return sum(
+            store.prefetch_structures(course_keys=store_keys)
+            for store, store_keys in store_course_keys.iteritems()
+        )
+
     def make_course_key(self, org, course, run):
         """
         Return a valid :class:`~opaque_keys.edx.keys.CourseKey` for this modulestore
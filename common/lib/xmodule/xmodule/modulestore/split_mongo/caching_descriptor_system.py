@@ -19,7 +19,7 @@ from xmodule.modulestore.exceptions import ItemNotFoundError
 from xmodule.modulestore.inheritance import inheriting_field_data, InheritanceMixin
 from xmodule.modulestore.split_mongo import BlockKey, CourseEnvelope
 from xmodule.modulestore.split_mongo.id_manager import SplitMongoIdManager
-from xmodule.modulestore.split_mongo.definition_lazy_loader import DefinitionLazyLoader
+from xmodule.modulestore.split_mongo.definition_lazy_loader import DefinitionLazyLoader, DefinitionPrefetcher
 from xmodule.modulestore.split_mongo.split_mongo_kvs import SplitMongoKVS
 from xmodule.x_module import XModuleMixin
 
@@ -83,6 +83,10 @@ class CachingDescriptorSystem(MakoDescriptorSystem, EditInfoRuntimeMixin):
         self.default_class = default_class
         self.local_modules = {}
         self._services['library_tools'] = LibraryToolsService(modulestore)
+        # Batches the lazy loading of the definitions of the cached blocks, when enabled in the modulestore
+        self.definition_prefetcher = (
+            DefinitionPrefetcher(modulestore) if getattr(modulestore, 'batch_definition_loads', False) else None
+        )
 
     @lazy
     @contract(returns="dict(BlockKey: BlockKey)")
@@ -198,6 +202,7 @@ class CachingDescriptorSystem(MakoDescriptorSystem, EditInfoRuntimeMixin):
                 block_key.type,
                 definition_id,
                 convert_fields,
+                prefetcher=self.definition_prefetcher,
             )
         else:
             definition_loader = None
@@ -1,6 +1,8 @@
 from opaque_keys.edx.locator import DefinitionLocator
 import copy
 
+import dogstats_wrapper as dog_stats_api
+
 
 class DefinitionLazyLoader(object):
     """
@@ -9,16 +11,18 @@ class DefinitionLazyLoader(object):
     object doesn't force access during init but waits until client wants the
     definition. Only works if the modulestore is a split mongo store.
     """
-    def __init__(self, modulestore, course_key, block_type, definition_id, field_converter):
+    def __init__(self, modulestore, course_key, block_type, definition_id, field_converter, prefetcher=None):
         """
         Simple placeholder for yet-to-be-fetched data
         :param modulestore: the pymongo db connection with the definitions
         :param definition_locator: the id of the record in the above to fetch
+        :param prefetcher: an optional DefinitionPrefetcher to fetch the definition with
         """
         self.modulestore = modulestore
         self.course_key = course_key
         self.definition_locator = DefinitionLocator(block_type, definition_id)
         self.field_converter = field_converter
+        self.prefetcher = prefetcher
 
     def fetch(self):
         """
@@ -28,5 +32,52 @@ class DefinitionLazyLoader(object):
         # get_definition may return a cached value perhaps from another course or code path
         # so, we copy the result here so that updates don't cross-pollinate nor change the cached
         # value in such a way that we can't tell that the definition's been updated.
-        definition = self.modulestore.get_definition(self.course_key, self.definition_locator.definition_id)
+        if self.prefetcher is not None:
+            definition = self.prefetcher.fetch(self.course_key, self.definition_locator.definition_id)
+        else:
+            definition = self.modulestore.get_definition(self.course_key, self.definition_locator.definition_id)
         return copy.deepcopy(definition)
+
+
+class DefinitionPrefetcher(object):
+    """
+    Batches the lazy loading of the definitions of the blocks cached by a
+    runtime.  The ids of the definitions are registered when the blocks are
+    cached, and the first definition fetched loads all of the registered ones
+    in a single query.
+    """
+    def __init__(self, modulestore):
+        self.modulestore = modulestore
+        self.pending_ids = set()
+        self.definitions = {}
+        # The number of definitions which had to be fetched on their own.
+        self.fallthroughs = 0
+
+    def add(self, definition_ids):
+        """
+        Registers the ids of definitions which may be fetched later.
+        """
+        self.pending_ids.update(
+            definition_id for definition_id in definition_ids if definition_id not in self.definitions
+        )
+
+    def fetch(self, course_key, definition_id):
+        """
+        Returns the definition with the given id, loading all of the pending
+        definitions first if it's one of them.
+        """
+        if definition_id in self.pending_ids:
+            pending_ids = list(self.pending_ids)
+            self.pending_ids.clear()
+            for definition in self.modulestore.get_definitions(course_key, pending_ids):
+                self.definitions[definition['_id']] = definition
+
+        definition = self.definitions.pop(definition_id, None)
+        if definition is None:
+            self.fallthroughs += 1
+            dog_stats_api.increment(
+                "xmodule.split_mongo.definition_fallthrough",
+                tags=[u"course_id:{}".format(course_key)],
+            )
+            definition = self.modulestore.get_definition(course_key, definition_id)
+        return definition
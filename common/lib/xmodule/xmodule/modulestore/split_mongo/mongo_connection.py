@@ -233,6 +233,11 @@ class CourseStructureCache(object):
     If the 'course_structure_cache' doesn't exist, then don't do anything for
     for set and get.
     """
+    # Key of the small marker cached along with each structure, so that
+    # missing_keys can check which structures are cached without fetching
+    # them.
+    MARKER_KEY = u'{}.cached'
+
     def __init__(self):
         self.cache = None
         if DJANGO_AVAILABLE:
@@ -277,6 +282,23 @@ class CourseStructureCache(object):
 
             # Stuctures are immutable, so we set a timeout of "never"
             self.cache.set(key, compressed_pickled_data, None)
+            self.cache.set(self.MARKER_KEY.format(key), True, None)
+
+    def missing_keys(self, keys):
+        """
+        Returns the given keys whose structures aren't in the cache, in a
+        single cache request for their markers rather than the structures
+        themselves.  Returns an empty list if no cache is configured, since
+        nothing can be cached then.
+
+        A structure whose marker was evicted is reported as missing, and
+        is simply cached again.
+        """
+        if self.cache is None:
+            return []
+
+        cached_markers = self.cache.get_many([self.MARKER_KEY.format(key) for key in keys])
+        return [key for key in keys if self.MARKER_KEY.format(key) not in cached_markers]
 
 
 class MongoConnection(object):
@@ -344,6 +366,34 @@ class MongoConnection(object):
 
             return structure
 
+    @autoretry_read()
+    def prefetch_structures(self, ids, course_context=None):
+        """
+        Loads the structures whose ids are given into the structure cache,
+        so that later calls to `get_structure`, in this process or in any
+        other process sharing the cache, don't have to fetch and convert them.
+
+        Only the structures missing from the cache are fetched, in a single
+        query.  Returns the number of structures which were loaded.
+
+        Arguments:
+            ids (list): A list of structure ids
+        """
+        with TIMER.timer("prefetch_structures", course_context) as tagger:
+            tagger.measure("requested_ids", len(ids))
+            cache = CourseStructureCache()
+            missing_ids = cache.missing_keys(ids)
+            tagger.measure("missing_ids", len(missing_ids))
+            if not missing_ids:
+                return 0
+
+            loaded = 0
+            for doc in self.structures.find({'_id': {'$in': missing_ids}}):
+                structure = structure_from_mongo(doc, course_context)
+                cache.set(structure['_id'], structure, course_context)
+                loaded += 1
+            return loaded
+
     @autoretry_read()
     def find_structures_by_id(self, ids, course_context=None):
         """
@@ -86,6 +86,7 @@ from .caching_descriptor_system import CachingDescriptorSystem
 from xmodule.partitions.partitions_service import PartitionService
 from xmodule.modulestore.split_mongo.mongo_connection import MongoConnection, DuplicateKeyError
 from xmodule.modulestore.split_mongo import BlockKey, CourseEnvelope
+from xmodule.modulestore.split_mongo.structure_index import StructureIndex
 from xmodule.modulestore.store_utilities import DETACHED_XBLOCK_TYPES
 from xmodule.error_module import ErrorDescriptor
 from collections import defaultdict
@@ -693,9 +694,11 @@ class SplitMongoModuleStore(SplitBulkWriteMixin, ModuleStoreWriteBase):
                  default_class=None,
                  error_tracker=null_error_tracker,
                  i18n_service=None, fs_service=None, user_service=None,
-                 services=None, signal_handler=None, **kwargs):
+                 services=None, signal_handler=None, batch_definition_loads=False, **kwargs):
         """
         :param doc_store_config: must have a host, db, and collection entries. Other common entries: port, tz_aware.
+        :param batch_definition_loads: whether the definitions of the blocks cached by a runtime
+            are lazily loaded all at once, rather than one by one.
         """
 
         super(SplitMongoModuleStore, self).__init__(contentstore, **kwargs)
@@ -725,6 +728,7 @@ class SplitMongoModuleStore(SplitBulkWriteMixin, ModuleStoreWriteBase):
             self.services["request_cache"] = self.request_cache
 
         self.signal_handler = signal_handler
+        self.batch_definition_loads = batch_definition_loads
 
     def close_connections(self):
         """
@@ -798,6 +802,13 @@ class SplitMongoModuleStore(SplitBulkWriteMixin, ModuleStoreWriteBase):
                         # convert_fields gets done later in the runtime's xblock_from_json
                         block.fields.update(definition.get('fields'))
                         block.definition_loaded = True
+            elif system.definition_prefetcher is not None:
+                # Lazy batched loading: the definitions are all loaded when the first one is needed.
+                system.definition_prefetcher.add(
+                    block.definition
+                    for block in new_module_data.itervalues()
+                    if block.definition is not None and not block.definition_loaded
+                )
 
             system.module_data.update(new_module_data)
             return system.module_data
@@ -959,6 +970,18 @@ class SplitMongoModuleStore(SplitBulkWriteMixin, ModuleStoreWriteBase):
             id_version_map[version_guid].append(course_index)
         return version_guids, id_version_map
 
+    def prefetch_structures(self, course_keys=None, branch=ModuleStoreEnum.BranchName.published):
+        """
+        Loads the structures of the given branch of the given courses, or of
+        all the courses if none are given, into the structure cache.
+
+        Returns the number of structures which weren't cached yet.
+        """
+        version_guids, __ = self.collect_ids_from_matching_indexes(branch, course_keys=course_keys)
+        if not version_guids:
+            return 0
+        return self.db_connection.prefetch_structures(version_guids)
+
     def _get_structures_for_branch_and_locator(self, branch, locator_factory, **kwargs):
 
         """
@@ -1269,7 +1292,13 @@ class SplitMongoModuleStore(SplitBulkWriteMixin, ModuleStoreWriteBase):
             path_cache = {}
             parents_cache = self.build_block_key_to_parents_mapping(course.structure)
 
-        for block_id, value in course.structure['blocks'].iteritems():
+        blocks = course.structure['blocks']
+        structure_index = self._get_structure_index(course)
+        candidates = structure_index.candidates(qualifiers, settings) if structure_index is not None else None
+        if candidates is not None:
+            blocks = {block_id: blocks[block_id] for block_id in candidates}
+
+        for block_id, value in blocks.iteritems():
             if _block_matches_all(value):
                 if not include_orphans:
                     if (  # pylint: disable=bad-continuation
@@ -1285,6 +1314,30 @@ class SplitMongoModuleStore(SplitBulkWriteMixin, ModuleStoreWriteBase):
         else:
             return []
 
+    def _get_structure_index(self, course_entry):
+        """
+        Returns the StructureIndex of the structure of the given course entry,
+        cached in the request cache with the structure's runtime, or None if
+        there's no request cache or if the structure is being edited in the
+        current bulk operation.
+        """
+        if self.request_cache is None:
+            return None
+
+        structure_id = course_entry.structure['_id']
+        bulk_write_record = self._get_bulk_ops_record(course_entry.course_key)
+        if (
+                bulk_write_record.active and
+                structure_id in bulk_write_record.structures and
+                structure_id not in bulk_write_record.structures_in_db
+        ):
+            return None
+
+        structure_indexes = self.request_cache.data.setdefault('structure_indexes', {})
+        if structure_id not in structure_indexes:
+            structure_indexes[structure_id] = StructureIndex(course_entry.structure)
+        return structure_indexes[structure_id]
+
     def build_block_key_to_parents_mapping(self, structure):
         """
         Given a structure, builds block_key to parents mapping for all block keys in structure
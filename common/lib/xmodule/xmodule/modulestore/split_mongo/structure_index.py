@@ -0,0 +1,90 @@
+"""
+Secondary indexes of the blocks of a split modulestore structure, used to
+answer get_items queries without scanning every block of the structure.
+"""
+from collections import defaultdict
+
+import six
+from bson.objectid import ObjectId
+
+# The types of the criteria which are looked up in the indexes, rather than
+# matched against every block.
+INDEXABLE_TYPES = six.string_types + (ObjectId,)
+
+
+def indexable_values(criteria):
+    """
+    Returns the values which a field must be equal to, or contain, to match
+    the given get_items criteria, or None if the criteria can't be looked up
+    in an index (regexes, functions, $exists or $nin tests...).
+    """
+    if isinstance(criteria, INDEXABLE_TYPES):
+        return [criteria]
+    if isinstance(criteria, dict) and criteria.keys() == ['$in']:
+        values = list(criteria['$in'])
+        if all(isinstance(value, INDEXABLE_TYPES) for value in values):
+            return values
+    return None
+
+
+class StructureIndex(object):
+    """
+    Indexes the blocks of a structure by block type and by definition id, and
+    lazily by the value of any settings field that is queried.
+
+    A structure is immutable once it has been saved, so its index may be kept
+    for as long as the structure.
+    """
+    def __init__(self, structure):
+        self.blocks = structure['blocks']
+        self.by_block_type = defaultdict(set)
+        self.by_definition = defaultdict(set)
+        for block_key, block in self.blocks.iteritems():
+            self.by_block_type[block.block_type].add(block_key)
+            self.by_definition[block.definition].add(block_key)
+        # dict {field name: dict {value: set(BlockKey)}}
+        self.by_field = {}
+
+    def _field_index(self, field_name):
+        """
+        Returns the index of the blocks by the value of the given settings
+        field, building it on first use.  The blocks whose field is a list
+        are indexed by each of its elements.
+        """
+        if field_name not in self.by_field:
+            index = defaultdict(set)
+            for block_key, block in self.blocks.iteritems():
+                if field_name not in block.fields:
+                    continue
+                value = block.fields[field_name]
+                for element in (value if isinstance(value, list) else [value]):
+                    if isinstance(element, INDEXABLE_TYPES):
+                        index[element].add(block_key)
+            self.by_field[field_name] = index
+        return self.by_field[field_name]
+
+    def candidates(self, qualifiers, settings):
+        """
+        Returns the keys of the blocks which may match the given get_items
+        qualifiers and settings, or None if none of them can be looked up in
+        the indexes.  The candidates still have to be matched against all of
+        the criteria.
+        """
+        lookups = []
+        for attribute, index in (('block_type', self.by_block_type), ('definition', self.by_definition)):
+            if attribute in qualifiers:
+                lookups.append((index, indexable_values(qualifiers[attribute])))
+        for field_name, criteria in settings.iteritems():
+            values = indexable_values(criteria)
+            if values is not None:
+                lookups.append((self._field_index(field_name), values))
+
+        candidates = None
+        for index, values in lookups:
+            if values is None:
+                continue
+            matches = set()
+            for value in values:
+                matches.update(index.get(value, ()))
+            candidates = matches if candidates is None else candidates & matches
+        return candidates
@@ -172,6 +172,20 @@ class CountMongoCallsCourseTraversal(TestCase):
                     start_block = modulestore.get_course(course_key, depth=depth, lazy=lazy)
                     self._traverse_blocks_in_course(start_block, access_all_block_fields)
 
+    def test_batched_definition_loads(self):
+        request_cache = MemoryCache()
+        with MIXED_SPLIT_MODULESTORE_BUILDER.build(
+            request_cache=request_cache, batch_definition_loads=True
+        ) as (content_store, modulestore):
+            course_key = self._import_course(content_store, modulestore)
+
+            # The definitions of the blocks cached with the course are loaded together
+            # when the first one is needed, as many calls as when loading them eagerly.
+            with check_mongo_calls(4):
+                with modulestore.bulk_operations(course_key):
+                    start_block = modulestore.get_course(course_key, depth=None, lazy=True)
+                    self._traverse_blocks_in_course(start_block, access_all_block_fields=True)
+
     @ddt.data(
         (MIXED_OLD_MONGO_MODULESTORE_BUILDER, 176),
         (MIXED_SPLIT_MODULESTORE_BUILDER, 5),
@@ -30,6 +30,7 @@ from xmodule.modulestore.inheritance import InheritanceMixin
 from xmodule.x_module import XModuleMixin
 from xmodule.fields import Date, Timedelta
 from xmodule.modulestore.split_mongo.split import SplitMongoModuleStore
+from xmodule.modulestore.split_mongo.mongo_connection import CourseStructureCache
 from xmodule.modulestore.tests.test_modulestore import check_has_course_method
 from xmodule.modulestore.split_mongo import BlockKey
 from xmodule.modulestore.tests.factories import check_mongo_calls
@@ -999,6 +1000,25 @@ class TestCourseStructureCache(SplitModuleTest):
         # now make sure that you get the same structure
         self.assertEqual(cached_structure, not_cached_structure)
 
+    @patch('xmodule.modulestore.split_mongo.mongo_connection.get_cache')
+    def test_prefetch_structures(self, mock_get_cache):
+        mock_get_cache.return_value = self.cache
+        store = modulestore()
+
+        # one query for the course index, and one for the structure
+        with check_mongo_calls(2):
+            self.assertEqual(store.prefetch_structures([self.new_course.id], BRANCH_NAME_DRAFT), 1)
+
+        with check_mongo_calls(0):
+            self._get_structure(self.new_course)
+
+        # cached structures aren't fetched again, nor read from the cache
+        with patch.object(self.cache, 'get_many', wraps=self.cache.get_many) as mock_get_many:
+            with check_mongo_calls(1):
+                self.assertEqual(store.prefetch_structures([self.new_course.id], BRANCH_NAME_DRAFT), 0)
+        structure_id = self.new_course.location.as_object_id(self.new_course.location.version_guid)
+        mock_get_many.assert_called_once_with([CourseStructureCache.MARKER_KEY.format(structure_id)])
+
     def _get_structure(self, course):
         """
         Helper function to get a structure from a course.
@@ -0,0 +1,62 @@
+"""
+Tests for the secondary indexes of split modulestore structures.
+"""
+import re
+import unittest
+
+from bson.objectid import ObjectId
+
+from xmodule.modulestore import BlockData
+from xmodule.modulestore.split_mongo import BlockKey
+from xmodule.modulestore.split_mongo.structure_index import StructureIndex
+
+
+class TestStructureIndex(unittest.TestCase):
+    """
+    Tests for StructureIndex.
+    """
+    def setUp(self):
+        super(TestStructureIndex, self).setUp()
+        self.definition_id = ObjectId()
+        self.problem = BlockKey('problem', 'problem')
+        self.other_problem = BlockKey('problem', 'other_problem')
+        self.discussion = BlockKey('discussion', 'discussion')
+        self.vertical = BlockKey('vertical', 'vertical')
+        self.index = StructureIndex({'blocks': {
+            self.problem: BlockData(block_type='problem', definition=self.definition_id, fields={'weight': 1}),
+            self.other_problem: BlockData(block_type='problem', definition=ObjectId()),
+            self.discussion: BlockData(
+                block_type='discussion', definition=ObjectId(), fields={'discussion_id': 'discussion_1'}
+            ),
+            self.vertical: BlockData(
+                block_type='vertical', definition=ObjectId(), fields={'tags': ['first', 'second']}
+            ),
+        }})
+
+    def test_by_block_type(self):
+        self.assertEqual(
+            self.index.candidates({'block_type': 'problem'}, {}),
+            {self.problem, self.other_problem}
+        )
+        self.assertEqual(
+            self.index.candidates({'block_type': {'$in': ['discussion', 'vertical']}}, {}),
+            {self.discussion, self.vertical}
+        )
+        self.assertEqual(self.index.candidates({'block_type': 'html'}, {}), set())
+
+    def test_by_definition(self):
+        self.assertEqual(self.index.candidates({'definition': self.definition_id}, {}), {self.problem})
+
+    def test_by_settings_field(self):
+        self.assertEqual(self.index.candidates({}, {'discussion_id': 'discussion_1'}), {self.discussion})
+        self.assertEqual(self.index.candidates({}, {'tags': 'second'}), {self.vertical})
+        self.assertEqual(
+            self.index.candidates({'block_type': 'problem'}, {'discussion_id': 'discussion_1'}),
+            set()
+        )
+
+    def test_not_indexable(self):
+        self.assertIsNone(self.index.candidates({}, {}))
+        self.assertIsNone(self.index.candidates({'block_type': re.compile('prob')}, {}))
+        self.assertIsNone(self.index.candidates({}, {'weight': {'$exists': True}}))
+        self.assertIsNone(self.index.candidates({'edited_by': lambda user: user == 1}, {'weight': 1}))
@@ -19,7 +19,7 @@ from rest_framework.response import Response
 
 from courseware import courses
 from lms.djangoapps.ccx.models import CcxFieldOverride, CustomCourseForEdX
-from lms.djangoapps.ccx.overrides import override_field_for_ccx
+from lms.djangoapps.ccx.overrides import bulk_override_fields_for_ccx, override_field_for_ccx
 from lms.djangoapps.ccx.utils import (
     add_master_course_staff_to_ccx,
     assign_staff_role_to_ccx,
@@ -477,12 +477,14 @@ class CCXListView(GenericAPIView):
 
             # Hide anything that can show up in the schedule
             hidden = 'visible_to_staff_only'
+            hidden_overrides = []
             for chapter in master_course_object.get_children():
-                override_field_for_ccx(ccx_course_object, chapter, hidden, True)
+                hidden_overrides.append((chapter, hidden, True))
                 for sequential in chapter.get_children():
-                    override_field_for_ccx(ccx_course_object, sequential, hidden, True)
+                    hidden_overrides.append((sequential, hidden, True))
                     for vertical in sequential.get_children():
-                        override_field_for_ccx(ccx_course_object, vertical, hidden, True)
+                        hidden_overrides.append((vertical, hidden, True))
+            bulk_override_fields_for_ccx(ccx_course_object, hidden_overrides)
 
             # make the coach user a coach on the master course
             make_user_coach(coach, master_course_key)
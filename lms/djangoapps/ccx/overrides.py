@@ -4,8 +4,11 @@ by the individual custom courses feature.
 """
 import json
 import logging
+from contextlib import contextmanager
+from uuid import uuid4
 
 from ccx_keys.locator import CCXBlockUsageLocator, CCXLocator
+from django.core.cache import cache
 from django.db import transaction
 from opaque_keys.edx.keys import CourseKey, UsageKey
 
@@ -15,6 +18,12 @@ from lms.djangoapps.ccx.models import CcxFieldOverride, CustomCourseForEdX
 
 log = logging.getLogger(__name__)
 
+CCX_OVERRIDES_CACHE_KEY = u'ccx.overrides.{ccx_id}.{version}'
+CCX_OVERRIDES_VERSION_CACHE_KEY = u'ccx.overrides.version.{ccx_id}'
+# The overrides are invalidated when they change, this only bounds how long
+# overrides loaded concurrently with a change can be served.
+CCX_OVERRIDES_CACHE_TIMEOUT = 15 * 60
+
 
 class CustomCoursesForEdxOverrideProvider(FieldOverrideProvider):
     """
@@ -46,6 +55,19 @@ class CustomCoursesForEdxOverrideProvider(FieldOverrideProvider):
             return get_override_for_ccx(ccx, block, name, default)
         return default
 
+    def overridden_fields(self, block):
+        """
+        Return the live map of the overrides of the block in the current ccx,
+        if there is one.
+        """
+        location = getattr(block, 'location', None)
+        if location is None:
+            return None
+        ccx = get_current_ccx(location.course_key)
+        if ccx:
+            return _get_block_overrides_for_ccx(ccx, block)
+        return ()
+
     @classmethod
     def enabled_for(cls, block):
         """
@@ -80,24 +102,32 @@ def get_override_for_ccx(ccx, block, name, default=None):
     specify the block and the name of the field.  If the field is not
     overridden for the given ccx, returns `default`.
     """
-    overrides = _get_overrides_for_ccx(ccx)
+    block_overrides = _get_block_overrides_for_ccx(ccx, block)
 
+    if name in block_overrides:
+        try:
+            return block.fields[name].from_json(block_overrides[name])
+        except KeyError:
+            return block_overrides[name]
+    else:
+        return default
+
+
+def _get_block_overrides_for_ccx(ccx, block):
+    """
+    Returns the dictionary of the overrides set on this block for this CCX,
+    as kept in the map of all of the CCX's overrides.
+    """
     clean_ccx_key = _clean_ccx_key(block.location)
 
-    block_overrides = overrides.get(clean_ccx_key, {})
+    block_overrides = _get_overrides_for_ccx(ccx).setdefault(clean_ccx_key, {})
 
     # Hardcode the course_edit_method to be None instead of 'Studio', so,
     # the LMS never tries to link back to Studio. CCX courses
     # can't be edited in Studio.
     block_overrides['course_edit_method'] = None
 
-    if name in block_overrides:
-        try:
-            return block.fields[name].from_json(block_overrides[name])
-        except KeyError:
-            return block_overrides[name]
-    else:
-        return default
+    return block_overrides
 
 
 def _clean_ccx_key(block_location):
@@ -117,63 +147,184 @@ def _clean_ccx_key(block_location):
 
 def _get_overrides_for_ccx(ccx):
     """
-    Returns a dictionary mapping field name to overriden value for any
-    overrides set on this block for this CCX.
+    Returns a dictionary mapping block locations to dictionaries of the
+    decoded values, and ids, of the fields overridden on these blocks for
+    this CCX.
+
+    The overrides are loaded with a single query, and shared between
+    requests through the cache until they change.
     """
     overrides_cache = request_cache.get_cache('ccx-overrides')
 
     if ccx not in overrides_cache:
-        overrides = {}
-        query = CcxFieldOverride.objects.filter(
-            ccx=ccx,
-        )
-
-        for override in query:
-            block_overrides = overrides.setdefault(override.location, {})
-            block_overrides[override.field] = json.loads(override.value)
-            block_overrides[override.field + "_id"] = override.id
-            block_overrides[override.field + "_instance"] = override
+        # The version is read before the overrides, so that overrides loaded
+        # while they are changed are cached for the version being replaced.
+        cache_key = CCX_OVERRIDES_CACHE_KEY.format(ccx_id=ccx.id, version=_get_overrides_version(ccx))
+        overrides = cache.get(cache_key)
+        if overrides is None:
+            overrides = {}
+            query = CcxFieldOverride.objects.filter(
+                ccx=ccx,
+            )
+
+            for override in query:
+                block_overrides = overrides.setdefault(_clean_ccx_key(override.location), {})
+                block_overrides[override.field] = json.loads(override.value)
+                block_overrides[override.field + "_id"] = override.id
+
+            cache.set(cache_key, overrides, CCX_OVERRIDES_CACHE_TIMEOUT)
 
         overrides_cache[ccx] = overrides
 
     return overrides_cache[ccx]
 
 
-@transaction.atomic
+def _get_overrides_version(ccx):
+    """
+    Returns the version of the cached overrides of the CCX.
+    """
+    version_cache_key = CCX_OVERRIDES_VERSION_CACHE_KEY.format(ccx_id=ccx.id)
+    version = cache.get(version_cache_key)
+    if version is None:
+        version = uuid4().hex
+        if not cache.add(version_cache_key, version, None):
+            version = cache.get(version_cache_key, version)
+    return version
+
+
+def _invalidate_overrides_cache(ccx):
+    """
+    Makes the requests which follow reload the overrides of the CCX, after
+    they've changed.
+
+    This must be called once the transaction changing the overrides has
+    exited, rather than within it: otherwise overrides loaded before the
+    changes are committed could be cached for the new version.
+    """
+    cache.set(CCX_OVERRIDES_VERSION_CACHE_KEY.format(ccx_id=ccx.id), uuid4().hex, None)
+
+
+@contextmanager
+def ccx_overrides_transaction(ccx):
+    """
+    Context manager which makes the changes to the overrides of the `ccx`
+    within it in a single transaction, and invalidates the cached overrides
+    once that transaction is committed.
+
+    Django 1.8 has no transaction.on_commit, so this must be the outermost
+    transaction: views using it are non-atomic requests.
+    """
+    with transaction.atomic():
+        yield
+    _invalidate_overrides_cache(ccx)
+
+
 def override_field_for_ccx(ccx, block, name, value):
     """
     Overrides a field for the `ccx`.  `block` and `name` specify the block
     and the name of the field on that block to override.  `value` is the
     value to set for the given field.
     """
+    if _override_field_for_ccx(ccx, block, name, value):
+        _invalidate_overrides_cache(ccx)
+
+
+@transaction.atomic
+def _override_field_for_ccx(ccx, block, name, value):
+    """
+    Overrides a field for the `ccx` as override_field_for_ccx does, and
+    returns whether the override was changed.
+    """
     field = block.fields[name]
     value_json = field.to_json(value)
     serialized_value = json.dumps(value_json)
     override_has_changes = False
-    clean_ccx_key = _clean_ccx_key(block.location)
+    block_overrides = _get_block_overrides_for_ccx(ccx, block)
 
-    override = get_override_for_ccx(ccx, block, name + "_instance")
-    if override:
-        override_has_changes = serialized_value != override.value
+    override_id = block_overrides.get(name + "_id")
+    if override_id and json.loads(serialized_value) != block_overrides.get(name):
+        override_has_changes = True
+        if not CcxFieldOverride.objects.filter(id=override_id).update(value=serialized_value):
+            # The override was deleted since the overrides were cached.
+            override_id = None
 
-    if not override:
+    if not override_id:
         override, created = CcxFieldOverride.objects.get_or_create(
             ccx=ccx,
             location=block.location,
             field=name,
             defaults={'value': serialized_value},
         )
-        if created:
-            _get_overrides_for_ccx(ccx).setdefault(clean_ccx_key, {})[name + "_id"] = override.id
-        else:
-            override_has_changes = serialized_value != override.value
+        override_id = override.id
+        override_has_changes = created or serialized_value != override.value
+        if override_has_changes and not created:
+            override.value = serialized_value
+            override.save()
+
+    block_overrides[name] = json.loads(serialized_value)
+    block_overrides[name + "_id"] = override_id
+    return override_has_changes
 
-    if override_has_changes:
-        override.value = serialized_value
-        override.save()
 
-    _get_overrides_for_ccx(ccx).setdefault(clean_ccx_key, {})[name] = value_json
-    _get_overrides_for_ccx(ccx).setdefault(clean_ccx_key, {})[name + "_instance"] = override
+def bulk_override_fields_for_ccx(ccx, block_overrides):
+    """
+    Overrides many fields for the `ccx` at once, with a query to create the
+    new overrides and a query per distinct value to update the existing ones.
+
+    Arguments:
+        ccx (CustomCourseForEdX): the CCX to override the fields for.
+        block_overrides (list): (block, name, value) tuples of the blocks and
+            the names of the fields on these blocks to override, with the
+            values to set for these fields.
+    """
+    if _bulk_override_fields_for_ccx(ccx, block_overrides):
+        _invalidate_overrides_cache(ccx)
+
+
+@transaction.atomic
+def _bulk_override_fields_for_ccx(ccx, block_overrides):
+    """
+    Overrides many fields for the `ccx` as bulk_override_fields_for_ccx
+    does, and returns whether any override was changed.
+    """
+    new_overrides = {}
+    updated_values = {}
+    for block, name, value in block_overrides:
+        serialized_value = json.dumps(block.fields[name].to_json(value))
+        ccx_override_map = _get_block_overrides_for_ccx(ccx, block)
+        override_id = ccx_override_map.get(name + "_id")
+        if override_id is None:
+            new_overrides[(_clean_ccx_key(block.location), name)] = serialized_value
+        elif json.loads(serialized_value) != ccx_override_map.get(name):
+            updated_values[override_id] = serialized_value
+        ccx_override_map[name] = json.loads(serialized_value)
+
+    updated_ids = {}
+    for override_id, serialized_value in updated_values.iteritems():
+        updated_ids.setdefault(serialized_value, []).append(override_id)
+    for serialized_value, ids in updated_ids.iteritems():
+        CcxFieldOverride.objects.filter(ccx=ccx, id__in=ids).update(value=serialized_value)
+
+    if new_overrides:
+        new_locations = set(location for location, _ in new_overrides)
+        for override in CcxFieldOverride.objects.filter(ccx=ccx, location__in=new_locations):
+            # The override was created since the overrides were cached.
+            serialized_value = new_overrides.pop((_clean_ccx_key(override.location), override.field), None)
+            if serialized_value is not None and serialized_value != override.value:
+                override.value = serialized_value
+                override.save()
+
+        CcxFieldOverride.objects.bulk_create([
+            CcxFieldOverride(ccx=ccx, location=location, field=name, value=serialized_value)
+            for (location, name), serialized_value in new_overrides.iteritems()
+        ])
+
+        # bulk_create doesn't set the ids of the new overrides, so these are reloaded.
+        for override in CcxFieldOverride.objects.filter(ccx=ccx, location__in=new_locations):
+            ccx_override_map = _get_overrides_for_ccx(ccx).setdefault(_clean_ccx_key(override.location), {})
+            ccx_override_map[override.field + "_id"] = override.id
+
+    return bool(updated_ids or new_overrides)
 
 
 def clear_override_for_ccx(ccx, block, name):
@@ -190,6 +341,7 @@ def clear_override_for_ccx(ccx, block, name):
             field=name).delete()
 
         clear_ccx_field_info_from_ccx_map(ccx, block, name)
+        _invalidate_overrides_cache(ccx)
 
     except CcxFieldOverride.DoesNotExist:
         pass
@@ -204,7 +356,6 @@ def clear_ccx_field_info_from_ccx_map(ccx, block, name):  # pylint: disable=inva
         ccx_override_map = _get_overrides_for_ccx(ccx).setdefault(clean_ccx_key, {})
         ccx_override_map.pop(name)
         ccx_override_map.pop(name + "_id")
-        ccx_override_map.pop(name + "_instance")
     except KeyError:
         pass
 
@@ -217,3 +368,4 @@ def bulk_delete_ccx_override_fields(ccx, ids):
     ids = list(set(ids))
     if ids:
         CcxFieldOverride.objects.filter(ccx=ccx, id__in=ids).delete()
+        _invalidate_overrides_cache(ccx)
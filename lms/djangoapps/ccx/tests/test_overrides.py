@@ -3,18 +3,21 @@
 tests for overrides
 """
 import datetime
+from copy import deepcopy
 
 import mock
 import pytz
 from ccx_keys.locator import CCXLocator
+from django.core.cache import cache
 from django.test.utils import override_settings
 from nose.plugins.attrib import attr
 
 from courseware.courses import get_course_by_id
 from courseware.field_overrides import OverrideFieldData
 from courseware.testutils import FieldOverrideTestMixin
+from lms.djangoapps.ccx import overrides
 from lms.djangoapps.ccx.models import CustomCourseForEdX
-from lms.djangoapps.ccx.overrides import override_field_for_ccx
+from lms.djangoapps.ccx.overrides import bulk_override_fields_for_ccx, get_override_for_ccx, override_field_for_ccx
 from lms.djangoapps.ccx.tests.utils import flatten, iter_blocks
 from lms.djangoapps.courseware.tests.test_field_overrides import inject_field_overrides
 from request_cache.middleware import RequestCache
@@ -148,6 +151,88 @@ class TestFieldOverrides(FieldOverrideTestMixin, SharedModuleStoreTestCase):
         with self.assertNumQueries(6):
             override_field_for_ccx(self.ccx, chapter, 'start', ccx_start)
 
+    @override_settings(CACHES={
+        'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache', 'LOCATION': 'ccx_overrides'}
+    })
+    def test_overrides_shared_between_requests(self):
+        """
+        Test that the overrides are loaded once for all requests, until they change.
+        """
+        cache.clear()
+        ccx_start = datetime.datetime(2014, 12, 25, 00, 00, tzinfo=pytz.UTC)
+        new_ccx_start = datetime.datetime(2015, 12, 25, 00, 00, tzinfo=pytz.UTC)
+        chapter = self.ccx_course.get_children()[0]
+        override_field_for_ccx(self.ccx, chapter, 'start', ccx_start)
+
+        for num_queries in (1, 0):
+            RequestCache.clear_request_cache()
+            with self.assertNumQueries(num_queries):
+                self.assertEquals(get_override_for_ccx(self.ccx, chapter, 'start'), ccx_start)
+
+        override_field_for_ccx(self.ccx, chapter, 'start', new_ccx_start)
+        RequestCache.clear_request_cache()
+        self.assertEquals(get_override_for_ccx(self.ccx, chapter, 'start'), new_ccx_start)
+
+    @override_settings(CACHES={
+        'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache', 'LOCATION': 'ccx_overrides'}
+    })
+    def test_overrides_loaded_during_change_not_shared(self):
+        """
+        Test that the overrides loaded by another request before a change
+        to them is committed aren't shared with the requests after it.
+        """
+        # pylint: disable=protected-access
+        cache.clear()
+        ccx_start = datetime.datetime(2014, 12, 25, 00, 00, tzinfo=pytz.UTC)
+        new_ccx_start = datetime.datetime(2015, 12, 25, 00, 00, tzinfo=pytz.UTC)
+        chapter = self.ccx_course.get_children()[0]
+        override_field_for_ccx(self.ccx, chapter, 'start', ccx_start)
+        RequestCache.clear_request_cache()
+        old_overrides = deepcopy(overrides._get_overrides_for_ccx(self.ccx))
+
+        original_override_field_for_ccx = overrides._override_field_for_ccx
+
+        def override_field_while_loaded(*args):
+            """
+            Overrides the field, while another request caches the overrides
+            as they were before the change.
+            """
+            changed = original_override_field_for_ccx(*args)
+            cache.set(
+                overrides.CCX_OVERRIDES_CACHE_KEY.format(
+                    ccx_id=self.ccx.id, version=overrides._get_overrides_version(self.ccx)
+                ),
+                old_overrides,
+            )
+            return changed
+
+        with mock.patch('lms.djangoapps.ccx.overrides._override_field_for_ccx', override_field_while_loaded):
+            override_field_for_ccx(self.ccx, chapter, 'start', new_ccx_start)
+        RequestCache.clear_request_cache()
+        self.assertEquals(get_override_for_ccx(self.ccx, chapter, 'start'), new_ccx_start)
+
+    def test_bulk_override(self):
+        """
+        Test that many fields are overridden with a query per kind of change.
+        """
+        ccx_start = datetime.datetime(2014, 12, 25, 00, 00, tzinfo=pytz.UTC)
+        new_ccx_start = datetime.datetime(2015, 12, 25, 00, 00, tzinfo=pytz.UTC)
+        chapters = self.ccx_course.get_children()
+        override_field_for_ccx(self.ccx, chapters[0], 'start', ccx_start)
+        # One SAVEPOINT/RELEASE SAVEPOINT pair caused by the transaction.atomic decorator.
+        # One UPDATE of the existing override, one SELECT of the overrides created
+        # meanwhile, one INSERT and one SELECT of the ids of the new overrides.
+        with self.assertNumQueries(6):
+            bulk_override_fields_for_ccx(
+                self.ccx,
+                [(chapter, 'start', new_ccx_start) for chapter in chapters] +
+                [(chapter, 'visible_to_staff_only', True) for chapter in chapters]
+            )
+        for chapter in chapters:
+            self.assertEquals(chapter.start, new_ccx_start)
+            self.assertTrue(chapter.visible_to_staff_only)
+            self.assertIsNotNone(get_override_for_ccx(self.ccx, chapter, 'visible_to_staff_only_id'))
+
     def test_override_is_inherited(self):
         """
         Test that sequentials inherit overridden start date from chapter.
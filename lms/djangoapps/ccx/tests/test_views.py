@@ -28,7 +28,7 @@ from django_comment_client.utils import has_forum_access
 from django_comment_common.models import FORUM_ROLE_ADMINISTRATOR
 from django_comment_common.utils import are_permissions_roles_seeded
 from edxmako.shortcuts import render_to_response
-from lms.djangoapps.ccx.models import CustomCourseForEdX
+from lms.djangoapps.ccx.models import CcxFieldOverride, CustomCourseForEdX
 from lms.djangoapps.ccx.overrides import get_override_for_ccx, override_field_for_ccx
 from lms.djangoapps.ccx.tests.factories import CcxFactory
 from lms.djangoapps.ccx.tests.utils import CcxTestCase, flatten
@@ -539,6 +539,31 @@ class TestCoachDashboard(CcxTestCase, LoginEnrollmentTestCase):
         self.assertEqual(policy['GRADER'][3]['type'], 'Final Exam')
         self.assertEqual(policy['GRADER'][3]['min_count'], 0)
 
+    @patch('ccx.views.render_to_response', intercept_renderer)
+    def test_edit_schedule_failure_not_applied(self):
+        """
+        Test that a schedule whose save fails partway through isn't
+        partially applied.
+        """
+        self.make_coach()
+        ccx = self.make_ccx()
+        url = reverse(
+            'ccx_coach_dashboard',
+            kwargs={'course_id': CCXLocator.from_course_locator(self.course.id, ccx.id)})
+        response = self.client.get(url)
+        schedule = json.loads(response.mako_context['schedule'])  # pylint: disable=no-member
+        schedule[0]['start'] = u'2014-11-20 00:00'
+        overrides = list(CcxFieldOverride.objects.filter(ccx=ccx).values_list('id', 'value'))
+
+        url = reverse(
+            'save_ccx',
+            kwargs={'course_id': CCXLocator.from_course_locator(self.course.id, ccx.id)})
+        with patch('ccx.views.override_field_for_ccx', side_effect=Exception):
+            with self.assertRaises(Exception):
+                self.client.post(url, json.dumps(schedule), content_type='application/json')
+
+        self.assertEqual(list(CcxFieldOverride.objects.filter(ccx=ccx).values_list('id', 'value')), overrides)
+
     @patch('ccx.views.render_to_response', intercept_renderer)
     def test_save_without_min_count(self):
         """
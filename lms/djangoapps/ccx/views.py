@@ -32,6 +32,8 @@ from edxmako.shortcuts import render_to_response
 from lms.djangoapps.ccx.models import CustomCourseForEdX
 from lms.djangoapps.ccx.overrides import (
     bulk_delete_ccx_override_fields,
+    bulk_override_fields_for_ccx,
+    ccx_overrides_transaction,
     clear_ccx_field_info_from_ccx_map,
     get_override_for_ccx,
     override_field_for_ccx
@@ -202,12 +204,14 @@ def create_ccx(request, course, ccx=None):
 
     # Hide anything that can show up in the schedule
     hidden = 'visible_to_staff_only'
+    hidden_overrides = []
     for chapter in course.get_children():
-        override_field_for_ccx(ccx, chapter, hidden, True)
+        hidden_overrides.append((chapter, hidden, True))
         for sequential in chapter.get_children():
-            override_field_for_ccx(ccx, sequential, hidden, True)
+            hidden_overrides.append((sequential, hidden, True))
             for vertical in sequential.get_children():
-                override_field_for_ccx(ccx, vertical, hidden, True)
+                hidden_overrides.append((vertical, hidden, True))
+    bulk_override_fields_for_ccx(ccx, hidden_overrides)
 
     ccx_id = CCXLocator.from_course_locator(course.id, unicode(ccx.id))
 
@@ -242,6 +246,8 @@ def create_ccx(request, course, ccx=None):
     return redirect(url)
 
 
+# The view's changes are made in a ccx_overrides_transaction, which must be the outermost transaction.
+@transaction.non_atomic_requests
 @ensure_csrf_cookie
 @cache_control(no_cache=True, no_store=True, must_revalidate=True)
 @coach_dashboard
@@ -252,28 +258,29 @@ def save_ccx(request, course, ccx=None):
     if not ccx:
         raise Http404
 
-    def override_fields(parent, data, graded, earliest=None, ccx_ids_to_delete=None):
+    def override_fields(parent, data, graded, earliest=None, ccx_ids_to_delete=None, ccx_overrides=None):
         """
-        Recursively apply CCX schedule data to CCX by overriding the
-        `visible_to_staff_only`, `start` and `due` fields for units in the
-        course.
+        Recursively collect the overrides of the `visible_to_staff_only`,
+        `start` and `due` fields for units in the course which apply CCX
+        schedule data to CCX.
         """
         if ccx_ids_to_delete is None:
             ccx_ids_to_delete = []
+        if ccx_overrides is None:
+            ccx_overrides = []
         blocks = {
             str(child.location): child
             for child in parent.get_children()}
 
         for unit in data:
             block = blocks[unit['location']]
-            override_field_for_ccx(
-                ccx, block, 'visible_to_staff_only', unit['hidden'])
+            ccx_overrides.append((block, 'visible_to_staff_only', unit['hidden']))
 
             start = parse_date(unit['start'])
             if start:
                 if not earliest or start < earliest:
                     earliest = start
-                override_field_for_ccx(ccx, block, 'start', start)
+                ccx_overrides.append((block, 'start', start))
             else:
                 ccx_ids_to_delete.append(get_override_for_ccx(ccx, block, 'start_id'))
                 clear_ccx_field_info_from_ccx_map(ccx, block, 'start')
@@ -282,7 +289,7 @@ def save_ccx(request, course, ccx=None):
             if 'due' in unit:  # checking that the key (due) exist in dict (unit).
                 due = parse_date(unit['due'])
                 if due:
-                    override_field_for_ccx(ccx, block, 'due', due)
+                    ccx_overrides.append((block, 'due', due))
                 else:
                     ccx_ids_to_delete.append(get_override_for_ccx(ccx, block, 'due_id'))
                     clear_ccx_field_info_from_ccx_map(ccx, block, 'due')
@@ -300,35 +307,37 @@ def save_ccx(request, course, ccx=None):
                 for component in block.get_children():
                     # override start and due date of problem (Copy dates of vertical into problems)
                     if start:
-                        override_field_for_ccx(ccx, component, 'start', start)
+                        ccx_overrides.append((component, 'start', start))
 
                     if due:
-                        override_field_for_ccx(ccx, component, 'due', due)
+                        ccx_overrides.append((component, 'due', due))
 
             if children:
-                override_fields(block, children, graded, earliest, ccx_ids_to_delete)
-        return earliest, ccx_ids_to_delete
+                override_fields(block, children, graded, earliest, ccx_ids_to_delete, ccx_overrides)
+        return earliest, ccx_ids_to_delete, ccx_overrides
 
     graded = {}
-    earliest, ccx_ids_to_delete = override_fields(course, json.loads(request.body), graded, [])
-    bulk_delete_ccx_override_fields(ccx, ccx_ids_to_delete)
-    if earliest:
-        override_field_for_ccx(ccx, course, 'start', earliest)
-
-    # Attempt to automatically adjust grading policy
-    changed = False
-    policy = get_override_for_ccx(
-        ccx, course, 'grading_policy', course.grading_policy
-    )
-    policy = deepcopy(policy)
-    grader = policy['GRADER']
-    for section in grader:
-        count = graded.get(section.get('type'), 0)
-        if count < section.get('min_count', 0):
-            changed = True
-            section['min_count'] = count
-    if changed:
-        override_field_for_ccx(ccx, course, 'grading_policy', policy)
+    with ccx_overrides_transaction(ccx):
+        earliest, ccx_ids_to_delete, ccx_overrides = override_fields(course, json.loads(request.body), graded, [])
+        bulk_override_fields_for_ccx(ccx, ccx_overrides)
+        bulk_delete_ccx_override_fields(ccx, ccx_ids_to_delete)
+        if earliest:
+            override_field_for_ccx(ccx, course, 'start', earliest)
+
+        # Attempt to automatically adjust grading policy
+        changed = False
+        policy = get_override_for_ccx(
+            ccx, course, 'grading_policy', course.grading_policy
+        )
+        policy = deepcopy(policy)
+        grader = policy['GRADER']
+        for section in grader:
+            count = graded.get(section.get('type'), 0)
+            if count < section.get('min_count', 0):
+                changed = True
+                section['min_count'] = count
+        if changed:
+            override_field_for_ccx(ccx, course, 'grading_policy', policy)
 
     # using CCX object as sender here.
     responses = SignalHandler.course_published.send(
@@ -346,6 +355,8 @@ def save_ccx(request, course, ccx=None):
     )
 
 
+# The view's changes are made in a ccx_overrides_transaction, which must be the outermost transaction.
+@transaction.non_atomic_requests
 @ensure_csrf_cookie
 @cache_control(no_cache=True, no_store=True, must_revalidate=True)
 @coach_dashboard
@@ -356,8 +367,9 @@ def set_grading_policy(request, course, ccx=None):
     if not ccx:
         raise Http404
 
-    override_field_for_ccx(
-        ccx, course, 'grading_policy', json.loads(request.POST['policy']))
+    with ccx_overrides_transaction(ccx):
+        override_field_for_ccx(
+            ccx, course, 'grading_policy', json.loads(request.POST['policy']))
 
     # using CCX object as sender here.
     responses = SignalHandler.course_published.send(
@@ -55,6 +55,18 @@ class BlocksAPITransformer(BlockStructureTransformer):
 
         # TODO support olx_data by calling export_to_xml(?)
 
+    def user_signature(self, usage_info, block_structure):
+        """
+        The output is the same for all users, and only depends on the
+        requested counts, student view data and depths.
+        """
+        return (
+            frozenset(self.block_types_to_count or ()),
+            frozenset(self.requested_student_view_data or ()),
+            self.depth,
+            self.nav_depth,
+        )
+
     def transform(self, usage_info, block_structure):
         """
         Mutates block_structure based on the given usage_info.
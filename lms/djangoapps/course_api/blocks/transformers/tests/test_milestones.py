@@ -130,6 +130,14 @@ class MilestonesTransformerTestCase(CourseStructureTestCase, MilestonesTestCaseM
             },
         ]
 
+    def test_collect_incrementally(self):
+        self.assert_incremental_collect(
+            self.build_tree_course(),
+            'sequential1',
+            is_time_limited=True,
+            is_proctored_enabled=True,
+        )
+
     def test_special_exams_not_visible_to_non_staff(self):
         self.get_blocks_and_check_against_expected(self.user, self.ALL_BLOCKS_EXCEPT_SPECIAL)
 
@@ -29,10 +29,12 @@ class HiddenContentTransformer(FilteringTransformerMixin, BlockStructureTransfor
 
     Staff users are exempted from hidden content rules.
     """
-    WRITE_VERSION = 2
+    WRITE_VERSION = 3
     READ_VERSION = 2
+    SUPPORTS_INCREMENTAL_COLLECT = True
     MERGED_DUE_DATE = 'merged_due_date'
     MERGED_HIDE_AFTER_DUE = 'merged_hide_after_due'
+    HIDDEN_DATES = 'hidden_dates'
 
     @classmethod
     def name(cls):
@@ -88,6 +90,39 @@ class HiddenContentTransformer(FilteringTransformerMixin, BlockStructureTransfor
 
         block_structure.request_xblock_fields(u'self_paced', u'end')
 
+    @classmethod
+    def collect_summary(cls, block_structure):
+        """
+        Collects the distinct dates that content may be hidden after: the
+        merged due dates of the blocks hidden after their due date, and
+        the course's end date if it's self-paced.
+        """
+        hidden_dates = set()
+        for block_key in block_structure:
+            if cls._get_merged_hide_after_due(block_structure, block_key):
+                hidden_dates.add(cls._get_merged_due_date(block_structure, block_key))
+        root_block_key = block_structure.root_block_usage_key
+        if hidden_dates and block_structure.get_xblock_field(root_block_key, 'self_paced'):
+            hidden_dates.add(block_structure.get_xblock_field(root_block_key, 'end'))
+        block_structure.set_transformer_data(
+            cls, cls.HIDDEN_DATES, [hidden_date for hidden_date in hidden_dates if hidden_date],
+        )
+
+    def user_signature(self, usage_info, block_structure):
+        """
+        Staff users share the same output.  Other users share it for as
+        long as the same number of the dates that content may be hidden
+        after have passed, which identifies which blocks are hidden.
+        """
+        if usage_info.has_staff_access:
+            return 'staff'
+        hidden_dates = block_structure.get_transformer_data(self, self.HIDDEN_DATES)
+        if hidden_dates is None:
+            # The hidden dates weren't collected by this version.
+            return None
+        now = datetime.now(utc)
+        return sum(1 for hidden_date in hidden_dates if hidden_date <= now)
+
     def transform_block_filters(self, usage_info, block_structure):
         # Users with staff access bypass the Visibility check.
         if usage_info.has_staff_access:
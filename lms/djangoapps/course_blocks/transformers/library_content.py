@@ -26,6 +26,7 @@ class ContentLibraryTransformer(FilteringTransformerMixin, BlockStructureTransfo
     """
     WRITE_VERSION = 1
     READ_VERSION = 1
+    SUPPORTS_INCREMENTAL_COLLECT = True
 
     @classmethod
     def name(cls):
@@ -67,6 +68,17 @@ class ContentLibraryTransformer(FilteringTransformerMixin, BlockStructureTransfo
                 summary = summarize_block(child_key)
                 block_structure.set_transformer_block_field(child_key, cls, 'block_analytics_summary', summary)
 
+    def user_signature(self, usage_info, block_structure):
+        """
+        The output is the same for all users if the course has no
+        library_content blocks.  Otherwise, it depends on each user's
+        selected children, whose selection is also recorded and
+        published, so it is never shared.
+        """
+        if any(block_key.block_type == 'library_content' for block_key in block_structure):
+            return None
+        return ()
+
     def transform_block_filters(self, usage_info, block_structure):
         all_library_children = set()
         all_selected_children = set()
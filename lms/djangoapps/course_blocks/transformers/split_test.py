@@ -72,6 +72,13 @@ class SplitTestTransformer(FilteringTransformerMixin, BlockStructureTransformer)
                 group = child_to_group.get(child_location, None)
                 child.group_access[partition_for_this_block.id] = [group] if group is not None else []
 
+    def user_signature(self, usage_info, block_structure):
+        """
+        The output is the same for all users, since the groups of the
+        users are enforced by the UserPartitionTransformer.
+        """
+        return ()
+
     def transform_block_filters(self, usage_info, block_structure):
         """
         Mutates block_structure based on the given usage_info.
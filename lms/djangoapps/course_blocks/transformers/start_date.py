@@ -1,7 +1,9 @@
 """
 Start Date Transformer implementation.
 """
-from lms.djangoapps.courseware.access_utils import check_start_date
+from django.conf import settings
+
+from lms.djangoapps.courseware.access_utils import check_start_date, in_preview_mode, is_beta_tester
 from openedx.core.djangoapps.content.block_structure.transformer import (
     BlockStructureTransformer,
     FilteringTransformerMixin
@@ -27,9 +29,11 @@ class StartDateTransformer(FilteringTransformerMixin, BlockStructureTransformer)
 
     Staff users are exempted from visibility rules.
     """
-    WRITE_VERSION = 1
+    WRITE_VERSION = 2
     READ_VERSION = 1
+    SUPPORTS_INCREMENTAL_COLLECT = True
     MERGED_START_DATE = 'merged_start_date'
+    START_DATES = 'start_dates'
 
     @classmethod
     def name(cls):
@@ -67,6 +71,41 @@ class StartDateTransformer(FilteringTransformerMixin, BlockStructureTransformer)
             func_merge_ancestors=max,
         )
 
+    @classmethod
+    def collect_summary(cls, block_structure):
+        """
+        Collects the distinct pairs of merged start date and beta offset
+        of the blocks.
+        """
+        block_structure.set_transformer_data(cls, cls.START_DATES, list({
+            (
+                cls._get_merged_start_date(block_structure, block_key),
+                block_structure.get_xblock_field(block_key, 'days_early_for_beta'),
+            )
+            for block_key in block_structure
+        }))
+
+    def user_signature(self, usage_info, block_structure):
+        """
+        Staff users share the same output.  Other users share it with
+        users of the same beta tester status for whom the same number
+        of the distinct start dates have passed, which identifies which
+        blocks have started.
+        """
+        if usage_info.has_staff_access:
+            return 'staff'
+        if settings.FEATURES['DISABLE_START_DATES'] or in_preview_mode():
+            return None
+        start_dates = block_structure.get_transformer_data(self, self.START_DATES)
+        if start_dates is None:
+            # The start dates weren't collected by this version.
+            return None
+        num_started = sum(
+            1 for start, days_early_for_beta in start_dates
+            if check_start_date(usage_info.user, days_early_for_beta, start, usage_info.course_key)
+        )
+        return is_beta_tester(usage_info.user, usage_info.course_key), num_started
+
     def transform_block_filters(self, usage_info, block_structure):
         # Users with staff access bypass the Start Date check.
         if usage_info.has_staff_access:
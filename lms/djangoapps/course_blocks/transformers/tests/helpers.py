@@ -5,6 +5,7 @@ from mock import patch
 
 from course_modes.models import CourseMode
 from lms.djangoapps.courseware.access import has_access
+from openedx.core.djangoapps.content.block_structure.factory import BlockStructureFactory
 from openedx.core.djangoapps.content.block_structure.tests.helpers import clear_registered_transformers_cache
 from openedx.core.djangoapps.content.block_structure.transformers import BlockStructureTransformers
 from student.tests.factories import CourseEnrollmentFactory, UserFactory
@@ -187,6 +188,95 @@ class CourseStructureTestCase(TransformerRegistryTestMixin, ModuleStoreTestCase)
 
         return block_map
 
+    def build_tree_course(self):
+        """
+        Builds a course with a chapter of two sequentials, each with a
+        vertical, and returns the mapping of build_course.
+        """
+        return self.build_course([{
+            '#type': 'course',
+            '#ref': 'course',
+            '#children': [{
+                '#type': 'chapter',
+                '#ref': 'chapter',
+                '#children': [
+                    {
+                        '#type': 'sequential',
+                        '#ref': 'sequential{}'.format(index),
+                        '#children': [{'#type': 'vertical', '#ref': 'vertical{}'.format(index)}],
+                    }
+                    for index in (1, 2)
+                ],
+            }],
+        }])
+
+    def assert_incremental_collect(self, blocks, block_ref, **field_values):
+        """
+        Verifies that TRANSFORMER_CLASS_TO_TEST collects the same data
+        incrementally as in a full collection, after the block with the
+        given #ref value is updated with the given field values.
+
+        Arguments:
+            blocks (dict[str: XBlock]): Mapping from '#ref' values to
+                their XBlocks, as returned by build_course.  The course
+                must not be a DAG.
+        """
+        course_key = blocks['course'].location
+        previous_block_structure = self._collect_from_modulestore(course_key)
+        self.assertTrue(all(
+            len(previous_block_structure.get_parents(block_key)) <= 1 for block_key in previous_block_structure
+        ))
+
+        block = modulestore().get_item(blocks[block_ref].location)
+        for field_name, value in field_values.iteritems():
+            setattr(block, field_name, value)
+        update_block(block)
+        publish_course(blocks['course'])
+
+        block_structure = self._collect_from_modulestore(course_key)
+        incremental_block_structure = self._collect_from_modulestore(course_key, previous_block_structure)
+        self.assertNotEqual(
+            self._get_collected_data(block_structure, include_edited_on=False),
+            self._get_collected_data(previous_block_structure, include_edited_on=False),
+        )
+        self.assertEqual(
+            self._get_collected_data(incremental_block_structure),
+            self._get_collected_data(block_structure),
+        )
+
+    def _collect_from_modulestore(self, root_block_usage_key, previous_block_structure=None):
+        """
+        Returns a block structure with data collected from the
+        modulestore, incrementally if a previous_block_structure is given.
+        """
+        block_structure = BlockStructureFactory.create_from_modulestore(root_block_usage_key, modulestore())
+        if previous_block_structure is None:
+            BlockStructureTransformers.collect(block_structure)
+        else:
+            BlockStructureTransformers.collect_incrementally(block_structure, previous_block_structure)
+        return block_structure
+
+    def _get_collected_data(self, block_structure, include_edited_on=True):
+        """
+        Returns the xBlock fields and the data of TRANSFORMER_CLASS_TO_TEST
+        collected in the given block structure.
+        """
+        transformer_name = self.TRANSFORMER_CLASS_TO_TEST.name()
+        collected_data = {}
+        for block_key in block_structure:
+            block_data = block_structure[block_key]
+            transformer_block_data = block_data.transformer_data.get(transformer_name)
+            collected_data[block_key] = (
+                {
+                    field_name: value
+                    for field_name, value in block_data.fields.iteritems()
+                    if include_edited_on or field_name not in ('edited_on', 'subtree_edited_on')
+                },
+                transformer_block_data.fields if transformer_block_data else {},
+            )
+        transformer_data = block_structure.transformer_data.get(transformer_name)
+        return collected_data, transformer_data.fields if transformer_data else {}
+
     def get_block_key_set(self, blocks, *refs):
         """
         Gets the set of usage keys that correspond to the list of
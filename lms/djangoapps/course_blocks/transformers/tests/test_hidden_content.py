@@ -7,8 +7,11 @@ import ddt
 from django.utils.timezone import now
 from nose.plugins.attrib import attr
 
+from openedx.core.djangoapps.content.block_structure.api import get_course_in_cache
+
+from ...usage_info import CourseUsageInfo
 from ..hidden_content import HiddenContentTransformer
-from .helpers import BlockParentsMapTestCase, update_block
+from .helpers import BlockParentsMapTestCase, CourseStructureTestCase, publish_course, update_block
 
 
 @attr(shard=3)
@@ -82,3 +85,41 @@ class HiddenContentTransformerTestCase(BlockParentsMapTestCase):
             blocks_with_differing_access=None,
             transformers=self.transformers,
         )
+
+    def test_user_signature(self):
+        hide_due_values = {1: self.DueDateType.past, 2: self.DueDateType.future, 4: self.DueDateType.past}
+        for idx, due_date_type in hide_due_values.iteritems():
+            block = self.get_block(idx)
+            block.due = self.DueDateType.due(due_date_type)
+            block.hide_after_due = True
+            update_block(block)
+        publish_course(self.course)
+        block_structure = get_course_in_cache(self.course.id)
+
+        def signature(user):
+            """
+            Returns the user signature of the transformer for the given user.
+            """
+            return HiddenContentTransformer().user_signature(CourseUsageInfo(self.course.id, user), block_structure)
+
+        # The signatures count the passed distinct hidden dates, rather
+        # than the hidden blocks.
+        self.assertEqual(len(block_structure.get_transformer_data(HiddenContentTransformer, 'hidden_dates')), 2)
+        self.assertEqual(signature(self.student), 1)
+        self.assertEqual(signature(self.staff), 'staff')
+
+
+@attr(shard=3)
+class HiddenContentTransformerIncrementalCollectTestCase(CourseStructureTestCase):
+    """
+    HiddenContentTransformer incremental collection Test
+    """
+    TRANSFORMER_CLASS_TO_TEST = HiddenContentTransformer
+
+    def test_collect_incrementally(self):
+        self.assert_incremental_collect(
+            self.build_tree_course(),
+            'sequential1',
+            due=now() - timedelta(days=1),
+            hide_after_due=True,
+        )
@@ -106,6 +106,9 @@ class ContentLibraryTransformerTestCase(CourseStructureTestCase):
             ]
         }]
 
+    def test_collect_incrementally(self):
+        self.assert_incremental_collect(self.blocks, 'library_content1', max_count=2)
+
     def test_content_library(self):
         """
         Test when course has content library section.
@@ -9,9 +9,12 @@ from mock import patch
 from nose.plugins.attrib import attr
 
 from courseware.tests.factories import BetaTesterFactory
+from openedx.core.djangoapps.content.block_structure.api import get_course_in_cache
+from student.tests.factories import UserFactory
 
+from ...usage_info import CourseUsageInfo
 from ..start_date import DEFAULT_START_DATE, StartDateTransformer
-from .helpers import BlockParentsMapTestCase, update_block
+from .helpers import BlockParentsMapTestCase, CourseStructureTestCase, publish_course, update_block
 
 
 @attr(shard=3)
@@ -121,3 +124,43 @@ class StartDateTransformerTestCase(BlockParentsMapTestCase):
             blocks_with_differing_student_access,
             self.transformers,
         )
+
+    @patch.dict('django.conf.settings.FEATURES', {'DISABLE_START_DATES': False})
+    def test_user_signature(self):
+        for idx, start_date_type in ((0, self.StartDateType.released), (2, self.StartDateType.future)):
+            block = self.get_block(idx)
+            block.start = self.StartDateType.start(start_date_type)
+            update_block(block)
+        publish_course(self.course)
+        block_structure = get_course_in_cache(self.course.id)
+
+        def signature(user):
+            """
+            Returns the user signature of the transformer for the given user.
+            """
+            return StartDateTransformer().user_signature(CourseUsageInfo(self.course.id, user), block_structure)
+
+        # The signatures count the started distinct start dates, rather
+        # than the started blocks.
+        self.assertEqual(len(block_structure.get_transformer_data(StartDateTransformer, 'start_dates')), 2)
+        other_student = UserFactory.create()
+        self.assertEqual(signature(self.student), (False, 1))
+        self.assertEqual(signature(self.student), signature(other_student))
+        self.assertEqual(signature(self.beta_user), (True, 2))
+        self.assertEqual(signature(self.staff), 'staff')
+
+
+@attr(shard=3)
+class StartDateTransformerIncrementalCollectTestCase(CourseStructureTestCase):
+    """
+    StartDateTransformer incremental collection Test
+    """
+    TRANSFORMER_CLASS_TO_TEST = StartDateTransformer
+
+    def test_collect_incrementally(self):
+        self.assert_incremental_collect(
+            self.build_tree_course(),
+            'sequential1',
+            start=now() + timedelta(days=30),
+            days_early_for_beta=5,
+        )
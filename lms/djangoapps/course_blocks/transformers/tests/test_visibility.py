@@ -5,7 +5,7 @@ import ddt
 from nose.plugins.attrib import attr
 
 from ..visibility import VisibilityTransformer
-from .helpers import BlockParentsMapTestCase, update_block
+from .helpers import BlockParentsMapTestCase, CourseStructureTestCase, update_block
 
 
 @attr(shard=3)
@@ -45,3 +45,14 @@ class VisibilityTransformerTestCase(BlockParentsMapTestCase):
             blocks_with_differing_access,
             self.transformers,
         )
+
+
+@attr(shard=3)
+class VisibilityTransformerIncrementalCollectTestCase(CourseStructureTestCase):
+    """
+    VisibilityTransformer incremental collection Test
+    """
+    TRANSFORMER_CLASS_TO_TEST = VisibilityTransformer
+
+    def test_collect_incrementally(self):
+        self.assert_incremental_collect(self.build_tree_course(), 'sequential1', visible_to_staff_only=True)
@@ -12,6 +12,7 @@ Note: The access control logic in this file does NOT check for enrollment in
 """
 import logging
 from datetime import datetime
+from functools import partial
 
 from ccx_keys.locator import CCXLocator
 from django.conf import settings
@@ -24,6 +25,7 @@ from util import milestones_helpers as milestones_helpers
 
 from xblock.core import XBlock
 
+from courseware.access_cache import cached_access_decision
 from courseware.access_response import (
     MilestoneAccessError,
     MobileAvailabilityError,
@@ -451,10 +453,11 @@ def _has_group_access(descriptor, user, course_key):
     # look up the user's group for each partition
     user_groups = {}
     for partition, groups in partition_groups:
-        user_groups[partition.id] = partition.scheme.get_group_for_user(
-            course_key,
+        user_groups[partition.id] = cached_access_decision(
             user,
-            partition,
+            course_key,
+            ('group', partition.id),
+            partial(partition.scheme.get_group_for_user, course_key, user, partition),
         )
 
     # finally: check that the user has a satisfactory group assignment
@@ -671,6 +674,19 @@ def _has_access_to_course(user, access_level, course_key):
     if is_masquerading_as_student(user, course_key):
         return ACCESS_DENIED
 
+    return cached_access_decision(
+        user,
+        course_key,
+        ('course_access', access_level),
+        partial(_check_access_to_course, user, access_level, course_key),
+    )
+
+
+def _check_access_to_course(user, access_level, course_key):
+    """
+    Returns whether the given authenticated user, who isn't masquerading,
+    has access_level access to the course with the given course_key.
+    """
     global_staff, staff_access, instructor_access = administrative_accesses_to_course_for_user(user, course_key)
 
     if global_staff:
@@ -762,13 +778,34 @@ def _can_access_descriptor_with_milestones(user, descriptor, course_key):
         descriptor: the object being accessed
         course_key: key for the course for this descriptor
     """
-    if milestones_helpers.get_course_content_milestones(course_key, unicode(descriptor.location), 'requires', user.id):
+    content_id = unicode(descriptor.location)
+    if user.is_authenticated():
+        blocked = content_id in cached_access_decision(
+            user,
+            course_key,
+            'milestone_blocked_content',
+            partial(_milestone_blocked_content_ids, user, course_key),
+        )
+    else:
+        blocked = bool(milestones_helpers.get_course_content_milestones(course_key, content_id, 'requires', user.id))
+    if blocked:
         debug("Deny: user has not completed all milestones for content")
         return ACCESS_DENIED
     else:
         return ACCESS_GRANTED
 
 
+def _milestone_blocked_content_ids(user, course_key):
+    """
+    Returns the set of the ids of the content in the course that requires
+    milestones which the given authenticated user hasn't fulfilled.
+    """
+    return {
+        milestone['content_id']
+        for milestone in milestones_helpers.get_course_content_milestones(course_key, None, 'requires', user.id)
+    }
+
+
 def _has_detached_class_tag(descriptor):
     """
     Returns if the given descriptor's type is marked as detached.
@@ -0,0 +1,83 @@
+"""
+A request cache of the access decisions made for users in courses.
+
+courseware.access checks a user's roles, beta tester status, group
+memberships and milestones for every block rendered on a page, although
+these only depend on the user and the course.  Each of them is resolved
+once per request and kept in this cache, so that the block-level checks
+become dictionary lookups.
+
+The cache is cleared whenever a role, a cohort membership or an enrollment
+changes.  Decisions are only cached while serving a request, and never for
+anonymous users or for users masquerading in the course.
+"""
+import crum
+from django.contrib.auth.models import User
+from django.db.models.signals import m2m_changed, post_delete, post_save
+from django.dispatch import receiver
+from organizations.models import OrganizationUser
+
+import request_cache
+from courseware.masquerade import get_course_masquerade
+from openedx.core.djangoapps.course_groups.models import CohortMembership, CourseUserGroup
+from student.models import CourseAccessRole, CourseEnrollment
+
+ACCESS_CACHE_NAMESPACE = u'courseware.access_cache.decisions'
+ACCESS_CACHE_STATS_NAMESPACE = u'courseware.access_cache.stats'
+
+
+def cached_access_decision(user, course_key, decision, compute):
+    """
+    Returns the result of the given access decision for the user in the
+    course, calling compute to make the decision if it isn't cached yet.
+
+    Arguments:
+        user (User): the user the decision is made for.
+        course_key (CourseKey): the course the decision is made in.
+        decision (hashable): identifies the decision within the course.
+        compute (callable): makes the decision, without any arguments.
+    """
+    if (
+            crum.get_current_request() is None or
+            user is None or
+            not user.is_authenticated() or
+            get_course_masquerade(user, course_key)
+    ):
+        return compute()
+
+    decisions = request_cache.get_cache(ACCESS_CACHE_NAMESPACE)
+    stats = request_cache.get_cache(ACCESS_CACHE_STATS_NAMESPACE)
+    key = (user.id, course_key, decision)
+    if key in decisions:
+        stats['hits'] = stats.get('hits', 0) + 1
+    else:
+        stats['misses'] = stats.get('misses', 0) + 1
+        decisions[key] = compute()
+    return decisions[key]
+
+
+def get_access_cache_stats():
+    """
+    Returns how many access decisions were served from the cache (hits)
+    and how many had to be made (misses) during the current request.
+    """
+    stats = request_cache.get_cache(ACCESS_CACHE_STATS_NAMESPACE)
+    return {'hits': stats.get('hits', 0), 'misses': stats.get('misses', 0)}
+
+
+@receiver(post_save, sender=CourseAccessRole)
+@receiver(post_delete, sender=CourseAccessRole)
+@receiver(post_save, sender=OrganizationUser)
+@receiver(post_delete, sender=OrganizationUser)
+@receiver(post_save, sender=User)
+@receiver(post_save, sender=CohortMembership)
+@receiver(post_delete, sender=CohortMembership)
+@receiver(m2m_changed, sender=CourseUserGroup.users.through)
+@receiver(post_save, sender=CourseEnrollment)
+@receiver(post_delete, sender=CourseEnrollment)
+def clear_access_cache(**kwargs):  # pylint: disable=unused-argument
+    """
+    Clears the cached access decisions when any of the data they're made
+    from changes.
+    """
+    request_cache.clear_cache(ACCESS_CACHE_NAMESPACE)
@@ -4,11 +4,13 @@ It allows us to share code between access.py and block transformers.
 """
 
 from datetime import datetime, timedelta
+from functools import partial
 from logging import getLogger
 
 from django.conf import settings
 from pytz import UTC
 
+from courseware.access_cache import cached_access_decision
 from courseware.access_response import AccessResponse, StartDateError
 from courseware.masquerade import is_masquerading_as_student
 from openedx.features.course_experience import COURSE_PRE_START_ACCESS_FLAG
@@ -31,6 +33,15 @@ def debug(*args, **kwargs):
         log.debug(*args, **kwargs)
 
 
+def is_beta_tester(user, course_key):
+    """
+    Returns whether the user is a beta tester of the course.
+    """
+    return cached_access_decision(
+        user, course_key, 'beta_tester', partial(CourseBetaTesterRole(course_key).has_user, user),
+    )
+
+
 def adjust_start_date(user, days_early_for_beta, start, course_key):
     """
     If user is in a beta test group, adjust the start date by the appropriate number of
@@ -43,7 +54,7 @@ def adjust_start_date(user, days_early_for_beta, start, course_key):
         # bail early if no beta testing is set up
         return start
 
-    if CourseBetaTesterRole(course_key).has_user(user):
+    if is_beta_tester(user, course_key):
         debug("Adjust start time: user in beta role for %s", course_key)
         delta = timedelta(days_early_for_beta)
         effective = start - delta
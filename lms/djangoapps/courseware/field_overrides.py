@@ -16,11 +16,13 @@ by `authored_data`, e.g. course content and settings stored in Mongo.
 """
 import threading
 from abc import ABCMeta, abstractmethod
+from collections import Counter
 from contextlib import contextmanager
 
 from django.conf import settings
 from xblock.field_data import FieldData
 
+from openedx.core.djangoapps import monitoring_utils
 from request_cache.middleware import RequestCache
 from xmodule.modulestore.inheritance import InheritanceMixin
 
@@ -113,6 +115,19 @@ class FieldOverrideProvider(object):
         """
         raise NotImplementedError
 
+    def overridden_fields(self, block):  # pylint: disable=unused-argument
+        """
+        Returns a container of the names of the fields that this provider may
+        override in `block`, or None if it can't tell without looking up each
+        field with `get`.
+
+        `OverrideFieldData` keeps the container for as long as it wraps the
+        block's field data, and only calls `get` for the fields in it.
+        Providers whose overrides may change in the meantime should return a
+        container that they keep up to date.
+        """
+        return None
+
     @abstractmethod
     def enabled_for(self, course):  # pragma no cover
         """
@@ -142,6 +157,12 @@ class OverrideFieldData(FieldData):
     is important for this setting.  Override providers will tried in the order
     configured in the setting.  The first provider to find an override 'wins'
     for a particular field lookup.
+
+    The providers which may override fields of a block, and the names of these
+    fields, are resolved once per block, so that the lookup of a field that
+    isn't overridden goes straight to the wrapped `FieldData`.  The number of
+    overrides found by each provider is kept in `provider_hits` and reported
+    as a custom metric, for profiling.
     """
     provider_classes = None
 
@@ -155,11 +176,6 @@ class OverrideFieldData(FieldData):
         any performance impact of this feature if no override providers are
         configured.
         """
-        if cls.provider_classes is None:
-            cls.provider_classes = tuple(
-                (resolve_dotted(name) for name in
-                 settings.FIELD_OVERRIDE_PROVIDERS))
-
         enabled_providers = cls._providers_for_course(course)
         if enabled_providers:
             # TODO: we might not actually want to return here.  Might be better
@@ -170,6 +186,15 @@ class OverrideFieldData(FieldData):
 
         return wrapped
 
+    @classmethod
+    def has_enabled_providers(cls, course):
+        """
+        Returns whether any of the configured override providers is enabled
+        for the given course, that is, whether the fields of its blocks may
+        be overridden for some users.
+        """
+        return bool(cls._providers_for_course(course))
+
     @classmethod
     def _providers_for_course(cls, course):
         """
@@ -180,6 +205,11 @@ class OverrideFieldData(FieldData):
         Arguments:
             course: The course XBlock
         """
+        if cls.provider_classes is None:
+            cls.provider_classes = tuple(
+                (resolve_dotted(name) for name in
+                 settings.FIELD_OVERRIDE_PROVIDERS))
+
         request_cache = RequestCache.get_request_cache()
         if course is None:
             cache_key = ENABLED_OVERRIDE_PROVIDERS_KEY.format(course_id='None')
@@ -197,6 +227,23 @@ class OverrideFieldData(FieldData):
     def __init__(self, user, fallback, providers):
         self.fallback = fallback
         self.providers = tuple(provider(user) for provider in providers)
+        self.provider_hits = Counter()
+        self._block_providers = {}
+
+    def _overriding_providers(self, block):
+        """
+        Returns the providers enabled for `block`, each with the container of
+        the names of the fields that it may override in `block`, or None if
+        it may override any of them.
+        """
+        cache_key = getattr(block, 'scope_ids', block)
+        block_providers = self._block_providers.get(cache_key)
+        if block_providers is None:
+            block_providers = tuple(
+                (provider, provider.overridden_fields(block)) for provider in self.providers
+            )
+            self._block_providers[cache_key] = block_providers
+        return block_providers
 
     def get_override(self, block, name):
         """
@@ -204,9 +251,14 @@ class OverrideFieldData(FieldData):
         Returns the overridden value or `NOTSET` if no override is found.
         """
         if not overrides_disabled():
-            for provider in self.providers:
+            for provider, fields in self._overriding_providers(block):
+                if fields is not None and name not in fields:
+                    continue
                 value = provider.get(block, name, NOTSET)
                 if value is not NOTSET:
+                    provider_name = provider.__class__.__name__
+                    self.provider_hits[provider_name] += 1
+                    monitoring_utils.increment('field_overrides.{}.hits'.format(provider_name))
                     return value
         return NOTSET
 
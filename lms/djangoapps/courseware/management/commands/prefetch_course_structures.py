@@ -0,0 +1,36 @@
+"""
+A Django command that loads the published structures of courses into the
+course structure cache, to warm it up after a deployment.
+
+When no course_id is given, the courses listed in the
+PREFETCH_COURSE_STRUCTURES setting are prefetched.
+"""
+from textwrap import dedent
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from opaque_keys import InvalidKeyError
+from opaque_keys.edx.keys import CourseKey
+
+from xmodule.modulestore.django import modulestore
+
+
+class Command(BaseCommand):
+    """
+    Load the published structures of courses into the course structure cache.
+    """
+    args = "<course_id course_id ...>"
+    help = dedent(__doc__).strip()
+
+    def handle(self, *args, **options):
+        course_ids = args or settings.PREFETCH_COURSE_STRUCTURES
+        if not course_ids:
+            raise CommandError("No course_id specified, and PREFETCH_COURSE_STRUCTURES is empty")
+
+        try:
+            course_keys = [CourseKey.from_string(course_id) for course_id in course_ids]
+        except InvalidKeyError:
+            raise CommandError("Invalid course_id")
+
+        loaded = modulestore().prefetch_structures(course_keys)
+        return u'Prefetched {} of {} course structures.\n'.format(loaded, len(course_keys))
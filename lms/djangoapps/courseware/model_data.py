@@ -24,7 +24,7 @@ DjangoOrmFieldCache: A base-class for single-row-per-field caches.
 import json
 import logging
 from abc import ABCMeta, abstractmethod
-from collections import defaultdict, namedtuple
+from collections import OrderedDict, defaultdict, namedtuple
 
 from contracts import contract, new_contract
 from django.db import DatabaseError
@@ -36,7 +36,7 @@ from xblock.exceptions import InvalidScopeError, KeyValueMultiSaveError
 from xblock.fields import Scope, UserScope
 from xblock.runtime import KeyValueStore
 
-from courseware.user_state_client import DjangoXBlockUserStateClient
+from courseware.user_state_client import DjangoXBlockUserStateClient, flush_buffered_writes
 from xmodule.modulestore.django import modulestore
 
 from .models import StudentModule, XModuleStudentInfoField, XModuleStudentPrefsField, XModuleUserStateSummaryField
@@ -682,7 +682,7 @@ class FieldDataCache(object):
     A cache of django model objects needed to supply the data
     for a module and its descendants
     """
-    def __init__(self, descriptors, course_id, user, asides=None, read_only=False):
+    def __init__(self, descriptors, course_id, user, asides=None, read_only=False, lazy=False):
         """
         Find any courseware.models objects that are needed by any descriptor
         in descriptors. Attempts to minimize the number of queries to the database.
@@ -695,6 +695,9 @@ class FieldDataCache(object):
         user: The user for which to cache data
         asides: The list of aside types to load, or None to prefetch no asides.
         read_only: We should not perform writes (they become a no-op).
+        lazy: Only plan the loading of the data of the descriptors added to the
+            cache, and load the data of all of them together, with a query per
+            scope, when the cache is first used.
         """
         if asides is None:
             self.asides = []
@@ -705,6 +708,9 @@ class FieldDataCache(object):
         self.course_id = course_id
         self.user = user
         self.read_only = read_only
+        self.lazy = lazy
+        self._pending_descriptors = OrderedDict()
+        self._loaded_usage_ids = set()
 
         self.cache = {
             Scope.user_state: UserStateCache(
@@ -730,11 +736,34 @@ class FieldDataCache(object):
         """
         if self.user.is_authenticated():
             self.scorable_locations.update(desc.location for desc in descriptors if desc.has_score)
-            for scope, fields in self._fields_to_cache(descriptors).items():
-                if scope not in self.cache:
-                    continue
+            if self.lazy:
+                for descriptor in descriptors:
+                    usage_id = descriptor.scope_ids.usage_id
+                    if usage_id not in self._loaded_usage_ids:
+                        self._pending_descriptors[usage_id] = descriptor
+            else:
+                self._cache_descriptors(descriptors)
+
+    def _cache_descriptors(self, descriptors):
+        """
+        Load the data of all `descriptors` into the caches of their scopes.
+        """
+        for scope, fields in self._fields_to_cache(descriptors).items():
+            if scope not in self.cache:
+                continue
 
-                self.cache[scope].cache_fields(fields, descriptors, self.asides)
+            self.cache[scope].cache_fields(fields, descriptors, self.asides)
+
+    def _load_pending_descriptors(self):
+        """
+        Load the data of the descriptors that were added to this lazy
+        FieldDataCache since it was last used.
+        """
+        if self._pending_descriptors:
+            descriptors = self._pending_descriptors.values()
+            self._loaded_usage_ids.update(self._pending_descriptors)
+            self._pending_descriptors.clear()
+            self._cache_descriptors(descriptors)
 
     def add_descriptor_descendents(self, descriptor, depth=None, descriptor_filter=lambda descriptor: True):
         """
@@ -751,23 +780,25 @@ class FieldDataCache(object):
         def get_child_descriptors(descriptor, depth, descriptor_filter):
             """
             Return a list of all child descriptors down to the specified depth
-            that match the descriptor filter. Includes `descriptor`
+            that match the descriptor filter, in depth-first order. Includes
+            `descriptor`
 
             descriptor: The parent to search inside
             depth: The number of levels to descend, or None for infinite depth
             descriptor_filter(descriptor): A function that returns True
                 if descriptor should be included in the results
             """
-            if descriptor_filter(descriptor):
-                descriptors = [descriptor]
-            else:
-                descriptors = []
-
-            if depth is None or depth > 0:
-                new_depth = depth - 1 if depth is not None else depth
-
-                for child in descriptor.get_children() + descriptor.get_required_module_descriptors():
-                    descriptors.extend(get_child_descriptors(child, new_depth, descriptor_filter))
+            descriptors = []
+            stack = [(descriptor, depth)]
+            while stack:
+                descriptor, depth = stack.pop()
+                if descriptor_filter(descriptor):
+                    descriptors.append(descriptor)
+
+                if depth is None or depth > 0:
+                    new_depth = depth - 1 if depth is not None else depth
+                    children = descriptor.get_children() + descriptor.get_required_module_descriptors()
+                    stack.extend((child, new_depth) for child in reversed(children))
 
             return descriptors
 
@@ -779,7 +810,7 @@ class FieldDataCache(object):
     @classmethod
     def cache_for_descriptor_descendents(cls, course_id, user, descriptor, depth=None,
                                          descriptor_filter=lambda descriptor: True,
-                                         asides=None, read_only=False):
+                                         asides=None, read_only=False, lazy=False):
         """
         course_id: the course in the context of which we want StudentModules.
         user: the django user for whom to load modules.
@@ -788,8 +819,9 @@ class FieldDataCache(object):
             the supplied descriptor. If depth is None, load all descendant StudentModules
         descriptor_filter is a function that accepts a descriptor and return whether the field data
             should be cached
+        lazy: whether to defer loading the data until the cache is first used
         """
-        cache = FieldDataCache([], course_id, user, asides=asides, read_only=read_only)
+        cache = FieldDataCache([], course_id, user, asides=asides, read_only=read_only, lazy=lazy)
         cache.add_descriptor_descendents(descriptor, depth, descriptor_filter)
         return cache
 
@@ -821,6 +853,7 @@ class FieldDataCache(object):
             # assert key.user_id == self.user.id
         #    pass
 
+        self._load_pending_descriptors()
         if key.scope not in self.cache:
             raise KeyError(key.field_name)
 
@@ -839,6 +872,7 @@ class FieldDataCache(object):
         if self.read_only:
             return
 
+        self._load_pending_descriptors()
         saved_fields = []
         by_scope = defaultdict(dict)
         for key, value in kv_dict.iteritems():
@@ -884,6 +918,7 @@ class FieldDataCache(object):
         if key.scope not in self.cache:
             raise KeyError(key.field_name)
 
+        self._load_pending_descriptors()
         self.cache[key.scope].delete(key)
 
     @contract(key=DjangoKeyValueStore.Key, returns=bool)
@@ -905,6 +940,7 @@ class FieldDataCache(object):
         if key.scope not in self.cache:
             return False
 
+        self._load_pending_descriptors()
         return self.cache[key.scope].has(key)
 
     @contract(key=DjangoKeyValueStore.Key, returns="datetime|None")
@@ -925,9 +961,11 @@ class FieldDataCache(object):
         if key.scope not in self.cache:
             return None
 
+        self._load_pending_descriptors()
         return self.cache[key.scope].last_modified(key)
 
     def __len__(self):
+        self._load_pending_descriptors()
         return sum(len(cache) for cache in self.cache.values())
 
 
@@ -989,12 +1027,37 @@ class ScoresClient(object):
         client.fetch_scores(scorable_locations)
         return client
 
+    @classmethod
+    def create_for_users(cls, course_id, user_ids, scorable_locations):
+        """
+        Create ScoresClients for the given users, with pre-fetched data for
+        the given locations, using a single query.  Returns a dict of the
+        clients keyed by user id.
+        """
+        # pylint: disable=protected-access
+        clients = {user_id: cls(course_id, user_id) for user_id in user_ids}
+        scores_qset = StudentModule.objects.filter(
+            student_id__in=clients.keys(),
+            course_id=course_id,
+            module_state_key__in=set(scorable_locations),
+        )
+        for user_id, location, correct, total, created in scores_qset.values_list(
+                'student_id', 'module_state_key', 'grade', 'max_grade', 'created'
+        ):
+            location = UsageKey.from_string(location).map_into_course(course_id)
+            clients[user_id]._locations_to_scores[location] = cls.Score(correct, total, created)
+        for client in clients.itervalues():
+            client._has_fetched = True
+        return clients
+
 
 # @contract(user_id=int, usage_key=UsageKey, score="number|None", max_score="number|None")
 def set_score(user_id, usage_key, score, max_score):
     """
     Set the score and max_score for the specified user and xblock usage.
     """
+    # Save the buffered state first, so that it's recorded in the score's history.
+    flush_buffered_writes()
     student_module, created = StudentModule.objects.get_or_create(
         student_id=user_id,
         module_state_key=usage_key,
@@ -200,6 +200,31 @@ class BaseStudentModuleHistory(models.Model):
 
         return history_entries
 
+    @staticmethod
+    def bulk_save_history(student_modules):
+        """
+        Create the history entries of the given saved StudentModules with a
+        single query, as the post_save receivers would for each of them.
+        Used when StudentModules are updated in bulk, without sending signals.
+        """
+        if settings.FEATURES.get('ENABLE_CSMH_EXTENDED'):
+            history_class = coursewarehistoryextended.models.StudentModuleHistoryExtended
+        else:
+            history_class = StudentModuleHistory
+
+        history_class.objects.bulk_create([
+            history_class(
+                student_module=student_module,
+                version=None,
+                created=student_module.modified,
+                state=student_module.state,
+                grade=student_module.grade,
+                max_grade=student_module.max_grade,
+            )
+            for student_module in student_modules
+            if student_module.module_type in history_class.HISTORY_SAVING_TYPES
+        ])
+
 
 class StudentModuleHistory(BaseStudentModuleHistory):
     """Keeps a complete history of state changes for a given XModule for a given
@@ -33,18 +33,23 @@ from courseware.entrance_exams import user_can_skip_entrance_exam, user_has_pass
 from courseware.masquerade import (
     MasqueradingKeyValueStore,
     filter_displayed_blocks,
+    get_course_masquerade,
     is_masquerading_as_specific_student,
     setup_masquerade
 )
 from courseware.model_data import DjangoKeyValueStore, FieldDataCache
+from courseware.user_state_client import buffered_writes
 from edxmako.shortcuts import render_to_string
 from eventtracking import tracker
+from lms.djangoapps.course_api.blocks.transformers.milestones import MilestonesAndSpecialExamsTransformer
+from lms.djangoapps.course_blocks.api import COURSE_BLOCK_ACCESS_TRANSFORMERS, get_course_blocks
 from lms.djangoapps.grades.signals.signals import SCORE_PUBLISHED
 from lms.djangoapps.lms_xblock.field_data import LmsFieldData
 from lms.djangoapps.lms_xblock.models import XBlockAsidesConfig
 from lms.djangoapps.lms_xblock.runtime import LmsModuleSystem
 from lms.djangoapps.verify_student.services import VerificationService
 from openedx.core.djangoapps.bookmarks.services import BookmarksService
+from openedx.core.djangoapps.content.block_structure.transformers import BlockStructureTransformers
 from openedx.core.djangoapps.crawlers.models import CrawlersConfig
 from openedx.core.djangoapps.credit.services import CreditService
 from openedx.core.djangoapps.monitoring_utils import set_custom_metrics_for_course_key, set_monitoring_transaction_name
@@ -67,6 +72,7 @@ from util.json_request import JsonResponse
 from django.utils.text import slugify
 from util.sandboxing import can_execute_unsafe_code, get_python_lib_zip
 from xblock_django.user_service import DjangoXBlockUserService
+from xmodule.block_metadata_utils import display_name_with_default_escaped
 from xmodule.contentstore.django import contentstore
 from xmodule.error_module import ErrorDescriptor, NonStaffErrorDescriptor
 from xmodule.exceptions import NotFoundError, ProcessingError
@@ -139,6 +145,10 @@ def toc_for_course(user, request, course, active_chapter, active_section, field_
 
     chapters with name 'hidden' are skipped.
 
+    When the ENABLE_BLOCK_STRUCTURE_TOC feature is enabled, the chapters and
+    sections are read from the user's transformed course block structure,
+    rather than from their bound XModules.
+
     NOTE: assumes that if we got this far, user has access to course.  Returns
     None if this is not the case.
 
@@ -152,73 +162,34 @@ def toc_for_course(user, request, course, active_chapter, active_section, field_
         if course_module is None:
             return None, None, None
 
-        toc_chapters = list()
-        chapters = course_module.get_display_items()
-
-        # Check for content which needs to be completed
-        # before the rest of the content is made available
-        required_content = milestones_helpers.get_required_content(course.id, user)
-
-        # The user may not actually have to complete the entrance exam, if one is required
-        if user_can_skip_entrance_exam(user, course):
-            required_content = [content for content in required_content if not content == course.entrance_exam_id]
+        if _can_use_block_structure_toc(user, course):
+            toc_chapters = _toc_chapters_from_block_structure(user, course)
+        else:
+            toc_chapters = _toc_chapters_from_modules(user, course, course_module)
 
         previous_of_active_section, next_of_active_section = None, None
         last_processed_section, last_processed_chapter = None, None
         found_active_section = False
-        for chapter in chapters:
-            # Only show required content, if there is required content
-            # chapter.hide_from_toc is read-only (bool)
-            display_id = slugify(chapter.display_name_with_default_escaped)
-            local_hide_from_toc = False
-            if required_content:
-                if unicode(chapter.location) not in required_content:
-                    local_hide_from_toc = True
-
-            # Skip the current chapter if a hide flag is tripped
-            if chapter.hide_from_toc or local_hide_from_toc:
-                continue
-
-            sections = list()
-            for section in chapter.get_display_items():
-                # skip the section if it is hidden from the user
-                if section.hide_from_toc:
-                    continue
-
-                is_section_active = (chapter.url_name == active_chapter and section.url_name == active_section)
+        for chapter in toc_chapters:
+            chapter['active'] = chapter['url_name'] == active_chapter
+            for section_context in chapter['sections']:
+                is_section_active = (chapter['active'] and section_context['url_name'] == active_section)
+                section_context['active'] = is_section_active
                 if is_section_active:
                     found_active_section = True
 
-                section_context = {
-                    'display_name': section.display_name_with_default_escaped,
-                    'url_name': section.url_name,
-                    'format': section.format if section.format is not None else '',
-                    'due': section.due,
-                    'active': is_section_active,
-                    'graded': section.graded,
-                }
-                _add_timed_exam_info(user, course, section, section_context)
-
                 # update next and previous of active section, if applicable
                 if is_section_active:
                     if last_processed_section:
                         previous_of_active_section = last_processed_section.copy()
-                        previous_of_active_section['chapter_url_name'] = last_processed_chapter.url_name
+                        previous_of_active_section['chapter_url_name'] = last_processed_chapter['url_name']
                 elif found_active_section and not next_of_active_section:
                     next_of_active_section = section_context.copy()
-                    next_of_active_section['chapter_url_name'] = chapter.url_name
+                    next_of_active_section['chapter_url_name'] = chapter['url_name']
 
-                sections.append(section_context)
                 last_processed_section = section_context
                 last_processed_chapter = chapter
 
-            toc_chapters.append({
-                'display_name': chapter.display_name_with_default_escaped,
-                'display_id': display_id,
-                'url_name': chapter.url_name,
-                'sections': sections,
-                'active': chapter.url_name == active_chapter
-            })
         return {
             'chapters': toc_chapters,
             'previous_of_active_section': previous_of_active_section,
@@ -226,6 +197,129 @@ def toc_for_course(user, request, course, active_chapter, active_section, field_
         }
 
 
+def _can_use_block_structure_toc(user, course):
+    """
+    Returns whether the table of contents of the course may be built from the
+    user's course block structure.
+
+    The block structure is collected from the modulestore without any user
+    state, so it neither reflects the fields overridden for some users (CCX,
+    individual due dates, self-paced due dates) nor masquerading.  The table
+    of contents is then built from the bound XModules instead.
+    """
+    return (
+        settings.FEATURES.get('ENABLE_BLOCK_STRUCTURE_TOC', False) and
+        not get_course_masquerade(user, course.id) and
+        not OverrideFieldData.has_enabled_providers(course)
+    )
+
+
+def _toc_chapters_from_modules(user, course, course_module):
+    """
+    Returns the chapters of the table of contents, and their sections, from
+    the children of the bound course module.
+    """
+    toc_chapters = list()
+    chapters = course_module.get_display_items()
+
+    # Check for content which needs to be completed
+    # before the rest of the content is made available
+    required_content = milestones_helpers.get_required_content(course.id, user)
+
+    # The user may not actually have to complete the entrance exam, if one is required
+    if user_can_skip_entrance_exam(user, course):
+        required_content = [content for content in required_content if not content == course.entrance_exam_id]
+
+    for chapter in chapters:
+        # Only show required content, if there is required content
+        # chapter.hide_from_toc is read-only (bool)
+        display_id = slugify(chapter.display_name_with_default_escaped)
+        local_hide_from_toc = False
+        if required_content:
+            if unicode(chapter.location) not in required_content:
+                local_hide_from_toc = True
+
+        # Skip the current chapter if a hide flag is tripped
+        if chapter.hide_from_toc or local_hide_from_toc:
+            continue
+
+        sections = list()
+        for section in chapter.get_display_items():
+            # skip the section if it is hidden from the user
+            if section.hide_from_toc:
+                continue
+
+            section_context = {
+                'display_name': section.display_name_with_default_escaped,
+                'url_name': section.url_name,
+                'format': section.format if section.format is not None else '',
+                'due': section.due,
+                'graded': section.graded,
+            }
+            _add_timed_exam_info(user, course, section, section_context)
+            sections.append(section_context)
+
+        toc_chapters.append({
+            'display_name': chapter.display_name_with_default_escaped,
+            'display_id': display_id,
+            'url_name': chapter.url_name,
+            'sections': sections,
+        })
+    return toc_chapters
+
+
+def _toc_chapters_from_block_structure(user, course):
+    """
+    Returns the chapters of the table of contents, and their sections, from
+    the course block structure transformed for the user, without loading any
+    XModule or user state.
+
+    On top of the course access transformers, the milestones transformer
+    removes the chapters hidden by a required entrance exam and the blocks
+    with unfulfilled prerequisites, and adds the information on special exams.
+    """
+    transformers = BlockStructureTransformers(
+        COURSE_BLOCK_ACCESS_TRANSFORMERS + [MilestonesAndSpecialExamsTransformer(include_special_exams=True)]
+    )
+    block_structure = get_course_blocks(user, course.location, transformers)
+    special_exams_enabled = settings.FEATURES.get('ENABLE_SPECIAL_EXAMS', False)
+
+    toc_chapters = list()
+    for chapter_key in block_structure.get_children(course.location):
+        if block_structure.get_xblock_field(chapter_key, 'hide_from_toc', False):
+            continue
+
+        sections = list()
+        for section_key in block_structure.get_children(chapter_key):
+            if block_structure.get_xblock_field(section_key, 'hide_from_toc', False):
+                continue
+
+            section_format = block_structure.get_xblock_field(section_key, 'format')
+            section_context = {
+                'display_name': display_name_with_default_escaped(block_structure[section_key]),
+                'url_name': section_key.block_id,
+                'format': section_format if section_format is not None else '',
+                'due': block_structure.get_xblock_field(section_key, 'due'),
+                'graded': block_structure.get_xblock_field(section_key, 'graded', False),
+            }
+            if special_exams_enabled:
+                special_exam_info = block_structure.get_transformer_block_field(
+                    section_key, MilestonesAndSpecialExamsTransformer, 'special_exam_info'
+                )
+                if special_exam_info:
+                    section_context['proctoring'] = special_exam_info
+            sections.append(section_context)
+
+        chapter_display_name = display_name_with_default_escaped(block_structure[chapter_key])
+        toc_chapters.append({
+            'display_name': chapter_display_name,
+            'display_id': slugify(chapter_display_name),
+            'url_name': chapter_key.block_id,
+            'sections': sections,
+        })
+    return toc_chapters
+
+
 def _add_timed_exam_info(user, course, section, section_context):
     """
     Add in rendering context if exam is a timed exam (which includes proctored)
@@ -979,7 +1073,8 @@ def _invoke_xblock_handler(request, course_id, usage_id, handler, suffix, course
         req = django_to_webob_request(request)
         try:
             with tracker.get_tracker().context(tracking_context_name, tracking_context):
-                resp = instance.handle(handler, req, suffix)
+                with buffered_writes(enabled=settings.FEATURES.get('ENABLE_BUFFERED_USER_STATE_WRITES')):
+                    resp = instance.handle(handler, req, suffix)
                 if suffix == 'problem_check' \
                         and course \
                         and getattr(course, 'entrance_exam_enabled', False) \
@@ -7,6 +7,9 @@ from openedx.core.djangoapps.self_paced.models import SelfPacedConfiguration
 
 from .field_overrides import FieldOverrideProvider
 
+OVERRIDDEN_COURSE_FIELDS = frozenset(['due'])
+OVERRIDDEN_CONTENT_FIELDS = frozenset(['due', 'start'])
+
 
 class SelfPacedDateOverrideProvider(FieldOverrideProvider):
     """
@@ -24,6 +27,11 @@ class SelfPacedDateOverrideProvider(FieldOverrideProvider):
 
         return default
 
+    def overridden_fields(self, block):
+        if block.category == 'course':
+            return OVERRIDDEN_COURSE_FIELDS
+        return OVERRIDDEN_CONTENT_FIELDS
+
     @classmethod
     def enabled_for(cls, block):
         """This provider is enabled for self-paced courses only."""
@@ -4,9 +4,13 @@ by the individual due dates feature.
 """
 import json
 
+import request_cache
+
 from .field_overrides import FieldOverrideProvider
 from .models import StudentFieldOverride
 
+STUDENT_OVERRIDES_CACHE_NAMESPACE = u'courseware.student_field_overrides'
+
 
 class IndividualStudentOverrideProvider(FieldOverrideProvider):
     """
@@ -17,6 +21,10 @@ class IndividualStudentOverrideProvider(FieldOverrideProvider):
     def get(self, block, name, default):
         return get_override_for_user(self.user, block, name, default)
 
+    def overridden_fields(self, block):
+        course_overrides = _get_course_overrides_for_user(self.user, block.runtime.course_id)
+        return course_overrides.setdefault(block.location, {})
+
     @classmethod
     def enabled_for(cls, course):
         """This simple override provider is always enabled"""
@@ -43,19 +51,35 @@ def _get_overrides_for_user(user, block):
     Gets all of the individual student overrides for given user and block.
     Returns a dictionary of field override values keyed by field name.
     """
-    query = StudentFieldOverride.objects.filter(
-        course_id=block.runtime.course_id,
-        location=block.location,
-        student_id=user.id,
-    )
+    course_overrides = _get_course_overrides_for_user(user, block.runtime.course_id)
     overrides = {}
-    for override in query:
-        field = block.fields[override.field]
-        value = field.from_json(json.loads(override.value))
-        overrides[override.field] = value
+    for field_name, value in course_overrides.get(block.location, {}).iteritems():
+        overrides[field_name] = block.fields[field_name].from_json(value)
     return overrides
 
 
+def _get_course_overrides_for_user(user, course_id):
+    """
+    Gets all of the individual student overrides for given user in the course,
+    with a single query per request.  Returns a dictionary mapping the
+    locations of the overridden blocks to dictionaries of the JSON values of
+    their field overrides, keyed by field name.
+    """
+    overrides_cache = request_cache.get_cache(STUDENT_OVERRIDES_CACHE_NAMESPACE)
+    cache_key = (user.id, course_id)
+    if cache_key not in overrides_cache:
+        overrides = {}
+        query = StudentFieldOverride.objects.filter(
+            course_id=course_id,
+            student_id=user.id,
+        )
+        for override in query:
+            location = override.location.map_into_course(course_id)
+            overrides.setdefault(location, {})[override.field] = json.loads(override.value)
+        overrides_cache[cache_key] = overrides
+    return overrides_cache[cache_key]
+
+
 def override_field_for_user(user, block, name, value):
     """
     Overrides a field for the `user`.  `block` and `name` specify the block
@@ -71,6 +95,12 @@ def override_field_for_user(user, block, name, value):
     override.value = json.dumps(field.to_json(value))
     override.save()
 
+    course_overrides = request_cache.get_cache(STUDENT_OVERRIDES_CACHE_NAMESPACE).get(
+        (user.id, block.runtime.course_id)
+    )
+    if course_overrides is not None:
+        course_overrides.setdefault(block.location, {})[name] = json.loads(override.value)
+
 
 def clear_override_for_user(user, block, name):
     """
@@ -87,3 +117,9 @@ def clear_override_for_user(user, block, name):
             field=name).delete()
     except StudentFieldOverride.DoesNotExist:
         pass
+
+    course_overrides = request_cache.get_cache(STUDENT_OVERRIDES_CACHE_NAMESPACE).get(
+        (user.id, block.runtime.course_id)
+    )
+    if course_overrides is not None:
+        course_overrides.get(block.location, {}).pop(name, None)
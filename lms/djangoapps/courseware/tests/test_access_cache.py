@@ -0,0 +1,61 @@
+"""
+Tests for the cache of access decisions.
+"""
+import crum
+from mock import Mock
+
+from courseware.access import has_access
+from courseware.access_cache import cached_access_decision, get_access_cache_stats
+from openedx.core.djangolib.testing.utils import get_mock_request
+from student.roles import CourseStaffRole
+from student.tests.factories import UserFactory
+from xmodule.modulestore.tests.django_utils import SharedModuleStoreTestCase
+from xmodule.modulestore.tests.factories import CourseFactory
+
+
+class AccessCacheTestCase(SharedModuleStoreTestCase):
+    """
+    Tests for the cache of access decisions.
+    """
+    @classmethod
+    def setUpClass(cls):
+        super(AccessCacheTestCase, cls).setUpClass()
+        cls.course = CourseFactory.create()
+
+    def setUp(self):
+        super(AccessCacheTestCase, self).setUp()
+        self.user = UserFactory.create()
+        get_mock_request(self.user)
+        self.addCleanup(crum.set_current_request, None)
+
+    def test_cached_decision(self):
+        compute = Mock(return_value=True)
+        for _ in range(3):
+            self.assertTrue(cached_access_decision(self.user, self.course.id, 'decision', compute))
+        self.assertEqual(compute.call_count, 1)
+        self.assertEqual(get_access_cache_stats(), {'hits': 2, 'misses': 1})
+
+    def test_not_cached_outside_of_requests(self):
+        crum.set_current_request(None)
+        compute = Mock(return_value=True)
+        for _ in range(3):
+            cached_access_decision(self.user, self.course.id, 'decision', compute)
+        self.assertEqual(compute.call_count, 3)
+        self.assertEqual(get_access_cache_stats(), {'hits': 0, 'misses': 0})
+
+    def test_decisions_per_user_and_course(self):
+        other_user = UserFactory.create()
+        other_course_key = CourseFactory.create().id
+        compute = Mock(return_value=True)
+        cached_access_decision(self.user, self.course.id, 'decision', compute)
+        cached_access_decision(other_user, self.course.id, 'decision', compute)
+        cached_access_decision(self.user, other_course_key, 'decision', compute)
+        self.assertEqual(compute.call_count, 3)
+
+    def test_role_change_clears_cache(self):
+        self.assertFalse(has_access(self.user, 'staff', self.course.id))
+        self.assertFalse(has_access(self.user, 'staff', self.course.id))
+        self.assertEqual(get_access_cache_stats()['hits'], 1)
+
+        CourseStaffRole(self.course.id).add_users(self.user)
+        self.assertTrue(has_access(self.user, 'staff', self.course.id))
@@ -5,6 +5,7 @@ Tests for `field_overrides` module.
 import unittest
 
 from django.test.utils import override_settings
+from mock import patch
 from nose.plugins.attrib import attr
 from xblock.field_data import DictFieldData
 
@@ -126,6 +127,19 @@ class OverrideFieldDataTests(OverrideFieldBase):
         with disable_overrides():
             self.assertEqual(data.get('block', 'foo'), 'baz')
 
+    def test_overridden_fields(self):
+        data = self.make_one()
+        with patch.object(TestOverrideProvider, 'overridden_fields', return_value=frozenset(['foo'])) as mock_fields:
+            self.assertEqual(data.get('block', 'foo'), 'fu')
+            self.assertFalse(data.has('block', 'oh'))
+        self.assertEqual(mock_fields.call_count, 1)
+
+    def test_provider_hits(self):
+        data = self.make_one()
+        for name in ('foo', 'oh', 'bees'):
+            data.get('block', name)
+        self.assertEqual(data.provider_hits, {'TestOverrideProvider': 2})
+
     @override_settings(FIELD_OVERRIDE_PROVIDERS=())
     def test_no_overrides_configured(self):
         data = self.make_one()
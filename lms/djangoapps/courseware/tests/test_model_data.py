@@ -235,6 +235,47 @@ class TestStudentModuleStorage(OtherUserFailureTestMixin, TestCase):
         self.assertEquals(exception_context.exception.saved_field_names, [])
 
 
+@attr(shard=1)
+class TestLazyFieldDataCache(TestCase):
+    """Tests for the deferred loading of a lazy FieldDataCache"""
+    # Tell Django to clean out all databases, not just default
+    multi_db = True
+
+    def setUp(self):
+        super(TestLazyFieldDataCache, self).setUp()
+        student_module = StudentModuleFactory(state=json.dumps({'a_field': 'a_value'}))
+        self.user = student_module.student
+        self.other_descriptor = mock_descriptor([mock_field(Scope.user_state, 'a_field')])
+        self.other_descriptor.scope_ids = ScopeIds(
+            'user1', 'mock_problem', location('other_def_id'), location('other_usage_id')
+        )
+
+        # Nothing is loaded until the cache is used
+        with self.assertNumQueries(0):
+            self.field_data_cache = FieldDataCache(
+                [mock_descriptor([mock_field(Scope.user_state, 'a_field')])], course_id, self.user, lazy=True
+            )
+            self.field_data_cache.add_descriptors_to_cache([self.other_descriptor])
+        self.kvs = DjangoKeyValueStore(self.field_data_cache)
+
+    def test_load_on_first_use(self):
+        "Test that all the descriptors added to the cache are loaded together when it is first used"
+        with self.assertNumQueries(1):
+            self.assertEquals('a_value', self.kvs.get(user_state_key('a_field')))
+        with self.assertNumQueries(0):
+            self.assertFalse(self.kvs.has(
+                DjangoKeyValueStore.Key(Scope.user_state, 1, location('other_usage_id'), 'a_field')
+            ))
+
+    def test_loaded_descriptors_not_reloaded(self):
+        "Test that adding already loaded descriptors to the cache doesn't load them again"
+        with self.assertNumQueries(1):
+            self.kvs.get(user_state_key('a_field'))
+        self.field_data_cache.add_descriptors_to_cache([self.other_descriptor])
+        with self.assertNumQueries(0):
+            self.kvs.get(user_state_key('a_field'))
+
+
 @attr(shard=1)
 class TestMissingStudentModule(TestCase):
     # Tell Django to clean out all databases, not just default
@@ -708,6 +708,22 @@ class TestTOC(ModuleStoreTestCase):
             self.assertEquals(actual['previous_of_active_section']['url_name'], 'Toy_Videos')
             self.assertEquals(actual['next_of_active_section']['url_name'], 'video_123456789012')
 
+    @ddt.data((ModuleStoreEnum.Type.mongo, 3, 0), (ModuleStoreEnum.Type.split, 6, 0))
+    @ddt.unpack
+    def test_toc_from_block_structure(self, default_ms, setup_finds, setup_sends):
+        with self.store.default_store(default_ms):
+            self.setup_request_and_course(setup_finds, setup_sends)
+            expected = render.toc_for_course(
+                self.request.user, self.request, self.toy_course, self.chapter, 'Welcome', self.field_data_cache
+            )
+            with patch.dict('django.conf.settings.FEATURES', {'ENABLE_BLOCK_STRUCTURE_TOC': True}):
+                with patch.object(render, '_toc_chapters_from_modules') as toc_chapters_from_modules:
+                    actual = render.toc_for_course(
+                        self.request.user, self.request, self.toy_course, self.chapter, 'Welcome', self.field_data_cache
+                    )
+            self.assertFalse(toc_chapters_from_modules.called)
+            self.assertEqual(actual, expected)
+
 
 @attr(shard=1)
 @ddt.ddt
@@ -8,9 +8,11 @@ from unittest import skip
 
 from django.test import TestCase
 from edx_user_state_client.tests import UserStateClientTestBase
+from opaque_keys.edx.locator import CourseLocator
 
+from courseware.models import StudentModule
 from courseware.tests.factories import UserFactory
-from courseware.user_state_client import DjangoXBlockUserStateClient
+from courseware.user_state_client import DjangoXBlockUserStateClient, buffered_writes
 
 
 class TestDjangoUserStateClient(UserStateClientTestBase, TestCase):
@@ -67,3 +69,54 @@ class TestDjangoUserStateClient(UserStateClientTestBase, TestCase):
     @skip("Not supported by DjangoXBlockUserStateClient")
     def test_iter_course_many_users(self):
         pass
+
+
+class TestBufferedWrites(TestCase):
+    """
+    Tests of the buffering of the writes of the DjangoUserStateClient.
+    """
+    # Tell Django to clean out all databases, not just default
+    multi_db = True
+
+    def setUp(self):
+        super(TestBufferedWrites, self).setUp()
+        self.user = UserFactory.create()
+        self.client = DjangoXBlockUserStateClient(self.user)
+        course_key = CourseLocator('org', 'course', 'run')
+        self.block_keys = [course_key.make_usage_key('problem', 'problem_{}'.format(idx)) for idx in range(2)]
+
+    def _get_state(self, block_key):
+        return self.client.get(self.user.username, block_key).state
+
+    def test_writes_merged(self):
+        with buffered_writes():
+            self.client.set_many(self.user.username, {self.block_keys[0]: {'a': 1}})
+            self.client.set_many(self.user.username, {self.block_keys[0]: {'b': 2}, self.block_keys[1]: {'c': 3}})
+            self.assertFalse(StudentModule.objects.exists())
+
+        self.assertEqual(self._get_state(self.block_keys[0]), {'a': 1, 'b': 2})
+        self.assertEqual(self._get_state(self.block_keys[1]), {'c': 3})
+        self.assertEqual(len(list(self.client.get_history(self.user.username, self.block_keys[0]))), 1)
+
+    def test_bulk_update(self):
+        self.client.set_many(self.user.username, {block_key: {'a': 1} for block_key in self.block_keys})
+        # Reading the existing StudentModules, and updating them in a savepoint
+        with self.assertNumQueries(4, using='default'):
+            with self.assertNumQueries(1, using='student_module_history'):
+                with buffered_writes():
+                    for block_key in self.block_keys:
+                        self.client.set_many(self.user.username, {block_key: {'b': 2}})
+
+        for block_key in self.block_keys:
+            self.assertEqual(self._get_state(block_key), {'a': 1, 'b': 2})
+            self.assertEqual(len(list(self.client.get_history(self.user.username, block_key))), 2)
+
+    def test_flushed_before_reads(self):
+        with buffered_writes():
+            self.client.set_many(self.user.username, {self.block_keys[0]: {'a': 1}})
+            self.assertEqual(self._get_state(self.block_keys[0]), {'a': 1})
+
+    def test_disabled(self):
+        with buffered_writes(enabled=False):
+            self.client.set_many(self.user.username, {self.block_keys[0]: {'a': 1}})
+            self.assertTrue(StudentModule.objects.exists())
@@ -5,16 +5,21 @@ data in a Django ORM model.
 
 import itertools
 import logging
+from collections import OrderedDict
+from contextlib import contextmanager
 from operator import attrgetter
 from time import time
 
 from django.contrib.auth.models import User
 from django.db import transaction
+from django.db.models import Case, TextField, Value, When
 from django.db.utils import IntegrityError
+from django.utils.timezone import now
 from edx_user_state_client.interface import XBlockUserState, XBlockUserStateClient
 from xblock.fields import Scope
 
 import dogstats_wrapper as dog_stats_api
+import request_cache
 from courseware.models import BaseStudentModuleHistory, StudentModule
 from openedx.core.djangoapps import monitoring_utils
 
@@ -26,6 +31,57 @@ except ImportError:
 
 log = logging.getLogger(__name__)
 
+BUFFERED_WRITES_NAMESPACE = u'courseware.user_state_client.buffered_writes'
+
+
+@contextmanager
+def buffered_writes(enabled=True):
+    """
+    Buffers the state set through :meth:`DjangoXBlockUserStateClient.set_many`
+    inside the context, and saves it in bulk when the context exits.
+
+    The writes to the state of a block are merged, so that each StudentModule
+    is saved once. The buffered writes are also saved before any state is read
+    or deleted, and before a score is set, so that these see the same data as
+    they would without buffering.
+
+    Arguments:
+        enabled (bool): whether to buffer the writes.
+    """
+    cache = request_cache.get_cache(BUFFERED_WRITES_NAMESPACE)
+    if not enabled or 'writes' in cache:
+        yield
+        return
+
+    cache['writes'] = OrderedDict()
+    try:
+        yield
+    finally:
+        try:
+            flush_buffered_writes()
+        finally:
+            cache.pop('writes', None)
+
+
+def flush_buffered_writes():
+    """
+    Saves the user state writes buffered so far, if any.
+    """
+    cache = request_cache.get_cache(BUFFERED_WRITES_NAMESPACE)
+    writes = cache.get('writes')
+    if not writes:
+        return
+
+    # Stop buffering while the writes are saved, so that the client saves
+    # them when it falls back to saving them one by one.
+    del cache['writes']
+    try:
+        client = DjangoXBlockUserStateClient()
+        for user, block_keys_to_state in writes.itervalues():
+            client._bulk_set_many(user, block_keys_to_state)  # pylint: disable=protected-access
+    finally:
+        cache['writes'] = OrderedDict()
+
 
 class DjangoXBlockUserStateClient(XBlockUserStateClient):
     """
@@ -186,6 +242,7 @@ class DjangoXBlockUserStateClient(XBlockUserStateClient):
         if scope != Scope.user_state:
             raise ValueError("Only Scope.user_state is supported, not {}".format(scope))
 
+        flush_buffered_writes()
         total_block_count = 0
         evt_time = time()
 
@@ -268,6 +325,21 @@ class DjangoXBlockUserStateClient(XBlockUserStateClient):
             # what we have.
             return
 
+        writes = request_cache.get_cache(BUFFERED_WRITES_NAMESPACE).get('writes')
+        if writes is not None:
+            _, buffered_state = writes.setdefault(user.id, (user, OrderedDict()))
+            for usage_key, state in block_keys_to_state.items():
+                buffered_state.setdefault(usage_key, {}).update(state)
+            self._nr_stat_increment('set_many', 'buffered_calls')
+            return
+
+        self._set_many_for_user(user, block_keys_to_state)
+
+    def _set_many_for_user(self, user, block_keys_to_state):
+        """
+        Set fields for XBlocks for the given user, saving each StudentModule
+        in turn.
+        """
         evt_time = time()
 
         for usage_key, state in block_keys_to_state.items():
@@ -337,6 +409,81 @@ class DjangoXBlockUserStateClient(XBlockUserStateClient):
         self._ddog_histogram(evt_time, 'set_many.response_time', duration)
         self._nr_stat_accumulate('set_many', 'duration', duration)
 
+    def _bulk_set_many(self, user, block_keys_to_state):
+        """
+        Set fields for XBlocks for the given user, creating the missing
+        StudentModules with one query, updating the existing ones with another
+        and creating their history entries with a third.
+        """
+        evt_time = time()
+        modified = now()
+
+        existing_modules = {
+            usage_key: student_module
+            for student_module, usage_key in self._get_student_modules(user.username, block_keys_to_state.keys())
+        }
+        new_modules = []
+        for usage_key, state in block_keys_to_state.items():
+            student_module = existing_modules.get(usage_key)
+            if student_module is None:
+                new_modules.append(StudentModule(
+                    student=user,
+                    course_id=usage_key.course_key,
+                    module_state_key=usage_key,
+                    module_type=usage_key.block_type,
+                    state=json.dumps(state),
+                ))
+            else:
+                current_state = {} if student_module.state is None else json.loads(student_module.state)
+                current_state.update(state)
+                student_module.state = json.dumps(current_state)
+                student_module.modified = modified
+
+        try:
+            with transaction.atomic():
+                StudentModule.objects.bulk_create(new_modules)
+                if existing_modules:
+                    # update() doesn't set auto_now fields, nor send signals
+                    states = [
+                        When(pk=student_module.pk, then=Value(student_module.state))
+                        for student_module in existing_modules.itervalues()
+                    ]
+                    StudentModule.objects.filter(
+                        pk__in=[student_module.pk for student_module in existing_modules.itervalues()]
+                    ).update(
+                        state=Case(*states, output_field=TextField()),
+                        modified=modified,
+                    )
+        except IntegrityError:
+            # Some of the StudentModules were created in the meantime.
+            log.warning("set_many: IntegrityError in bulk save for student {} - saving {} block keys one by one".format(
+                user, len(block_keys_to_state)
+            ))
+            self._set_many_for_user(user, block_keys_to_state)
+            return
+
+        saved_modules = existing_modules.values()
+        if any(module.module_type in BaseStudentModuleHistory.HISTORY_SAVING_TYPES for module in new_modules):
+            # bulk_create doesn't set the primary keys the history entries refer to.
+            saved_modules.extend(
+                student_module for student_module, _ in
+                self._get_student_modules(user.username, [module.module_state_key for module in new_modules])
+            )
+        BaseStudentModuleHistory.bulk_save_history(saved_modules)
+
+        for student_module in new_modules:
+            self._nr_block_stat_increment('set_many', student_module.module_type, 'blocks_created')
+        for student_module in existing_modules.itervalues():
+            self._nr_block_stat_increment('set_many', student_module.module_type, 'blocks_updated')
+
+        # Events for the entire flush.
+        duration = (time() - evt_time) * 1000  # milliseconds
+        self._ddog_histogram(evt_time, 'set_many.flush_blks', len(block_keys_to_state))
+        self._ddog_histogram(evt_time, 'set_many.flush_time', duration)
+        self._nr_stat_increment('set_many', 'flushes')
+        self._nr_stat_accumulate('set_many', 'flush_blocks', len(block_keys_to_state))
+        self._nr_stat_accumulate('set_many', 'flush_duration', duration)
+
     def delete_many(self, username, block_keys, scope=Scope.user_state, fields=None):
         """
         Delete the stored XBlock state for a many xblock usages.
@@ -350,6 +497,7 @@ class DjangoXBlockUserStateClient(XBlockUserStateClient):
         if scope != Scope.user_state:
             raise ValueError("Only Scope.user_state is supported")
 
+        flush_buffered_writes()
         evt_time = time()
         if fields is None:
             self._ddog_increment(evt_time, 'delete_many.empty_state')
@@ -396,6 +544,7 @@ class DjangoXBlockUserStateClient(XBlockUserStateClient):
 
         if scope != Scope.user_state:
             raise ValueError("Only Scope.user_state is supported")
+        flush_buffered_writes()
         student_modules = list(
             student_module
             for student_module, usage_id
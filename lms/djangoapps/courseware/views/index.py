@@ -101,6 +101,7 @@ class CoursewareIndex(View):
         self.section_url_name = section
         self.position = position
         self.chapter, self.section = None, None
+        self.planned_section = None
         self.course = None
         self.url = request.path
 
@@ -283,7 +284,9 @@ class CoursewareIndex(View):
             self.course,
             depth=CONTENT_DEPTH,
             read_only=CrawlersConfig.is_crawler(request),
+            lazy=True,
         )
+        self._plan_requested_section()
 
         self.course = get_module_for_descriptor(
             self.effective_user,
@@ -294,14 +297,32 @@ class CoursewareIndex(View):
             course=self.course,
         )
 
+    def _plan_requested_section(self):
+        """
+        Adds the descendants of the section named in the URL to the field
+        data cache before it is first used, so that their data is loaded in
+        the same queries as the data of the course.
+        """
+        if not (self.chapter_url_name and self.section_url_name):
+            return
+
+        chapter = self.course.get_child_by(lambda m: m.location.name == self.chapter_url_name)
+        section = chapter.get_child_by(lambda m: m.location.name == self.section_url_name) if chapter else None
+        if section:
+            self.planned_section = modulestore().get_item(section.location, depth=None, lazy=False)
+            self.field_data_cache.add_descriptor_descendents(self.planned_section, depth=None)
+
     def _prefetch_and_bind_section(self):
         """
         Prefetches all descendant data for the requested section and
         sets up the runtime, which binds the request user to the section.
         """
-        # Pre-fetch all descendant data
-        self.section = modulestore().get_item(self.section.location, depth=None, lazy=False)
-        self.field_data_cache.add_descriptor_descendents(self.section, depth=None)
+        # Pre-fetch all descendant data, unless it was planned with the course
+        if self.planned_section and self.planned_section.location == self.section.location:
+            self.section = self.planned_section
+        else:
+            self.section = modulestore().get_item(self.section.location, depth=None, lazy=False)
+            self.field_data_cache.add_descriptor_descendents(self.section, depth=None)
 
         # Bind section to user
         self.section = get_module_for_descriptor(
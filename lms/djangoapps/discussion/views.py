@@ -286,14 +286,16 @@ def single_thread(request, course_key, discussion_id, thread_id):
 
     if request.is_ajax():
         cc_user = cc.User.from_django_user(request.user)
-        user_info = cc_user.to_dict()
         is_staff = has_permission(request.user, 'openclose_thread', course.id)
-        thread = _load_thread_for_viewing(
-            request,
-            course,
-            discussion_id=discussion_id,
-            thread_id=thread_id,
-            raise_event=True,
+        user_info, thread = cc.utils.run_concurrently(
+            cc_user.to_dict,
+            lambda: _load_thread_for_viewing(
+                request,
+                course,
+                discussion_id=discussion_id,
+                thread_id=thread_id,
+                raise_event=True,
+            ),
         )
 
         with function_trace("get_annotated_content_infos"):
@@ -523,12 +525,14 @@ def user_profile(request, course_key, user_id):
         else:
             profiled_user = cc.User(id=user_id, course_id=course_key)
 
-        threads, page, num_pages = profiled_user.active_threads(query_params)
+        (threads, page, num_pages), user_info = cc.utils.run_concurrently(
+            lambda: profiled_user.active_threads(query_params),
+            cc.User.from_django_user(request.user).to_dict,
+        )
         query_params['page'] = page
         query_params['num_pages'] = num_pages
 
         with function_trace("get_metadata_for_threads"):
-            user_info = cc.User.from_django_user(request.user).to_dict()
             annotated_content_info = utils.get_metadata_for_threads(course_key, threads, request.user, user_info)
 
         is_staff = has_permission(request.user, 'openclose_thread', course.id)
@@ -1,6 +1,7 @@
 """
 Discussion API internal interface
 """
+import functools
 import itertools
 from collections import defaultdict
 from urllib import urlencode
@@ -41,7 +42,8 @@ from lms.djangoapps.courseware.exceptions import CourseAccessRedirect
 from lms.djangoapps.discussion_api.pagination import DiscussionAPIPagination
 from lms.lib.comment_client.comment import Comment
 from lms.lib.comment_client.thread import Thread
-from lms.lib.comment_client.utils import CommentClientRequestError
+from lms.lib.comment_client.user import User as CommentClientUser
+from lms.lib.comment_client.utils import CommentClientRequestError, run_concurrently
 from openedx.core.djangoapps.user_api.accounts.views import AccountViewSet
 from openedx.core.lib.exceptions import CourseNotFoundError, DiscussionNotFoundError, PageNotFoundError
 
@@ -536,7 +538,8 @@ def get_thread_list(
         })
 
     course = _get_course(course_key, request.user)
-    context = get_context(course, request)
+    cc_requester = CommentClientUser.from_django_user(request.user)
+    context = get_context(course, request, cc_requester=cc_requester)
 
     query_params = {
         "user_id": unicode(request.user.id),
@@ -559,12 +562,19 @@ def get_thread_list(
             })
 
     if following:
-        paginated_results = context["cc_requester"].subscribed_threads(query_params)
+        # A separate user, since cc_requester is retrieved concurrently.
+        cc_subscriber = CommentClientUser.from_django_user(request.user)
+        cc_subscriber["course_id"] = course.id
+        search_threads = functools.partial(cc_subscriber.subscribed_threads, query_params)
     else:
         query_params["course_id"] = unicode(course.id)
         query_params["commentable_ids"] = ",".join(topic_id_list) if topic_id_list else None
         query_params["text"] = text_search
-        paginated_results = Thread.search(query_params)
+        search_threads = functools.partial(Thread.search, query_params)
+    # The requester is only needed to serialize the threads, so it's
+    # retrieved while the threads are searched.
+    _, paginated_results = run_concurrently(cc_requester.retrieve, search_threads)
+    cc_requester["course_id"] = course.id
     # The comments service returns the last page of results if the requested
     # page is beyond the last page, but we want be consistent with DRF's general
     # behavior and return a PageNotFoundError in that case
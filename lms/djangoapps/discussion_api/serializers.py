@@ -21,10 +21,12 @@ from lms.lib.comment_client.user import User as CommentClientUser
 from lms.lib.comment_client.utils import CommentClientRequestError
 
 
-def get_context(course, request, thread=None):
+def get_context(course, request, thread=None, cc_requester=None):
     """
     Returns a context appropriate for use with ThreadSerializer or
-    (if thread is provided) CommentSerializer.
+    (if thread is provided) CommentSerializer.  The requester's comments
+    service user is retrieved unless cc_requester is provided, in which case
+    the caller is responsible for retrieving it and then setting its course_id.
     """
     # TODO: cache staff_user_ids and ta_user_ids if we need to improve perf
     staff_user_ids = {
@@ -41,8 +43,9 @@ def get_context(course, request, thread=None):
         for user in role.users.all()
     }
     requester = request.user
-    cc_requester = CommentClientUser.from_django_user(requester).retrieve()
-    cc_requester["course_id"] = course.id
+    if cc_requester is None:
+        cc_requester = CommentClientUser.from_django_user(requester).retrieve()
+        cc_requester["course_id"] = course.id
     course_discussion_settings = get_course_discussion_settings(course.id)
     return {
         "course": course,
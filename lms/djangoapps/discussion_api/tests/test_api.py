@@ -11,6 +11,7 @@ import httpretty
 import mock
 from django.core.exceptions import ValidationError
 from django.test.client import RequestFactory
+from django.test.utils import override_settings
 from nose.plugins.attrib import attr
 from opaque_keys.edx.locator import CourseLocator
 from pytz import UTC
@@ -863,6 +864,46 @@ class GetThreadListTest(ForumsEnableMixin, CommentsServiceMockMixin, UrlResetMix
             "per_page": ["11"],
         })
 
+    @override_settings(COMMENTS_SERVICE_MAX_CONCURRENT_REQUESTS=4)
+    def test_following_concurrently(self):
+        self.register_subscribed_threads_response(self.user, [], page=1, num_pages=0)
+        result = get_thread_list(
+            self.request,
+            self.course.id,
+            page=1,
+            page_size=11,
+            following=True,
+        ).data
+        self.assertEqual(result["results"], [])
+
+        subscribed_threads_requests = [
+            request for request in httpretty.httpretty.latest_requests
+            if urlparse(request.path).path == "/api/v1/users/{}/subscribed_threads".format(self.user.id)
+        ]
+        self.assertEqual(len(subscribed_threads_requests), 1)
+        self.assert_query_params_equal(subscribed_threads_requests[0], {
+            "user_id": [unicode(self.user.id)],
+            "course_id": [unicode(self.course.id)],
+            "sort_key": ["activity"],
+            "page": ["1"],
+            "per_page": ["11"],
+        })
+
+    @ddt.data(True, False)
+    def test_requester_retrieved_without_course(self, following):
+        if following:
+            self.register_subscribed_threads_response(self.user, [], page=1, num_pages=0)
+        else:
+            self.register_get_threads_response([], page=1, num_pages=0)
+        get_thread_list(self.request, self.course.id, page=1, page_size=11, following=following)
+
+        user_requests = [
+            request for request in httpretty.httpretty.latest_requests
+            if urlparse(request.path).path == "/api/v1/users/{}".format(self.user.id)
+        ]
+        self.assertEqual(len(user_requests), 1)
+        self.assertNotIn("course_id", user_requests[0].querystring)
+
     @ddt.data("unanswered", "unread")
     def test_view_query(self, query):
         self.register_get_threads_response([], page=1, num_pages=0)
@@ -1,12 +1,15 @@
 # -*- coding: utf-8 -*-
 import datetime
 import json
+import threading
 
 import ddt
 import mock
 from django.core.management import call_command
 from django.core.urlresolvers import reverse
 from django.test import RequestFactory, TestCase
+from django.test.utils import override_settings
+from django.utils import translation
 from mock import Mock, patch
 from nose.plugins.attrib import attr
 from pytz import UTC
@@ -34,12 +37,18 @@ from django_comment_common.utils import (
 )
 from edxmako import add_lookup
 from lms.djangoapps.teams.tests.factories import CourseTeamFactory, CourseTeamMembershipFactory
-from lms.lib.comment_client.utils import CommentClientMaintenanceError, perform_request
+from lms.lib.comment_client.utils import (
+    CommentClientMaintenanceError,
+    get_session,
+    perform_request,
+    run_concurrently
+)
 from openedx.core.djangoapps.content.course_structures.models import CourseStructure
 from openedx.core.djangoapps.course_groups import cohorts
 from openedx.core.djangoapps.course_groups.cohorts import set_course_cohorted
 from openedx.core.djangoapps.course_groups.tests.helpers import CohortFactory, config_course_cohorts
 from openedx.core.djangoapps.util.testing import ContentGroupTestCase
+from request_cache.middleware import RequestCache
 from student.roles import CourseStaffRole
 from student.tests.factories import AdminFactory, CourseEnrollmentFactory, UserFactory
 from xmodule.modulestore import ModuleStoreEnum
@@ -1827,7 +1836,7 @@ class ClientConfigurationTestCase(TestCase):
         with self.assertRaises(CommentClientMaintenanceError):
             perform_request('GET', 'http://www.google.com')
 
-    @patch('requests.request')
+    @patch('lms.lib.comment_client.utils.send_request')
     def test_enabled(self, mock_request):
         """Ensures that requests proceed normally when forums are enabled."""
         config = ForumsConfig.current()
@@ -1844,6 +1853,68 @@ class ClientConfigurationTestCase(TestCase):
         self.assertEqual(result, {})
 
 
+class SessionTestCase(TestCase):
+    """Tests for the session shared by the requests to the comment service."""
+
+    def test_same_session(self):
+        self.assertIs(get_session(), get_session())
+
+    def test_new_session_after_fork(self):
+        session = get_session()
+        with patch('lms.lib.comment_client.utils.os.getpid', return_value=-1):
+            self.assertIsNot(get_session(), session)
+
+    def test_no_cookies(self):
+        self.assertEqual(get_session().cookies.get_policy().allowed_domains(), ())
+
+
+@ddt.ddt
+class RunConcurrentlyTestCase(TestCase):
+    """Tests for calling functions that make requests to the comment service concurrently."""
+
+    @ddt.data(1, 4)
+    def test_results_in_order(self, max_concurrent_requests):
+        with override_settings(COMMENTS_SERVICE_MAX_CONCURRENT_REQUESTS=max_concurrent_requests):
+            self.assertEqual(run_concurrently(lambda: 1, lambda: 2, lambda: 3), [1, 2, 3])
+
+    @ddt.data(1, 4)
+    def test_first_exception_raised(self, max_concurrent_requests):
+        def raise_error(message):
+            """Raises a ValueError with the given message."""
+            raise ValueError(message)
+
+        with override_settings(COMMENTS_SERVICE_MAX_CONCURRENT_REQUESTS=max_concurrent_requests):
+            with self.assertRaisesRegexp(ValueError, 'first'):
+                run_concurrently(lambda: 1, lambda: raise_error('first'), lambda: raise_error('last'))
+
+    @override_settings(COMMENTS_SERVICE_MAX_CONCURRENT_REQUESTS=4)
+    def test_last_function_in_calling_thread(self):
+        calling_thread = threading.current_thread()
+        threads = run_concurrently(threading.current_thread, threading.current_thread)
+        self.assertIsNot(threads[0], calling_thread)
+        self.assertIs(threads[1], calling_thread)
+
+    @override_settings(COMMENTS_SERVICE_MAX_CONCURRENT_REQUESTS=4)
+    def test_request_cache_not_shared(self):
+        def cache_in_request_cache(value):
+            """Caches the given value in the request cache and returns the previously cached value."""
+            cache = RequestCache.get_request_cache('test')
+            previous_value = cache.get('value')
+            cache['value'] = value
+            return previous_value
+
+        for value in range(3):
+            self.assertEqual(
+                run_concurrently(lambda value=value: cache_in_request_cache(value), lambda: None),
+                [None, None],
+            )
+
+    @override_settings(COMMENTS_SERVICE_MAX_CONCURRENT_REQUESTS=4)
+    def test_language(self):
+        with translation.override('eo'):
+            self.assertEqual(run_concurrently(translation.get_language, translation.get_language), ['eo', 'eo'])
+
+
 def set_discussion_division_settings(
         course_key, enable_cohorts=False, always_divide_inline_discussions=False,
         divided_discussions=[], division_scheme=CourseDiscussionSettings.COHORT
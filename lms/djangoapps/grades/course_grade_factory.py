@@ -1,4 +1,5 @@
 from collections import namedtuple
+from itertools import islice
 from logging import getLogger
 
 import dogstats_wrapper as dog_stats_api
@@ -8,7 +9,8 @@ from openedx.core.djangoapps.signals.signals import COURSE_GRADE_CHANGED, COURSE
 from .config import assume_zero_if_absent, should_persist_grades
 from .course_data import CourseData
 from .course_grade import CourseGrade, ZeroCourseGrade
-from .models import PersistentCourseGrade, prefetch
+from .models import PersistentCourseGrade, bulk_prefetch, prefetch
+from .subsection_grade_factory import SubsectionGradeFactory
 
 log = getLogger(__name__)
 
@@ -19,6 +21,9 @@ class CourseGradeFactory(object):
     """
     GradeResult = namedtuple('GradeResult', ['student', 'course_grade', 'error'])
 
+    # Number of users whose grading data is prefetched together by iter.
+    PREFETCH_BATCH_SIZE = 100
+
     def read(
             self,
             user,
@@ -84,6 +89,9 @@ class CourseGradeFactory(object):
 
         If an error occurred, course_grade will be None and err_msg will be an
         exception message. If there was no error, err_msg is an empty string.
+
+        The students are graded in batches of PREFETCH_BATCH_SIZE, for
+        which the scores and persisted grades are prefetched in bulk.
         """
         # Pre-fetch the collected course_structure (in _iter_grade_result) so:
         # 1. Correctness: the same version of the course is used to
@@ -94,9 +102,39 @@ class CourseGradeFactory(object):
             user=None, course=course, collected_block_structure=collected_block_structure, course_key=course_key,
         )
         stats_tags = [u'action:{}'.format(course_data.course_key)]
-        for user in users:
-            with dog_stats_api.timer('lms.grades.CourseGradeFactory.iter', tags=stats_tags):
-                yield self._iter_grade_result(user, course_data, force_update)
+        users = iter(users)
+        while True:
+            batch_users = list(islice(users, self.PREFETCH_BATCH_SIZE))
+            if not batch_users:
+                break
+            try:
+                self._prefetch(batch_users, course_data, force_update)
+            except Exception:  # pylint: disable=broad-except
+                # The data is then queried for each student while grading,
+                # where any errors are reported for the student.
+                log.exception(u'Grades: Failed to prefetch grading data for course %s', course_data.course_key)
+            for user in batch_users:
+                with dog_stats_api.timer('lms.grades.CourseGradeFactory.iter', tags=stats_tags):
+                    yield self._iter_grade_result(user, course_data, force_update)
+
+    @staticmethod
+    def _prefetch(users, course_data, force_update):
+        """
+        Prefetches, in bulk, the data needed to compute the grades of the
+        given users, so that grading each user reads it from memory.
+        Persisted subsection grades aren't read when updating grades, so
+        they are only prefetched when not force_update.
+        """
+        structure = course_data.collected_structure
+        chapter_keys = structure.get_children(structure.root_block_usage_key)
+        subsections_exist = any(structure.get_children(chapter_key) for chapter_key in chapter_keys)
+        if not subsections_exist:
+            # Without subsections, there's nothing to prefetch.
+            return
+
+        if should_persist_grades(course_data.course_key):
+            bulk_prefetch(users, course_data.course_key, subsection_grades=not force_update)
+        SubsectionGradeFactory.prefetch_scores(users, course_data.course_key, structure)
 
     def _iter_grade_result(self, user, course_data, force_update):
         try:
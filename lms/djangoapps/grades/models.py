@@ -295,6 +295,8 @@ class PersistentSubsectionGrade(TimeStampedModel):
     # track which blocks were visible at the time of grade calculation
     visible_blocks = models.ForeignKey(VisibleBlocks, db_column='visible_blocks_hash', to_field='hashed')
 
+    _CACHE_NAMESPACE = u"grades.models.PersistentSubsectionGrade"
+
     @property
     def full_usage_key(self):
         """
@@ -341,15 +343,37 @@ class PersistentSubsectionGrade(TimeStampedModel):
             usage_key=usage_key,
         )
 
+    @classmethod
+    def prefetch(cls, course_key, users):
+        """
+        Prefetches grades for the given users for the given course, so
+        that the next call to bulk_read_grades for each of the users
+        doesn't query the database.
+        """
+        prefetched = {user.id: [] for user in users}
+        for grade in cls.objects.select_related('visible_blocks', 'override').filter(
+                user_id__in=prefetched.keys(),
+                course_id=course_key,
+        ):
+            prefetched[grade.user_id].append(grade)
+        get_cache(cls._CACHE_NAMESPACE)[cls._cache_key(course_key)] = prefetched
+
     @classmethod
     def bulk_read_grades(cls, user_id, course_key):
         """
         Reads all grades for the given user and course.
 
+        Prefetched grades are only used once, so that subsequent reads
+        see any grades that were updated in the meantime.
+
         Arguments:
             user_id: The user associated with the desired grades
             course_key: The course identifier for the desired grades
         """
+        prefetched_grades = get_cache(cls._CACHE_NAMESPACE).get(cls._cache_key(course_key), {}).pop(user_id, None)
+        if prefetched_grades is not None:
+            return prefetched_grades
+
         return cls.objects.select_related('visible_blocks', 'override').filter(
             user_id=user_id,
             course_id=course_key,
@@ -439,6 +463,10 @@ class PersistentSubsectionGrade(TimeStampedModel):
             if override.possible_graded_override is not None:
                 params['possible_graded'] = override.possible_graded_override
 
+    @classmethod
+    def _cache_key(cls, course_key):
+        return u"subsection_grades_cache.{}".format(course_key)
+
     @staticmethod
     def _emit_grade_calculated_event(grade):
         events.subsection_grade_calculated(grade)
@@ -592,14 +620,33 @@ class PersistentSubsectionGradeOverride(models.Model):
     possible_graded_override = models.FloatField(null=True, blank=True)
 
     _CACHE_NAMESPACE = u"grades.models.PersistentSubsectionGradeOverride"
+    _BULK_CACHE_NAMESPACE = u"grades.models.PersistentSubsectionGradeOverride.bulk"
 
     @classmethod
     def prefetch(cls, user_id, course_key):
-        get_cache(cls._CACHE_NAMESPACE)[(user_id, str(course_key))] = {
-            override.grade.usage_key: override
-            for override in
-            cls.objects.filter(grade__user_id=user_id, grade__course_id=course_key)
-        }
+        prefetched = get_cache(cls._BULK_CACHE_NAMESPACE).get(str(course_key), {}).pop(user_id, None)
+        if prefetched is None:
+            prefetched = {
+                override.grade.usage_key: override
+                for override in
+                cls.objects.select_related('grade').filter(grade__user_id=user_id, grade__course_id=course_key)
+            }
+        get_cache(cls._CACHE_NAMESPACE)[(user_id, str(course_key))] = prefetched
+
+    @classmethod
+    def bulk_prefetch(cls, course_key, users):
+        """
+        Prefetches overrides for the given users for the given course
+        with a single query.  The overrides of each user are used by the
+        next call to prefetch for that user, instead of querying again.
+        """
+        prefetched = {user.id: {} for user in users}
+        for override in cls.objects.select_related('grade').filter(
+                grade__user_id__in=prefetched.keys(),
+                grade__course_id=course_key,
+        ):
+            prefetched[override.grade.user_id][override.grade.usage_key] = override
+        get_cache(cls._BULK_CACHE_NAMESPACE)[str(course_key)] = prefetched
 
     @classmethod
     def get_override(cls, user_id, usage_key):
@@ -620,3 +667,15 @@ def prefetch(user, course_key):
     PersistentSubsectionGradeOverride.prefetch(user.id, course_key)
     VisibleBlocks.bulk_read(course_key)
 
+
+def bulk_prefetch(users, course_key, subsection_grades=True):
+    """
+    Prefetches the grading data of the given users for the given course
+    in bulk.  Persisted subsection grades are only prefetched if
+    subsection_grades is True.
+    """
+    if subsection_grades:
+        PersistentSubsectionGrade.prefetch(course_key, users)
+    PersistentSubsectionGradeOverride.bulk_prefetch(course_key, users)
+    VisibleBlocks.bulk_read(course_key)
+
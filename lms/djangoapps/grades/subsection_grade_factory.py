@@ -1,4 +1,4 @@
-from collections import OrderedDict
+from collections import OrderedDict, defaultdict, namedtuple
 from logging import getLogger
 
 from lazy import lazy
@@ -8,8 +8,11 @@ from lms.djangoapps.grades.config import assume_zero_if_absent, should_persist_g
 from lms.djangoapps.grades.models import PersistentSubsectionGrade
 from lms.djangoapps.grades.scores import possibly_scored
 from openedx.core.lib.grade_utils import is_score_higher_or_equal
+from request_cache import get_cache
 from student.models import anonymous_id_for_user
 from submissions import api as submissions_api
+from submissions.models import ScoreSummary
+from submissions.serializers import UnannotatedScoreSerializer
 
 from .course_data import CourseData
 from .subsection_grade import CreateSubsectionGrade, ReadSubsectionGrade, ZeroSubsectionGrade
@@ -17,10 +20,15 @@ from .subsection_grade import CreateSubsectionGrade, ReadSubsectionGrade, ZeroSu
 log = getLogger(__name__)
 
 
+PrefetchedScores = namedtuple('PrefetchedScores', ['submissions_scores', 'csm_scores'])
+
+
 class SubsectionGradeFactory(object):
     """
     Factory for Subsection Grades.
     """
+    _CACHE_NAMESPACE = u"grades.subsection_grade_factory.SubsectionGradeFactory"
+
     def __init__(self, student, course=None, course_structure=None, course_data=None):
         self.student = student
         self.course_data = course_data or CourseData(student, course=course, structure=course_structure)
@@ -94,12 +102,44 @@ class SubsectionGradeFactory(object):
 
         return calculated_grade
 
+    @classmethod
+    def prefetch_scores(cls, users, course_key, collected_structure):
+        """
+        Prefetches the scores of the given users for all the scorable
+        blocks in the given collected block structure of the course,
+        with a query for each of CSM and the Submissions API rather
+        than queries for each user.  The scores of each user are used
+        by the next SubsectionGradeFactory created for that user.
+        """
+        scorable_locations = [block_key for block_key in collected_structure if possibly_scored(block_key)]
+        csm_scores = ScoresClient.create_for_users(course_key, [user.id for user in users], scorable_locations)
+
+        anonymous_user_ids = {user.id: anonymous_id_for_user(user, course_key) for user in users}
+        submissions_scores = _bulk_get_submissions_scores(course_key, anonymous_user_ids.values())
+
+        get_cache(cls._CACHE_NAMESPACE)[unicode(course_key)] = {
+            user.id: PrefetchedScores(submissions_scores[anonymous_user_ids[user.id]], csm_scores[user.id])
+            for user in users
+        }
+
+    @lazy
+    def _prefetched_scores(self):
+        """
+        Returns the scores prefetched for the student by prefetch_scores,
+        if any, and removes them from the cache so that they are only
+        used once.
+        """
+        course_scores = get_cache(self._CACHE_NAMESPACE).get(unicode(self.course_data.course_key), {})
+        return course_scores.pop(self.student.id, None)
+
     @lazy
     def _csm_scores(self):
         """
         Lazily queries and returns all the scores stored in the user
         state (in CSM) for the course, while caching the result.
         """
+        if self._prefetched_scores is not None:
+            return self._prefetched_scores.csm_scores
         scorable_locations = [block_key for block_key in self.course_data.structure if possibly_scored(block_key)]
         return ScoresClient.create_for_locations(self.course_data.course_key, self.student.id, scorable_locations)
 
@@ -109,6 +149,8 @@ class SubsectionGradeFactory(object):
         Lazily queries and returns the scores stored by the
         Submissions API for the course, while caching the result.
         """
+        if self._prefetched_scores is not None:
+            return self._prefetched_scores.submissions_scores
         anonymous_user_id = anonymous_id_for_user(self.student, self.course_data.course_key)
         return submissions_api.get_scores(str(self.course_data.course_key), anonymous_user_id)
 
@@ -157,3 +199,26 @@ class SubsectionGradeFactory(object):
             getattr(subsection, 'subtree_edited_on', None),
             self.student.id,
         ))
+
+
+def _bulk_get_submissions_scores(course_key, anonymous_user_ids):
+    """
+    Returns the scores stored by the Submissions API for the given
+    anonymous users in the course, with a single query.  The result
+    maps each anonymous user id to a dict in the format returned by
+    submissions_api.get_scores for that user.
+
+    The Submissions API has no bulk equivalent of get_scores, so this
+    repeats its query and filtering for many users.  It must be kept in
+    sync with get_scores whenever edx-submissions is upgraded.
+    """
+    scores = defaultdict(dict)
+    score_summaries = ScoreSummary.objects.filter(
+        student_item__course_id=str(course_key),
+        student_item__student_id__in=anonymous_user_ids,
+    ).select_related('latest', 'latest__submission', 'student_item')
+    for summary in score_summaries:
+        if not summary.latest.is_hidden():
+            student_item = summary.student_item
+            scores[student_item.student_id][student_item.item_id] = UnannotatedScoreSerializer(summary.latest).data
+    return scores
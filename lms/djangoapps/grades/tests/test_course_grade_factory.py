@@ -3,10 +3,14 @@ from nose.plugins.attrib import attr
 
 import ddt
 from courseware.access import has_access
+from courseware.model_data import set_score
 from django.conf import settings
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
 from lms.djangoapps.grades.config.tests.utils import persistent_grades_feature_flags
 from mock import patch
 from openedx.core.djangoapps.content.block_structure.factory import BlockStructureFactory
+from request_cache.middleware import RequestCache
 from student.tests.factories import UserFactory
 from xmodule.modulestore.tests.django_utils import SharedModuleStoreTestCase
 from xmodule.modulestore.tests.factories import CourseFactory
@@ -171,6 +175,47 @@ class TestCourseGradeFactory(GradeTestBase):
             ))
         self.assertEqual(mock_update.called, force_update)
 
+    @ddt.data(True, False)
+    def test_iter_prefetch_query_counts(self, force_update):
+        """
+        Benchmarks the number of queries made to grade several students
+        with and without prefetching their grading data in bulk.
+        """
+        students = [self.request.user] + [UserFactory.create() for _ in range(4)]
+        for index, student in enumerate(students):
+            set_score(student.id, self.problem.location, index % 3, 2)
+
+        def _grade_students():
+            """
+            Grades the students, returning the course grades and the
+            number of queries made to grade them.
+            """
+            RequestCache.clear_request_cache()
+            with CaptureQueriesContext(connection) as queries:
+                grades = [
+                    (
+                        course_grade.percent,
+                        {
+                            location: (score.earned, score.possible)
+                            for location, score in course_grade.problem_scores.iteritems()
+                        },
+                    )
+                    for _, course_grade, _ in CourseGradeFactory().iter(
+                        students, self.course, force_update=force_update,
+                    )
+                ]
+            return grades, len(queries)
+
+        # Persist the grades first, so that both runs below read and
+        # write the same data.
+        _grade_students()
+        with patch.object(CourseGradeFactory, '_prefetch'):
+            unbatched_grades, unbatched_num_queries = _grade_students()
+        batched_grades, batched_num_queries = _grade_students()
+
+        self.assertEqual(batched_grades, unbatched_grades)
+        self.assertLess(batched_num_queries, unbatched_num_queries)
+
     def test_course_grade_summary(self):
         with mock_get_score(1, 2):
             self.subsection_grade_factory.update(self.course_structure[self.sequence.location])
@@ -13,7 +13,7 @@ from django.db.utils import IntegrityError
 from django.test import TestCase
 from django.utils.timezone import now
 from freezegun import freeze_time
-from mock import patch
+from mock import Mock, patch
 from opaque_keys.edx.locator import BlockUsageLocator, CourseLocator
 
 from lms.djangoapps.grades.models import (
@@ -294,6 +294,37 @@ class PersistentSubsectionGradeTest(GradesModelTestCase):
         self.assertEqual(grade.earned_all, 0.0)
         self.assertEqual(grade.earned_graded, 0.0)
 
+    def test_prefetch(self):
+        grade = PersistentSubsectionGrade.update_or_create_grade(**self.params)
+        user = Mock(id=self.params['user_id'])
+        other_user = Mock(id=self.params['user_id'] + 1)
+
+        with self.assertNumQueries(1):
+            PersistentSubsectionGrade.prefetch(self.course_key, [user, other_user])
+
+        with self.assertNumQueries(0):
+            self.assertEqual(PersistentSubsectionGrade.bulk_read_grades(user.id, self.course_key), [grade])
+            self.assertEqual(PersistentSubsectionGrade.bulk_read_grades(other_user.id, self.course_key), [])
+
+        # prefetched grades are only read once
+        with self.assertNumQueries(1):
+            self.assertEqual(list(PersistentSubsectionGrade.bulk_read_grades(user.id, self.course_key)), [grade])
+
+    def test_bulk_prefetch_override(self):
+        grade = PersistentSubsectionGrade.update_or_create_grade(**self.params)
+        override = PersistentSubsectionGradeOverride.objects.create(grade=grade, earned_all_override=0.0)
+        user = Mock(id=self.params['user_id'])
+
+        with self.assertNumQueries(1):
+            PersistentSubsectionGradeOverride.bulk_prefetch(self.course_key, [user])
+
+        with self.assertNumQueries(0):
+            PersistentSubsectionGradeOverride.prefetch(user.id, self.course_key)
+            self.assertEqual(PersistentSubsectionGradeOverride.get_override(user.id, self.usage_key), override)
+
+        with self.assertNumQueries(1):
+            PersistentSubsectionGradeOverride.prefetch(user.id, self.course_key)
+
     def _assert_tracker_emitted_event(self, tracker_mock, grade):
         """
         Helper function to ensure that the mocked event tracker
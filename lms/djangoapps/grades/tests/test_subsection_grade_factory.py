@@ -1,11 +1,14 @@
 import ddt
 from courseware.tests.test_submitting_problems import ProblemSubmissionTestMixin
 from django.conf import settings
+from django.test import TestCase
 from lms.djangoapps.grades.config.tests.utils import persistent_grades_feature_flags
 from mock import patch
+from opaque_keys.edx.locator import CourseLocator
+from submissions import api as submissions_api
 
 from ..models import PersistentSubsectionGrade
-from ..subsection_grade_factory import ZeroSubsectionGrade
+from ..subsection_grade_factory import ZeroSubsectionGrade, _bulk_get_submissions_scores
 from .base import GradeTestBase
 from .utils import mock_get_score
 
@@ -99,3 +102,53 @@ class TestSubsectionGradeFactory(ProblemSubmissionTestMixin, GradeTestBase):
             ):
                 self.subsection_grade_factory.create(self.sequence)
         self.assertEqual(mock_read_saved_grade.called, feature_flag and course_setting)
+
+
+class BulkGetSubmissionsScoresTest(TestCase):
+    """
+    Tests that _bulk_get_submissions_scores, which queries the Submissions
+    API's models directly to fetch the scores of many students at once,
+    returns the same scores as submissions_api.get_scores does for each
+    student.
+    """
+    course_key = CourseLocator('org', 'course', 'run')
+
+    def _set_score(self, student_id, item_id, points_earned, points_possible, course_key=None):
+        """
+        Submits an answer to the given item for the given student, and
+        scores the submission.
+        """
+        student_item = {
+            'student_id': student_id,
+            'course_id': str(course_key or self.course_key),
+            'item_id': item_id,
+            'item_type': 'openassessment',
+        }
+        submission = submissions_api.create_submission(student_item, 'answer')
+        submissions_api.set_score(submission['uuid'], points_earned, points_possible)
+
+    def test_same_as_get_scores(self):
+        self._set_score('student0', 'item0', 1, 2)
+        self._set_score('student0', 'item1', 3, 3)
+
+        # A hidden score.
+        self._set_score('student1', 'item0', 0, 0)
+        # A score that's reset.
+        self._set_score('student1', 'item1', 2, 2)
+        submissions_api.reset_score('student1', str(self.course_key), 'item1')
+        # A score that's set again after it's reset.
+        self._set_score('student1', 'item2', 1, 1)
+        submissions_api.reset_score('student1', str(self.course_key), 'item2')
+        self._set_score('student1', 'item2', 1, 4)
+
+        # A score in another course.
+        self._set_score('student1', 'item3', 1, 1, course_key=CourseLocator('org', 'other_course', 'run'))
+
+        student_ids = ['student0', 'student1', 'student2']
+        bulk_scores = _bulk_get_submissions_scores(self.course_key, student_ids)
+        self.assertEqual(set(bulk_scores['student0']), {'item0', 'item1'})
+        for student_id in student_ids:
+            self.assertEqual(
+                bulk_scores[student_id],
+                submissions_api.get_scores(str(self.course_key), student_id),
+            )
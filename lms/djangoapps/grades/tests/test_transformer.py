@@ -222,6 +222,34 @@ class GradesTransformerTestCase(CourseStructureTestCase):
             )
             self.assertEqual(actual_subsections, {blocks[sub].location for sub in expected_subsections})
 
+    def test_collect_incrementally(self):
+        blocks = self.build_course([{
+            u'#type': u'course',
+            u'#ref': u'course',
+            u'#children': [{
+                u'#type': u'chapter',
+                u'#ref': u'chapter',
+                u'#children': [
+                    {
+                        u'#type': u'sequential',
+                        u'#ref': u'sub_{}'.format(index),
+                        u'#children': [{
+                            u'#type': u'vertical',
+                            u'#ref': u'vert_{}'.format(index),
+                            u'#children': [{
+                                u'metadata': self.problem_metadata,
+                                u'#type': u'problem',
+                                u'#ref': u'prob_{}'.format(index),
+                                u'data': u'<problem></problem>',
+                            }],
+                        }],
+                    }
+                    for index in (1, 2)
+                ],
+            }],
+        }])
+        self.assert_incremental_collect(blocks, u'prob_1', graded=False, weight=2)
+
     def test_unscored_block_collection(self):
         blocks = self.build_course_with_problems()
         block_structure = get_course_blocks(self.student, blocks[u'course'].location, self.transformers)
@@ -408,9 +408,9 @@ def coupon_codes_features(features, coupons_list, course_id):
 
 def list_problem_responses(course_key, problem_location):
     """
-    Return responses to a given problem as a dict.
+    Return a generator of the responses to a given problem as dicts.
 
-    list_problem_responses(course_key, problem_location)
+    list(list_problem_responses(course_key, problem_location))
 
     would return [
         {'username': u'user1', 'state': u'...'},
@@ -419,7 +419,8 @@ def list_problem_responses(course_key, problem_location):
     ]
 
     where `state` represents a student's response to the problem
-    identified by `problem_location`.
+    identified by `problem_location`.  The responses are read from the
+    database as they're consumed, so they're never all held in memory.
     """
     problem_key = UsageKey.from_string(problem_location)
     # Are we dealing with an "old-style" problem location?
@@ -427,19 +428,19 @@ def list_problem_responses(course_key, problem_location):
     if not run:
         problem_key = UsageKey.from_string(problem_location).map_into_course(course_key)
     if problem_key.course_key != course_key:
-        return []
+        return
 
     smdat = StudentModule.objects.filter(
         course_id=course_key,
         module_state_key=problem_key,
         student__is_staff=0,
     )
-    smdat = smdat.order_by('student')
+    smdat = smdat.order_by('student').select_related('student')
 
-    return [
-        {'username': response.student.username, 'state': response.state}
-        for response in smdat
-    ]
+    # Iterate without caching the StudentModules, since only their
+    # responses are returned.
+    for response in smdat.iterator():
+        yield {'username': response.student.username, 'state': response.state}
 
 
 def course_registration_features(features, registration_codes, csv_type):
@@ -17,12 +17,12 @@ import hashlib
 import json
 import logging
 import os.path
+from tempfile import SpooledTemporaryFile
 from uuid import uuid4
 
 from boto.exception import BotoServerError
 from django.conf import settings
 from django.contrib.auth.models import User
-from django.core.files.base import ContentFile
 from django.db import models, transaction
 
 from openedx.core.djangoapps.xmodule_django.models import CourseKeyField
@@ -34,6 +34,10 @@ logger = logging.getLogger(__name__)
 QUEUING = 'QUEUING'
 PROGRESS = 'PROGRESS'
 
+# Size in bytes of reports that are held in memory before they're stored.
+# Larger reports are spooled to a temporary file.
+REPORT_MAX_MEMORY_SIZE = 5 * 1024 * 1024
+
 
 class InstructorTask(models.Model):
     """
@@ -181,9 +185,8 @@ class InstructorTask(models.Model):
 class ReportStore(object):
     """
     Simple abstraction layer that can fetch and store CSV files for reports
-    download. Should probably refactor later to create a ReportFile object that
-    can simply be appended to for the sake of memory efficiency, rather than
-    passing in the whole dataset. Doing that for now just because it's simpler.
+    download. Rows can be passed in as a generator, so that reports can be
+    stored without holding the whole dataset in memory.
     """
     @classmethod
     def from_config(cls, config_name):
@@ -267,12 +270,47 @@ class DjangoStorageReportStore(ReportStore):
         """
         Given a course_id, filename, and rows (each row is an iterable of
         strings), write the rows to the storage backend in csv format.
+
+        The rows are written as they're iterated over, and only up to
+        REPORT_MAX_MEMORY_SIZE bytes of them are held in memory; the rest
+        are spooled to a temporary file, which the storage backend then
+        reads and uploads in chunks.
+        """
+        with SpooledTemporaryFile(max_size=REPORT_MAX_MEMORY_SIZE) as output_buffer:
+            csvwriter = csv.writer(output_buffer)
+            for row in self._get_utf8_encoded_rows(rows):
+                csvwriter.writerow(row)
+            output_buffer.seek(0)
+            self.store(course_id, filename, output_buffer)
+
+    def rows_for(self, course_id, filename):
+        """
+        A generator of the rows of the CSV file with the given filename for
+        the given course_id, as lists of unicode strings.  The file is read
+        as the rows are generated.
+        """
+        with self.storage.open(self.path_to(course_id, filename)) as csv_file:
+            for row in csv.reader(csv_file):
+                yield [item.decode('utf-8') for item in row]
+
+    def filenames_in(self, course_id, directory):
+        """
+        Returns the sorted list of names of the files in the given
+        directory for the given course_id.
+        """
+        try:
+            _, filenames = self.storage.listdir(self.path_to(course_id, directory))
+        except OSError:
+            # Django's FileSystemStorage fails with an OSError if the
+            # directory does not exist.
+            return []
+        return sorted(filenames)
+
+    def delete(self, course_id, filename):
+        """
+        Deletes the file with the given filename for the given course_id.
         """
-        output_buffer = ContentFile('')
-        csvwriter = csv.writer(output_buffer)
-        csvwriter.writerows(self._get_utf8_encoded_rows(rows))
-        output_buffer.seek(0)
-        self.store(course_id, filename, output_buffer)
+        self.storage.delete(self.path_to(course_id, filename))
 
     def links_for(self, course_id):
         """
@@ -49,6 +49,7 @@ from lms.djangoapps.instructor_task.tasks_helper.module_state import (
     rescore_problem_module_state,
     reset_attempts_module_state
 )
+from lms.djangoapps.instructor_task.subtasks import SubtaskStatus, check_subtask_is_valid
 from lms.djangoapps.instructor_task.tasks_helper.runner import run_main_task
 
 TASK_LOG = logging.getLogger('edx.celery.task')
@@ -187,6 +188,30 @@ def calculate_grades_csv(entry_id, xmodule_instance_args):
     return run_main_task(entry_id, task_fn, action_name)
 
 
+@task(routing_key=settings.GRADES_DOWNLOAD_ROUTING_KEY)  # pylint: disable=not-callable
+def calculate_grades_csv_shard(entry_id, xmodule_instance_args, user_id_range, subtask_status_dict):
+    """
+    Grade the enrollees of a course in the given range of user ids, as one
+    of the subtasks of a sharded grade report.
+    """
+    # Translators: This is a past-tense verb that is inserted into task progress messages as {action}.
+    action_name = ugettext_noop('graded')
+    subtask_status = SubtaskStatus.from_dict(subtask_status_dict)
+    TASK_LOG.info(
+        u"Task: %s, InstructorTask ID: %s, Task type: %s, Preparing for subtask execution for users %s",
+        subtask_status.task_id, entry_id, action_name, user_id_range
+    )
+
+    # Reject the subtask if it's unknown to the InstructorTask or has
+    # already been run, e.g. if it was requeued by Celery.
+    check_subtask_is_valid(entry_id, subtask_status.task_id, subtask_status)
+
+    subtask_status = CourseGradeReport.generate_shard(
+        xmodule_instance_args, entry_id, user_id_range, subtask_status, action_name,
+    )
+    return subtask_status.to_dict()
+
+
 @task(base=BaseInstructorTask, routing_key=settings.GRADES_DOWNLOAD_ROUTING_KEY)  # pylint: disable=not-callable
 def calculate_problem_grade_report(entry_id, xmodule_instance_args):
     """
@@ -1,23 +1,29 @@
 """
 Functionality for generating grade reports.
 """
+import json
 import logging
 import re
+import traceback
 from collections import OrderedDict
 from datetime import datetime
-from itertools import chain, izip, izip_longest
+from itertools import chain
 from time import time
 
+from celery.states import FAILURE, SUCCESS
+from django.conf import settings
 from lazy import lazy
 from pytz import UTC
 
 from certificates.models import CertificateWhitelist, GeneratedCertificate, certificate_info_for_user
 from courseware.courses import get_course_by_id
 from instructor_analytics.basic import list_problem_responses
-from instructor_analytics.csvs import format_dictlist
 from lms.djangoapps.grades.context import grading_context, grading_context_for_course
 from lms.djangoapps.grades.models import PersistentCourseGrade
 from lms.djangoapps.grades.course_grade_factory import CourseGradeFactory
+from lms.djangoapps.instructor_task.exceptions import GradeReportShardsError
+from lms.djangoapps.instructor_task.models import InstructorTask, ReportStore
+from lms.djangoapps.instructor_task.subtasks import queue_subtasks_for_query, update_subtask_status
 from lms.djangoapps.teams.models import CourseTeamMembership
 from lms.djangoapps.verify_student.models import SoftwareSecurePhotoVerification
 from openedx.core.djangoapps.content.block_structure.api import get_course_in_cache
@@ -54,6 +60,25 @@ def _flatten(iterable):
     return list(chain.from_iterable(iterable))
 
 
+def _batched_users(users, batch_size):
+    """
+    Returns a generator of lists of the given users, in order of id, with
+    up to batch_size users in each list.  Each batch is fetched from the
+    database separately, so that only one batch of users is held in memory
+    at a time.
+    """
+    users = users.order_by('id')
+    last_user_id = None
+    while True:
+        batch_users = users if last_user_id is None else users.filter(id__gt=last_user_id)
+        batch = list(batch_users[:batch_size])
+        if batch:
+            yield batch
+        if len(batch) < batch_size:
+            return
+        last_user_id = batch[-1].id
+
+
 class _CourseGradeReportContext(object):
     """
     Internal class that provides a common context to use for a single grade
@@ -61,7 +86,9 @@ class _CourseGradeReportContext(object):
     elements of this context are serialized and parsed across process
     boundaries.
     """
-    def __init__(self, _xmodule_instance_args, _entry_id, course_id, _task_input, action_name):
+    def __init__(
+            self, _xmodule_instance_args, _entry_id, course_id, _task_input, action_name, user_id_range=None,
+    ):
         self.task_info_string = (
             u'Task: {task_id}, '
             u'InstructorTask ID: {entry_id}, '
@@ -75,6 +102,9 @@ class _CourseGradeReportContext(object):
         )
         self.action_name = action_name
         self.course_id = course_id
+        # The (first, last) ids of the users to include in the report
+        # when it's sharded, or None to include all enrollees.
+        self.user_id_range = user_id_range
         self.task_progress = TaskProgress(self.action_name, total=None, start_time=time())
 
     @lazy
@@ -192,15 +222,82 @@ class CourseGradeReport(object):
     # Batch size for chunking the list of enrollees in the course.
     USER_BATCH_SIZE = 100
 
+    # Directory of the report store in which the partial reports of the
+    # shards of a grade report are kept until they're merged.
+    SHARDS_DIRECTORY = u'grade_report_shards/{task_id}'
+
     @classmethod
     def generate(cls, _xmodule_instance_args, _entry_id, course_id, _task_input, action_name):
         """
-        Public method to generate a grade report.
+        Public method to generate a grade report.  If the
+        GRADE_REPORT_NUM_SHARDS setting is greater than 1, subtasks that
+        generate the report for ranges of user ids are queued instead.
         """
         with modulestore().bulk_operations(course_id):
             context = _CourseGradeReportContext(_xmodule_instance_args, _entry_id, course_id, _task_input, action_name)
+            num_shards = getattr(settings, 'GRADE_REPORT_NUM_SHARDS', 1)
+            if num_shards > 1:
+                progress = CourseGradeReport()._queue_shards(context, _xmodule_instance_args, _entry_id, num_shards)
+                if progress is not None:
+                    return progress
             return CourseGradeReport()._generate(context)
 
+    @classmethod
+    def generate_shard(cls, _xmodule_instance_args, _entry_id, user_id_range, subtask_status, action_name):
+        """
+        Public method to generate the partial grade report of the enrollees
+        in the given range of user ids, as a subtask of a sharded grade
+        report.  The last shard to complete merges the partial reports of
+        all shards into the grade report.  Returns the updated subtask
+        status.
+        """
+        entry = InstructorTask.objects.get(pk=_entry_id)
+        course_id = entry.course_id
+        task_input = json.loads(entry.task_input)
+        with modulestore().bulk_operations(course_id):
+            context = _CourseGradeReportContext(
+                _xmodule_instance_args, _entry_id, course_id, task_input, action_name, user_id_range=user_id_range,
+            )
+            return CourseGradeReport()._generate_shard(context, _entry_id, entry.task_id, subtask_status)
+
+    def _queue_shards(self, context, xmodule_instance_args, entry_id, num_shards):
+        """
+        Queues a subtask for each of num_shards ranges of user ids of the
+        enrollees, and returns the task progress.  Returns None if there
+        are no enrollees to shard.
+        """
+        # Imported here to avoid a circular import, since the subtask is
+        # defined along with the other instructor tasks.
+        from lms.djangoapps.instructor_task.tasks import calculate_grades_csv_shard
+
+        users = CourseEnrollment.objects.users_enrolled_in(context.course_id, include_inactive=True).order_by('id')
+        total_num_users = users.count()
+        if total_num_users == 0:
+            return None
+
+        def create_shard_subtask(user_list, initial_subtask_status):
+            """
+            Creates a subtask for the range of ids of the given users,
+            which are in order of id.
+            """
+            user_id_range = (user_list[0]['pk'], user_list[-1]['pk'])
+            return calculate_grades_csv_shard.subtask(
+                (entry_id, xmodule_instance_args, user_id_range, initial_subtask_status.to_dict()),
+                task_id=initial_subtask_status.task_id,
+                routing_key=settings.GRADES_DOWNLOAD_ROUTING_KEY,
+            )
+
+        context.update_status(u'Queuing grade report shards')
+        return queue_subtasks_for_query(
+            InstructorTask.objects.get(pk=entry_id),
+            context.action_name,
+            create_shard_subtask,
+            [users],
+            [],
+            -(-total_num_users // num_shards),
+            total_num_users,
+        )
+
     def _generate(self, context):
         """
         Internal method for generating a grade report for the given context.
@@ -210,14 +307,117 @@ class CourseGradeReport(object):
         error_headers = self._error_headers()
         batched_rows = self._batched_rows(context)
 
-        context.update_status(u'Compiling grades')
-        success_rows, error_rows = self._compile(context, batched_rows)
-
-        context.update_status(u'Uploading grades')
+        context.update_status(u'Compiling and uploading grades')
+        error_rows = []
+        success_rows = self._compile(context, batched_rows, error_rows)
         self._upload(context, success_headers, success_rows, error_headers, error_rows)
 
+        context.task_progress.total = context.task_progress.attempted
         return context.update_status(u'Completed grades')
 
+    def _generate_shard(self, context, entry_id, task_id, subtask_status):
+        """
+        Internal method for generating the partial reports of a shard of a
+        grade report for the given context, and merging the partial reports
+        of all shards if it's the last one to complete.
+        """
+        context.update_status(u'Compiling and uploading grades of shard')
+        shards_directory = self.SHARDS_DIRECTORY.format(task_id=task_id)
+        shard_filename = u'{}/{:012d}'.format(shards_directory, context.user_id_range[0])
+        report_store = ReportStore.from_config(config_name='GRADES_DOWNLOAD')
+
+        shard_exception = None
+        error_rows = []
+        try:
+            success_rows = self._compile(context, self._batched_rows(context), error_rows)
+            report_store.store_rows(context.course_id, shard_filename + u'.csv', success_rows)
+            if error_rows:
+                report_store.store_rows(context.course_id, shard_filename + u'_err.csv', error_rows)
+        except Exception as exc:  # pylint: disable=broad-except
+            TASK_LOG.exception(u'%s, Task type: %s, Failed to grade shard', context.task_info_string, context.action_name)
+            shard_exception = exc
+
+        subtask_status.increment(
+            succeeded=context.task_progress.succeeded,
+            failed=context.task_progress.failed,
+            state=SUCCESS if shard_exception is None else FAILURE,
+        )
+        if update_subtask_status(entry_id, subtask_status.task_id, subtask_status, complete_parent=False):
+            self._complete_shards(context, entry_id, shards_directory)
+
+        if shard_exception is not None:
+            raise shard_exception  # pylint: disable=raising-bad-type
+        return subtask_status
+
+    def _complete_shards(self, context, entry_id, shards_directory):
+        """
+        Merges the partial reports of all shards, once the last of them has
+        completed, and then sets the final state of the InstructorTask:
+        SUCCESS if the grade report was uploaded, and FAILURE otherwise.
+        """
+        subtask_dict = json.loads(InstructorTask.objects.get(pk=entry_id).subtasks)
+        try:
+            self._merge_shards(context, shards_directory, subtask_dict)
+        except Exception as exc:  # pylint: disable=broad-except
+            TASK_LOG.exception(u'%s, Task type: %s, Failed to merge shards', context.task_info_string, context.action_name)
+            entry = InstructorTask.objects.get(pk=entry_id)
+            entry.task_state = FAILURE
+            entry.task_output = InstructorTask.create_output_for_failure(exc, traceback.format_exc())
+        else:
+            entry = InstructorTask.objects.get(pk=entry_id)
+            entry.task_state = SUCCESS
+        entry.save_now()
+
+    def _merge_shards(self, context, shards_directory, subtask_dict):
+        """
+        Uploads the grade report merged from the partial reports in the
+        given shards_directory, in order of user id, and deletes the
+        partial reports.  Raises GradeReportShardsError without uploading
+        the report if any shard failed or its partial report is missing.
+        """
+        context.update_status(u'Merging grades of shards')
+        report_store = ReportStore.from_config(config_name='GRADES_DOWNLOAD')
+        filenames = [
+            u'{}/{}'.format(shards_directory, filename)
+            for filename in report_store.filenames_in(context.course_id, shards_directory)
+        ]
+        success_filenames = [filename for filename in filenames if not filename.endswith(u'_err.csv')]
+        error_filenames = [filename for filename in filenames if filename.endswith(u'_err.csv')]
+
+        try:
+            if subtask_dict['failed'] > 0 or len(success_filenames) != subtask_dict['total']:
+                raise GradeReportShardsError(
+                    u'{} of {} shards failed and {} partial reports were found'.format(
+                        subtask_dict['failed'], subtask_dict['total'], len(success_filenames),
+                    )
+                )
+            self._upload_merged_shards(context, report_store, success_filenames, error_filenames)
+        finally:
+            for filename in filenames:
+                report_store.delete(context.course_id, filename)
+
+    def _upload_merged_shards(self, context, report_store, success_filenames, error_filenames):
+        """
+        Uploads the grade report merged from the partial reports with the
+        given filenames.
+        """
+        def merged_rows(filenames):
+            """
+            A generator of the rows of the partial reports with the given
+            filenames.
+            """
+            for filename in filenames:
+                for row in report_store.rows_for(context.course_id, filename):
+                    yield row
+
+        self._upload(
+            context,
+            self._success_headers(context),
+            merged_rows(success_filenames),
+            self._error_headers(),
+            list(merged_rows(error_filenames)),
+        )
+
     def _success_headers(self, context):
         """
         Returns a list of all applicable column headers for this grade report.
@@ -244,32 +444,33 @@ class CourseGradeReport(object):
         A generator of batches of (success_rows, error_rows) for this report.
         """
         for users in self._batch_users(context):
-            users = filter(lambda u: u is not None, users)
             yield self._rows_for_users(context, users)
 
-    def _compile(self, context, batched_rows):
+    def _compile(self, context, batched_rows, error_rows):
         """
-        Compiles and returns the complete list of (success_rows, error_rows) for
-        the given batched_rows and context.
+        A generator of the success rows for the given batched_rows and
+        context, which updates the task progress after each batch.  Error
+        rows, which are expected to be few, are appended to the given
+        error_rows list.
         """
-        # partition and chain successes and errors
-        success_rows, error_rows = izip(*batched_rows)
-        success_rows = list(chain(*success_rows))
-        error_rows = list(chain(*error_rows))
+        for batch_success_rows, batch_error_rows in batched_rows:
+            for row in batch_success_rows:
+                yield row
+            error_rows.extend(batch_error_rows)
 
-        # update metrics on task status
-        context.task_progress.succeeded = len(success_rows)
-        context.task_progress.failed = len(error_rows)
-        context.task_progress.attempted = context.task_progress.succeeded + context.task_progress.failed
-        context.task_progress.total = context.task_progress.attempted
-        return success_rows, error_rows
+            # update metrics on task status
+            context.task_progress.succeeded += len(batch_success_rows)
+            context.task_progress.failed += len(batch_error_rows)
+            context.task_progress.attempted = context.task_progress.succeeded + context.task_progress.failed
+            context.task_progress.update_task_state(extra_meta={'step': u'Compiling and uploading grades'})
 
     def _upload(self, context, success_headers, success_rows, error_headers, error_rows):
         """
-        Creates and uploads a CSV for the given headers and rows.
+        Creates and uploads a CSV for the given headers and rows.  The error
+        rows are uploaded once all success rows have been generated.
         """
         date = datetime.now(UTC)
-        upload_csv_to_report_store([success_headers] + success_rows, 'grade_report', context.course_id, date)
+        upload_csv_to_report_store(chain([success_headers], success_rows), 'grade_report', context.course_id, date)
         if len(error_rows) > 0:
             error_rows = [error_headers] + error_rows
             upload_csv_to_report_store(error_rows, 'grade_report_err', context.course_id, date)
@@ -290,13 +491,11 @@ class CourseGradeReport(object):
         """
         Returns a generator of batches of users.
         """
-        def grouper(iterable, chunk_size=self.USER_BATCH_SIZE, fillvalue=None):
-            args = [iter(iterable)] * chunk_size
-            return izip_longest(*args, fillvalue=fillvalue)
-
         users = CourseEnrollment.objects.users_enrolled_in(context.course_id, include_inactive=True)
         users = users.select_related('profile__allow_certificate')
-        return grouper(users)
+        if context.user_id_range is not None:
+            users = users.filter(id__range=context.user_id_range)
+        return _batched_users(users, self.USER_BATCH_SIZE)
 
     def _user_grades(self, course_grade, context):
         """
@@ -451,6 +650,9 @@ class CourseGradeReport(object):
 
 
 class ProblemGradeReport(object):
+    # Batch size for chunking the list of enrollees in the course.
+    USER_BATCH_SIZE = 100
+
     @classmethod
     def generate(cls, _xmodule_instance_args, _entry_id, course_id, _task_input, action_name):
         """
@@ -459,7 +661,6 @@ class ProblemGradeReport(object):
         """
         start_time = time()
         start_date = datetime.now(UTC)
-        status_interval = 100
         enrolled_students = CourseEnrollment.objects.users_enrolled_in(course_id, include_inactive=True)
         task_progress = TaskProgress(action_name, enrolled_students.count(), start_time)
 
@@ -472,56 +673,82 @@ class ProblemGradeReport(object):
         graded_scorable_blocks = cls._graded_scorable_blocks_to_header(course)
 
         # Just generate the static fields for now.
-        rows = [list(header_row.values()) + ['Enrollment Status', 'Grade'] + _flatten(graded_scorable_blocks.values())]
+        header = list(header_row.values()) + ['Enrollment Status', 'Grade'] + _flatten(graded_scorable_blocks.values())
         error_rows = [list(header_row.values()) + ['error_msg']]
-        current_step = {'step': 'Calculating Grades'}
-
-        # Bulk fetch and cache enrollment states so we can efficiently determine
-        # whether each user is currently enrolled in the course.
-        CourseEnrollment.bulk_fetch_enrollment_states(enrolled_students, course_id)
-
-        for student, course_grade, error in CourseGradeFactory().iter(enrolled_students, course):
-            student_fields = [getattr(student, field_name) for field_name in header_row]
-            task_progress.attempted += 1
-
-            if not course_grade:
-                err_msg = error.message
-                # There was an error grading this student.
-                if not err_msg:
-                    err_msg = u'Unknown error'
-                error_rows.append(student_fields + [err_msg])
-                task_progress.failed += 1
-                continue
-
-            enrollment_status = _user_enrollment_status(student, course_id)
-
-            earned_possible_values = []
-            for block_location in graded_scorable_blocks:
-                try:
-                    problem_score = course_grade.problem_scores[block_location]
-                except KeyError:
-                    earned_possible_values.append([u'Not Available', u'Not Available'])
-                else:
-                    if problem_score.first_attempted:
-                        earned_possible_values.append([problem_score.earned, problem_score.possible])
-                    else:
-                        earned_possible_values.append([u'Not Attempted', problem_score.possible])
-
-            rows.append(student_fields + [enrollment_status, course_grade.percent] + _flatten(earned_possible_values))
 
-            task_progress.succeeded += 1
-            if task_progress.attempted % status_interval == 0:
-                task_progress.update_task_state(extra_meta=current_step)
+        # The rows are generated as they're uploaded, so only the first one
+        # is generated in advance to find out whether any students have been
+        # successfully graded.
+        rows = cls._rows_for_students(
+            course, enrolled_students, header_row, graded_scorable_blocks, task_progress, error_rows,
+        )
+        first_row = next(rows, None)
 
         # Perform the upload if any students have been successfully graded
-        if len(rows) > 1:
-            upload_csv_to_report_store(rows, 'problem_grade_report', course_id, start_date)
+        if first_row is not None:
+            upload_csv_to_report_store(chain([header, first_row], rows), 'problem_grade_report', course_id, start_date)
         # If there are any error rows, write them out as well
         if len(error_rows) > 1:
             upload_csv_to_report_store(error_rows, 'problem_grade_report_err', course_id, start_date)
 
         return task_progress.update_task_state(extra_meta={'step': 'Uploading CSV'})
 
+    @classmethod
+    def _rows_for_students(cls, course, students, header_row, graded_scorable_blocks, task_progress, error_rows):
+        """
+        A generator of the rows of the successfully graded students, which
+        grades the students one batch at a time and updates the given
+        task_progress.  Rows for students who couldn't be graded are
+        appended to the given error_rows list.
+        """
+        status_interval = 100
+        current_step = {'step': 'Calculating Grades'}
+
+        # Use the same version of the course for all batches of students.
+        course_structure = get_course_in_cache(course.id)
+
+        for batch_students in _batched_users(students, cls.USER_BATCH_SIZE):
+            # Bulk fetch and cache enrollment states so we can efficiently determine
+            # whether each user is currently enrolled in the course.
+            CourseEnrollment.bulk_fetch_enrollment_states(batch_students, course.id)
+
+            for student, course_grade, error in CourseGradeFactory().iter(
+                batch_students,
+                course=course,
+                collected_block_structure=course_structure,
+            ):
+                student_fields = [getattr(student, field_name) for field_name in header_row]
+                task_progress.attempted += 1
+
+                if not course_grade:
+                    err_msg = error.message
+                    # There was an error grading this student.
+                    if not err_msg:
+                        err_msg = u'Unknown error'
+                    error_rows.append(student_fields + [err_msg])
+                    task_progress.failed += 1
+                    continue
+
+                enrollment_status = _user_enrollment_status(student, course.id)
+
+                earned_possible_values = []
+                for block_location in graded_scorable_blocks:
+                    try:
+                        problem_score = course_grade.problem_scores[block_location]
+                    except KeyError:
+                        earned_possible_values.append([u'Not Available', u'Not Available'])
+                    else:
+                        if problem_score.first_attempted:
+                            earned_possible_values.append([problem_score.earned, problem_score.possible])
+                        else:
+                            earned_possible_values.append([u'Not Attempted', problem_score.possible])
+
+                yield student_fields + [enrollment_status, course_grade.percent] + _flatten(earned_possible_values)
+
+                task_progress.succeeded += 1
+                if task_progress.attempted % status_interval == 0:
+                    task_progress.update_task_state(extra_meta=current_step)
+
     @classmethod
     def _graded_scorable_blocks_to_header(cls, course):
         """
@@ -561,23 +788,32 @@ class ProblemResponses(object):
         current_step = {'step': 'Calculating students answers to problem'}
         task_progress.update_task_state(extra_meta=current_step)
 
-        # Compute result table and format it
+        # Compute result table and format it as it's uploaded
         problem_location = task_input.get('problem_location')
         student_data = list_problem_responses(course_id, problem_location)
         features = ['username', 'state']
-        header, rows = format_dictlist(student_data, features)
-
-        task_progress.attempted = task_progress.succeeded = len(rows)
-        task_progress.skipped = task_progress.total - task_progress.attempted
-
-        rows.insert(0, header)
-
-        current_step = {'step': 'Uploading CSV'}
-        task_progress.update_task_state(extra_meta=current_step)
+        header = features
+        rows = cls._rows(task_progress, features, student_data)
 
-        # Perform the upload
+        # Perform the upload; the rows are generated as they're written
         problem_location = re.sub(r'[:/]', '_', problem_location)
         csv_name = 'student_state_from_{}'.format(problem_location)
-        upload_csv_to_report_store(rows, csv_name, course_id, start_date)
+        upload_csv_to_report_store(chain([header], rows), csv_name, course_id, start_date)
 
+        # The number of responses is only known once they've all been
+        # uploaded.
+        task_progress.skipped = task_progress.total - task_progress.attempted
+
+        current_step = {'step': 'Uploading CSV'}
         return task_progress.update_task_state(extra_meta=current_step)
+
+    @staticmethod
+    def _rows(task_progress, features, student_data):
+        """
+        A generator of the CSV rows for the given student_data, which counts
+        each row in task_progress as it's generated.
+        """
+        for response in student_data:
+            task_progress.attempted += 1
+            task_progress.succeeded += 1
+            yield [response[feature] for feature in features]
@@ -24,6 +24,8 @@ def upload_csv_to_report_store(rows, csv_name, course_id, timestamp, config_name
                 [row1_colum1, row1_colum2, ...],
                 ...
             ]
+            The rows can be generated by a generator, in which case they're
+            uploaded as they're generated.
         csv_name: Name of the resulting CSV
         course_id: ID of the course
     """
@@ -2,17 +2,19 @@
 Tests for instructor_task/models.py.
 """
 import copy
+import csv
 import time
 from cStringIO import StringIO
 
 import boto
+import ddt
 from django.conf import settings
 from django.test import SimpleTestCase, TestCase, override_settings
 from mock import patch
 from opaque_keys.edx.locator import CourseLocator
 
 from common.test.utils import MockS3Mixin
-from lms.djangoapps.instructor_task.models import ReportStore
+from lms.djangoapps.instructor_task.models import REPORT_MAX_MEMORY_SIZE, ReportStore
 from lms.djangoapps.instructor_task.tests.test_base import TestReportMixin
 
 
@@ -49,7 +51,25 @@ class ReportStoreTestMixin(object):
             ['new_file', 'middle_file', 'old_file']
         )
 
+    @ddt.data(REPORT_MAX_MEMORY_SIZE, 1)
+    def test_store_rows_from_generator(self, max_memory_size):
+        """
+        Test that ReportStore.store_rows() stores rows generated by a
+        generator, whether or not they're spooled to a temporary file.
+        """
+        report_store = self.create_report_store()
+        rows = ([u'row {}'.format(index), u'\u00e9'] for index in range(100))
+        with patch('lms.djangoapps.instructor_task.models.REPORT_MAX_MEMORY_SIZE', max_memory_size):
+            report_store.store_rows(self.course_id, 'report.csv', rows)
+
+        stored_file = report_store.storage.open(report_store.path_to(self.course_id, 'report.csv'))
+        self.assertEqual(
+            list(csv.reader(StringIO(stored_file.read()))),
+            [['row {}'.format(index), u'\u00e9'.encode('utf-8')] for index in range(100)]
+        )
+
 
+@ddt.ddt
 class LocalFSReportStoreTestCase(ReportStoreTestMixin, TestReportMixin, SimpleTestCase):
     """
     Test the old LocalFSReportStore configuration.
@@ -62,6 +82,7 @@ class LocalFSReportStoreTestCase(ReportStoreTestMixin, TestReportMixin, SimpleTe
         return ReportStore.from_config(config_name='GRADES_DOWNLOAD')
 
 
+@ddt.ddt
 @patch.dict(settings.GRADES_DOWNLOAD, {'STORAGE_TYPE': 's3'})
 class S3ReportStoreTestCase(MockS3Mixin, ReportStoreTestMixin, TestReportMixin, SimpleTestCase):
     """
@@ -77,6 +98,7 @@ class S3ReportStoreTestCase(MockS3Mixin, ReportStoreTestMixin, TestReportMixin,
         return ReportStore.from_config(config_name='GRADES_DOWNLOAD')
 
 
+@ddt.ddt
 class DjangoStorageReportStoreLocalTestCase(ReportStoreTestMixin, TestReportMixin, SimpleTestCase):
     """
     Test the DjangoStorageReportStore implementation using the local
@@ -93,6 +115,7 @@ class DjangoStorageReportStoreLocalTestCase(ReportStoreTestMixin, TestReportMixi
             return ReportStore.from_config(config_name='GRADES_DOWNLOAD')
 
 
+@ddt.ddt
 class DjangoStorageReportStoreS3TestCase(MockS3Mixin, ReportStoreTestMixin, TestReportMixin, SimpleTestCase):
     """
     Test the DjangoStorageReportStore implementation using S3 stubs.
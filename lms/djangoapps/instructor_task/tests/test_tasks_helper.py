@@ -8,14 +8,17 @@ Unit tests for LMS instructor-initiated background tasks helper functions.
 
 """
 
+import json
 import os
 import shutil
 import tempfile
 import urllib
 from datetime import datetime
+from uuid import uuid4
 
 import ddt
 import unicodecsv
+from celery.states import FAILURE, SUCCESS
 from django.conf import settings
 from django.core.urlresolvers import reverse
 from django.test.utils import override_settings
@@ -53,6 +56,7 @@ from lms.djangoapps.instructor_task.tasks_helper.misc import (
     upload_course_survey_report,
     upload_ora2_data
 )
+from lms.djangoapps.instructor_task.tests.factories import InstructorTaskFactory
 from lms.djangoapps.instructor_task.tests.test_base import (
     InstructorTaskCourseTestCase,
     InstructorTaskModuleTestCase,
@@ -423,6 +427,91 @@ class TestInstructorGradeReport(InstructorGradeReportTestCase):
             {'attempted': expected_students, 'succeeded': expected_students, 'failed': 0}, result
         )
 
+    @ddt.data(1, 2, 3)
+    @patch('lms.djangoapps.instructor_task.tasks_helper.runner._get_current_task')
+    def test_batched_users(self, batch_size, _mock_current_task):
+        """
+        Test that all students are included in the report, however they're
+        batched.
+        """
+        students = [self.create_student('student{}'.format(index)) for index in range(3)]
+        with patch.object(CourseGradeReport, 'USER_BATCH_SIZE', batch_size):
+            result = CourseGradeReport.generate(None, None, self.course.id, None, 'graded')
+
+        self.assertDictContainsSubset({'total': 3, 'attempted': 3, 'succeeded': 3, 'failed': 0}, result)
+        self.verify_rows_in_csv(
+            [
+                {u'Student ID': unicode(student.id), u'Username': student.username}
+                for student in students
+            ],
+            verify_order=True,
+            ignore_other_columns=True,
+        )
+
+    @ddt.data(2, 3, 5)
+    @patch('lms.djangoapps.instructor_task.tasks_helper.runner._get_current_task')
+    def test_sharded_report(self, num_shards, _mock_current_task):
+        """
+        Test that the grade report merged from the shards of a sharded
+        report includes all students in order.
+        """
+        students = [self.create_student('student{}'.format(index)) for index in range(3)]
+        entry = InstructorTaskFactory.create(course_id=self.course.id, task_id=str(uuid4()), task_type='grade_course')
+        with override_settings(GRADE_REPORT_NUM_SHARDS=num_shards):
+            CourseGradeReport.generate(None, entry.id, self.course.id, None, 'graded')
+
+        entry.refresh_from_db()
+        self.assertEqual(entry.task_state, SUCCESS)
+        self.assertDictContainsSubset(
+            {'total': 3, 'attempted': 3, 'succeeded': 3, 'failed': 0}, json.loads(entry.task_output)
+        )
+        self.verify_rows_in_csv(
+            [
+                {u'Student ID': unicode(student.id), u'Username': student.username}
+                for student in students
+            ],
+            verify_order=True,
+            ignore_other_columns=True,
+        )
+        report_store = ReportStore.from_config(config_name='GRADES_DOWNLOAD')
+        shards_directory = CourseGradeReport.SHARDS_DIRECTORY.format(task_id=entry.task_id)
+        self.assertEqual(report_store.filenames_in(self.course.id, shards_directory), [])
+
+    @patch('lms.djangoapps.instructor_task.tasks_helper.runner._get_current_task')
+    def test_sharded_report_with_failed_shard(self, _mock_current_task):
+        """
+        Test that a sharded report fails without uploading a grade report
+        if one of its shards fails, so that its partial report is missing.
+        """
+        for index in range(3):
+            self.create_student('student{}'.format(index))
+        entry = InstructorTaskFactory.create(course_id=self.course.id, task_id=str(uuid4()), task_type='grade_course')
+
+        original_compile = CourseGradeReport._compile  # pylint: disable=protected-access
+        compiled_user_id_ranges = []
+
+        def compile_unless_first_shard(report, context, batched_rows, error_rows):
+            """
+            Fails to compile the rows of the first shard.
+            """
+            compiled_user_id_ranges.append(context.user_id_range)
+            if len(compiled_user_id_ranges) == 1:
+                raise ValueError('Failed to compile shard')
+            return original_compile(report, context, batched_rows, error_rows)
+
+        with patch.object(CourseGradeReport, '_compile', compile_unless_first_shard):
+            with override_settings(GRADE_REPORT_NUM_SHARDS=3):
+                CourseGradeReport.generate(None, entry.id, self.course.id, None, 'graded')
+
+        entry.refresh_from_db()
+        self.assertEqual(len(compiled_user_id_ranges), 3)
+        self.assertEqual(entry.task_state, FAILURE)
+        self.assertEqual(json.loads(entry.task_output)['exception'], 'GradeReportShardsError')
+        report_store = ReportStore.from_config(config_name='GRADES_DOWNLOAD')
+        self.assertEqual(report_store.links_for(self.course.id), [])
+        shards_directory = CourseGradeReport.SHARDS_DIRECTORY.format(task_id=entry.task_id)
+        self.assertEqual(report_store.filenames_in(self.course.id, shards_directory), [])
+
 
 class TestTeamGradeReport(InstructorGradeReportTestCase):
     """ Test that teams appear correctly in the grade report when it is enabled for the course. """
@@ -474,11 +563,13 @@ class TestProblemResponsesReport(TestReportMixin, InstructorTaskCourseTestCase):
         task_input = {'problem_location': ''}
         with patch('lms.djangoapps.instructor_task.tasks_helper.runner._get_current_task'):
             with patch('lms.djangoapps.instructor_task.tasks_helper.grades.list_problem_responses') as patched_data_source:
-                patched_data_source.return_value = [
-                    {'username': 'user0', 'state': u'state0'},
-                    {'username': 'user1', 'state': u'state1'},
-                    {'username': 'user2', 'state': u'state2'},
-                ]
+                patched_data_source.return_value = (
+                    response for response in [
+                        {'username': 'user0', 'state': u'state0'},
+                        {'username': 'user1', 'state': u'state1'},
+                        {'username': 'user2', 'state': u'state2'},
+                    ]
+                )
                 result = ProblemResponses.generate(None, None, self.course.id, task_input, 'calculated')
         report_store = ReportStore.from_config(config_name='GRADES_DOWNLOAD')
         links = report_store.links_for(self.course.id)
@@ -360,6 +360,11 @@ VIRTUAL_UNIVERSITIES = ENV_TOKENS.get('VIRTUAL_UNIVERSITIES', [])
 META_UNIVERSITIES = ENV_TOKENS.get('META_UNIVERSITIES', {})
 COMMENTS_SERVICE_URL = ENV_TOKENS.get("COMMENTS_SERVICE_URL", '')
 COMMENTS_SERVICE_KEY = ENV_TOKENS.get("COMMENTS_SERVICE_KEY", '')
+COMMENTS_SERVICE_POOL_CONNECTIONS = ENV_TOKENS.get("COMMENTS_SERVICE_POOL_CONNECTIONS", COMMENTS_SERVICE_POOL_CONNECTIONS)
+COMMENTS_SERVICE_POOL_MAXSIZE = ENV_TOKENS.get("COMMENTS_SERVICE_POOL_MAXSIZE", COMMENTS_SERVICE_POOL_MAXSIZE)
+COMMENTS_SERVICE_MAX_CONCURRENT_REQUESTS = ENV_TOKENS.get(
+    "COMMENTS_SERVICE_MAX_CONCURRENT_REQUESTS", COMMENTS_SERVICE_MAX_CONCURRENT_REQUESTS
+)
 CERT_QUEUE = ENV_TOKENS.get("CERT_QUEUE", 'test-pull')
 
 HELPDESK = ENV_TOKENS.get("HELPDESK", '')
@@ -578,6 +583,7 @@ MODULESTORE = convert_module_store_setting_if_needed(AUTH_TOKENS.get('MODULESTOR
 CONTENTSTORE = AUTH_TOKENS.get('CONTENTSTORE', CONTENTSTORE)
 DOC_STORE_CONFIG = AUTH_TOKENS.get('DOC_STORE_CONFIG', DOC_STORE_CONFIG)
 MONGODB_LOG = AUTH_TOKENS.get('MONGODB_LOG', {})
+PREFETCH_COURSE_STRUCTURES = ENV_TOKENS.get('PREFETCH_COURSE_STRUCTURES', PREFETCH_COURSE_STRUCTURES)
 
 EMAIL_HOST_USER = AUTH_TOKENS.get('EMAIL_HOST_USER', '')  # django default is ''
 EMAIL_HOST_PASSWORD = AUTH_TOKENS.get('EMAIL_HOST_PASSWORD', '')  # django default is ''
@@ -650,6 +656,7 @@ DISABLE_ACCOUNT_ACTIVATION_REQUIREMENT_SWITCH = ENV_TOKENS.get(
 
 # Grades download
 GRADES_DOWNLOAD_ROUTING_KEY = ENV_TOKENS.get('GRADES_DOWNLOAD_ROUTING_KEY', HIGH_MEM_QUEUE)
+GRADE_REPORT_NUM_SHARDS = ENV_TOKENS.get('GRADE_REPORT_NUM_SHARDS', GRADE_REPORT_NUM_SHARDS)
 
 GRADES_DOWNLOAD = ENV_TOKENS.get("GRADES_DOWNLOAD", GRADES_DOWNLOAD)
 
@@ -839,6 +846,11 @@ COURSE_CATALOG_API_URL = ENV_TOKENS.get('COURSE_CATALOG_API_URL', COURSE_CATALOG
 CREDENTIALS_INTERNAL_SERVICE_URL = ENV_TOKENS.get('CREDENTIALS_INTERNAL_SERVICE_URL', CREDENTIALS_INTERNAL_SERVICE_URL)
 CREDENTIALS_PUBLIC_SERVICE_URL = ENV_TOKENS.get('CREDENTIALS_PUBLIC_SERVICE_URL', CREDENTIALS_PUBLIC_SERVICE_URL)
 
+EDX_API_POOL_CONNECTIONS = ENV_TOKENS.get('EDX_API_POOL_CONNECTIONS', EDX_API_POOL_CONNECTIONS)
+EDX_API_POOL_MAXSIZE = ENV_TOKENS.get('EDX_API_POOL_MAXSIZE', EDX_API_POOL_MAXSIZE)
+EDX_API_PAGINATION_WORKERS = ENV_TOKENS.get('EDX_API_PAGINATION_WORKERS', EDX_API_PAGINATION_WORKERS)
+EDX_API_STALE_CACHE_TTL = ENV_TOKENS.get('EDX_API_STALE_CACHE_TTL', EDX_API_STALE_CACHE_TTL)
+
 ECOMMERCE_SERVICE_WORKER_USERNAME = ENV_TOKENS.get(
     'ECOMMERCE_SERVICE_WORKER_USERNAME',
     ECOMMERCE_SERVICE_WORKER_USERNAME
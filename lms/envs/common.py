@@ -59,6 +59,12 @@ DISCUSSION_SETTINGS = {
     'MAX_COMMENT_DEPTH': 2,
 }
 
+# Connection pooling and concurrency of the requests made by the
+# comment_client to the comments service.
+COMMENTS_SERVICE_POOL_CONNECTIONS = 10
+COMMENTS_SERVICE_POOL_MAXSIZE = 10
+COMMENTS_SERVICE_MAX_CONCURRENT_REQUESTS = 4
+
 LMS_ROOT_URL = "http://localhost:8000"
 LMS_ENROLLMENT_API_PATH = "/api/enrollment/v1/"
 
@@ -375,6 +381,14 @@ FEATURES = {
     # making multiple queries.
     'ENABLE_READING_FROM_MULTIPLE_HISTORY_TABLES': True,
 
+    # Buffer the XBlock user state saved while an XBlock handler runs, and
+    # save it, with its history, in bulk when the handler returns.
+    'ENABLE_BUFFERED_USER_STATE_WRITES': False,
+
+    # Build the courseware table of contents from the learner's course block
+    # structure, rather than from the chapter and sequential XModules.
+    'ENABLE_BLOCK_STRUCTURE_TOC': False,
+
     # Display the 'Analytics' tab in the instructor dashboard for CCX courses.
     # Note: This has no effect unless ANALYTICS_DASHBOARD_URL is already set,
     #       because without that setting, the tab does not show up for any courses.
@@ -844,6 +858,12 @@ MODULESTORE = {
     }
 }
 
+# The ids of the courses whose published structures are loaded into the
+# course_structure_cache when the LMS starts, typically the most accessed ones.
+# Configure course_structure_cache as a cache shared by the workers of a host
+# (or of the whole cluster) so that they all benefit from it.
+PREFETCH_COURSE_STRUCTURES = []
+
 #################### Python sandbox ############################################
 
 CODE_JAIL = {
@@ -1895,12 +1915,34 @@ BLOCK_STRUCTURES_SETTINGS = dict(
     # Maximum number of retries per task.
     TASK_MAX_RETRIES=5,
 
+    # Maximum approximate memory, in bytes, used by the collected block
+    # structures held in the process cache of each worker, when the
+    # block_structure.process_cache waffle switch is enabled.
+    PROCESS_CACHE_MAX_SIZE_IN_BYTES=128 * 1024 * 1024,
+
+    # Maximum total number of blocks of the transformed block structures
+    # held in the transformed cache of each worker, when the
+    # block_structure.transformed_cache waffle switch is enabled.
+    TRANSFORMED_CACHE_MAX_BLOCKS=50 * 1000,
+
     # Backend storage
     # STORAGE_CLASS='storages.backends.s3boto.S3BotoStorage',
     # STORAGE_KWARGS=dict(bucket='nim-beryl-test'),
     # DIRECTORY_PREFIX='/modeltest/',
 )
 
+############################## Publish Pipeline ###############################
+
+# Delay, in seconds, after a course is published before the publish
+# pipeline loads it and runs its consumers, when the
+# publish_pipeline.single_load waffle switch is enabled.
+COURSE_PUBLISH_PIPELINE_DELAY = 30
+
+# Delay, in seconds, before the publish pipeline is retried for the
+# consumers that failed, and the maximum number of such retries.
+COURSE_PUBLISH_PIPELINE_RETRY_DELAY = 30
+COURSE_PUBLISH_PIPELINE_MAX_RETRIES = 5
+
 ################################ Bulk Email ###################################
 
 # Suffix used to construct 'from' email address for bulk emails.
@@ -2188,6 +2230,7 @@ INSTALLED_APPS = [
     'openedx.core.djangoapps.content.course_overviews',
     'openedx.core.djangoapps.content.course_structures.apps.CourseStructuresConfig',
     'openedx.core.djangoapps.content.block_structure.apps.BlockStructureConfig',
+    'openedx.core.djangoapps.content.publish_pipeline.apps.PublishPipelineConfig',
     'lms.djangoapps.course_blocks',
 
 
@@ -2578,6 +2621,11 @@ BADGR_TIMEOUT = 10
 # the ones that contain information other than grades.
 GRADES_DOWNLOAD_ROUTING_KEY = HIGH_MEM_QUEUE
 
+# Number of subtasks into which course grade reports are sharded by ranges
+# of user ids, so that grades are computed by several workers in parallel.
+# Reports are generated by a single task when it's 1.
+GRADE_REPORT_NUM_SHARDS = 1
+
 GRADES_DOWNLOAD = {
     'STORAGE_TYPE': 'localfs',
     'BUCKET': 'edx-grades',
@@ -3060,6 +3108,19 @@ COURSE_CATALOG_API_URL = None
 CREDENTIALS_INTERNAL_SERVICE_URL = None
 CREDENTIALS_PUBLIC_SERVICE_URL = None
 
+# Whether the API clients of the catalog and credentials services share a
+# pool of keep-alive connections to each service, per process, and the
+# maximum number of connections kept in each pool.
+EDX_API_POOL_CONNECTIONS = True
+EDX_API_POOL_MAXSIZE = 10
+# Number of threads retrieving the pages of a paginated API response
+# concurrently, when the response tells how many pages there are.
+EDX_API_PAGINATION_WORKERS = 4
+# Number of seconds for which cached API data older than the cache TTL of
+# its configuration is still served, while it is refreshed in the
+# background, when get_edx_api_data is called with stale_while_revalidate.
+EDX_API_STALE_CACHE_TTL = 24 * 60 * 60
+
 # Reverification checkpoint name pattern
 CHECKPOINT_PATTERN = r'(?P<checkpoint_name>[^/]+)'
 
@@ -62,6 +62,9 @@ FEATURES['DISABLE_START_DATES'] = True
 # the one in cms/envs/test.py
 FEATURES['ENABLE_DISCUSSION_SERVICE'] = False
 
+# Tests check the order of the requests to the comments service, so make them one at a time.
+COMMENTS_SERVICE_MAX_CONCURRENT_REQUESTS = 1
+
 FEATURES['ENABLE_SERVICE_STATUS'] = True
 
 FEATURES['ENABLE_SHOPPING_CART'] = True
@@ -575,6 +578,12 @@ FEATURES['ENABLE_DASHBOARD_SIDEBAR'] = True
 # Use MockSearchEngine as the search engine for test scenario
 SEARCH_ENGINE = "search.tests.mock_search_engine.MockSearchEngine"
 
+# httpretty mocks API responses in the order they're requested, and its fake
+# sockets must not outlive a test, so API clients neither pool their
+# connections nor retrieve pages concurrently unless a test asks for it.
+EDX_API_POOL_CONNECTIONS = False
+EDX_API_PAGINATION_WORKERS = 1
+
 FACEBOOK_APP_SECRET = "Test"
 FACEBOOK_APP_ID = "Test"
 FACEBOOK_API_VERSION = "v2.8"
@@ -1,14 +1,20 @@
 """" Common utilities for comment client wrapper """
 import logging
+import os
 from contextlib import contextmanager
+from cookielib import DefaultCookiePolicy
+from multiprocessing.pool import ThreadPool
+from threading import Lock
 from time import time
 from uuid import uuid4
 
 import requests
 from django.conf import settings
-from django.utils.translation import get_language
+from django.db import close_old_connections
+from django.utils.translation import get_language, override as override_language
 
 import dogstats_wrapper as dog_stats_api
+from request_cache.middleware import RequestCache
 
 log = logging.getLogger(__name__)
 
@@ -53,6 +59,122 @@ def request_timer(request_id, method, url, tags=None):
     )
 
 
+_session = None  # pylint: disable=invalid-name
+_thread_pool = None  # pylint: disable=invalid-name
+_pid = None  # pylint: disable=invalid-name
+_lock = Lock()  # pylint: disable=invalid-name
+
+
+def _reset_after_fork():
+    """
+    Discards the session and thread pool if they were created by another
+    process, e.g. before gunicorn forked its workers, since their
+    connections and threads can't be shared across processes.
+
+    Must be called while holding the lock.
+    """
+    global _session, _thread_pool, _pid  # pylint: disable=global-statement, invalid-name
+    if _pid != os.getpid():
+        _session = None
+        _thread_pool = None
+        _pid = os.getpid()
+
+
+def get_session():
+    """
+    Returns the requests Session of this process, which keeps its
+    connections to the comments service alive to reuse them across
+    requests.
+
+    The size of its connection pool is set by the
+    COMMENTS_SERVICE_POOL_MAXSIZE setting.
+    """
+    global _session  # pylint: disable=global-statement, invalid-name
+    with _lock:
+        _reset_after_fork()
+        if _session is None:
+            session = requests.Session()
+            # The session is shared by all users, so cookies set by the
+            # comments service must not be sent with other requests.
+            session.cookies.set_policy(DefaultCookiePolicy(allowed_domains=[]))
+            adapter = requests.adapters.HTTPAdapter(
+                pool_connections=getattr(settings, 'COMMENTS_SERVICE_POOL_CONNECTIONS', 10),
+                pool_maxsize=getattr(settings, 'COMMENTS_SERVICE_POOL_MAXSIZE', 10),
+            )
+            session.mount('http://', adapter)
+            session.mount('https://', adapter)
+            _session = session
+        return _session
+
+
+def send_request(method, url, **kwargs):
+    """
+    Sends a request using the session of this process. Takes the same
+    arguments as requests.request.
+    """
+    return get_session().request(method, url, **kwargs)
+
+
+def _get_thread_pool(num_threads):
+    """
+    Returns the thread pool of this process used by run_concurrently.
+    """
+    global _thread_pool  # pylint: disable=global-statement, invalid-name
+    with _lock:
+        _reset_after_fork()
+        if _thread_pool is None:
+            _thread_pool = ThreadPool(num_threads)
+        return _thread_pool
+
+
+def _call_in_thread_pool(func, language):
+    """
+    Calls func in a thread of the pool, with the language of the calling
+    thread, and closes any database connections it opened.
+
+    The thread's request cache is cleared before and after the call, as the
+    RequestCache middleware does for request threads, so that no cached
+    data is shared by the requests served by the pool.
+    """
+    RequestCache.clear_request_cache()
+    try:
+        with override_language(language):
+            return func()
+    finally:
+        RequestCache.clear_request_cache()
+        close_old_connections()
+
+
+def run_concurrently(*funcs):
+    """
+    Calls the given functions, which make independent requests to the
+    comments service, concurrently and returns the list of their results.
+
+    The last function is called in the calling thread, so any function
+    that relies on thread-local state other than the language (such as
+    event tracking) should be passed last.  If any of the functions raise
+    an exception, the exception of the first one of them is raised, as if
+    the functions had been called in order.
+
+    The number of functions called at once is limited by the
+    COMMENTS_SERVICE_MAX_CONCURRENT_REQUESTS setting.  When it's 1, the
+    functions are called in order in the calling thread.
+    """
+    max_concurrent_requests = getattr(settings, 'COMMENTS_SERVICE_MAX_CONCURRENT_REQUESTS', 4)
+    if max_concurrent_requests <= 1 or len(funcs) <= 1:
+        return [func() for func in funcs]
+
+    thread_pool = _get_thread_pool(max_concurrent_requests - 1)
+    language = get_language()
+    async_results = [thread_pool.apply_async(_call_in_thread_pool, (func, language)) for func in funcs[:-1]]
+    try:
+        last_result = funcs[-1]()
+    finally:
+        # Exceptions of earlier functions take precedence.
+        results = [async_result.get() for async_result in async_results]
+    return results + [last_result]
+
+
 def perform_request(method, url, data_or_params=None, raw=False,
                     metric_action=None, metric_tags=None, paged_results=False):
     # To avoid dependency conflict
@@ -85,7 +207,7 @@ def perform_request(method, url, data_or_params=None, raw=False,
         data = None
         params = merge_dict(data_or_params, request_id_dict)
     with request_timer(request_id, method, url, metric_tags):
-        response = requests.request(
+        response = send_request(
             method,
             url,
             data=data,
@@ -93,6 +93,9 @@ def run():
     # validate configurations on startup
     validate_lms_config(settings)
 
+    if settings.PREFETCH_COURSE_STRUCTURES:
+        prefetch_course_structures()
+
 
 def add_mimetypes():
     """
@@ -108,6 +111,26 @@ def add_mimetypes():
     mimetypes.add_type('application/font-woff', '.woff')
 
 
+def prefetch_course_structures():
+    """
+    Loads the published structures of the courses listed in the
+    PREFETCH_COURSE_STRUCTURES setting into the course structure cache, so
+    that the first requests served after a deployment don't have to fetch
+    and convert them.  A failure only logs, as the cache is filled on demand
+    anyway.
+    """
+    from opaque_keys.edx.keys import CourseKey
+    from xmodule.modulestore.django import modulestore
+
+    try:
+        course_keys = [CourseKey.from_string(course_id) for course_id in settings.PREFETCH_COURSE_STRUCTURES]
+        loaded = modulestore().prefetch_structures(course_keys)
+    except Exception:  # pylint: disable=broad-except
+        log.exception(u'Unable to prefetch the course structures.')
+    else:
+        log.info(u'Prefetched %d course structures.', loaded)
+
+
 def enable_microsites():
     """
     Calls the enable_microsites function in the microsite backend.
@@ -0,0 +1,18 @@
+"""
+This module contains various configuration settings via
+waffle switches for the Bookmarks app.
+"""
+from openedx.core.djangoapps.waffle_utils import WaffleSwitchNamespace
+
+# Namespace
+WAFFLE_NAMESPACE = u'bookmarks'
+
+# Switches
+INCREMENTAL_XBLOCK_CACHE_UPDATE = u'incremental_xblock_cache_update'
+
+
+def waffle():
+    """
+    Returns the namespaced, cached, audited Waffle class for Bookmarks.
+    """
+    return WaffleSwitchNamespace(name=WAFFLE_NAMESPACE, log_prefix=u'Bookmarks: ')
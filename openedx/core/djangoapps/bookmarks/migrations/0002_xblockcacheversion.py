@@ -0,0 +1,30 @@
+# -*- coding: utf-8 -*-
+from __future__ import unicode_literals
+
+from django.db import migrations, models
+import model_utils.fields
+import django.utils.timezone
+from openedx.core.djangoapps.xmodule_django.models import CourseKeyField
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('bookmarks', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='XBlockCacheVersion',
+            fields=[
+                ('id', models.AutoField(verbose_name='ID', serialize=False, auto_created=True, primary_key=True)),
+                ('created', model_utils.fields.AutoCreatedField(default=django.utils.timezone.now, verbose_name='created', editable=False)),
+                ('modified', model_utils.fields.AutoLastModifiedField(default=django.utils.timezone.now, verbose_name='modified', editable=False)),
+                ('course_key', CourseKeyField(unique=True, max_length=255)),
+                ('subtree_edited_on', models.DateTimeField(help_text=b'The subtree_edited_on value of the course when its XBlockCache was last updated.', null=True)),
+            ],
+            options={
+                'abstract': False,
+            },
+        ),
+    ]
@@ -245,3 +245,18 @@ class XBlockCache(TimeStampedModel):
                 xblock_cache.save()
 
         return xblock_cache
+
+
+class XBlockCacheVersion(TimeStampedModel):
+    """
+    Records the version of a course's content from which its XBlockCache
+    entries were last updated incrementally.
+    """
+
+    course_key = CourseKeyField(max_length=255, unique=True)
+    subtree_edited_on = models.DateTimeField(
+        null=True, help_text='The subtree_edited_on value of the course when its XBlockCache was last updated.'
+    )
+
+    def __unicode__(self):
+        return unicode(self.course_key)
@@ -5,6 +5,7 @@ from importlib import import_module
 
 from django.dispatch.dispatcher import receiver
 
+from openedx.core.djangoapps.content.publish_pipeline.api import publish_consumer, publish_pipeline_enabled
 from xmodule.modulestore.django import SignalHandler
 
 
@@ -13,8 +14,20 @@ def trigger_update_xblocks_cache_task(sender, course_key, **kwargs):  # pylint:
     """
     Trigger update_xblocks_cache() when course_published signal is fired.
     """
+    if publish_pipeline_enabled():
+        return
+
     tasks = import_module('openedx.core.djangoapps.bookmarks.tasks')  # Importing tasks early causes issues in tests.
 
     # Note: The countdown=0 kwarg is set to ensure the method below does not attempt to access the course
     # before the signal emitter has finished all operations. This is also necessary to ensure all tests pass.
     tasks.update_xblocks_cache.apply_async([unicode(course_key)], countdown=0)
+
+
+@publish_consumer(u'bookmarks')
+def update_xblocks_cache_from_published_course(course_key, course):  # pylint: disable=invalid-name
+    """
+    Update the XBlocks cache from the course loaded by the publish pipeline.
+    """
+    tasks = import_module('openedx.core.djangoapps.bookmarks.tasks')
+    tasks._update_xblocks_cache(course_key, course)  # pylint: disable=protected-access
@@ -1,28 +1,41 @@
 """
 Tasks for bookmarks.
 """
+import json
 import logging
 
 from celery.task import task  # pylint: disable=import-error,no-name-in-module
-from django.db import transaction
+from django.db import IntegrityError, transaction
+from django.db.models import Case, CharField, TextField, Value, When
+from django.utils import timezone
 from opaque_keys.edx.keys import CourseKey
 
+from xmodule.modulestore import ModuleStoreEnum
 from xmodule.modulestore.django import modulestore
 
 from . import PathItem
+from .config.waffle import INCREMENTAL_XBLOCK_CACHE_UPDATE, waffle
 
 log = logging.getLogger('edx.celery.task')
 
+# The number of XBlockCache entries read and written by each query of an
+# incremental update.
+XBLOCK_CACHE_BATCH_SIZE = 100
 
-def _calculate_course_xblocks_data(course_key):
+
+def _calculate_course_xblocks_data(course_key, course=None):
     """
     Fetch data for all the blocks in the course.
 
     This data consists of the display_name and path of the block.
+
+    The course is loaded from the modulestore, unless it's given already
+    loaded with all of its descendants.
     """
     with modulestore().bulk_operations(course_key):
 
-        course = modulestore().get_course(course_key, depth=None)
+        if course is None:
+            course = modulestore().get_course(course_key, depth=None)
         blocks_info_dict = {}
 
         # Collect display_name and children usage keys.
@@ -41,11 +54,24 @@ def _calculate_course_xblocks_data(course_key):
             # Add this blocks children to the stack so that we can traverse them as well.
             blocks_stack.extend(children)
 
+    _add_paths_info(blocks_info_dict, unicode(course.scope_ids.usage_id))
+
+    return blocks_info_dict
+
+
+def _add_paths_info(blocks_info_dict, root_id):
+    """
+    Link the collected blocks to their children and add the paths to each
+    of them from the root block.
+
+    Children which weren't collected are left out.
+    """
     # Set children
     for block in blocks_info_dict.values():
         block.setdefault('children', [])
         for child_id in block['children_ids']:
-            block['children'].append(blocks_info_dict[child_id])
+            if child_id in blocks_info_dict:
+                block['children'].append(blocks_info_dict[child_id])
         block.pop('children_ids', None)
 
     # Calculate paths
@@ -58,9 +84,56 @@ def _calculate_course_xblocks_data(course_key):
         for child_block_info in block_info['children']:
             add_path_info(child_block_info, current_path + [block_info])
 
-    add_path_info(blocks_info_dict[unicode(course.scope_ids.usage_id)], [])
+    add_path_info(blocks_info_dict[root_id], [])
 
-    return blocks_info_dict
+
+def _edited_since(edited_on, recorded_edited_on):
+    """
+    Return whether a block edited on edited_on may have changed since
+    recorded_edited_on.  Unknown times are always considered changed.
+    """
+    return edited_on is None or recorded_edited_on is None or edited_on > recorded_edited_on
+
+
+def _calculate_changed_xblocks_data(course, recorded_edited_on):
+    """
+    Fetch data for the blocks of the course whose display_name or paths may
+    have changed since recorded_edited_on.
+
+    Only the subtrees which were edited since then are traversed.  A block
+    whose own fields were edited invalidates the paths of all of its
+    descendants, since they include its display_name.
+    """
+    blocks_info_dict = {}
+    changed_ids = set()
+
+    blocks_stack = [(course, False)]
+    while blocks_stack:
+        current_block, ancestor_changed = blocks_stack.pop()
+        usage_id = unicode(current_block.scope_ids.usage_id)
+        if usage_id in blocks_info_dict:
+            continue
+
+        changed = ancestor_changed or _edited_since(current_block.edited_on, recorded_edited_on)
+        if changed:
+            changed_ids.add(usage_id)
+
+        children = []
+        if current_block.has_children and (
+                changed or _edited_since(current_block.subtree_edited_on, recorded_edited_on)
+        ):
+            children = current_block.get_children()
+
+        blocks_info_dict[usage_id] = {
+            'usage_key': current_block.scope_ids.usage_id,
+            'display_name': current_block.display_name_with_default,
+            'children_ids': [unicode(child.scope_ids.usage_id) for child in children]
+        }
+        blocks_stack.extend((child, changed) for child in children)
+
+    _add_paths_info(blocks_info_dict, unicode(course.scope_ids.usage_id))
+
+    return {usage_id: blocks_info_dict[usage_id] for usage_id in changed_ids}
 
 
 def _paths_from_data(paths_data):
@@ -104,12 +177,22 @@ def paths_equal(paths_1, paths_2):
     return True
 
 
-def _update_xblocks_cache(course_key):
+def _update_xblocks_cache(course_key, course=None):
     """
     Calculate the XBlock cache data for a course and update the XBlockCache table.
+
+    The course is loaded from the modulestore, unless it's given already
+    loaded with all of its descendants.
     """
+    if (
+            waffle().is_enabled(INCREMENTAL_XBLOCK_CACHE_UPDATE) and
+            modulestore().get_modulestore_type(course_key) == ModuleStoreEnum.Type.split
+    ):
+        _update_xblocks_cache_incrementally(course_key, course)
+        return
+
     from .models import XBlockCache
-    blocks_data = _calculate_course_xblocks_data(course_key)
+    blocks_data = _calculate_course_xblocks_data(course_key, course)
 
     def update_block_cache_if_needed(block_cache, block_data):
         """ Compare block_cache object with data and update if there are differences. """
@@ -141,6 +224,107 @@ def _update_xblocks_cache(course_key):
                 update_block_cache_if_needed(block_cache, block_data)
 
 
+def _update_xblocks_cache_incrementally(course_key, course=None):
+    """
+    Update the XBlockCache table for the blocks of a split course which were
+    edited since its last incremental update.
+
+    Split modulestore records when each block and each subtree was last
+    edited, so the subtrees which weren't edited since the recorded
+    subtree_edited_on of the course are skipped.  The changed entries are
+    then written with a few bulk queries.
+    """
+    from .models import XBlockCacheVersion
+
+    with modulestore().bulk_operations(course_key):
+        if course is None:
+            course = modulestore().get_course(course_key, depth=None)
+
+        version = XBlockCacheVersion.objects.filter(course_key=course_key).first()
+        recorded_edited_on = version.subtree_edited_on if version else None
+        if recorded_edited_on is not None and not _edited_since(course.subtree_edited_on, recorded_edited_on):
+            log.info(u'XBlockCache of course_key %s is up to date', unicode(course_key))
+            return
+
+        blocks_data = _calculate_changed_xblocks_data(course, recorded_edited_on)
+
+    _write_xblocks_cache(course_key, blocks_data)
+    XBlockCacheVersion.objects.update_or_create(
+        course_key=course_key, defaults={'subtree_edited_on': course.subtree_edited_on}
+    )
+
+
+def _write_xblocks_cache(course_key, blocks_data):
+    """
+    Update the XBlockCache entries of the given blocks which differ from
+    their data, and create the missing ones, in batches of
+    XBLOCK_CACHE_BATCH_SIZE entries.
+    """
+    from .models import XBlockCache
+
+    blocks_data = blocks_data.values()
+    for start in range(0, len(blocks_data), XBLOCK_CACHE_BATCH_SIZE):
+        batch = {
+            unicode(block_data['usage_key']): block_data
+            for block_data in blocks_data[start:start + XBLOCK_CACHE_BATCH_SIZE]
+        }
+        with transaction.atomic():
+            changed_caches = []
+            block_caches = XBlockCache.objects.filter(
+                course_key=course_key, usage_key__in=[block_data['usage_key'] for block_data in batch.values()]
+            )
+            for block_cache in block_caches:
+                block_data = batch.pop(unicode(block_cache.usage_key), None)
+                if block_data is None:
+                    continue
+                paths = _paths_from_data(block_data['paths'])
+                if block_cache.display_name != block_data['display_name'] or not paths_equal(block_cache.paths, paths):
+                    log.info(u'Updating XBlockCache with usage_key: %s', unicode(block_cache.usage_key))
+                    block_cache.display_name = block_data['display_name']
+                    block_cache.paths = paths
+                    changed_caches.append(block_cache)
+
+            if changed_caches:
+                # Django 1.8 has no bulk_update, so each field is set to a
+                # CASE over the ids of the entries in a single UPDATE.
+                display_names = [
+                    When(id=block_cache.id, then=Value(block_cache.display_name)) for block_cache in changed_caches
+                ]
+                paths = [
+                    When(id=cache.id, then=Value(json.dumps(cache._paths)))  # pylint: disable=protected-access
+                    for cache in changed_caches
+                ]
+                XBlockCache.objects.filter(id__in=[block_cache.id for block_cache in changed_caches]).update(
+                    display_name=Case(*display_names, output_field=CharField()),
+                    _paths=Case(*paths, output_field=TextField()),
+                    modified=timezone.now(),
+                )
+
+        new_caches = []
+        for block_data in batch.values():
+            log.info(u'Creating XBlockCache with usage_key: %s', unicode(block_data['usage_key']))
+            block_cache = XBlockCache(
+                course_key=course_key,
+                usage_key=block_data['usage_key'],
+                display_name=block_data['display_name'],
+            )
+            block_cache.paths = _paths_from_data(block_data['paths'])
+            new_caches.append(block_cache)
+
+        try:
+            with transaction.atomic():
+                XBlockCache.objects.bulk_create(new_caches)
+        except IntegrityError:
+            # Some of the entries were created concurrently, e.g. by a bookmark.
+            for block_cache in new_caches:
+                with transaction.atomic():
+                    XBlockCache.objects.get_or_create(usage_key=block_cache.usage_key, defaults={
+                        'course_key': course_key,
+                        'display_name': block_cache.display_name,
+                        'paths': block_cache.paths,
+                    })
+
+
 @task(name=u'openedx.core.djangoapps.bookmarks.tasks.update_xblock_cache')
 def update_xblocks_cache(course_id):
     """
@@ -2,6 +2,7 @@
 Tests for tasks.
 """
 import ddt
+from mock import patch
 from nose.plugins.attrib import attr
 
 from django.conf import settings
@@ -9,7 +10,9 @@ from django.conf import settings
 from xmodule.modulestore import ModuleStoreEnum
 from xmodule.modulestore.tests.factories import check_mongo_calls, ItemFactory
 
-from ..models import XBlockCache
+from .. import tasks
+from ..config.waffle import INCREMENTAL_XBLOCK_CACHE_UPDATE, waffle
+from ..models import XBlockCache, XBlockCacheVersion
 from ..tasks import _calculate_course_xblocks_data, _update_xblocks_cache
 from .test_models import BookmarksTestsBase
 
@@ -204,3 +207,82 @@ class XBlockCacheTaskTests(BookmarksTestsBase):
                         path_item.usage_key,
                         self.course_expected_cache_data[usage_key][path_index][path_item_index + 1]
                     )
+
+
+@attr(shard=2)
+class XBlockCacheIncrementalUpdateTests(BookmarksTestsBase):
+    """
+    Test the incremental updates of the XBlockCache of split courses.
+    """
+    STORE_TYPE = ModuleStoreEnum.Type.split
+
+    def setUp(self):
+        super(XBlockCacheIncrementalUpdateTests, self).setUp()
+        switch = waffle().override(INCREMENTAL_XBLOCK_CACHE_UPDATE, active=True)
+        switch.__enter__()
+        self.addCleanup(switch.__exit__, None, None, None)
+
+    def assert_cache_matches_course(self):
+        """
+        Assert that the XBlockCache entries of the course are those of a full update.
+        """
+        expected_caches = {
+            unicode(usage_key): (block_data['display_name'], tasks._paths_from_data(block_data['paths']))
+            for usage_key, block_data in _calculate_course_xblocks_data(self.course.id).items()
+        }
+        for xblock_cache in XBlockCache.objects.filter(course_key=self.course.id):
+            display_name, paths = expected_caches.pop(unicode(xblock_cache.usage_key))
+            self.assertEqual(xblock_cache.display_name, display_name)
+            self.assertTrue(tasks.paths_equal(xblock_cache.paths, paths))
+        self.assertEqual(expected_caches, {})
+
+    def test_update_xblocks_cache(self):
+        _update_xblocks_cache(self.course.id)
+
+        self.assert_cache_matches_course()
+        self.assertEqual(
+            XBlockCacheVersion.objects.get(course_key=self.course.id).subtree_edited_on,
+            self.store.get_course(self.course.id).subtree_edited_on
+        )
+
+    def test_display_name_change(self):
+        _update_xblocks_cache(self.course.id)
+
+        self.chapter_1.display_name = 'Week One'
+        self.store.update_item(self.chapter_1, self.admin.id)
+
+        _update_xblocks_cache(self.course.id)
+
+        self.assert_cache_matches_course()
+        self.assertEqual(
+            XBlockCache.objects.get(usage_key=self.vertical_2.location).paths[0][0].display_name, 'Week One'
+        )
+
+    def test_new_block(self):
+        _update_xblocks_cache(self.course.id)
+
+        vertical = ItemFactory.create(
+            parent_location=self.sequential_1.location, category='vertical', display_name='Subsection 4'
+        )
+        _update_xblocks_cache(self.course.id)
+
+        self.assert_cache_matches_course()
+        self.assertEqual(
+            [path_item.usage_key for path_item in XBlockCache.objects.get(usage_key=vertical.location).paths[0]],
+            [self.chapter_1.location, self.sequential_1.location]
+        )
+
+    def test_unchanged_course(self):
+        _update_xblocks_cache(self.course.id)
+
+        with patch.object(tasks, '_write_xblocks_cache') as mock_write:
+            _update_xblocks_cache(self.course.id)
+        self.assertEqual(mock_write.call_count, 0)
+
+    def test_mongo_course(self):
+        self.setup_data(ModuleStoreEnum.Type.mongo)
+
+        with patch.object(tasks, '_update_xblocks_cache_incrementally') as mock_update:
+            _update_xblocks_cache(self.course.id)
+        self.assertEqual(mock_update.call_count, 0)
+        self.assertFalse(XBlockCacheVersion.objects.filter(course_key=self.course.id).exists())
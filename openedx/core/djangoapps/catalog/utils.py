@@ -6,14 +6,13 @@ import waffle
 from django.conf import settings
 from django.core.cache import cache
 from django.core.exceptions import ObjectDoesNotExist
-from edx_rest_api_client.client import EdxRestApiClient
 
 from openedx.core.djangoapps.catalog.cache import (
     PROGRAM_CACHE_KEY_TPL,
     SITE_PROGRAM_UUIDS_CACHE_KEY_TPL
 )
 from openedx.core.djangoapps.catalog.models import CatalogIntegration
-from openedx.core.lib.edx_api_utils import get_edx_api_data
+from openedx.core.lib.edx_api_utils import create_api_client, get_edx_api_data
 from openedx.core.lib.token_utils import JwtBuilder
 
 logger = logging.getLogger(__name__)
@@ -30,7 +29,7 @@ def create_catalog_api_client(user, site=None):
     else:
         url = CatalogIntegration.current().get_internal_api_url()
 
-    return EdxRestApiClient(url, jwt=jwt)
+    return create_api_client(url, jwt)
 
 
 def get_programs(site, uuid=None):
@@ -108,7 +107,8 @@ def get_program_types(name=None):
         cache_key = '{base}.program_types'.format(base=catalog_integration.CACHE_KEY)
 
         data = get_edx_api_data(catalog_integration, 'program_types', api=api,
-                                cache_key=cache_key if catalog_integration.is_cache_enabled else None)
+                                cache_key=cache_key if catalog_integration.is_cache_enabled else None,
+                                stale_while_revalidate=True)
 
         # Filter by name if a name was provided
         if name:
@@ -237,7 +237,8 @@ def get_course_run_details(course_run_key, fields):
         cache_key = '{base}.course_runs'.format(base=catalog_integration.CACHE_KEY)
 
         course_run_details = get_edx_api_data(catalog_integration, 'course_runs', api, resource_id=course_run_key,
-                                              cache_key=cache_key, many=False, traverse_pagination=False, fields=fields)
+                                              cache_key=cache_key, many=False, traverse_pagination=False, fields=fields,
+                                              stale_while_revalidate=True)
     else:
         msg = 'Unable to retrieve details about course_run {} because Catalog Integration is not enabled'.format(
             course_run_key
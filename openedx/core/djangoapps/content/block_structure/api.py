@@ -5,6 +5,7 @@ from django.core.cache import cache
 from xmodule.modulestore.django import modulestore
 
 from .manager import BlockStructureManager
+from .process_cache import get_process_cache, get_transformed_cache
 
 
 def get_course_in_cache(course_key):
@@ -20,13 +21,16 @@ def get_course_in_cache(course_key):
     return get_block_structure_manager(course_key).get_collected()
 
 
-def update_course_in_cache(course_key):
+def update_course_in_cache(course_key, course=None):
     """
     A higher order function implemented on top of the
     block_structure.updated_collected function that updates the block
     structure in the cache for the given course_key.
+
+    The course may be optionally provided if it's already loaded from
+    the modulestore with all of its descendants.
     """
-    return get_block_structure_manager(course_key).update_collected_if_needed()
+    return get_block_structure_manager(course_key).update_collected_if_needed(course)
 
 
 def clear_course_from_cache(course_key):
@@ -57,3 +61,25 @@ def get_cache():
     Returns the storage for caching Block Structures.
     """
     return cache
+
+
+def get_process_cache_stats():
+    """
+    Returns the hit, miss and eviction counters and the current size
+    of the Block Structures process cache of this process.
+
+    Returns:
+        ProcessCacheStats
+    """
+    return get_process_cache().stats()
+
+
+def get_transformed_cache_stats():
+    """
+    Returns the hit, miss and eviction counters and the current number
+    of blocks of the transformed Block Structures cache of this process.
+
+    Returns:
+        ProcessCacheStats
+    """
+    return get_transformed_cache().stats()
@@ -0,0 +1,788 @@
+"""
+Module with a compact, array-backed representation of collected block
+structures.
+
+    CompactBlockStructure - A drop-in alternative to BlockStructureBlockData
+        for the Transform phase.
+
+Rather than a dict of _BlockRelations objects with two lists each and a
+BlockData object with its own dicts per block, a CompactBlockStructure
+keeps:
+
+    * A table of the blocks' usage keys, so blocks are identified by
+      integer ids internally and each usage key is stored only once.
+    * CSR-style arrays of the children and parents ids of all blocks.
+      Relations of blocks that are changed by transformers are kept
+      separately, so the arrays themselves are never modified and can
+      be shared by copies of the structure.
+    * One column (list indexed by block id) per collected xBlock field
+      and per transformer block field.  Columns are shared by copies of
+      the structure and copied on their first write, so copying a
+      structure doesn't copy the collected values.
+
+BlockData and TransformerData objects returned by its accessors, and
+their fields dicts, are lightweight views that read and write the
+columns.  To serialize a CompactBlockStructure, convert it back with
+to_block_structure.
+"""
+# pylint: disable=protected-access
+from array import array
+from collections import Mapping, MutableMapping
+
+from .block_structure import (
+    BlockData,
+    BlockStructureBlockData,
+    TransformerData,
+    TransformerDataMap,
+    _BlockRelations,
+)
+
+
+_ID_TYPECODE = 'l'
+
+
+class _Missing(object):
+    """
+    Marker for field values that are not set for a block.
+    """
+    def __copy__(self):
+        return self
+
+    def __deepcopy__(self, memo):
+        return self
+
+    def __reduce__(self):
+        return '_MISSING'
+
+
+_MISSING = _Missing()
+
+
+def _transformer_name(transformer):
+    """
+    Returns the name of the given transformer, which can be either the
+    transformer's class or name.  See TransformerDataMap._translate_key.
+    """
+    try:
+        return transformer.name()
+    except AttributeError:
+        return transformer
+
+
+def _copy_transformer_data(transformer_data):
+    """
+    Returns a copy of the given TransformerDataMap whose TransformerData
+    objects can be modified independently.  Their values are shared.
+    """
+    transformer_data_copy = TransformerDataMap()
+    for transformer_name, data in transformer_data.iteritems():
+        data_copy = transformer_data_copy[transformer_name] = TransformerData()
+        data_copy.fields.update(data.fields)
+    return transformer_data_copy
+
+
+class CompactBlockStructure(BlockStructureBlockData):
+    """
+    Array-backed BlockStructureBlockData with the same public interface.
+    Create instances using create_from.
+    """
+    def __init__(self, root_block_usage_key):  # pylint: disable=super-init-not-called
+        # The usage key of the root block for this structure.
+        # UsageKey
+        self.root_block_usage_key = root_block_usage_key
+
+        # Table of the usage keys of all blocks, indexed by block id, and
+        # the reverse map.
+        # list [UsageKey], dict {UsageKey: int}
+        self._block_keys = []
+        self._block_ids = {}
+
+        # CSR-style adjacency arrays: the children ids of block i are
+        # _child_ids[_child_offsets[i]:_child_offsets[i + 1]], and
+        # likewise for parents.
+        # array [int]
+        self._child_offsets = array(_ID_TYPECODE, [0])
+        self._child_ids = array(_ID_TYPECODE)
+        self._parent_offsets = array(_ID_TYPECODE, [0])
+        self._parent_ids = array(_ID_TYPECODE)
+
+        # Relations of blocks that changed since creation, which take
+        # precedence over the adjacency arrays.
+        # dict {int: [int]}
+        self._children_overrides = {}
+        self._parents_overrides = {}
+
+        # Per block flags of whether the block is in the structure and
+        # whether it has collected data.
+        # bytearray
+        self._in_structure = bytearray()
+        self._has_data = bytearray()
+        self._num_blocks_in_structure = 0
+
+        # Columns of xBlock field values and transformer block field
+        # values, indexed by block id.
+        # dict {string: list}, dict {string: {string: list}}
+        self._xblock_fields = {}
+        self._transformer_block_fields = {}
+
+        # Ids of the columns that were created by this instance, rather
+        # than shared with the instance it was copied from or with its
+        # copies, and can therefore be written in place.
+        # set {int}
+        self._owned_columns = set()
+
+        # Map of a transformer's name to its non-block-specific data.
+        self.transformer_data = TransformerDataMap()
+
+        # Add the root block.
+        self._get_or_create_block_id_in_structure(root_block_usage_key)
+
+    @classmethod
+    def create_from(cls, block_structure):
+        """
+        Returns a CompactBlockStructure with the relations and data of
+        the given BlockStructureBlockData.
+
+        Note: Collected values are not copied, so the given block
+        structure should no longer be used.
+        """
+        block_relations = block_structure._block_relations
+        block_data_map = block_structure._block_data_map
+
+        compact = cls(block_structure.root_block_usage_key)
+        compact._children_overrides.clear()
+        compact._parents_overrides.clear()
+        compact._block_keys = list(block_relations)
+        compact._block_keys.extend(key for key in block_data_map if key not in block_relations)
+        compact._block_ids = {block_key: block_id for block_id, block_key in enumerate(compact._block_keys)}
+        num_blocks = len(compact._block_keys)
+
+        for block_key in compact._block_keys:
+            relations = block_relations.get(block_key)
+            if relations:
+                compact._child_ids.extend(compact._block_ids[child] for child in relations.children)
+                compact._parent_ids.extend(compact._block_ids[parent] for parent in relations.parents)
+            compact._child_offsets.append(len(compact._child_ids))
+            compact._parent_offsets.append(len(compact._parent_ids))
+
+        compact._num_blocks_in_structure = len(block_relations)
+        compact._in_structure = bytearray([1]) * len(block_relations) + bytearray(num_blocks - len(block_relations))
+        compact._has_data = bytearray(num_blocks)
+
+        for block_key, block_data in block_data_map.iteritems():
+            block_id = compact._block_ids[block_key]
+            compact._has_data[block_id] = 1
+            for field_name, value in block_data.fields.iteritems():
+                compact._get_column(compact._xblock_fields, field_name)[block_id] = value
+            for transformer_name, transformer_block_data in block_data.transformer_data.iteritems():
+                transformer_columns = compact._transformer_block_fields.setdefault(transformer_name, {})
+                for field_name, value in transformer_block_data.fields.iteritems():
+                    compact._get_column(transformer_columns, field_name)[block_id] = value
+
+        compact.transformer_data = block_structure.transformer_data
+        return compact
+
+    def to_block_structure(self):
+        """
+        Returns a BlockStructureBlockData with the relations and data of
+        this instance, for example to serialize it.
+
+        Note: Collected values are not copied.
+        """
+        block_structure = BlockStructureBlockData(self.root_block_usage_key)
+        block_structure._block_relations = {}
+        for block_key in self.get_block_keys():
+            relations = block_structure._block_relations[block_key] = _BlockRelations()
+            relations.parents = self.get_parents(block_key)
+            relations.children = self.get_children(block_key)
+
+        for block_key, compact_block_data in self.iteritems():
+            block_data = block_structure._block_data_map[block_key] = BlockData(block_key)
+            block_data.fields = dict(compact_block_data.fields)
+            for transformer_name, compact_transformer_data in compact_block_data.transformer_data.iteritems():
+                transformer_block_data = block_data.transformer_data[transformer_name] = TransformerData()
+                transformer_block_data.fields = dict(compact_transformer_data.fields)
+
+        block_structure.transformer_data = _copy_transformer_data(self.transformer_data)
+        return block_structure
+
+    @property
+    def _block_relations(self):
+        """
+        Read-only map of the usage keys of the blocks in the structure to
+        their relations.
+        """
+        return _CompactBlockRelationsMap(self)
+
+    @property
+    def _block_data_map(self):
+        """
+        Read-only map of the usage keys of the blocks with data to their
+        BlockData.
+        """
+        return _CompactBlockDataMap(self)
+
+    def __len__(self):
+        return self._num_blocks_in_structure
+
+    #--- Block structure relation methods ---#
+
+    def get_parents(self, usage_key):
+        block_id = self._get_block_id_in_structure(usage_key)
+        return [] if block_id is None else self._to_keys(self._get_parent_ids(block_id))
+
+    def get_children(self, usage_key):
+        block_id = self._get_block_id_in_structure(usage_key)
+        return [] if block_id is None else self._to_keys(self._get_child_ids(block_id))
+
+    def set_root_block(self, usage_key):
+        self.root_block_usage_key = usage_key
+        self._parents_overrides[self._block_ids[usage_key]] = []
+
+    def __contains__(self, usage_key):
+        return self._get_block_id_in_structure(usage_key) is not None
+
+    def get_block_keys(self):
+        return (
+            self._block_keys[block_id]
+            for block_id, in_structure in enumerate(self._in_structure)
+            if in_structure
+        )
+
+    #--- Block data methods ---#
+
+    def copy(self):
+        """
+        Returns a new instance of CompactBlockStructure with a copy of
+        this instance's data.  The adjacency arrays are shared, since
+        they are never modified, and so are the columns until either
+        instance writes to them.
+
+        Note: Collected values are shared rather than deep-copied, so
+        they must be replaced rather than mutated in place.
+        """
+        compact = CompactBlockStructure(self.root_block_usage_key)
+        compact._block_keys = list(self._block_keys)
+        compact._block_ids = dict(self._block_ids)
+        compact._child_offsets = self._child_offsets
+        compact._child_ids = self._child_ids
+        compact._parent_offsets = self._parent_offsets
+        compact._parent_ids = self._parent_ids
+        compact._children_overrides = {block_id: list(ids) for block_id, ids in self._children_overrides.iteritems()}
+        compact._parents_overrides = {block_id: list(ids) for block_id, ids in self._parents_overrides.iteritems()}
+        compact._in_structure = bytearray(self._in_structure)
+        compact._has_data = bytearray(self._has_data)
+        compact._num_blocks_in_structure = self._num_blocks_in_structure
+        compact._xblock_fields = dict(self._xblock_fields)
+        compact._transformer_block_fields = {
+            transformer_name: dict(transformer_columns)
+            for transformer_name, transformer_columns in self._transformer_block_fields.iteritems()
+        }
+        self._owned_columns.clear()
+        compact.transformer_data = _copy_transformer_data(self.transformer_data)
+        return compact
+
+    def iteritems(self):
+        return (
+            (self._block_keys[block_id], _CompactBlockData(self, block_id))
+            for block_id, has_data in enumerate(self._has_data)
+            if has_data
+        )
+
+    def itervalues(self):
+        return (block_data for _, block_data in self.iteritems())
+
+    def __getitem__(self, usage_key):
+        block_id = self._get_block_id_with_data(usage_key)
+        if block_id is None:
+            raise KeyError(usage_key)
+        return _CompactBlockData(self, block_id)
+
+    def get_xblock_field(self, usage_key, field_name, default=None):
+        block_id = self._get_block_id_with_data(usage_key)
+        if block_id is None:
+            return default
+        return self._get_value(self._xblock_fields, field_name, block_id, default)
+
+    def get_transformer_block_data(self, usage_key, transformer):
+        block_id = self._get_block_id_with_data(usage_key)
+        transformer_name = _transformer_name(transformer)
+        if block_id is None or not self._has_transformer_block_data(block_id, transformer_name):
+            raise KeyError(transformer_name)
+        return _CompactTransformerData(self, block_id, transformer_name)
+
+    def get_transformer_block_field(self, usage_key, transformer, key, default=None):
+        block_id = self._get_block_id_with_data(usage_key)
+        transformer_columns = self._transformer_block_fields.get(_transformer_name(transformer))
+        if block_id is None or transformer_columns is None:
+            return default
+        return self._get_value(transformer_columns, key, block_id, default)
+
+    def set_transformer_block_field(self, usage_key, transformer, key, value):
+        block_id = self._get_or_create_block_id_with_data(usage_key)
+        transformer_columns = self._transformer_block_fields.setdefault(_transformer_name(transformer), {})
+        self._get_column(transformer_columns, key)[block_id] = value
+
+    def remove_transformer_block_field(self, usage_key, transformer, key):
+        block_id = self._get_block_id_with_data(usage_key)
+        transformer_columns = self._transformer_block_fields.get(_transformer_name(transformer), {})
+        if block_id is not None and key in transformer_columns:
+            self._get_column(transformer_columns, key)[block_id] = _MISSING
+
+    def remove_block(self, usage_key, keep_descendants):
+        block_id = self._get_block_id_in_structure(usage_key)
+        if block_id is None:
+            raise KeyError(usage_key)
+
+        children = list(self._get_child_ids(block_id))
+        parents = list(self._get_parent_ids(block_id))
+
+        # Remove block from its children.
+        for child in children:
+            child_parents = list(self._get_parent_ids(child))
+            child_parents.remove(block_id)
+            self._parents_overrides[child] = child_parents
+
+        # Remove block from its parents.
+        for parent in parents:
+            parent_children = list(self._get_child_ids(parent))
+            parent_children.remove(block_id)
+            self._children_overrides[parent] = parent_children
+
+        # Remove block.
+        self._in_structure[block_id] = 0
+        self._has_data[block_id] = 0
+        self._num_blocks_in_structure -= 1
+
+        # Recreate the graph connections if descendants are to be kept.
+        if keep_descendants:
+            for child in children:
+                for parent in parents:
+                    self._add_relation_ids(parent, child)
+
+    #--- Internal methods ---#
+    # To be used within the block_structure framework or by tests.
+
+    def _prune_unreachable(self):
+        reachable = {self._block_ids[block_key] for block_key in self.post_order_traversal()}
+        for block_id, in_structure in enumerate(self._in_structure):
+            if in_structure and block_id not in reachable:
+                self._in_structure[block_id] = 0
+                self._num_blocks_in_structure -= 1
+        for block_id in reachable:
+            parents = self._get_parent_ids(block_id)
+            if any(parent not in reachable for parent in parents):
+                self._parents_overrides[block_id] = [parent for parent in parents if parent in reachable]
+
+    def _add_relation(self, parent_key, child_key):
+        self._add_relation_ids(
+            self._get_or_create_block_id_in_structure(parent_key),
+            self._get_or_create_block_id_in_structure(child_key),
+        )
+
+    def _get_or_create_block(self, usage_key):
+        return _CompactBlockData(self, self._get_or_create_block_id_with_data(usage_key))
+
+    def _add_relation_ids(self, parent, child):
+        """
+        Adds a parent to child relationship between the given block ids.
+        """
+        self._parents_overrides[child] = list(self._get_parent_ids(child)) + [parent]
+        self._children_overrides[parent] = list(self._get_child_ids(parent)) + [child]
+
+    def _get_child_ids(self, block_id):
+        """
+        Returns the ids of the children of the given block.
+        """
+        child_ids = self._children_overrides.get(block_id)
+        if child_ids is None:
+            child_ids = self._child_ids[self._child_offsets[block_id]:self._child_offsets[block_id + 1]]
+        return child_ids
+
+    def _get_parent_ids(self, block_id):
+        """
+        Returns the ids of the parents of the given block.
+        """
+        parent_ids = self._parents_overrides.get(block_id)
+        if parent_ids is None:
+            parent_ids = self._parent_ids[self._parent_offsets[block_id]:self._parent_offsets[block_id + 1]]
+        return parent_ids
+
+    def _to_keys(self, block_ids):
+        """
+        Returns the usage keys of the given block ids.
+        """
+        block_keys = self._block_keys
+        return [block_keys[block_id] for block_id in block_ids]
+
+    def _get_block_id_in_structure(self, usage_key):
+        """
+        Returns the id of the given block if it's in the structure, or None.
+        """
+        block_id = self._block_ids.get(usage_key)
+        return block_id if block_id is not None and self._in_structure[block_id] else None
+
+    def _get_block_id_with_data(self, usage_key):
+        """
+        Returns the id of the given block if it has data, or None.
+        """
+        block_id = self._block_ids.get(usage_key)
+        return block_id if block_id is not None and self._has_data[block_id] else None
+
+    def _get_or_create_block_id(self, usage_key):
+        """
+        Returns the id of the given block, adding it to the key table if
+        it's not found.
+        """
+        block_id = self._block_ids.get(usage_key)
+        if block_id is None:
+            block_id = len(self._block_keys)
+            self._block_keys.append(usage_key)
+            self._block_ids[usage_key] = block_id
+            self._in_structure.append(0)
+            self._has_data.append(0)
+            self._children_overrides[block_id] = []
+            self._parents_overrides[block_id] = []
+        return block_id
+
+    def _get_or_create_block_id_in_structure(self, usage_key):
+        """
+        Returns the id of the given block, adding the block to the
+        structure, without any relations, if it's not in the structure.
+        """
+        block_id = self._get_or_create_block_id(usage_key)
+        if not self._in_structure[block_id]:
+            self._in_structure[block_id] = 1
+            self._num_blocks_in_structure += 1
+            self._children_overrides[block_id] = []
+            self._parents_overrides[block_id] = []
+        return block_id
+
+    def _get_or_create_block_id_with_data(self, usage_key):
+        """
+        Returns the id of the given block, creating empty data for the
+        block if it doesn't have data.
+        """
+        block_id = self._get_or_create_block_id(usage_key)
+        if not self._has_data[block_id]:
+            self._has_data[block_id] = 1
+            for columns, field_name in self._iter_columns():
+                if block_id < len(columns[field_name]):
+                    self._get_column(columns, field_name)[block_id] = _MISSING
+        return block_id
+
+    def _has_transformer_block_data(self, block_id, transformer_name):
+        """
+        Returns whether the given block has any data for the given transformer.
+        """
+        return any(
+            block_id < len(column) and column[block_id] is not _MISSING
+            for column in self._transformer_block_fields.get(transformer_name, {}).itervalues()
+        )
+
+    def _iter_columns(self):
+        """
+        Returns an iterator of (columns, field name) pairs of all the columns.
+        """
+        for field_name in self._xblock_fields.keys():
+            yield self._xblock_fields, field_name
+        for transformer_columns in self._transformer_block_fields.itervalues():
+            for field_name in transformer_columns.keys():
+                yield transformer_columns, field_name
+
+    def _get_column(self, columns, field_name):
+        """
+        Returns the column of the given field for writing, with an entry
+        for every block.  The column is created if needed, and copied if
+        it's shared with another instance.
+        """
+        column = columns.get(field_name)
+        if column is None or id(column) not in self._owned_columns:
+            column = columns[field_name] = [] if column is None else list(column)
+            self._owned_columns.add(id(column))
+        if len(column) < len(self._block_keys):
+            column.extend([_MISSING] * (len(self._block_keys) - len(column)))
+        return column
+
+    @staticmethod
+    def _get_value(columns, field_name, block_id, default):
+        """
+        Returns the value of the given field for the given block from the
+        given columns, or default if not found.
+        """
+        column = columns.get(field_name)
+        if column is None or block_id >= len(column) or column[block_id] is _MISSING:
+            return default
+        return column[block_id]
+
+
+class _CompactBlockRelations(object):
+    """
+    Read-only view of the relations of a single block in a
+    CompactBlockStructure, with the interface of _BlockRelations.
+    """
+    __slots__ = ('_structure', '_block_id')
+
+    def __init__(self, structure, block_id):
+        self._structure = structure
+        self._block_id = block_id
+
+    @property
+    def parents(self):
+        """
+        Usage keys of the block's parents.
+        """
+        return self._structure._to_keys(self._structure._get_parent_ids(self._block_id))
+
+    @property
+    def children(self):
+        """
+        Usage keys of the block's children.
+        """
+        return self._structure._to_keys(self._structure._get_child_ids(self._block_id))
+
+
+class _CompactBlockRelationsMap(Mapping):
+    """
+    Read-only view of the relations of the blocks in a
+    CompactBlockStructure, with the interface of a dict of
+    _BlockRelations.
+    """
+    __slots__ = ('_structure',)
+
+    def __init__(self, structure):
+        self._structure = structure
+
+    def __getitem__(self, usage_key):
+        block_id = self._structure._get_block_id_in_structure(usage_key)
+        if block_id is None:
+            raise KeyError(usage_key)
+        return _CompactBlockRelations(self._structure, block_id)
+
+    def __iter__(self):
+        return self._structure.get_block_keys()
+
+    def __len__(self):
+        return len(self._structure)
+
+
+class _CompactBlockDataMap(Mapping):
+    """
+    Read-only view of the data of the blocks in a CompactBlockStructure,
+    with the interface of a dict of BlockData.
+    """
+    __slots__ = ('_structure',)
+
+    def __init__(self, structure):
+        self._structure = structure
+
+    def __getitem__(self, usage_key):
+        return self._structure[usage_key]
+
+    def __iter__(self):
+        return (block_key for block_key, _ in self._structure.iteritems())
+
+    def __len__(self):
+        return sum(self._structure._has_data)
+
+
+class _CompactFields(MutableMapping):
+    """
+    View of the values of a single block in the given columns of a
+    CompactBlockStructure, with the interface of a dict.
+    """
+    __slots__ = ('_structure', '_columns', '_block_id')
+
+    def __init__(self, structure, columns, block_id):
+        self._structure = structure
+        self._columns = columns
+        self._block_id = block_id
+
+    def __getitem__(self, field_name):
+        value = self._structure._get_value(self._columns, field_name, self._block_id, _MISSING)
+        if value is _MISSING:
+            raise KeyError(field_name)
+        return value
+
+    def __setitem__(self, field_name, value):
+        self._structure._get_column(self._columns, field_name)[self._block_id] = value
+
+    def __delitem__(self, field_name):
+        if field_name not in self:
+            raise KeyError(field_name)
+        self._structure._get_column(self._columns, field_name)[self._block_id] = _MISSING
+
+    def __contains__(self, field_name):
+        return self._structure._get_value(self._columns, field_name, self._block_id, _MISSING) is not _MISSING
+
+    def __iter__(self):
+        block_id = self._block_id
+        return iter([
+            field_name
+            for field_name, column in self._columns.iteritems()
+            if block_id < len(column) and column[block_id] is not _MISSING
+        ])
+
+    def __len__(self):
+        return len(list(iter(self)))
+
+    def __repr__(self):
+        return repr(dict(self))
+
+
+class _CompactBlockData(object):
+    """
+    View of the data of a single block in a CompactBlockStructure, with
+    the interface of BlockData.
+    """
+    __slots__ = ('_structure', '_block_id')
+
+    def __init__(self, structure, block_id):
+        object.__setattr__(self, '_structure', structure)
+        object.__setattr__(self, '_block_id', block_id)
+
+    @property
+    def location(self):
+        """
+        Location (or usage key) of the block.
+        """
+        return self._structure._block_keys[self._block_id]
+
+    @property
+    def fields(self):
+        """
+        Map of the block's xBlock field names to their values.
+        """
+        return _CompactFields(self._structure, self._structure._xblock_fields, self._block_id)
+
+    @property
+    def transformer_data(self):
+        """
+        Map of transformer name to its block-specific data.
+        """
+        return _CompactTransformerDataMap(self._structure, self._block_id)
+
+    def __getattr__(self, field_name):
+        value = self._structure._get_value(self._structure._xblock_fields, field_name, self._block_id, _MISSING)
+        if value is _MISSING:
+            raise AttributeError("Field {0} does not exist".format(field_name))
+        return value
+
+    def __setattr__(self, field_name, value):
+        if field_name == 'fields':
+            _replace_fields(self.fields, value)
+        elif field_name in ('location', 'transformer_data'):
+            raise AttributeError("Field {0} can't be set on a compact block".format(field_name))
+        else:
+            self.fields[field_name] = value
+
+    def __delattr__(self, field_name):
+        try:
+            del self.fields[field_name]
+        except KeyError:
+            raise AttributeError(field_name)
+
+
+class _CompactTransformerDataMap(MutableMapping):
+    """
+    View of the transformer data of a single block in a
+    CompactBlockStructure, with the interface of TransformerDataMap.
+    """
+    __slots__ = ('_structure', '_block_id')
+
+    def __init__(self, structure, block_id):
+        self._structure = structure
+        self._block_id = block_id
+
+    def __getitem__(self, transformer):
+        transformer_name = _transformer_name(transformer)
+        if not self._structure._has_transformer_block_data(self._block_id, transformer_name):
+            raise KeyError(transformer_name)
+        return _CompactTransformerData(self._structure, self._block_id, transformer_name)
+
+    def __setitem__(self, transformer, transformer_data):
+        _replace_fields(self.get_or_create(transformer).fields, transformer_data.fields)
+
+    def __delitem__(self, transformer):
+        if transformer not in self:
+            raise KeyError(_transformer_name(transformer))
+        self.get_or_create(transformer).fields.clear()
+
+    def __contains__(self, transformer):
+        return self._structure._has_transformer_block_data(self._block_id, _transformer_name(transformer))
+
+    def __iter__(self):
+        return iter([
+            transformer_name
+            for transformer_name in self._structure._transformer_block_fields
+            if transformer_name in self
+        ])
+
+    def __len__(self):
+        return len(list(iter(self)))
+
+    def get_or_create(self, transformer):
+        """
+        Returns the TransformerData of the given transformer.
+        """
+        return _CompactTransformerData(self._structure, self._block_id, _transformer_name(transformer))
+
+    def iteritems(self):
+        """
+        Returns an iterator of (transformer name, TransformerData) pairs.
+        """
+        for transformer_name in self:
+            yield transformer_name, _CompactTransformerData(self._structure, self._block_id, transformer_name)
+
+
+class _CompactTransformerData(object):
+    """
+    View of a transformer's data for a single block in a
+    CompactBlockStructure, with the interface of TransformerData.
+    """
+    __slots__ = ('_structure', '_block_id', '_transformer_name')
+
+    def __init__(self, structure, block_id, transformer_name):
+        object.__setattr__(self, '_structure', structure)
+        object.__setattr__(self, '_block_id', block_id)
+        object.__setattr__(self, '_transformer_name', transformer_name)
+
+    @property
+    def fields(self):
+        """
+        Map of the transformer's field names to their values for the block.
+        """
+        return _CompactFields(self._structure, self._columns(), self._block_id)
+
+    def _columns(self):
+        """
+        Returns the columns of the transformer's fields.
+        """
+        return self._structure._transformer_block_fields.setdefault(self._transformer_name, {})
+
+    def __getattr__(self, field_name):
+        value = self._structure._get_value(self._columns(), field_name, self._block_id, _MISSING)
+        if value is _MISSING:
+            raise AttributeError("Field {0} does not exist".format(field_name))
+        return value
+
+    def __setattr__(self, field_name, value):
+        if field_name == 'fields':
+            _replace_fields(self.fields, value)
+        else:
+            self.fields[field_name] = value
+
+    def __delattr__(self, field_name):
+        try:
+            del self.fields[field_name]
+        except KeyError:
+            raise AttributeError(field_name)
+
+
+def _replace_fields(fields, new_fields):
+    """
+    Replaces the values in the given fields view with the given ones.
+    """
+    new_fields = dict(new_fields)
+    fields.clear()
+    fields.update(new_fields)
@@ -16,6 +16,11 @@ INVALIDATE_CACHE_ON_PUBLISH = u'invalidate_cache_on_publish'
 STORAGE_BACKING_FOR_CACHE = u'storage_backing_for_cache'
 RAISE_ERROR_WHEN_NOT_FOUND = u'raise_error_when_not_found'
 PRUNE_OLD_VERSIONS = u'prune_old_versions'
+BINARY_SERIALIZATION = u'binary_serialization'
+PROCESS_CACHE = u'process_cache'
+INCREMENTAL_COLLECT = u'incremental_collect'
+COMPACT_BLOCK_STRUCTURE = u'compact_block_structure'
+TRANSFORMED_CACHE = u'transformed_cache'
 
 
 def waffle():
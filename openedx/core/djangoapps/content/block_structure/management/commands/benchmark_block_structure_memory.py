@@ -0,0 +1,155 @@
+"""
+Command to compare the memory footprint and access times of the default
+and compact representations of collected block structures.
+"""
+import os
+import resource
+
+from django.core.management.base import BaseCommand
+
+import openedx.core.djangoapps.content.block_structure.api as api
+from openedx.core.djangoapps.content.block_structure.compact import CompactBlockStructure
+from openedx.core.lib.command_utils import parse_course_keys
+
+from .benchmark_block_structure_serialization import (
+    SYNTHETIC_TRANSFORMERS,
+    create_synthetic_block_structure,
+    _time_in_ms,
+)
+
+
+class Command(BaseCommand):
+    """
+    Example usage:
+        $ ./manage.py lms benchmark_block_structure_memory --settings=devstack
+        $ ./manage.py lms benchmark_block_structure_memory --num_blocks 20000 --settings=devstack
+        $ ./manage.py lms benchmark_block_structure_memory --courses 'edX/DemoX/Demo_Course' --settings=devstack
+    """
+    help = u'Compares memory, copy time and traversal time of the default and compact block structures.'
+
+    def add_arguments(self, parser):
+        """
+        Entry point for subclassed commands to add custom arguments.
+        """
+        parser.add_argument(
+            '--courses',
+            dest='courses',
+            nargs='+',
+            help=u'Benchmark the collected block structures of the list of courses provided.',
+        )
+        parser.add_argument(
+            '--num_blocks',
+            help=u'Number of blocks in the synthetic block structure, used when no courses are provided.',
+            default=5000,
+            type=int,
+        )
+        parser.add_argument(
+            '--num_copies',
+            help=u'Number of copies of the block structure held in memory when measuring its footprint.',
+            default=10,
+            type=int,
+        )
+        parser.add_argument(
+            '--iterations',
+            help=u'Number of times each copy and traversal is timed.',
+            default=10,
+            type=int,
+        )
+
+    def handle(self, *args, **options):
+        if options.get('courses'):
+            block_structures = [
+                (unicode(course_key), api.get_course_in_cache(course_key))
+                for course_key in parse_course_keys(options['courses'])
+            ]
+        else:
+            block_structures = [
+                (u'synthetic', create_synthetic_block_structure(options['num_blocks'])),
+            ]
+
+        for name, block_structure in block_structures:
+            self._benchmark(name, block_structure, options['num_copies'], options['iterations'])
+
+    def _benchmark(self, name, block_structure, num_copies, iterations):
+        """
+        Writes the benchmark results of both representations for the
+        given block structure.
+        """
+        representations = [
+            (u'default', block_structure.copy),
+            (u'compact', lambda: CompactBlockStructure.create_from(block_structure.copy())),
+        ]
+
+        def hold_copies(create_representation):
+            """
+            Creates the representation and holds copies of it, as
+            concurrent requests for the course would.
+            """
+            representation = create_representation()
+            return [representation.copy() for _ in range(num_copies)]
+
+        # Memory is measured before any timing, so that memory freed by
+        # the timed runs doesn't hide the growth.
+        memory_results = [
+            _rss_growth_in_kb(hold_copies, create_representation)
+            for _, create_representation in representations
+        ]
+
+        self.stdout.write(u'{}: {} blocks, {} copies'.format(name, len(block_structure), num_copies))
+        self.stdout.write(u'{:<10}{:>16}{:>12}{:>18}'.format(
+            u'format', u'copies RSS (KB)', u'copy (ms)', u'traversal (ms)',
+        ))
+        for (representation_name, create_representation), memory_result in zip(representations, memory_results):
+            representation = create_representation()
+            self.stdout.write(u'{:<10}{:>16}{:>12.2f}{:>18.2f}'.format(
+                representation_name,
+                memory_result,
+                _time_in_ms(lambda block_structure: block_structure.copy(), representation, iterations),
+                _time_in_ms(_traverse, representation, iterations),
+            ))
+
+
+def _traverse(block_structure):
+    """
+    Traverses the given block structure and reads the fields of every
+    block, as a typical transform phase would.
+    """
+    for usage_key in block_structure.topological_traversal():
+        block_structure.get_xblock_field(usage_key, u'display_name')
+        block_structure.get_children(usage_key)
+        for transformer_name in SYNTHETIC_TRANSFORMERS:
+            block_structure.get_transformer_block_field(usage_key, transformer_name, u'value')
+
+
+def _rss_growth_in_kb(func, data):
+    """
+    Returns the growth in resident memory caused by calling func with data
+    and holding on to its result, measured in a forked child process.
+
+    Unlike the peak resident memory, which a forked child inherits from
+    its parent, the current resident memory is read from /proc.
+    """
+    read_fd, write_fd = os.pipe()
+    pid = os.fork()
+    if pid == 0:  # pragma: no cover
+        os.close(read_fd)
+        baseline = _current_rss_in_kb()
+        result = func(data)
+        os.write(write_fd, str(_current_rss_in_kb() - baseline))
+        del result
+        os._exit(0)  # pylint: disable=protected-access
+
+    os.close(write_fd)
+    result = os.read(read_fd, 64)
+    os.close(read_fd)
+    os.waitpid(pid, 0)
+    return int(result)
+
+
+def _current_rss_in_kb():
+    """
+    Returns the current resident memory of this process.
+    """
+    with open('/proc/self/statm') as statm:
+        resident_pages = int(statm.read().split()[1])
+    return resident_pages * resource.getpagesize() / 1024
@@ -0,0 +1,206 @@
+"""
+Command to compare the serialization formats of collected block structures.
+"""
+import os
+import resource
+from timeit import default_timer
+
+from django.core.management.base import BaseCommand
+from opaque_keys.edx.locator import BlockUsageLocator, CourseLocator
+
+import openedx.core.djangoapps.content.block_structure.api as api
+from openedx.core.djangoapps.content.block_structure import serialization
+from openedx.core.djangoapps.content.block_structure.block_structure import BlockStructureBlockData
+from openedx.core.lib.cache_utils import zpickle, zunpickle
+from openedx.core.lib.command_utils import parse_course_keys
+
+
+# Transformer names used for the data collected into synthetic block structures.
+SYNTHETIC_TRANSFORMERS = [u'blocks_api', u'grades', u'milestones', u'completion']
+
+
+class Command(BaseCommand):
+    """
+    Example usage:
+        $ ./manage.py lms benchmark_block_structure_serialization --settings=devstack
+        $ ./manage.py lms benchmark_block_structure_serialization --num_blocks 20000 --settings=devstack
+        $ ./manage.py lms benchmark_block_structure_serialization --courses 'edX/DemoX/Demo_Course' --settings=devstack
+    """
+    help = u'Compares size, decode time and peak memory of the zpickle and binary block structure formats.'
+
+    def add_arguments(self, parser):
+        """
+        Entry point for subclassed commands to add custom arguments.
+        """
+        parser.add_argument(
+            '--courses',
+            dest='courses',
+            nargs='+',
+            help=u'Benchmark the collected block structures of the list of courses provided.',
+        )
+        parser.add_argument(
+            '--num_blocks',
+            help=u'Number of blocks in the synthetic block structure, used when no courses are provided.',
+            default=5000,
+            type=int,
+        )
+        parser.add_argument(
+            '--iterations',
+            help=u'Number of times each decode is timed.',
+            default=10,
+            type=int,
+        )
+
+    def handle(self, *args, **options):
+        if options.get('courses'):
+            block_structures = [
+                (unicode(course_key), api.get_course_in_cache(course_key))
+                for course_key in parse_course_keys(options['courses'])
+            ]
+        else:
+            block_structures = [
+                (u'synthetic', create_synthetic_block_structure(options['num_blocks'])),
+            ]
+
+        for name, block_structure in block_structures:
+            self._benchmark(name, block_structure, options['iterations'])
+
+    def _benchmark(self, name, block_structure, iterations):
+        """
+        Writes the benchmark results of both formats for the given block structure.
+        """
+        root_key = block_structure.root_block_usage_key
+
+        def decode_binary(data):
+            """
+            Decodes binary data, including all transformer sections.
+            """
+            _read_all_transformers(serialization.deserialize(data, root_key))
+
+        def decode_binary_one_transformer(data):
+            """
+            Decodes binary data, including a single transformer section.
+            """
+            _read_one_transformer(serialization.deserialize(data, root_key))
+
+        # pylint: disable=protected-access
+        zpickle_data = zpickle((
+            block_structure._block_relations,
+            block_structure.transformer_data,
+            block_structure._block_data_map,
+        ))
+        formats = [
+            # The zpickle format can only be decoded in full.
+            (u'zpickle', zpickle_data, zunpickle, zunpickle),
+            (u'binary', serialization.serialize(block_structure), decode_binary, decode_binary_one_transformer),
+        ]
+
+        self.stdout.write(u'{}: {} blocks'.format(name, len(block_structure)))
+        self.stdout.write(u'{:<10}{:>14}{:>18}{:>22}{:>16}'.format(
+            u'format', u'size (bytes)', u'full decode (ms)', u'one transformer (ms)', u'peak RSS (KB)',
+        ))
+        for format_name, data, decode_all, decode_one_transformer in formats:
+            self.stdout.write(u'{:<10}{:>14}{:>18.2f}{:>22.2f}{:>16}'.format(
+                format_name,
+                len(data),
+                _time_in_ms(decode_all, data, iterations),
+                _time_in_ms(decode_one_transformer, data, iterations),
+                _peak_rss_in_kb(decode_all, data),
+            ))
+
+
+def create_synthetic_block_structure(num_blocks):
+    """
+    Returns a collected block structure with the given number of blocks,
+    shaped like a typical course and populated with xBlock fields and
+    transformer data.
+    """
+    course_key = CourseLocator(u'benchmark', u'course', u'run')
+
+    def block_key(block_type, index):
+        """
+        Returns the usage key of the index-th block of the given type.
+        """
+        return BlockUsageLocator(course_key, block_type, u'{}_{}'.format(block_type, index))
+
+    root_key = block_key(u'course', 0)
+    block_structure = BlockStructureBlockData(root_key)
+    block_types = [u'chapter', u'sequential', u'vertical', u'problem']
+    level = [root_key]
+    depth = 0
+    index = 1
+    while index < num_blocks:
+        # Each block has 5 children, with all blocks below the
+        # vertical level being problems.
+        block_type = block_types[min(depth, len(block_types) - 1)]
+        next_level = []
+        for parent_key in level:
+            for _ in range(5):
+                if index >= num_blocks:
+                    break
+                child_key = block_key(block_type, index)
+                block_structure._add_relation(parent_key, child_key)  # pylint: disable=protected-access
+                next_level.append(child_key)
+                index += 1
+        level = next_level
+        depth += 1
+
+    for usage_key in block_structure:
+        block_data = block_structure._get_or_create_block(usage_key)  # pylint: disable=protected-access
+        block_data.display_name = u'Block {}'.format(usage_key.block_id)
+        block_data.category = usage_key.block_type
+        block_data.graded = usage_key.block_type == u'sequential'
+        block_data.visible_to_staff_only = False
+        for transformer_name in SYNTHETIC_TRANSFORMERS:
+            block_structure.set_transformer_block_field(usage_key, transformer_name, u'value', usage_key.block_id)
+    return block_structure
+
+
+def _read_one_transformer(block_structure):
+    """
+    Reads the data of a single transformer for every block in the given
+    block structure, as a typical transform phase would.
+    """
+    for usage_key in block_structure:
+        block_structure.get_transformer_block_field(usage_key, SYNTHETIC_TRANSFORMERS[0], u'value')
+
+
+def _read_all_transformers(block_structure):
+    """
+    Forces the decoding of all transformer data of the given block structure.
+    """
+    for block_data in block_structure.itervalues():
+        block_data.transformer_data.keys()
+
+
+def _time_in_ms(func, data, iterations):
+    """
+    Returns the mean duration in milliseconds of calling func with data.
+    """
+    start = default_timer()
+    for _ in range(iterations):
+        func(data)
+    return (default_timer() - start) * 1000 / iterations
+
+
+def _peak_rss_in_kb(func, data):
+    """
+    Returns the growth in peak resident memory caused by calling func with
+    data, measured in a forked child process so that measurements don't
+    interfere with each other.
+    """
+    read_fd, write_fd = os.pipe()
+    pid = os.fork()
+    if pid == 0:  # pragma: no cover
+        os.close(read_fd)
+        baseline = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        func(data)
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        os.write(write_fd, str(peak - baseline))
+        os._exit(0)  # pylint: disable=protected-access
+
+    os.close(write_fd)
+    result = os.read(read_fd, 64)
+    os.close(read_fd)
+    os.waitpid(pid, 0)
+    return int(result)
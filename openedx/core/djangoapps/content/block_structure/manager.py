@@ -5,9 +5,12 @@ BlockStructures.
 from contextlib import contextmanager
 
 from . import config
+from .compact import CompactBlockStructure
 from .exceptions import UsageKeyNotInBlockStructure, TransformerDataIncompatible, BlockStructureNotFound
 from .factory import BlockStructureFactory
+from .process_cache import get_transformed_cache
 from .store import BlockStructureStore
+from .transformer_registry import TransformerRegistry
 from .transformers import BlockStructureTransformers
 
 
@@ -41,7 +44,13 @@ class BlockStructureManager(object):
         and modulestore, as needed.
 
         Details: Similar to the get_collected method, except the transformers'
-        transform methods are also called.
+        transform methods are also called.  When the transformed cache is
+        enabled and every transformer declares the user attributes its
+        output depends on, the transformed block structure is cached in
+        this process for the combined signature of those attributes, so
+        that it's only transformed once for all users sharing it.  It's
+        cached as a CompactBlockStructure, so each hit is served with a
+        copy-on-write copy rather than a deep copy.
 
         Arguments:
             transformers (BlockStructureTransformers) - Collection of
@@ -60,20 +69,36 @@ class BlockStructureManager(object):
             BlockStructureBlockData - A transformed block structure,
                 starting at starting_block_usage_key.
         """
-        block_structure = collected_block_structure.copy() if collected_block_structure else self.get_collected()
+        block_structure = collected_block_structure if collected_block_structure else self.get_collected()
+
+        if starting_block_usage_key and starting_block_usage_key not in block_structure:
+            raise UsageKeyNotInBlockStructure(
+                "The requested usage_key '{0}' is not found in the block_structure with root '{1}'",
+                unicode(starting_block_usage_key),
+                unicode(self.root_block_usage_key),
+            )
+
+        transformed_cache_key = self._transformed_cache_key(transformers, starting_block_usage_key, block_structure)
+        if transformed_cache_key:
+            transformed_block_structure = get_transformed_cache().get(transformed_cache_key)
+            if transformed_block_structure is not None:
+                return transformed_block_structure.copy()
+
+        if block_structure is collected_block_structure:
+            block_structure = block_structure.copy()
 
         if starting_block_usage_key:
             # Override the root_block_usage_key so traversals start at the
             # requested location.  The rest of the structure will be pruned
             # as part of the transformation.
-            if starting_block_usage_key not in block_structure:
-                raise UsageKeyNotInBlockStructure(
-                    "The requested usage_key '{0}' is not found in the block_structure with root '{1}'",
-                    unicode(starting_block_usage_key),
-                    unicode(self.root_block_usage_key),
-                )
             block_structure.set_root_block(starting_block_usage_key)
         transformers.transform(block_structure)
+
+        if transformed_cache_key:
+            if not isinstance(block_structure, CompactBlockStructure):
+                block_structure = CompactBlockStructure.create_from(block_structure)
+            get_transformed_cache().set(transformed_cache_key, block_structure, len(block_structure))
+            return block_structure.copy()
         return block_structure
 
     def get_collected(self):
@@ -105,29 +130,76 @@ class BlockStructureManager(object):
 
         return block_structure
 
-    def update_collected_if_needed(self):
+    def update_collected_if_needed(self, root_xblock=None):
         """
         The store is updated with newly collected transformers data from
         the modulestore, only if the data in the store is outdated.
+
+        Arguments:
+            root_xblock (XBlock) - The xBlock for the root_block_usage_key,
+                if already loaded from the modulestore with all of its
+                descendants.  Can be optionally provided for optimization.
         """
         with self._bulk_operations():
             if not self.store.is_up_to_date(self.root_block_usage_key, self.modulestore):
-                self._update_collected()
+                self._update_collected(root_xblock)
+
+    def _transformed_cache_key(self, transformers, starting_block_usage_key, collected_block_structure):
+        """
+        Returns the key of the transformed block structure in the
+        transformed cache, or None if it must not be cached.  The key
+        includes the version of the collected data, so that entries
+        are invalidated whenever the block structure is re-collected.
+        """
+        if not config.waffle().is_enabled(config.TRANSFORMED_CACHE):
+            return None
+
+        data_version = self.store.get_data_version(self.root_block_usage_key)
+        if not data_version:
+            return None
+
+        signature = transformers.user_signature(collected_block_structure)
+        if signature is None:
+            return None
 
-    def _update_collected(self):
+        return (
+            (self.root_block_usage_key, starting_block_usage_key or self.root_block_usage_key, signature),
+            data_version,
+            TransformerRegistry.get_write_version_hash(),
+        )
+
+    def _update_collected(self, root_xblock=None):
         """
         The store is updated with newly collected transformers data from
         the modulestore.
         """
         with self._bulk_operations():
+            previous_block_structure = self._get_previous_collected()
             block_structure = BlockStructureFactory.create_from_modulestore(
                 self.root_block_usage_key,
                 self.modulestore,
+                root_xblock,
             )
-            BlockStructureTransformers.collect(block_structure)
+            if previous_block_structure is not None:
+                BlockStructureTransformers.collect_incrementally(block_structure, previous_block_structure)
+            else:
+                BlockStructureTransformers.collect(block_structure)
             self.store.add(block_structure)
             return block_structure
 
+    def _get_previous_collected(self):
+        """
+        Returns the currently stored collected Block Structure for the
+        root_block_usage_key, if incremental collection is enabled and
+        the block structure is found.  Otherwise, returns None.
+        """
+        if not config.waffle().is_enabled(config.INCREMENTAL_COLLECT):
+            return None
+        try:
+            return self.store.get(self.root_block_usage_key)
+        except BlockStructureNotFound:
+            return None
+
     def clear(self):
         """
         Removes data for the block structure associated with the given
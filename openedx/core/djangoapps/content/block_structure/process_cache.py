@@ -0,0 +1,232 @@
+"""
+Module for the process-local cache of collected BlockStructures.
+
+The process cache is a tier in front of the Django cache (memcached)
+that holds already deserialized collected block structures, so that
+frequently requested courses are neither transferred from memcached
+nor decompressed on every request.
+
+Each gunicorn worker has its own process cache, bounded by the
+approximate memory used by the block structures it holds.  They are
+held as CompactBlockStructures, whose copies share the collected values
+with the cached instance, so serving an entry doesn't copy its data.  Entries are keyed
+by the version of the collected data, which BlockStructureStore keeps
+in the Django cache and updates whenever the data is re-collected or
+deleted.  Therefore, entries of other processes are invalidated as
+soon as the block structure is updated by the signal handlers and
+celery tasks.
+
+A second, separate cache holds transformed block structures, also as
+CompactBlockStructures, keyed by the version of the collected data they
+were transformed from and by the user signature of their transformers
+(see BlockStructureTransformer.user_signature).  Since transformed block
+structures are never serialized, its entries are sized by their number
+of blocks rather than in bytes.
+"""
+import sys
+from array import array
+from collections import OrderedDict, namedtuple
+from logging import getLogger
+from threading import Lock
+
+from django.conf import settings
+
+
+logger = getLogger(__name__)  # pylint: disable=C0103
+
+# Default maximum total size, in bytes, of the entries in a process cache.
+DEFAULT_MAX_SIZE_IN_BYTES = 128 * 1024 * 1024
+
+# Default maximum total number of blocks of the entries in a transformed
+# cache.
+DEFAULT_TRANSFORMED_MAX_BLOCKS = 50 * 1000
+
+
+ProcessCacheStats = namedtuple(
+    'ProcessCacheStats',
+    ['hits', 'misses', 'evictions', 'entries', 'size_in_bytes', 'max_size_in_bytes'],
+)
+
+
+class BlockStructureProcessCache(object):
+    """
+    Least-recently-used cache of collected block structures, bounded
+    by the total size of the cached block structures.
+    """
+    def __init__(self, max_size_in_bytes):
+        """
+        Arguments:
+            max_size_in_bytes (int) - The maximum total size of the
+                block structures held by this cache.
+        """
+        self.max_size_in_bytes = max_size_in_bytes
+
+        # Map of an entry's key to a tuple of its block structure and
+        # size, ordered from the least to the most recently used.
+        # OrderedDict {tuple: (BlockStructureBlockData, int)}
+        self._entries = OrderedDict()
+        self._size_in_bytes = 0
+        self._lock = Lock()
+
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+
+    def get(self, key):
+        """
+        Returns the block structure cached for the given key, or None if
+        not found.
+
+        Note: The returned block structure is shared with future callers
+        and must not be mutated.
+
+        Arguments:
+            key (tuple) - A tuple whose first item is the usage key of
+                the root of the block structure, followed by version
+                data of the block structure.
+        """
+        with self._lock:
+            entry = self._entries.pop(key, None)
+            if entry is None:
+                self._misses += 1
+                return None
+            self._entries[key] = entry
+            self._hits += 1
+            return entry[0]
+
+    def set(self, key, block_structure, size_in_bytes):
+        """
+        Caches the given block structure for the given key, replacing
+        any older versions of the block structure and evicting the
+        least recently used entries to stay within the maximum size.
+
+        Arguments:
+            key (tuple) - See the description in get.
+
+            block_structure (BlockStructureBlockData) - The collected
+                block structure.  It must not be mutated after it is
+                cached.
+
+            size_in_bytes (int) - The size of the block structure, see
+                approximate_size_in_bytes.
+        """
+        if size_in_bytes > self.max_size_in_bytes:
+            return
+
+        with self._lock:
+            self._remove(lambda entry_key: entry_key[0] == key[0])
+            while self._entries and self._size_in_bytes + size_in_bytes > self.max_size_in_bytes:
+                _, (_, evicted_size) = self._entries.popitem(last=False)
+                self._size_in_bytes -= evicted_size
+                self._evictions += 1
+            self._entries[key] = (block_structure, size_in_bytes)
+            self._size_in_bytes += size_in_bytes
+
+    def delete(self, root_block_usage_key):
+        """
+        Removes all versions of the block structure with the given root
+        from the cache.
+        """
+        with self._lock:
+            self._remove(lambda entry_key: entry_key[0] == root_block_usage_key)
+
+    def clear(self):
+        """
+        Removes all entries from the cache and resets its counters.
+        """
+        with self._lock:
+            self._entries.clear()
+            self._size_in_bytes = 0
+            self._hits = self._misses = self._evictions = 0
+
+    def stats(self):
+        """
+        Returns a ProcessCacheStats with the counters of this cache.
+        """
+        with self._lock:
+            return ProcessCacheStats(
+                hits=self._hits,
+                misses=self._misses,
+                evictions=self._evictions,
+                entries=len(self._entries),
+                size_in_bytes=self._size_in_bytes,
+                max_size_in_bytes=self.max_size_in_bytes,
+            )
+
+    def _remove(self, condition):
+        """
+        Removes the entries whose keys satisfy the given condition.
+        Must be called while holding the lock.
+        """
+        for entry_key in [entry_key for entry_key in self._entries if condition(entry_key)]:
+            _, size_in_bytes = self._entries.pop(entry_key)
+            self._size_in_bytes -= size_in_bytes
+
+
+# Types of objects that don't reference other objects.
+_ATOMIC_TYPES = (basestring, int, long, float, bool, type(None), array, bytearray)
+
+
+def approximate_size_in_bytes(block_structure):
+    """
+    Returns an approximation of the memory used by the given block
+    structure: the total size of the objects reachable from it, each
+    counted once.
+    """
+    size_in_bytes = 0
+    seen = set()
+    pending = [block_structure]
+    while pending:
+        obj = pending.pop()
+        if id(obj) in seen or isinstance(obj, type):
+            continue
+        seen.add(id(obj))
+        size_in_bytes += sys.getsizeof(obj)
+
+        if isinstance(obj, _ATOMIC_TYPES):
+            continue
+        elif isinstance(obj, dict):
+            pending.extend(obj.iterkeys())
+            pending.extend(obj.itervalues())
+        elif isinstance(obj, (list, tuple, set, frozenset)):
+            pending.extend(obj)
+        else:
+            if hasattr(obj, '__dict__'):
+                pending.append(obj.__dict__)
+            for cls in type(obj).__mro__:
+                slots = cls.__dict__.get('__slots__', ())
+                for slot in (slots,) if isinstance(slots, basestring) else slots:
+                    pending.append(getattr(obj, slot, None))
+    return size_in_bytes
+
+
+_process_cache = None  # pylint: disable=invalid-name
+
+
+def get_process_cache():
+    """
+    Returns the process cache of this process, creating it on first use.
+    """
+    global _process_cache  # pylint: disable=global-statement, invalid-name
+    if _process_cache is None:
+        _process_cache = BlockStructureProcessCache(
+            settings.BLOCK_STRUCTURES_SETTINGS.get('PROCESS_CACHE_MAX_SIZE_IN_BYTES', DEFAULT_MAX_SIZE_IN_BYTES)
+        )
+    return _process_cache
+
+
+_transformed_cache = None  # pylint: disable=invalid-name
+
+
+def get_transformed_cache():
+    """
+    Returns the cache of transformed block structures of this process,
+    creating it on first use.  Its entries are sized by their number of
+    blocks.
+    """
+    global _transformed_cache  # pylint: disable=global-statement, invalid-name
+    if _transformed_cache is None:
+        _transformed_cache = BlockStructureProcessCache(
+            settings.BLOCK_STRUCTURES_SETTINGS.get('TRANSFORMED_CACHE_MAX_BLOCKS', DEFAULT_TRANSFORMED_MAX_BLOCKS)
+        )
+    return _transformed_cache
@@ -0,0 +1,349 @@
+"""
+Module for the binary serialization format of collected BlockStructures.
+
+Unlike a single pickle of the entire structure, the binary format is
+columnar so that a reader only pays for the data it actually accesses:
+
+    * Header - Magic bytes, format version and section counts.
+    * Course key table - The distinct course keys of all blocks.
+    * Block key table - One (course key index, block type, block id)
+      entry per block.  Usage keys are rebuilt from the (interned)
+      course keys instead of being individually unpickled.
+    * Adjacency arrays - CSR-style children offsets and child indices,
+      from which the parents of each block are also derived.
+    * Field sections - One compressed section for the collected xBlock
+      fields, one for the structure-wide transformer data and one per
+      transformer for its block-specific data.
+
+The xBlock fields and structure-wide transformer data are decoded
+eagerly.  Each transformer's block-specific section is decoded only
+when data for that transformer is first accessed on any block.
+
+Field values can be of any picklable type, so the contents of each
+section are still pickled; only the framing is binary.
+"""
+# pylint: disable=protected-access
+import cPickle as pickle
+import struct
+import zlib
+from array import array
+
+from opaque_keys.edx.keys import CourseKey
+
+from .block_structure import BlockData, TransformerData, TransformerDataMap, _BlockRelations
+from .factory import BlockStructureFactory
+
+
+# Magic bytes at the start of every binary serialized block structure.
+# Since zlib streams always start with 0x78, these can never be
+# confused with the legacy zpickle format.
+MAGIC = b'BSBF'
+
+# The latest version of the binary format.  Incrementally update this
+# value whenever the layout of the format changes.
+FORMAT_VERSION = 1
+
+# Section names reserved by the format itself.  Transformer names are
+# used for all other sections.
+XBLOCK_FIELDS_SECTION = u'__xblock_fields__'
+TRANSFORMER_DATA_SECTION = u'__transformer_data__'
+
+_HEADER = struct.Struct('<4sHIII')
+_LENGTH = struct.Struct('<I')
+_INDEX_TYPECODE = 'I'
+
+
+class BlockStructureSerializationError(Exception):
+    """
+    Raised when serialized data is not in a supported binary format.
+    """
+    pass
+
+
+def is_binary_format(serialized_data):
+    """
+    Returns whether the given serialized data is in the binary format.
+    """
+    return serialized_data[:len(MAGIC)] == MAGIC
+
+
+def serialize(block_structure):
+    """
+    Returns a binary serialization of the given collected block structure.
+
+    Arguments:
+        block_structure (BlockStructureBlockData) - The block structure
+            that is to be serialized.
+
+    Returns:
+        str - The serialized data.
+    """
+    block_relations = block_structure._block_relations
+    block_data_map = block_structure._block_data_map
+
+    # Blocks that are in the structure come first, followed by any blocks
+    # that only have collected data.
+    block_keys = list(block_relations)
+    block_keys.extend(key for key in block_data_map if key not in block_relations)
+    block_indices = {block_key: index for index, block_key in enumerate(block_keys)}
+
+    course_key_indices = {}
+    key_table = []
+    for block_key in block_keys:
+        course_key_index = course_key_indices.setdefault(block_key.course_key, len(course_key_indices))
+        key_table.append(u'{}\t{}\t{}'.format(course_key_index, block_key.block_type, block_key.block_id))
+    course_keys = sorted(course_key_indices, key=course_key_indices.get)
+
+    child_offsets = array(_INDEX_TYPECODE, [0])
+    child_indices = array(_INDEX_TYPECODE)
+    for block_key in block_keys[:len(block_relations)]:
+        child_indices.extend(block_indices[child] for child in block_relations[block_key].children)
+        child_offsets.append(len(child_indices))
+
+    xblock_fields = {}
+    transformer_sections = {}
+    for block_key, block_data in block_data_map.iteritems():
+        block_index = block_indices[block_key]
+        xblock_fields[block_index] = block_data.fields
+        for transformer_name, transformer_block_data in block_data.transformer_data.iteritems():
+            transformer_sections.setdefault(transformer_name, {})[block_index] = transformer_block_data.fields
+
+    sections = [
+        (XBLOCK_FIELDS_SECTION, xblock_fields),
+        (TRANSFORMER_DATA_SECTION, dict(block_structure.transformer_data)),
+    ]
+    sections.extend(sorted(transformer_sections.iteritems()))
+
+    chunks = [
+        _HEADER.pack(MAGIC, FORMAT_VERSION, len(block_keys), len(block_relations), len(sections)),
+        _pack_bytes(u'\n'.join(unicode(course_key) for course_key in course_keys).encode('utf-8')),
+        _pack_bytes(zlib.compress(u'\n'.join(key_table).encode('utf-8'))),
+        _pack_bytes(child_offsets.tostring()),
+        _pack_bytes(child_indices.tostring()),
+    ]
+    for section_name, section_data in sections:
+        chunks.append(_pack_bytes(section_name.encode('utf-8')))
+        chunks.append(_pack_bytes(zlib.compress(pickle.dumps(section_data, pickle.HIGHEST_PROTOCOL))))
+    return b''.join(chunks)
+
+
+def deserialize(serialized_data, root_block_usage_key):
+    """
+    Deserializes the given binary data and returns the block structure.
+    Block-specific transformer data is decoded lazily, on first access.
+
+    Arguments:
+        serialized_data (str) - Data previously returned by serialize.
+
+        root_block_usage_key (UsageKey) - The usage key of the root of
+            the block structure.
+
+    Returns:
+        BlockStructureBlockData - The deserialized block structure.
+
+    Raises:
+        BlockStructureSerializationError if the data is not in a
+        supported binary format.
+    """
+    if not is_binary_format(serialized_data):
+        raise BlockStructureSerializationError('Data is not in the binary block structure format.')
+
+    _, version, num_blocks, num_related_blocks, num_sections = _HEADER.unpack_from(serialized_data)
+    if version != FORMAT_VERSION:
+        raise BlockStructureSerializationError(
+            'Unsupported block structure format version {} (expected {}).'.format(version, FORMAT_VERSION)
+        )
+    reader = _Reader(serialized_data, _HEADER.size)
+
+    # The course key table is always written, even when it is empty, so it
+    # must always be read to stay in step with the following chunks.
+    course_key_table = reader.read_bytes().decode('utf-8')
+    course_keys = [
+        CourseKey.from_string(course_key) for course_key in course_key_table.split(u'\n')
+    ] if num_blocks else []
+
+    block_keys = []
+    key_table = zlib.decompress(reader.read_bytes()).decode('utf-8')
+    for entry in key_table.split(u'\n') if num_blocks else []:
+        course_key_index, block_type, block_id = entry.split(u'\t')
+        block_keys.append(course_keys[int(course_key_index)].make_usage_key(block_type, block_id))
+
+    child_offsets = array(_INDEX_TYPECODE)
+    child_offsets.fromstring(reader.read_bytes())
+    child_indices = array(_INDEX_TYPECODE)
+    child_indices.fromstring(reader.read_bytes())
+
+    block_relations = {block_key: _BlockRelations() for block_key in block_keys[:num_related_blocks]}
+    for parent_index in xrange(num_related_blocks):
+        parent_key = block_keys[parent_index]
+        parent_relations = block_relations[parent_key]
+        for child_index in child_indices[child_offsets[parent_index]:child_offsets[parent_index + 1]]:
+            child_key = block_keys[child_index]
+            parent_relations.children.append(child_key)
+            block_relations[child_key].parents.append(parent_key)
+
+    section_offsets = {}
+    for _ in xrange(num_sections):
+        section_name = reader.read_bytes().decode('utf-8')
+        section_offsets[section_name] = reader.skip_bytes()
+
+    block_data_map = {}
+    lazy_sections = _LazySections(serialized_data, section_offsets, block_keys, block_data_map)
+    for block_index, fields in lazy_sections.pop_section(XBLOCK_FIELDS_SECTION).iteritems():
+        block_key = block_keys[block_index]
+        block_data = BlockData(block_key)
+        block_data.fields = fields
+        block_data.transformer_data = _LazyTransformerDataMap(lazy_sections)
+        block_data_map[block_key] = block_data
+
+    transformer_data = TransformerDataMap(lazy_sections.pop_section(TRANSFORMER_DATA_SECTION))
+
+    return BlockStructureFactory.create_new(
+        root_block_usage_key,
+        block_relations,
+        transformer_data,
+        block_data_map,
+    )
+
+
+def _pack_bytes(data):
+    """
+    Returns the given bytes prefixed by their length.
+    """
+    return _LENGTH.pack(len(data)) + data
+
+
+class _Reader(object):
+    """
+    Sequential reader of length-prefixed chunks of serialized data.
+    """
+    def __init__(self, data, offset):
+        self.data = data
+        self.offset = offset
+
+    def skip_bytes(self):
+        """
+        Skips over the next chunk without copying it and returns its
+        (start, end) offsets within the data.
+        """
+        length, = _LENGTH.unpack_from(self.data, self.offset)
+        start = self.offset + _LENGTH.size
+        self.offset = start + length
+        return start, self.offset
+
+    def read_bytes(self):
+        """
+        Returns the next chunk.
+        """
+        start, end = self.skip_bytes()
+        return self.data[start:end]
+
+
+class _LazySections(object):
+    """
+    Holds the not yet decoded field sections of a deserialized block
+    structure, decoding each one only when it is first needed.
+    """
+    def __init__(self, data, section_offsets, block_keys, block_data_map):
+        self.data = data
+        self.section_offsets = section_offsets
+        self.block_keys = block_keys
+        self.block_data_map = block_data_map
+
+    def pop_section(self, section_name):
+        """
+        Decodes, forgets and returns the data of the given section.
+        Returns None if the section is not present or already decoded.
+        """
+        offsets = self.section_offsets.pop(section_name, None)
+        if offsets is None:
+            return None
+        start, end = offsets
+        return pickle.loads(zlib.decompress(self.data[start:end]))
+
+    def load(self, transformer_name):
+        """
+        Decodes the given transformer's section, if not yet decoded,
+        into the TransformerDataMaps of the blocks that are still in
+        the block structure.
+        """
+        section = self.pop_section(transformer_name)
+        if section is None:
+            return
+        for block_index, fields in section.iteritems():
+            block_data = self.block_data_map.get(self.block_keys[block_index])
+            if block_data is not None:
+                transformer_block_data = TransformerData()
+                transformer_block_data.fields = fields
+                dict.__setitem__(block_data.transformer_data, transformer_name, transformer_block_data)
+        if not self.section_offsets:
+            # Release the serialized data once all sections are decoded.
+            self.data = None
+
+    def load_all(self):
+        """
+        Decodes all remaining sections.
+        """
+        for transformer_name in list(self.section_offsets):
+            self.load(transformer_name)
+
+
+class _LazyTransformerDataMap(TransformerDataMap):
+    """
+    A TransformerDataMap whose entries are decoded from _LazySections
+    on first access.
+    """
+    def __init__(self, lazy_sections):
+        super(_LazyTransformerDataMap, self).__init__()
+        self._lazy_sections = lazy_sections
+
+    def __getitem__(self, key):
+        self._lazy_sections.load(self._translate_key(key))
+        return super(_LazyTransformerDataMap, self).__getitem__(key)
+
+    def __setitem__(self, key, value):
+        self._lazy_sections.load(self._translate_key(key))
+        super(_LazyTransformerDataMap, self).__setitem__(key, value)
+
+    def __delitem__(self, key):
+        self._lazy_sections.load(self._translate_key(key))
+        super(_LazyTransformerDataMap, self).__delitem__(key)
+
+    def __contains__(self, key):
+        key = self._translate_key(key)
+        self._lazy_sections.load(key)
+        return dict.__contains__(self, key)
+
+    def get(self, key, default=None):
+        try:
+            return self[key]
+        except KeyError:
+            return default
+
+    def __iter__(self):
+        self._lazy_sections.load_all()
+        return super(_LazyTransformerDataMap, self).__iter__()
+
+    def __len__(self):
+        self._lazy_sections.load_all()
+        return super(_LazyTransformerDataMap, self).__len__()
+
+    def keys(self):
+        self._lazy_sections.load_all()
+        return super(_LazyTransformerDataMap, self).keys()
+
+    def items(self):
+        self._lazy_sections.load_all()
+        return super(_LazyTransformerDataMap, self).items()
+
+    def iteritems(self):
+        self._lazy_sections.load_all()
+        return super(_LazyTransformerDataMap, self).iteritems()
+
+    def values(self):
+        self._lazy_sections.load_all()
+        return super(_LazyTransformerDataMap, self).values()
+
+    def itervalues(self):
+        self._lazy_sections.load_all()
+        return super(_LazyTransformerDataMap, self).itervalues()
@@ -8,8 +8,10 @@ from xmodule.modulestore.django import SignalHandler
 
 from opaque_keys.edx.locator import LibraryLocator
 
+from openedx.core.djangoapps.content.publish_pipeline.api import publish_consumer, publish_pipeline_enabled
+
 from . import config
-from .api import clear_course_from_cache
+from .api import clear_course_from_cache, update_course_in_cache
 from .tasks import update_course_in_cache_v2
 
 
@@ -20,7 +22,7 @@ def _update_block_structure_on_course_publish(sender, course_key, **kwargs):  #
     store and creates/updates the corresponding cache entry.
     Ignores publish signals from content libraries.
     """
-    if isinstance(course_key, LibraryLocator):
+    if isinstance(course_key, LibraryLocator) or publish_pipeline_enabled():
         return
 
     if config.waffle().is_enabled(config.INVALIDATE_CACHE_ON_PUBLISH):
@@ -32,6 +34,22 @@ def _update_block_structure_on_course_publish(sender, course_key, **kwargs):  #
     )
 
 
+@publish_consumer(u'block_structure', modifies_course=True)
+def _update_block_structure_from_published_course(course_key, course):
+    """
+    Creates/updates the cache entry of the course from the course loaded
+    by the publish pipeline.
+
+    Note: Collecting the split_test transformer's data sets the
+    group_access field of the xBlocks in split_test modules, so this
+    consumer runs after those which don't modify the course.
+    """
+    if config.waffle().is_enabled(config.INVALIDATE_CACHE_ON_PUBLISH):
+        clear_course_from_cache(course_key)
+
+    update_course_in_cache(course_key, course)
+
+
 @receiver(SignalHandler.course_deleted)
 def _delete_block_structure_on_course_delete(sender, course_key, **kwargs):  # pylint: disable=unused-argument
     """
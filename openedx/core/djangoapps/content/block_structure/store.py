@@ -3,14 +3,17 @@ Module for the Storage of BlockStructure objects.
 """
 # pylint: disable=protected-access
 from logging import getLogger
+from uuid import uuid4
 
 from openedx.core.lib.cache_utils import zpickle, zunpickle
 
-from . import config
+from . import config, serialization
 from .block_structure import BlockStructureBlockData
+from .compact import CompactBlockStructure
 from .exceptions import BlockStructureNotFound
 from .factory import BlockStructureFactory
 from .models import BlockStructureModel
+from .process_cache import approximate_size_in_bytes, get_process_cache
 from .transformer_registry import TransformerRegistry
 
 
@@ -65,11 +68,13 @@ class BlockStructureStore(object):
 
         bs_model = self._update_or_create_model(block_structure, serialized_data)
         self._add_to_cache(serialized_data, bs_model)
+        self._update_data_version(block_structure.root_block_usage_key)
 
     def get(self, root_block_usage_key):
         """
         Deserializes and returns the block structure starting at
-        root_block_usage_key, if found in the cache or storage.
+        root_block_usage_key, if found in the process cache, cache or
+        storage.
 
         The given root_block_usage_key must equate the
         root_block_usage_key previously passed to the `add` method.
@@ -87,6 +92,18 @@ class BlockStructureStore(object):
             BlockStructureNotFound if the root_block_usage_key is not
             found.
         """
+        use_process_cache = _is_process_cache_enabled()
+        data_version = None
+        if use_process_cache:
+            data_version = self.get_data_version(root_block_usage_key)
+            if data_version:
+                block_structure = get_process_cache().get(self._process_cache_key(root_block_usage_key, data_version))
+                if block_structure is not None:
+                    # Return a copy since callers transform block
+                    # structures in place.  Copies of a compact
+                    # block structure share its columns until written.
+                    return block_structure.copy()
+
         bs_model = self._get_model(root_block_usage_key)
 
         try:
@@ -95,7 +112,19 @@ class BlockStructureStore(object):
             serialized_data = self._get_from_store(bs_model)
             self._add_to_cache(serialized_data, bs_model)
 
-        return self._deserialize(serialized_data, root_block_usage_key)
+        block_structure = self._deserialize(serialized_data, root_block_usage_key)
+        if use_process_cache:
+            block_structure = self._add_to_process_cache(block_structure, data_version)
+        return block_structure
+
+    def get_data_version(self, root_block_usage_key):
+        """
+        Returns the version of the data recorded for the given
+        root_block_usage_key, or None if no version is recorded.  The
+        version changes whenever the block structure is added or
+        deleted.
+        """
+        return self._cache.get(self._encode_data_version_cache_key(root_block_usage_key))
 
     def delete(self, root_block_usage_key):
         """
@@ -108,6 +137,8 @@ class BlockStructureStore(object):
         """
         bs_model = self._get_model(root_block_usage_key)
         self._cache.delete(self._encode_root_cache_key(bs_model))
+        self._cache.delete(self._encode_data_version_cache_key(root_block_usage_key))
+        get_process_cache().delete(root_block_usage_key)
         bs_model.delete()
         logger.info("BlockStructure: Deleted from cache and store; %s.", bs_model)
 
@@ -160,6 +191,49 @@ class BlockStructureStore(object):
         self._cache.set(cache_key, serialized_data, timeout=config.cache_timeout_in_seconds())
         logger.info("BlockStructure: Added to cache; %s, size: %d", bs_model, len(serialized_data))
 
+    def _update_data_version(self, root_block_usage_key):
+        """
+        Records a new version of the data for the given root_block_usage_key
+        in the cache, thereby invalidating the entries of all process caches.
+
+        Note: The version is updated regardless of whether the process
+        cache is enabled for this process, so that processes with an
+        enabled process cache never read outdated data.
+        """
+        self._cache.set(
+            self._encode_data_version_cache_key(root_block_usage_key),
+            uuid4().hex,
+            timeout=config.cache_timeout_in_seconds(),
+        )
+        get_process_cache().delete(root_block_usage_key)
+
+    def _add_to_process_cache(self, block_structure, data_version):
+        """
+        Adds the given block_structure, as a CompactBlockStructure, to
+        the process cache for the given data_version, and returns a copy
+        of it for the caller.  If no data_version was recorded yet, a
+        new version is recorded unless another process records one first.
+        """
+        if not isinstance(block_structure, CompactBlockStructure):
+            block_structure = CompactBlockStructure.create_from(block_structure)
+
+        root_block_usage_key = block_structure.root_block_usage_key
+        if not data_version:
+            data_version = uuid4().hex
+            if not self._cache.add(
+                self._encode_data_version_cache_key(root_block_usage_key),
+                data_version,
+                timeout=config.cache_timeout_in_seconds(),
+            ):
+                return block_structure
+
+        get_process_cache().set(
+            self._process_cache_key(root_block_usage_key, data_version),
+            block_structure,
+            approximate_size_in_bytes(block_structure),
+        )
+        return block_structure.copy()
+
     def _get_from_cache(self, bs_model):
         """
         Returns the serialized data for the given BlockStructureModel
@@ -193,6 +267,12 @@ class BlockStructureStore(object):
         """
         Serializes the data for the given block_structure.
         """
+        if isinstance(block_structure, CompactBlockStructure):
+            block_structure = block_structure.to_block_structure()
+
+        if config.waffle().is_enabled(config.BINARY_SERIALIZATION):
+            return serialization.serialize(block_structure)
+
         data_to_cache = (
             block_structure._block_relations,
             block_structure.transformer_data,
@@ -203,14 +283,23 @@ class BlockStructureStore(object):
     def _deserialize(self, serialized_data, root_block_usage_key):
         """
         Deserializes the given data and returns the parsed block_structure.
+        Data in either the binary or the zpickle format is supported, so
+        the format can be switched without invalidating stored data.
         """
-        block_relations, transformer_data, block_data_map = zunpickle(serialized_data)
-        return BlockStructureFactory.create_new(
-            root_block_usage_key,
-            block_relations,
-            transformer_data,
-            block_data_map,
-        )
+        if serialization.is_binary_format(serialized_data):
+            block_structure = serialization.deserialize(serialized_data, root_block_usage_key)
+        else:
+            block_relations, transformer_data, block_data_map = zunpickle(serialized_data)
+            block_structure = BlockStructureFactory.create_new(
+                root_block_usage_key,
+                block_relations,
+                transformer_data,
+                block_data_map,
+            )
+
+        if config.waffle().is_enabled(config.COMPACT_BLOCK_STRUCTURE):
+            block_structure = CompactBlockStructure.create_from(block_structure)
+        return block_structure
 
     @staticmethod
     def _encode_root_cache_key(bs_model):
@@ -227,6 +316,25 @@ class BlockStructureStore(object):
                 root_usage_key=unicode(bs_model.data_usage_key),
             )
 
+    @staticmethod
+    def _encode_data_version_cache_key(root_block_usage_key):
+        """
+        Returns the cache key under which the version of the data for
+        the given root_block_usage_key is recorded.
+        """
+        return u"v{version}.data_version.key.{root_usage_key}".format(
+            version=unicode(BlockStructureBlockData.VERSION),
+            root_usage_key=unicode(root_block_usage_key),
+        )
+
+    @staticmethod
+    def _process_cache_key(root_block_usage_key, data_version):
+        """
+        Returns the key of the given version of the block structure in
+        the process cache.
+        """
+        return (root_block_usage_key, data_version, TransformerRegistry.get_write_version_hash())
+
     @staticmethod
     def _version_data_of_block(root_block):
         """
@@ -256,3 +364,10 @@ def _is_storage_backing_enabled():
     Returns whether storage backing for Block Structures is enabled.
     """
     return config.waffle().is_enabled(config.STORAGE_BACKING_FOR_CACHE)
+
+
+def _is_process_cache_enabled():
+    """
+    Returns whether the process cache for Block Structures is enabled.
+    """
+    return config.waffle().is_enabled(config.PROCESS_CACHE)
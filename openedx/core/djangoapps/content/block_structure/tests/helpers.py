@@ -134,11 +134,22 @@ class MockCache(object):
         """
         return self.map.get(key, default)
 
+    def add(self, key, val, timeout):
+        """
+        Associates the given key with the given value in the cache,
+        only if the key isn't already in the cache. Returns whether
+        the value was added.
+        """
+        if key in self.map:
+            return False
+        self.set(key, val, timeout)
+        return True
+
     def delete(self, key):
         """
         Deletes the given key from the cache.
         """
-        del self.map[key]
+        self.map.pop(key, None)
 
 
 class MockModulestoreFactory(object):
@@ -0,0 +1,268 @@
+"""
+Tests for block_structure/compact.py
+"""
+# pylint: disable=protected-access
+from copy import deepcopy
+import ddt
+import itertools
+from nose.plugins.attrib import attr
+from unittest import TestCase
+
+from openedx.core.lib.graph_traversals import traverse_post_order
+
+from ..block_structure import BlockStructureBlockData, TransformerData
+from ..compact import CompactBlockStructure
+from .helpers import ChildrenMapTestMixin, MockTransformer
+
+
+@attr(shard=2)
+@ddt.ddt
+class TestCompactBlockStructure(TestCase, ChildrenMapTestMixin):
+    """
+    Tests for CompactBlockStructure
+    """
+    def create_compact_block_structure(self, children_map):
+        """
+        Returns a CompactBlockStructure created from a block structure
+        for the given children_map, with an xBlock field and transformer
+        data for each block.
+        """
+        block_structure = self.create_block_structure(children_map)
+        block_structure._add_transformer(MockTransformer)
+        block_structure.set_transformer_data(MockTransformer, 'global', 'global_value')
+        for block_key in block_structure:
+            block_structure._get_or_create_block(block_key).display_name = 'Block {}'.format(block_key)
+            block_structure.set_transformer_block_field(block_key, MockTransformer, 'test', block_key)
+        return CompactBlockStructure.create_from(block_structure)
+
+    @ddt.data(
+        [],
+        ChildrenMapTestMixin.SIMPLE_CHILDREN_MAP,
+        ChildrenMapTestMixin.LINEAR_CHILDREN_MAP,
+        ChildrenMapTestMixin.DAG_CHILDREN_MAP,
+    )
+    def test_create_from(self, children_map):
+        compact = self.create_compact_block_structure(children_map)
+        self.assert_block_structure(compact, children_map)
+        self.assertEqual(len(compact), max(len(children_map), 1))
+        self.assertEqual(compact.get_transformer_data(MockTransformer, 'global'), 'global_value')
+        self.assertEqual(compact._get_transformer_data_version(MockTransformer), MockTransformer.WRITE_VERSION)
+        for block_key in compact:
+            self.assertEqual(compact.get_xblock_field(block_key, 'display_name'), 'Block {}'.format(block_key))
+            self.assertEqual(compact[block_key].display_name, 'Block {}'.format(block_key))
+            self.assertEqual(compact[block_key].location, block_key)
+            self.assertEqual(compact.get_transformer_block_field(block_key, MockTransformer, 'test'), block_key)
+            self.assertEqual(compact.get_transformer_block_data(block_key, MockTransformer).fields, {'test': block_key})
+
+    @ddt.data(
+        [],
+        ChildrenMapTestMixin.SIMPLE_CHILDREN_MAP,
+        ChildrenMapTestMixin.DAG_CHILDREN_MAP,
+    )
+    def test_add_relation(self, children_map):
+        compact = self.create_block_structure(children_map, CompactBlockStructure)
+        self.assert_block_structure(compact, children_map)
+
+    def test_missing_fields(self):
+        compact = self.create_compact_block_structure(self.SIMPLE_CHILDREN_MAP)
+        self.assertIsNone(compact.get_xblock_field(1, 'unknown'))
+        self.assertEqual(compact.get_xblock_field(10, 'display_name', 'default'), 'default')
+        self.assertIsNone(compact.get_transformer_block_field(1, 'unknown_transformer', 'test'))
+        self.assertIsNone(getattr(compact[1], 'unknown', None))
+        with self.assertRaises(KeyError):
+            compact[10]  # pylint: disable=pointless-statement
+        with self.assertRaises(KeyError):
+            compact.get_transformer_block_data(1, 'unknown_transformer')
+
+    def test_set_and_remove_transformer_block_field(self):
+        compact = self.create_compact_block_structure(self.SIMPLE_CHILDREN_MAP)
+        compact.set_transformer_block_field(1, 'other_transformer', 'key', 'value')
+        self.assertEqual(compact.get_transformer_block_field(1, 'other_transformer', 'key'), 'value')
+        self.assertIsNone(compact.get_transformer_block_field(2, 'other_transformer', 'key'))
+        self.assertItemsEqual(compact[1].transformer_data.keys(), [MockTransformer.name(), 'other_transformer'])
+        self.assertEqual(compact[2].transformer_data.keys(), [MockTransformer.name()])
+
+        compact.remove_transformer_block_field(1, 'other_transformer', 'key')
+        self.assertIsNone(compact.get_transformer_block_field(1, 'other_transformer', 'key'))
+        self.assertNotIn('other_transformer', compact[1].transformer_data)
+
+    def test_fields_views(self):
+        compact = self.create_compact_block_structure(self.SIMPLE_CHILDREN_MAP)
+        block_data = compact[1]
+        block_data.fields['display_name'] = 'edit'
+        block_data.fields.update(graded=True)
+        self.assertEqual(compact.get_xblock_field(1, 'display_name'), 'edit')
+        self.assertEqual(block_data.graded, True)
+        self.assertEqual(dict(block_data.fields), {'display_name': 'edit', 'graded': True})
+        self.assertEqual(len(block_data.fields), 2)
+
+        del block_data.fields['graded']
+        self.assertNotIn('graded', block_data.fields)
+        with self.assertRaises(KeyError):
+            del block_data.fields['graded']
+        with self.assertRaises(AttributeError):
+            del block_data.graded
+        with self.assertRaises(AttributeError):
+            block_data.location = 10
+
+        block_data.fields = {'format': 'homework'}
+        self.assertEqual(block_data.fields, {'format': 'homework'})
+        self.assertIsNone(compact.get_xblock_field(1, 'display_name'))
+
+        transformer_block_data = compact.get_transformer_block_data(1, MockTransformer)
+        transformer_block_data.fields['other'] = 'value'
+        self.assertEqual(compact.get_transformer_block_field(1, MockTransformer, 'other'), 'value')
+        self.assertEqual(transformer_block_data.fields, {'test': 1, 'other': 'value'})
+
+    def test_transformer_data_map_view(self):
+        compact = self.create_compact_block_structure(self.SIMPLE_CHILDREN_MAP)
+        transformer_data_map = compact[1].transformer_data
+        self.assertEqual(list(transformer_data_map), [MockTransformer.name()])
+        self.assertEqual(len(transformer_data_map), 1)
+        self.assertEqual(transformer_data_map.items()[0][1].fields, {'test': 1})
+
+        new_transformer_data = TransformerData()
+        new_transformer_data.key = 'value'
+        transformer_data_map['other_transformer'] = new_transformer_data
+        self.assertEqual(compact.get_transformer_block_field(1, 'other_transformer', 'key'), 'value')
+        self.assertItemsEqual(transformer_data_map.keys(), [MockTransformer.name(), 'other_transformer'])
+
+        transformer_data_map[MockTransformer] = new_transformer_data
+        self.assertIsNone(compact.get_transformer_block_field(1, MockTransformer, 'test'))
+        self.assertEqual(compact.get_transformer_block_field(1, MockTransformer, 'key'), 'value')
+
+        del transformer_data_map['other_transformer']
+        self.assertNotIn('other_transformer', transformer_data_map)
+        with self.assertRaises(KeyError):
+            del transformer_data_map['other_transformer']
+
+    @ddt.data(
+        ChildrenMapTestMixin.SIMPLE_CHILDREN_MAP,
+        ChildrenMapTestMixin.DAG_CHILDREN_MAP,
+    )
+    def test_to_block_structure(self, children_map):
+        compact = self.create_compact_block_structure(children_map)
+        compact.remove_block(1, keep_descendants=True)
+        compact.set_transformer_block_field(2, 'other_transformer', 'key', 'value')
+
+        block_structure = compact.to_block_structure()
+        self.assertNotIsInstance(block_structure, CompactBlockStructure)
+        self.assertEqual(list(block_structure.topological_traversal()), list(compact.topological_traversal()))
+        for block_key in compact:
+            self.assertEqual(block_structure.get_parents(block_key), compact.get_parents(block_key))
+            self.assertEqual(block_structure[block_key].fields, compact[block_key].fields)
+            self.assertEqual(
+                block_structure.get_transformer_block_data(block_key, MockTransformer).fields,
+                compact.get_transformer_block_data(block_key, MockTransformer).fields,
+            )
+        self.assertEqual(block_structure.get_transformer_block_field(2, 'other_transformer', 'key'), 'value')
+        self.assertEqual(block_structure.get_transformer_data(MockTransformer, 'global'), 'global_value')
+
+    def test_internal_views(self):
+        block_structure = self.create_block_structure(self.SIMPLE_CHILDREN_MAP)
+        for block_key in block_structure:
+            block_structure._get_or_create_block(block_key).display_name = 'Block {}'.format(block_key)
+        compact = CompactBlockStructure.create_from(deepcopy(block_structure))
+        compact.remove_block(1, keep_descendants=True)
+        block_structure.remove_block(1, keep_descendants=True)
+
+        self.assertEqual(set(compact._block_relations), set(block_structure._block_relations))
+        self.assertEqual(len(compact._block_relations), len(block_structure._block_relations))
+        for block_key, relations in block_structure._block_relations.iteritems():
+            self.assertEqual(compact._block_relations[block_key].parents, relations.parents)
+            self.assertEqual(compact._block_relations[block_key].children, relations.children)
+        self.assertNotIn(1, compact._block_relations)
+
+        self.assertEqual(set(compact._block_data_map), set(block_structure._block_data_map))
+        self.assertEqual(len(compact._block_data_map), len(block_structure._block_data_map))
+        for block_key, block_data in block_structure._block_data_map.iteritems():
+            self.assertEqual(compact._block_data_map[block_key].fields, block_data.fields)
+
+    @ddt.data(
+        *itertools.product(
+            [True, False],
+            range(7),
+            [
+                ChildrenMapTestMixin.SIMPLE_CHILDREN_MAP,
+                ChildrenMapTestMixin.LINEAR_CHILDREN_MAP,
+                ChildrenMapTestMixin.DAG_CHILDREN_MAP,
+            ],
+        )
+    )
+    @ddt.unpack
+    def test_remove_block(self, keep_descendants, block_to_remove, children_map):
+        if (block_to_remove >= len(children_map)) or (keep_descendants and block_to_remove == 0):
+            return
+
+        compact = self.create_compact_block_structure(children_map)
+        parents_map = self.get_parents_map(children_map)
+        compact.remove_block(block_to_remove, keep_descendants)
+        missing_blocks = [block_to_remove]
+        self.assertEqual(len(compact), len(children_map) - 1)
+        self.assertIsNone(compact.get_xblock_field(block_to_remove, 'display_name'))
+
+        removed_children_map = deepcopy(children_map)
+        removed_children_map[block_to_remove] = []
+        for parent in parents_map[block_to_remove]:
+            removed_children_map[parent].remove(block_to_remove)
+        if keep_descendants:
+            for child in children_map[block_to_remove]:
+                for parent in parents_map[block_to_remove]:
+                    removed_children_map[parent].append(child)
+        self.assert_block_structure(compact, removed_children_map, missing_blocks)
+
+        compact._prune_unreachable()
+        pruned_children_map = deepcopy(removed_children_map)
+        if not keep_descendants:
+            pruned_parents_map = self.get_parents_map(pruned_children_map)
+            for child in children_map[block_to_remove]:
+                if pruned_parents_map[child]:
+                    continue
+                for block in traverse_post_order(child, get_children=lambda block: pruned_children_map[block]):
+                    missing_blocks.append(block)
+                    pruned_children_map[block] = []
+        self.assert_block_structure(compact, pruned_children_map, missing_blocks)
+        self.assertEqual(len(compact), len(children_map) - len(set(missing_blocks)))
+
+    def test_copy(self):
+        compact = self.create_compact_block_structure(self.LINEAR_CHILDREN_MAP)
+        new_copy = compact.copy()
+        self.assertIs(new_copy._child_ids, compact._child_ids)
+
+        compact.remove_block(2, keep_descendants=True)
+        compact.set_transformer_block_field(1, MockTransformer, 'test', 'edit1')
+        compact[3].display_name = 'edit2'
+        self.assert_block_structure(compact, [[1], [3], [], []], missing_blocks=[2])
+        self.assert_block_structure(new_copy, [[1], [2], [3], []])
+        self.assertEqual(new_copy.get_transformer_block_field(1, MockTransformer, 'test'), 1)
+        self.assertEqual(new_copy.get_xblock_field(3, 'display_name'), 'Block 3')
+
+        new_copy.remove_block(3, keep_descendants=True)
+        self.assert_block_structure(compact, [[1], [3], [], []], missing_blocks=[2])
+        self.assert_block_structure(new_copy, [[1], [2], [], []], missing_blocks=[3])
+
+    def test_copy_on_write(self):
+        compact = self.create_compact_block_structure(self.LINEAR_CHILDREN_MAP)
+        new_copy = compact.copy()
+        self.assertIs(new_copy._xblock_fields['display_name'], compact._xblock_fields['display_name'])
+
+        new_copy[2].display_name = 'edit'
+        del new_copy.get_transformer_block_data(1, MockTransformer).test
+        new_copy.set_transformer_data(MockTransformer, 'global', 'edit')
+        self.assertIsNot(new_copy._xblock_fields['display_name'], compact._xblock_fields['display_name'])
+        self.assertEqual(new_copy.get_xblock_field(2, 'display_name'), 'edit')
+        self.assertIsNone(new_copy.get_transformer_block_field(1, MockTransformer, 'test'))
+
+        self.assertEqual(compact.get_xblock_field(2, 'display_name'), 'Block 2')
+        self.assertEqual(compact.get_transformer_block_field(1, MockTransformer, 'test'), 1)
+        self.assertEqual(compact.get_transformer_data(MockTransformer, 'global'), 'global_value')
+
+        # Writes to the original don't show in the copy either.
+        compact[3].display_name = 'edit'
+        self.assertEqual(new_copy.get_xblock_field(3, 'display_name'), 'Block 3')
+
+    def test_same_traversal_as_block_structure(self):
+        block_structure = self.create_block_structure(self.DAG_CHILDREN_MAP, BlockStructureBlockData)
+        compact = self.create_compact_block_structure(self.DAG_CHILDREN_MAP)
+        self.assertEqual(list(compact.topological_traversal()), list(block_structure.topological_traversal()))
+        self.assertEqual(list(compact.post_order_traversal()), list(block_structure.post_order_traversal()))
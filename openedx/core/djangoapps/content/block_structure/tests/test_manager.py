@@ -6,9 +6,10 @@ from django.test import TestCase
 from nose.plugins.attrib import attr
 
 from ..block_structure import BlockStructureBlockData
-from ..config import RAISE_ERROR_WHEN_NOT_FOUND, STORAGE_BACKING_FOR_CACHE, waffle
+from ..config import RAISE_ERROR_WHEN_NOT_FOUND, STORAGE_BACKING_FOR_CACHE, TRANSFORMED_CACHE, waffle
 from ..exceptions import UsageKeyNotInBlockStructure, BlockStructureNotFound
 from ..manager import BlockStructureManager
+from ..process_cache import get_transformed_cache
 from ..transformers import BlockStructureTransformers
 from .helpers import (
     MockModulestoreFactory, MockCache, MockTransformer,
@@ -89,6 +90,27 @@ class TestTransformer1(MockTransformer):
         return data_key + 't1.val1.' + unicode(block_key)
 
 
+class TestSignatureTransformer(TestTransformer1):
+    """
+    Test Transformer class whose output is shared by users with the
+    same usage_info.
+    """
+    transform_call_count = 0
+
+    def transform(self, usage_info, block_structure):
+        """
+        Transforms the block structure and counts the transforms.
+        """
+        super(TestSignatureTransformer, self).transform(usage_info, block_structure)
+        TestSignatureTransformer.transform_call_count += 1
+
+    def user_signature(self, usage_info, block_structure):
+        """
+        Returns the usage_info as the signature.
+        """
+        return usage_info
+
+
 @attr(shard=2)
 @ddt.ddt
 class TestBlockStructureManager(UsageKeyFactoryMixin, ChildrenMapTestMixin, TestCase):
@@ -123,7 +145,8 @@ class TestBlockStructureManager(UsageKeyFactoryMixin, ChildrenMapTestMixin, Test
             self.assertGreater(self.modulestore.get_items_call_count, 0)
         else:
             self.assertEquals(self.modulestore.get_items_call_count, 0)
-        self.assertEquals(self.cache.set_call_count, 1 if expect_cache_updated else 0)
+        # An update of the cache sets both the data and its version.
+        self.assertEquals(self.cache.set_call_count, 2 if expect_cache_updated else 0)
 
     def test_get_transformed(self):
         with mock_registered_transformers(self.registered_transformers):
@@ -219,3 +242,44 @@ class TestBlockStructureManager(UsageKeyFactoryMixin, ChildrenMapTestMixin, Test
         self.bs_manager.clear()
         self.collect_and_verify(expect_modulestore_called=True, expect_cache_updated=True)
         self.assertEquals(TestTransformer1.collect_call_count, 2)
+
+    @ddt.data(
+        # enabled, signatures, expected transforms
+        (True, ['group_a', 'group_a', 'group_a'], 1),
+        (True, ['group_a', 'group_b', 'group_a'], 2),
+        (True, [None, None], 2),
+        (False, ['group_a', 'group_a'], 2),
+    )
+    @ddt.unpack
+    def test_get_transformed_cached(self, enabled, signatures, expected_transforms):
+        get_transformed_cache().clear()
+        TestSignatureTransformer.transform_call_count = 0
+        registered_transformers = [TestSignatureTransformer()]
+        with mock_registered_transformers(registered_transformers):
+            with waffle().override(TRANSFORMED_CACHE, active=enabled):
+                for signature in signatures:
+                    transformers = BlockStructureTransformers(registered_transformers, usage_info=signature)
+                    block_structure = self.bs_manager.get_transformed(transformers)
+                    self.assert_block_structure(block_structure, self.children_map)
+                    TestSignatureTransformer.assert_transformed(block_structure)
+
+                    # mutating the returned block structure doesn't affect the cache
+                    block_structure.remove_block(self.block_key_factory(1), keep_descendants=False)
+
+        self.assertEquals(TestSignatureTransformer.transform_call_count, expected_transforms)
+
+    def test_get_transformed_cache_invalidated(self):
+        get_transformed_cache().clear()
+        TestSignatureTransformer.transform_call_count = 0
+        registered_transformers = [TestSignatureTransformer()]
+        transformers = BlockStructureTransformers(registered_transformers, usage_info='group_a')
+        with mock_registered_transformers(registered_transformers):
+            with waffle().override(TRANSFORMED_CACHE, active=True):
+                self.bs_manager.get_transformed(transformers)
+                self.bs_manager.get_transformed(transformers, starting_block_usage_key=self.block_key_factory(1))
+                self.assertEquals(TestSignatureTransformer.transform_call_count, 2)
+
+                # re-collecting the data records a new version
+                self.bs_manager.clear()
+                self.bs_manager.get_transformed(transformers)
+                self.assertEquals(TestSignatureTransformer.transform_call_count, 3)
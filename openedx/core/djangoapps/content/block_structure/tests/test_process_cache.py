@@ -0,0 +1,81 @@
+"""
+Tests for block_structure/process_cache.py
+"""
+from nose.plugins.attrib import attr
+from unittest import TestCase
+
+from ..process_cache import BlockStructureProcessCache, approximate_size_in_bytes
+
+
+@attr(shard=2)
+class TestBlockStructureProcessCache(TestCase):
+    """
+    Tests for BlockStructureProcessCache
+    """
+    def setUp(self):
+        super(TestBlockStructureProcessCache, self).setUp()
+        self.process_cache = BlockStructureProcessCache(max_size_in_bytes=100)
+
+    def assert_stats(self, **expected_stats):
+        """
+        Verifies the given counters of the process cache.
+        """
+        stats = self.process_cache.stats()._asdict()
+        self.assertEqual({name: stats[name] for name in expected_stats}, expected_stats)
+
+    def test_get_and_set(self):
+        self.assertIsNone(self.process_cache.get(('root', 'v1')))
+        self.process_cache.set(('root', 'v1'), 'structure', 10)
+        self.assertEqual(self.process_cache.get(('root', 'v1')), 'structure')
+        self.assertIsNone(self.process_cache.get(('root', 'v2')))
+        self.assert_stats(hits=1, misses=2, evictions=0, entries=1, size_in_bytes=10)
+
+    def test_new_version_replaces_old(self):
+        self.process_cache.set(('root', 'v1'), 'structure 1', 10)
+        self.process_cache.set(('root', 'v2'), 'structure 2', 20)
+        self.assertIsNone(self.process_cache.get(('root', 'v1')))
+        self.assertEqual(self.process_cache.get(('root', 'v2')), 'structure 2')
+        self.assert_stats(evictions=0, entries=1, size_in_bytes=20)
+
+    def test_evicts_least_recently_used(self):
+        self.process_cache.set(('root1', 'v1'), 'structure 1', 40)
+        self.process_cache.set(('root2', 'v1'), 'structure 2', 40)
+        self.process_cache.get(('root1', 'v1'))
+        self.process_cache.set(('root3', 'v1'), 'structure 3', 40)
+
+        self.assertEqual(self.process_cache.get(('root1', 'v1')), 'structure 1')
+        self.assertIsNone(self.process_cache.get(('root2', 'v1')))
+        self.assertEqual(self.process_cache.get(('root3', 'v1')), 'structure 3')
+        self.assert_stats(evictions=1, entries=2, size_in_bytes=80)
+
+    def test_too_large(self):
+        self.process_cache.set(('root', 'v1'), 'structure', 101)
+        self.assertIsNone(self.process_cache.get(('root', 'v1')))
+        self.assert_stats(entries=0, size_in_bytes=0)
+
+    def test_delete(self):
+        self.process_cache.set(('root1', 'v1'), 'structure 1', 10)
+        self.process_cache.set(('root2', 'v1'), 'structure 2', 10)
+        self.process_cache.delete('root1')
+        self.assertIsNone(self.process_cache.get(('root1', 'v1')))
+        self.assertEqual(self.process_cache.get(('root2', 'v1')), 'structure 2')
+        self.assert_stats(entries=1, size_in_bytes=10)
+
+    def test_clear(self):
+        self.process_cache.set(('root', 'v1'), 'structure', 10)
+        self.process_cache.get(('root', 'v1'))
+        self.process_cache.clear()
+        self.assert_stats(hits=0, misses=0, evictions=0, entries=0, size_in_bytes=0)
+
+
+class TestApproximateSizeInBytes(TestCase):
+    """
+    Tests for approximate_size_in_bytes
+    """
+    def test_counts_reachable_objects(self):
+        value = 'x' * 1000
+        self.assertGreater(approximate_size_in_bytes({'field': [value]}), 1000)
+
+    def test_counts_shared_objects_once(self):
+        value = 'x' * 1000
+        self.assertLess(approximate_size_in_bytes([value, value, value]), 2000)
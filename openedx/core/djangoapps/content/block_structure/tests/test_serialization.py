@@ -0,0 +1,111 @@
+"""
+Tests for block_structure/serialization.py
+"""
+import ddt
+from nose.plugins.attrib import attr
+from unittest import TestCase
+
+from openedx.core.lib.cache_utils import zpickle
+
+from .. import serialization
+from .helpers import ChildrenMapTestMixin, UsageKeyFactoryMixin, MockTransformer
+
+
+@attr(shard=2)
+@ddt.ddt
+class TestBinarySerialization(UsageKeyFactoryMixin, ChildrenMapTestMixin, TestCase):
+    """
+    Tests for the binary serialization format of block structures.
+    """
+    def create_collected_block_structure(self, children_map):
+        """
+        Returns a block structure for the given children_map with
+        collected xBlock fields and transformer data for each block.
+        """
+        block_structure = self.create_block_structure(children_map)
+        block_structure._add_transformer(MockTransformer)  # pylint: disable=protected-access
+        for block_key in block_structure:
+            block_data = block_structure._get_or_create_block(block_key)  # pylint: disable=protected-access
+            block_data.display_name = unicode(block_key.block_id)
+            block_structure.set_transformer_block_field(block_key, MockTransformer, 'test', block_key.block_id)
+        return block_structure
+
+    def deserialize(self, block_structure):
+        """
+        Returns the result of serializing and deserializing the given block structure.
+        """
+        serialized_data = serialization.serialize(block_structure)
+        return serialization.deserialize(serialized_data, block_structure.root_block_usage_key)
+
+    @ddt.data(
+        ChildrenMapTestMixin.SIMPLE_CHILDREN_MAP,
+        ChildrenMapTestMixin.LINEAR_CHILDREN_MAP,
+        ChildrenMapTestMixin.DAG_CHILDREN_MAP,
+    )
+    def test_round_trip(self, children_map):
+        block_structure = self.create_collected_block_structure(children_map)
+        deserialized = self.deserialize(block_structure)
+
+        self.assert_block_structure(deserialized, children_map)
+        self.assertEqual(deserialized.root_block_usage_key, block_structure.root_block_usage_key)
+        self.assertEqual(
+            deserialized._get_transformer_data_version(MockTransformer),  # pylint: disable=protected-access
+            MockTransformer.WRITE_VERSION,
+        )
+        for block_key in block_structure:
+            self.assertEqual(deserialized.get_xblock_field(block_key, 'display_name'), unicode(block_key.block_id))
+            self.assertEqual(
+                deserialized.get_transformer_block_field(block_key, MockTransformer, 'test'),
+                block_key.block_id,
+            )
+
+    def test_round_trip_empty(self):
+        block_structure = self.create_collected_block_structure([])
+        deserialized = self.deserialize(block_structure)
+
+        self.assertEqual(list(deserialized), [])
+        self.assertEqual(deserialized.root_block_usage_key, block_structure.root_block_usage_key)
+        self.assertEqual(
+            deserialized._get_transformer_data_version(MockTransformer),  # pylint: disable=protected-access
+            MockTransformer.WRITE_VERSION,
+        )
+
+    def test_is_binary_format(self):
+        block_structure = self.create_collected_block_structure(self.SIMPLE_CHILDREN_MAP)
+        self.assertTrue(serialization.is_binary_format(serialization.serialize(block_structure)))
+        self.assertFalse(serialization.is_binary_format(zpickle(block_structure)))
+
+    def test_unsupported_data(self):
+        block_structure = self.create_collected_block_structure(self.SIMPLE_CHILDREN_MAP)
+        with self.assertRaises(serialization.BlockStructureSerializationError):
+            serialization.deserialize(zpickle(block_structure), block_structure.root_block_usage_key)
+
+    def test_transformer_data_is_lazy(self):
+        deserialized = self.deserialize(self.create_collected_block_structure(self.SIMPLE_CHILDREN_MAP))
+        root_data = deserialized[deserialized.root_block_usage_key]
+        self.assertEqual(dict.keys(root_data.transformer_data), [])
+
+        deserialized.get_transformer_block_field(deserialized.root_block_usage_key, MockTransformer, 'test')
+        for block_data in deserialized.itervalues():
+            self.assertEqual(dict.keys(block_data.transformer_data), [MockTransformer.name()])
+
+    def test_lazy_data_after_removal_and_copy(self):
+        deserialized = self.deserialize(self.create_collected_block_structure(self.SIMPLE_CHILDREN_MAP))
+        removed_key = self.block_key_factory(1)
+        deserialized.remove_block(removed_key, keep_descendants=True)
+        copied = deserialized.copy()
+
+        self.assertNotIn(removed_key, copied)
+        self.assert_block_structure(copied, [[2, 3, 4], [], [], [], []], missing_blocks=[1])
+        for block_key in copied:
+            self.assertEqual(copied.get_transformer_block_field(block_key, MockTransformer, 'test'), block_key.block_id)
+
+    def test_reserialize(self):
+        block_structure = self.create_collected_block_structure(self.DAG_CHILDREN_MAP)
+        deserialized = self.deserialize(self.deserialize(block_structure))
+        self.assert_block_structure(deserialized, self.DAG_CHILDREN_MAP)
+        for block_key in block_structure:
+            self.assertEqual(
+                deserialized.get_transformer_block_field(block_key, MockTransformer, 'test'),
+                block_key.block_id,
+            )
@@ -2,13 +2,22 @@
 Tests for block_structure/cache.py
 """
 import ddt
+from mock import patch
 from nose.plugins.attrib import attr
 
 from openedx.core.djangolib.testing.utils import CacheIsolationTestCase
 
-from ..config import STORAGE_BACKING_FOR_CACHE, waffle
+from ..compact import CompactBlockStructure
+from ..config import (
+    BINARY_SERIALIZATION,
+    COMPACT_BLOCK_STRUCTURE,
+    PROCESS_CACHE,
+    STORAGE_BACKING_FOR_CACHE,
+    waffle,
+)
 from ..config.models import BlockStructureConfiguration
 from ..exceptions import BlockStructureNotFound
+from ..process_cache import get_process_cache
 from ..store import BlockStructureStore
 from .helpers import ChildrenMapTestMixin, UsageKeyFactoryMixin, MockCache, MockTransformer
 
@@ -30,6 +39,7 @@ class TestBlockStructureStore(UsageKeyFactoryMixin, ChildrenMapTestMixin, CacheI
 
         self.mock_cache = MockCache()
         self.store = BlockStructureStore(self.mock_cache)
+        get_process_cache().clear()
 
     def add_transformers(self):
         """
@@ -59,6 +69,45 @@ class TestBlockStructureStore(UsageKeyFactoryMixin, ChildrenMapTestMixin, CacheI
             self.assertIsNotNone(stored_value)
             self.assert_block_structure(stored_value, self.children_map)
 
+    @ddt.data(True, False)
+    def test_binary_serialization(self, with_storage_backing):
+        with waffle().override(STORAGE_BACKING_FOR_CACHE, active=with_storage_backing):
+            with waffle().override(BINARY_SERIALIZATION, active=True):
+                self.store.add(self.block_structure)
+            stored_value = self.store.get(self.block_structure.root_block_usage_key)
+            self.assert_block_structure(stored_value, self.children_map)
+            self.assertEqual(
+                stored_value.get_transformer_block_field(self.block_key_factory(0), MockTransformer, 'test'),
+                '{} val'.format(MockTransformer.name()),
+            )
+
+    @ddt.data(True, False)
+    def test_compact_block_structure(self, with_binary_serialization):
+        with waffle().override(BINARY_SERIALIZATION, active=with_binary_serialization):
+            self.store.add(self.block_structure)
+        with waffle().override(COMPACT_BLOCK_STRUCTURE, active=True):
+            stored_value = self.store.get(self.block_structure.root_block_usage_key)
+        self.assertIsInstance(stored_value, CompactBlockStructure)
+        self.assert_block_structure(stored_value, self.children_map)
+        self.assertEqual(
+            stored_value.get_transformer_block_field(self.block_key_factory(0), MockTransformer, 'test'),
+            '{} val'.format(MockTransformer.name()),
+        )
+
+    @ddt.data(True, False)
+    def test_add_compact_block_structure(self, with_binary_serialization):
+        compact = CompactBlockStructure.create_from(self.block_structure)
+        compact.remove_block(self.block_key_factory(1), keep_descendants=False)
+        with waffle().override(BINARY_SERIALIZATION, active=with_binary_serialization):
+            self.store.add(compact)
+            stored_value = self.store.get(self.block_structure.root_block_usage_key)
+        self.assertNotIsInstance(stored_value, CompactBlockStructure)
+        self.assertEqual(set(stored_value), set(compact))
+        self.assertEqual(
+            stored_value.get_transformer_block_field(self.block_key_factory(0), MockTransformer, 'test'),
+            '{} val'.format(MockTransformer.name()),
+        )
+
     @ddt.data(True, False)
     def test_delete(self, with_storage_backing):
         with waffle().override(STORAGE_BACKING_FOR_CACHE, active=with_storage_backing):
@@ -67,6 +116,49 @@ class TestBlockStructureStore(UsageKeyFactoryMixin, ChildrenMapTestMixin, CacheI
             with self.assertRaises(BlockStructureNotFound):
                 self.store.get(self.block_structure.root_block_usage_key)
 
+    def test_process_cache(self):
+        with waffle().override(PROCESS_CACHE, active=True):
+            self.store.add(self.block_structure)
+            for _ in range(3):
+                stored_value = self.store.get(self.block_structure.root_block_usage_key)
+                self.assert_block_structure(stored_value, self.children_map)
+
+            stats = get_process_cache().stats()
+            self.assertEqual((stats.hits, stats.misses, stats.entries), (2, 1, 1))
+            self.assertIsInstance(stored_value, CompactBlockStructure)
+
+            # Data served from the process cache is not shared with callers.
+            stored_value.remove_block(self.block_key_factory(1), keep_descendants=False)
+            stored_value.set_transformer_block_field(self.block_key_factory(0), MockTransformer, 'test', 'edit')
+            stored_value = self.store.get(self.block_structure.root_block_usage_key)
+            self.assert_block_structure(stored_value, self.children_map)
+            self.assertEqual(
+                stored_value.get_transformer_block_field(self.block_key_factory(0), MockTransformer, 'test'),
+                '{} val'.format(MockTransformer.name()),
+            )
+
+    def test_process_cache_invalidated_by_other_process(self):
+        with waffle().override(PROCESS_CACHE, active=True):
+            self.store.add(self.block_structure)
+            self.store.get(self.block_structure.root_block_usage_key)
+
+            # Mimic an update of the data by another process, which doesn't
+            # clear the process cache of this process.
+            updated_block_structure = self.create_block_structure(self.LINEAR_CHILDREN_MAP)
+            with patch.object(get_process_cache(), 'delete'):
+                self.store.add(updated_block_structure)
+
+            stored_value = self.store.get(self.block_structure.root_block_usage_key)
+            self.assert_block_structure(stored_value, self.LINEAR_CHILDREN_MAP)
+
+    def test_process_cache_delete(self):
+        with waffle().override(PROCESS_CACHE, active=True):
+            self.store.add(self.block_structure)
+            self.store.get(self.block_structure.root_block_usage_key)
+            self.store.delete(self.block_structure.root_block_usage_key)
+            with self.assertRaises(BlockStructureNotFound):
+                self.store.get(self.block_structure.root_block_usage_key)
+
     def test_uncached_without_storage(self):
         self.store.add(self.block_structure)
         self.mock_cache.map.clear()
@@ -7,9 +7,11 @@ from unittest import TestCase
 
 from ..block_structure import BlockStructureModulestoreData
 from ..exceptions import TransformerException, TransformerDataIncompatible
+from ..factory import BlockStructureFactory
 from ..transformers import BlockStructureTransformers
 from .helpers import (
-    ChildrenMapTestMixin, MockTransformer, MockFilteringTransformer, mock_registered_transformers
+    ChildrenMapTestMixin, MockModulestoreFactory, MockTransformer, MockFilteringTransformer,
+    mock_registered_transformers
 )
 
 
@@ -82,3 +84,137 @@ class TestBlockStructureTransformers(ChildrenMapTestMixin, TestCase):
                 self.transformers.verify_versions(block_structure)
             self.transformers.collect(block_structure)
             self.assertTrue(self.transformers.verify_versions(block_structure))
+
+
+class IncrementalTransformer(MockTransformer):
+    """
+    Mock transformer that supports incremental collection and records
+    the blocks it collects.
+    """
+    SUPPORTS_INCREMENTAL_COLLECT = True
+    collected_blocks = []
+
+    @classmethod
+    def collect(cls, block_structure):
+        block_structure.request_xblock_fields('display_name')
+        for block_key in block_structure.topological_traversal():
+            cls.collected_blocks.append(block_key)
+            xblock = block_structure.get_xblock(block_key)
+            block_structure.set_transformer_block_field(block_key, cls, 'edited_on', xblock.edited_on)
+
+    @classmethod
+    def collect_summary(cls, block_structure):
+        block_structure.set_transformer_data(cls, 'edited_on', sorted({
+            block_structure.get_transformer_block_field(block_key, cls, 'edited_on')
+            for block_key in block_structure
+        }))
+
+
+@attr(shard=2)
+class TestIncrementalCollect(ChildrenMapTestMixin, TestCase):
+    """
+    Test class for BlockStructureTransformers.collect_incrementally
+    """
+    def setUp(self):
+        super(TestIncrementalCollect, self).setUp()
+        IncrementalTransformer.collected_blocks = []
+        self.registered_transformers = [IncrementalTransformer, MockTransformer]
+
+    def create_modulestore(self, children_map):
+        """
+        Returns a mock modulestore for the given children_map, with an
+        edit timestamp and display name for each block.
+        """
+        modulestore = MockModulestoreFactory.create(children_map, self.block_key_factory)
+        for block_key, xblock in modulestore.blocks.iteritems():
+            xblock.field_map.update(edited_on=1, display_name=u'block {}'.format(block_key))
+        return modulestore
+
+    def collect(self, modulestore, previous_block_structure=None):
+        """
+        Returns a block structure created from the given modulestore, with
+        data collected incrementally if a previous_block_structure is given.
+        """
+        block_structure = BlockStructureFactory.create_from_modulestore(self.block_key_factory(0), modulestore)
+        IncrementalTransformer.collected_blocks = []
+        with mock_registered_transformers(self.registered_transformers):
+            if previous_block_structure:
+                BlockStructureTransformers.collect_incrementally(block_structure, previous_block_structure)
+            else:
+                BlockStructureTransformers.collect(block_structure)
+        return block_structure
+
+    def assert_collected_data(self, block_structure, modulestore):
+        """
+        Verifies that the collected data of all blocks in the given
+        block_structure is up to date with the given modulestore.
+        """
+        with mock_registered_transformers(self.registered_transformers):
+            self.assertTrue(BlockStructureTransformers.verify_versions(block_structure))
+        for block_key in block_structure:
+            xblock = modulestore.get_item(block_key)
+            self.assertEqual(block_structure.get_xblock_field(block_key, 'edited_on'), xblock.edited_on)
+            self.assertEqual(block_structure.get_xblock_field(block_key, 'display_name'), xblock.display_name)
+            self.assertEqual(
+                block_structure.get_transformer_block_field(block_key, IncrementalTransformer, 'edited_on'),
+                xblock.edited_on,
+            )
+        self.assertEqual(
+            block_structure.get_transformer_data(IncrementalTransformer, 'edited_on'),
+            sorted({modulestore.get_item(block_key).edited_on for block_key in block_structure}),
+        )
+
+    def test_changed_block(self):
+        modulestore = self.create_modulestore(self.SIMPLE_CHILDREN_MAP)
+        previous_block_structure = self.collect(modulestore)
+        self.assertEqual(len(IncrementalTransformer.collected_blocks), 5)
+
+        modulestore.get_item(3).field_map.update(edited_on=2, display_name=u'new name')
+        block_structure = self.collect(modulestore, previous_block_structure)
+        self.assertEqual(set(IncrementalTransformer.collected_blocks), {0, 1, 3})
+        self.assert_block_structure(block_structure, self.SIMPLE_CHILDREN_MAP)
+        self.assert_collected_data(block_structure, modulestore)
+
+    def test_changed_children(self):
+        modulestore = self.create_modulestore(self.SIMPLE_CHILDREN_MAP)
+        previous_block_structure = self.collect(modulestore)
+
+        # Move block 4 from block 1 to block 2.
+        modulestore.get_item(1).children = [3]
+        modulestore.get_item(2).children = [4]
+        block_structure = self.collect(modulestore, previous_block_structure)
+        self.assertEqual(set(IncrementalTransformer.collected_blocks), {0, 1, 2, 3, 4})
+        self.assert_block_structure(block_structure, [[1, 2], [3], [4], [], []])
+        self.assert_collected_data(block_structure, modulestore)
+
+    def test_unchanged(self):
+        modulestore = self.create_modulestore(self.SIMPLE_CHILDREN_MAP)
+        previous_block_structure = self.collect(modulestore)
+        block_structure = self.collect(modulestore, previous_block_structure)
+        self.assertEqual(IncrementalTransformer.collected_blocks, [0])
+        self.assert_collected_data(block_structure, modulestore)
+
+    def test_requested_fields_collected_for_all_blocks(self):
+        modulestore = self.create_modulestore(self.SIMPLE_CHILDREN_MAP)
+        previous_block_structure = self.collect(modulestore)
+
+        # Change a field without an edit of the block.
+        modulestore.get_item(4).field_map.update(display_name=u'new name')
+        block_structure = self.collect(modulestore, previous_block_structure)
+        self.assertEqual(IncrementalTransformer.collected_blocks, [0])
+        self.assert_collected_data(block_structure, modulestore)
+
+    def test_dag(self):
+        modulestore = self.create_modulestore(self.DAG_CHILDREN_MAP)
+        previous_block_structure = self.collect(modulestore)
+        block_structure = self.collect(modulestore, previous_block_structure)
+        self.assertEqual(len(IncrementalTransformer.collected_blocks), len(self.DAG_CHILDREN_MAP))
+        self.assert_collected_data(block_structure, modulestore)
+
+    def test_new_transformer_version(self):
+        modulestore = self.create_modulestore(self.SIMPLE_CHILDREN_MAP)
+        previous_block_structure = self.collect(modulestore)
+        with patch.object(IncrementalTransformer, 'WRITE_VERSION', IncrementalTransformer.WRITE_VERSION + 1):
+            block_structure = self.collect(modulestore, previous_block_structure)
+            self.assertEqual(len(IncrementalTransformer.collected_blocks), 5)
+            self.assert_collected_data(block_structure, modulestore)
@@ -55,6 +55,25 @@ class BlockStructureTransformer(object):
     WRITE_VERSION = 0
     READ_VERSION = 0
 
+    # Whether the transformer's collect method can be run on a partial
+    # block structure during incremental collection.  When a course is
+    # re-collected incrementally, the collect method of such a
+    # transformer is given only the root block, the changed blocks,
+    # their descendants and their ancestors, while its previously
+    # collected data for all other blocks is reused.  The xBlock fields
+    # it requests are still collected for all blocks.
+    #
+    # A transformer should set this to True only if the data it collects
+    # for a block depends solely on the block itself and the block's
+    # ancestors (for example, when percolating data down the hierarchy),
+    # and the data it collects for the structure as a whole depends
+    # solely on the root block.  It must not depend on the block's
+    # descendants (as block counts do), on data outside of the
+    # modulestore (as dynamic user partitions do), nor modify the
+    # xBlocks of other blocks (as the split_test transformer does).
+    #
+    SUPPORTS_INCREMENTAL_COLLECT = False
+
     @classmethod
     def name(cls):
         """
@@ -105,6 +124,27 @@ class BlockStructureTransformer(object):
         """
         pass
 
+    @classmethod
+    def collect_summary(cls, block_structure):
+        """
+        Collects and stores data about the block structure as a whole,
+        derived from the data collected for all of its blocks, using
+        block_structure.set_transformer_data.  For example, the distinct
+        dates on which blocks become visible, so that the transformer's
+        user_signature doesn't have to visit every block.
+
+        This is called with the entire block structure once the collect
+        methods of all transformers have run and the requested xBlock
+        fields are collected, including after an incremental collection,
+        in which the collect method is only given part of the block
+        structure.
+
+        Arguments:
+            block_structure (BlockStructureModulestoreData) - The block
+                structure with the collected data of all of its blocks.
+        """
+        pass
+
     @abstractmethod
     def transform(self, usage_info, block_structure):
         """
@@ -155,6 +195,35 @@ class BlockStructureTransformer(object):
         """
         raise NotImplementedError
 
+    def user_signature(self, usage_info, block_structure):  # pylint: disable=unused-argument
+        """
+        Returns a hashable value identifying the attributes of the user
+        in the given usage_info on which the output of this
+        transformer's transform method depends, for the given collected
+        block_structure.  For example, the groups of the user in the
+        course's user partitions, or whether the user has staff access.
+
+        Users with equal signatures for all of the requested
+        transformers share the same transformed block structure, which
+        the BlockStructureManager may then cache rather than transform
+        the collected block structure for each of them.
+
+        Transformers whose output depends on the current time should
+        include in their signature which of the relevant dates have
+        passed.  Transformers whose output is specific to each user, or
+        whose transform has side effects, should return None, which is
+        the default, so that their output is never shared.
+
+        Arguments:
+            usage_info (any negotiated type) - The usage-specific object
+                that is also passed to the transform method.
+
+            block_structure (BlockStructureBlockData) - The collected
+                block structure that is about to be transformed.  It
+                must not be mutated.
+        """
+        return None
+
 
 class FilteringTransformerMixin(BlockStructureTransformer):
     """
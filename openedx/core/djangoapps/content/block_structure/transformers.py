@@ -4,6 +4,7 @@ Module for a collection of BlockStructureTransformers.
 import functools
 from logging import getLogger
 
+from .block_structure import BlockStructureModulestoreData
 from .exceptions import TransformerException, TransformerDataIncompatible
 from .transformer import FilteringTransformerMixin
 from .transformer_registry import TransformerRegistry
@@ -11,6 +12,10 @@ from .transformer_registry import TransformerRegistry
 
 logger = getLogger(__name__)  # pylint: disable=C0103
 
+# Name of the xBlock field that is always collected so that changed
+# blocks can be detected during incremental collection.
+EDITED_ON_FIELD = 'edited_on'
+
 
 class BlockStructureTransformers(object):
     """
@@ -80,8 +85,161 @@ class BlockStructureTransformers(object):
             transformer.collect(block_structure)
 
         # Collect all fields that were requested by the transformers.
+        block_structure.request_xblock_fields(EDITED_ON_FIELD)
         block_structure._collect_requested_xblock_fields()  # pylint: disable=protected-access
 
+        cls._collect_summaries(block_structure)
+
+    @classmethod
+    def collect_incrementally(cls, block_structure, previous_block_structure):
+        """
+        Collects data for each registered transformer, reusing the data
+        in the given previously collected block structure for blocks that
+        haven't changed since.
+
+        Transformers that support incremental collection are given a
+        partial block structure with only the root block, the changed
+        blocks, their descendants and their ancestors.  All other
+        transformers collect from the entire block structure.  The xBlock
+        fields requested by any transformer are collected for all blocks,
+        since reading them from the already loaded xBlocks is cheap and
+        some, such as course_version, change without an edit of the
+        block.  Falls back to a full collection if the block structure
+        is a DAG.
+
+        Arguments:
+            block_structure (BlockStructureModulestoreData) - The block
+                structure, newly created from the modulestore, into which
+                data is to be collected.
+
+            previous_block_structure (BlockStructureBlockData) - The
+                block structure with data collected from a previous
+                version of the modulestore data.
+        """
+        if any(len(block_structure.get_parents(block_key)) > 1 for block_key in block_structure):
+            cls.collect(block_structure)
+            return
+
+        # pylint: disable=protected-access
+        blocks_to_recollect = cls._get_blocks_to_recollect(block_structure, previous_block_structure)
+        partial_block_structure = cls._create_partial_block_structure(block_structure, blocks_to_recollect)
+
+        incrementally_collected_transformers = set()
+        for transformer in TransformerRegistry.get_registered_transformers():
+            block_structure._add_transformer(transformer)
+            if cls._can_collect_incrementally(transformer, previous_block_structure):
+                incrementally_collected_transformers.add(transformer.name())
+                partial_block_structure._add_transformer(transformer)
+                transformer.collect(partial_block_structure)
+            else:
+                transformer.collect(block_structure)
+
+        block_structure.request_xblock_fields(EDITED_ON_FIELD, *partial_block_structure._requested_xblock_fields)
+        block_structure._collect_requested_xblock_fields()
+
+        # Only the data of the incrementally collected transformers is
+        # merged: recollected data for the recollected blocks and
+        # previously collected data for all other blocks.  Data collected
+        # from the entire block structure takes precedence.
+        for block_key in block_structure:
+            if block_key in blocks_to_recollect:
+                source_block_data = _get_block_data(partial_block_structure, block_key)
+            else:
+                source_block_data = _get_block_data(previous_block_structure, block_key)
+            if source_block_data is not None:
+                block_data = block_structure._get_or_create_block(block_key)
+                for transformer_name in incrementally_collected_transformers:
+                    transformer_block_data = source_block_data.transformer_data.get(transformer_name)
+                    if transformer_block_data is not None:
+                        _merge_fields(
+                            block_data.transformer_data.get_or_create(transformer_name).fields,
+                            transformer_block_data.fields,
+                        )
+
+        for transformer_name in incrementally_collected_transformers:
+            transformer_data = partial_block_structure.transformer_data.get(transformer_name)
+            if transformer_data is not None:
+                _merge_fields(
+                    block_structure.transformer_data.get_or_create(transformer_name).fields,
+                    transformer_data.fields,
+                )
+
+        cls._collect_summaries(block_structure)
+
+        logger.info(
+            'BlockStructure: Recollected %d of %d blocks for %s.',
+            len(blocks_to_recollect),
+            len(block_structure),
+            block_structure.root_block_usage_key,
+        )
+
+    @classmethod
+    def _collect_summaries(cls, block_structure):
+        """
+        Collects the data of each registered transformer about the given
+        block structure as a whole, once the data of all of its blocks is
+        collected.
+        """
+        for transformer in TransformerRegistry.get_registered_transformers():
+            transformer.collect_summary(block_structure)
+
+    @classmethod
+    def _can_collect_incrementally(cls, transformer, previous_block_structure):
+        """
+        Returns whether the given transformer can collect only the changed
+        blocks, reusing its data in the given previous block structure.
+        """
+        return (
+            transformer.SUPPORTS_INCREMENTAL_COLLECT and
+            transformer.WRITE_VERSION == previous_block_structure._get_transformer_data_version(transformer)  # pylint: disable=protected-access
+        )
+
+    @classmethod
+    def _get_blocks_to_recollect(cls, block_structure, previous_block_structure):
+        """
+        Returns the set of keys of the blocks in the given block_structure
+        that are new or have changed since the previous_block_structure was
+        collected, including all of their descendants and ancestors, and
+        the root block, whose data is always recollected since the data
+        of transformers for the structure as a whole derives from it.
+        """
+        changed_blocks = set()
+        for block_key in block_structure:
+            edited_on = getattr(block_structure.get_xblock(block_key), EDITED_ON_FIELD, None)
+            if (
+                    block_key not in previous_block_structure or
+                    edited_on is None or
+                    edited_on != previous_block_structure.get_xblock_field(block_key, EDITED_ON_FIELD) or
+                    block_structure.get_children(block_key) != previous_block_structure.get_children(block_key) or
+                    block_structure.get_parents(block_key) != previous_block_structure.get_parents(block_key)
+            ):
+                changed_blocks.add(block_key)
+
+        blocks_to_recollect = {block_structure.root_block_usage_key}
+        for block_key in changed_blocks:
+            for descendant_key in block_structure.topological_traversal(start_node=block_key):
+                blocks_to_recollect.add(descendant_key)
+            parents = block_structure.get_parents(block_key)
+            while parents and parents[0] not in blocks_to_recollect:
+                blocks_to_recollect.add(parents[0])
+                parents = block_structure.get_parents(parents[0])
+        return blocks_to_recollect
+
+    @classmethod
+    def _create_partial_block_structure(cls, block_structure, block_keys):
+        """
+        Returns a block structure with the xBlocks and relations of the
+        given block_structure for only the given block_keys.
+        """
+        # pylint: disable=protected-access
+        partial_block_structure = BlockStructureModulestoreData(block_structure.root_block_usage_key)
+        for block_key in block_structure.topological_traversal(filter_func=lambda key: key in block_keys):
+            partial_block_structure._add_xblock(block_key, block_structure.get_xblock(block_key))
+            for child_key in block_structure.get_children(block_key):
+                if child_key in block_keys:
+                    partial_block_structure._add_relation(block_key, child_key)
+        return partial_block_structure
+
     @classmethod
     def verify_versions(cls, block_structure):
         """
@@ -118,6 +276,20 @@ class BlockStructureTransformers(object):
         # Prune the block structure to remove any unreachable blocks.
         block_structure._prune_unreachable()  # pylint: disable=protected-access
 
+    def user_signature(self, block_structure):
+        """
+        Returns the combined user signatures of the transformers in the
+        collection for the given collected block structure, or None if
+        any of them can't share its output between users.
+        """
+        signatures = []
+        for transformer in self._transformers['supports_filter'] + self._transformers['no_filter']:
+            signature = transformer.user_signature(self.usage_info, block_structure)
+            if signature is None:
+                return None
+            signatures.append((transformer.name(), signature))
+        return tuple(signatures)
+
     def _transform_with_filters(self, block_structure):
         """
         Transforms the given block_structure using the transform_block_filters
@@ -151,3 +323,23 @@ class BlockStructureTransformers(object):
         """
         for transformer in self._transformers['no_filter']:
             transformer.transform(self.usage_info, block_structure)
+
+
+def _merge_fields(fields, other_fields):
+    """
+    Adds the items of the other_fields dict that aren't already in the
+    given fields dict.
+    """
+    for field_name, value in other_fields.iteritems():
+        fields.setdefault(field_name, value)
+
+
+def _get_block_data(block_structure, block_key):
+    """
+    Returns the collected data of the given block in the given block
+    structure, or None if not found.
+    """
+    try:
+        return block_structure[block_key]
+    except KeyError:
+        return None
@@ -3,6 +3,7 @@ Django Signals classes and functions for the Course Structure application
 """
 from django.dispatch.dispatcher import receiver
 
+from openedx.core.djangoapps.content.publish_pipeline.api import publish_consumer, publish_pipeline_enabled
 from xmodule.modulestore.django import SignalHandler
 
 from .models import CourseStructure
@@ -13,17 +14,38 @@ def listen_for_course_publish(sender, course_key, **kwargs):  # pylint: disable=
     """
     Course Structure application receiver for the course_published signal
     """
+    _clear_discussion_id_map(course_key)
+
+    if publish_pipeline_enabled():
+        return
+
     # Import tasks here to avoid a circular import.
     from .tasks import update_course_structure
 
-    # Delete the existing discussion id map cache to avoid inconsistencies
+    # Note: The countdown=0 kwarg is set to to ensure the method below does not attempt to access the course
+    # before the signal emitter has finished all operations. This is also necessary to ensure all tests pass.
+    update_course_structure.apply_async([unicode(course_key)], countdown=0)
+
+
+@publish_consumer(u'course_structures')
+def update_course_structure_from_published_course(course_key, course):
+    """
+    Course Structure application consumer of the publish pipeline.  The
+    discussion id map is cleared by the course_published receiver.
+    """
+    # Import tasks here to avoid a circular import.
+    from .tasks import generate_structure_from_course, save_course_structure
+
+    save_course_structure(course_key, generate_structure_from_course(course))
+
+
+def _clear_discussion_id_map(course_key):
+    """
+    Deletes the existing discussion id map cache to avoid inconsistencies.
+    """
     try:
         structure = CourseStructure.objects.get(course_id=course_key)
         structure.discussion_id_map_json = None
         structure.save()
     except CourseStructure.DoesNotExist:
         pass
-
-    # Note: The countdown=0 kwarg is set to to ensure the method below does not attempt to access the course
-    # before the signal emitter has finished all operations. This is also necessary to ensure all tests pass.
-    update_course_structure.apply_async([unicode(course_key)], countdown=0)
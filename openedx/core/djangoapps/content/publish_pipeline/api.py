@@ -0,0 +1,161 @@
+"""
+The course publish pipeline.
+
+Many apps update their own data whenever a course is published, and most
+of them need the course's full block tree to do so.  Rather than have
+each of them load the course from the modulestore in its own celery
+task, they may register as consumers of the publish pipeline.  When the
+publish_pipeline.single_load waffle switch is enabled, a single task
+loads the published course once and hands it to each consumer in turn,
+recording the time each of them takes.
+
+Consumers are registered with the publish_consumer decorator, usually
+in the module that also has the app's course_published receiver.  That
+receiver should return early if the pipeline is enabled, since its work
+is then done by the consumer:
+
+    @receiver(SignalHandler.course_published)
+    def listen_for_course_publish(sender, course_key, **kwargs):
+        if publish_pipeline_enabled():
+            return
+        do_my_expensive_update.delay(unicode(course_key))
+
+    @publish_consumer(u'my_app')
+    def update_from_published_course(course_key, course):
+        ...
+
+Work that is cheap and needed right after publishing should stay in the
+receiver, since the pipeline runs later, in an LMS worker.
+
+The course given to consumers is shared by all of them.  Consumers which
+modify it must be registered with modifies_course, so that they are run
+after all the consumers which don't.  When consumers fail, the pipeline
+is retried for them.
+"""
+from collections import OrderedDict
+from logging import getLogger
+from time import time
+
+import dogstats_wrapper as dog_stats_api
+
+from openedx.core.djangoapps.waffle_utils import WaffleSwitchNamespace
+from xmodule.modulestore import ModuleStoreEnum
+from xmodule.modulestore.django import modulestore
+
+log = getLogger(__name__)  # pylint: disable=C0103
+
+# Namespace
+WAFFLE_NAMESPACE = u'publish_pipeline'
+
+# Switches
+SINGLE_LOAD = u'single_load'
+
+# Ordered maps of the names of the registered consumers to their
+# functions, for the consumers which don't modify the course and for those
+# which do.
+_consumers = OrderedDict()  # pylint: disable=invalid-name
+_modifying_consumers = OrderedDict()  # pylint: disable=invalid-name
+
+
+class PublishConsumersError(Exception):
+    """
+    Exception raised when consumers of the publish pipeline fail.
+    """
+    def __init__(self, consumer_names):
+        super(PublishConsumersError, self).__init__(
+            u'Publish pipeline consumers failed: {}'.format(u', '.join(consumer_names))
+        )
+        self.consumer_names = consumer_names
+
+
+def waffle():
+    """
+    Returns the namespaced and cached Waffle class for the publish pipeline.
+    """
+    return WaffleSwitchNamespace(name=WAFFLE_NAMESPACE, log_prefix=u'PublishPipeline: ')
+
+
+def publish_pipeline_enabled():
+    """
+    Returns whether the registered consumers are run by the publish
+    pipeline, rather than by their apps' own course_published receivers.
+    """
+    return waffle().is_enabled(SINGLE_LOAD)
+
+
+def publish_consumer(name, modifies_course=False):
+    """
+    Decorator that registers the decorated function as a consumer of the
+    publish pipeline under the given name.  The function is called with
+    the key of the published course and the course, loaded with all of
+    its descendants.  modifies_course must be True if the function
+    modifies the course.
+    """
+    def decorator(func):
+        """
+        Registers and returns func.
+        """
+        (_modifying_consumers if modifies_course else _consumers)[name] = func
+        return func
+    return decorator
+
+
+def get_consumers():
+    """
+    Returns an ordered map of the names of the registered consumers to
+    their functions, in the order they are run: the consumers which don't
+    modify the course first, each group in the order it was registered.
+    """
+    consumers = _consumers.copy()
+    consumers.update(_modifying_consumers)
+    return consumers
+
+
+def run_consumers(course_key, consumer_names=None):
+    """
+    Loads the published course once and calls each registered consumer,
+    or only those with the given names, with it, in the order returned
+    by get_consumers.  A consumer that fails is logged, and doesn't
+    prevent the others from running.
+
+    Returns:
+        OrderedDict {unicode: float} - The time, in seconds, that each
+            consumer took.
+
+    Raises:
+        PublishConsumersError - If any consumer failed, once all of
+            them have run.
+    """
+    timings = OrderedDict()
+    failed_consumer_names = []
+    store = modulestore()
+    # The consumers must only see published content, even when run in the
+    # CMS, where the modulestore prefers drafts by default.
+    with store.bulk_operations(course_key), store.branch_setting(ModuleStoreEnum.Branch.published_only, course_key):
+        start_time = time()
+        course = store.get_course(course_key, depth=None, lazy=False)
+        if course is None:
+            log.info(u'PublishPipeline: Course %s not found, no consumers run.', course_key)
+            return timings
+        timings[u'load'] = time() - start_time
+
+        for name, consumer in get_consumers().iteritems():
+            if consumer_names is not None and name not in consumer_names:
+                continue
+            start_time = time()
+            with dog_stats_api.timer(u'publish_pipeline.consumer.time', tags=[u'consumer:{}'.format(name)]):
+                try:
+                    consumer(course_key, course)
+                except Exception:  # pylint: disable=broad-except
+                    log.exception(u'PublishPipeline: Consumer %s failed for course %s.', name, course_key)
+                    failed_consumer_names.append(name)
+            timings[name] = time() - start_time
+
+    log.info(
+        u'PublishPipeline: Ran consumers for course %s; timings: %s',
+        course_key,
+        u', '.join(u'{}={:.3f}s'.format(name, seconds) for name, seconds in timings.iteritems()),
+    )
+    if failed_consumer_names:
+        raise PublishConsumersError(failed_consumer_names)
+    return timings
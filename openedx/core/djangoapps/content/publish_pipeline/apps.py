@@ -0,0 +1,23 @@
+"""
+Configuration for the publish_pipeline djangoapp
+"""
+
+from django.apps import AppConfig
+
+
+class PublishPipelineConfig(AppConfig):
+    """
+    publish_pipeline django app.
+    """
+    name = u'openedx.core.djangoapps.content.publish_pipeline'
+
+    def ready(self):
+        """
+        Define tasks to perform at app loading time
+
+        * Connect signal handlers
+        * Register celery tasks
+
+        These happen at import time.  Hence the unused imports
+        """
+        from . import signals, tasks  # pylint: disable=unused-variable
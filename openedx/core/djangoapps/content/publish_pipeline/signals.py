@@ -0,0 +1,29 @@
+"""
+Signal handler for running the publish pipeline.
+"""
+from django.conf import settings
+from django.dispatch.dispatcher import receiver
+from opaque_keys.edx.locator import LibraryLocator
+
+from xmodule.modulestore.django import SignalHandler
+
+from .api import publish_pipeline_enabled
+from .tasks import run_publish_pipeline
+
+
+@receiver(SignalHandler.course_published)
+def _run_publish_pipeline_on_course_publish(sender, course_key, **kwargs):  # pylint: disable=unused-argument
+    """
+    Catches the signal that a course has been published in the module
+    store and runs the publish pipeline for it, if enabled.  Ignores
+    publish signals from content libraries.
+    """
+    if isinstance(course_key, LibraryLocator) or not publish_pipeline_enabled():
+        return
+
+    # The countdown gives a better chance at reading the latest changes
+    # when there are secondary reads in sharded mongoDB clusters.
+    run_publish_pipeline.apply_async(
+        kwargs=dict(course_id=unicode(course_key)),
+        countdown=settings.COURSE_PUBLISH_PIPELINE_DELAY,
+    )
@@ -0,0 +1,26 @@
+"""
+Asynchronous tasks for the publish pipeline.
+"""
+from celery.task import task
+from django.conf import settings
+from opaque_keys.edx.keys import CourseKey
+
+from .api import PublishConsumersError, run_consumers
+
+
+@task(
+    bind=True,
+    default_retry_delay=settings.COURSE_PUBLISH_PIPELINE_RETRY_DELAY,
+    max_retries=settings.COURSE_PUBLISH_PIPELINE_MAX_RETRIES,
+    name=u'openedx.core.djangoapps.content.publish_pipeline.tasks.run_publish_pipeline',
+)
+def run_publish_pipeline(self, course_id, consumer_names=None):
+    """
+    Runs the registered consumers of the publish pipeline, or only those
+    with the given names, for the course with the given id.  The task is
+    retried for the consumers that fail.
+    """
+    try:
+        run_consumers(CourseKey.from_string(course_id), consumer_names)
+    except PublishConsumersError as exc:
+        raise self.retry(kwargs=dict(course_id=course_id, consumer_names=exc.consumer_names), exc=exc)
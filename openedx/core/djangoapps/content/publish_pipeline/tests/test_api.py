@@ -0,0 +1,117 @@
+"""
+Tests for the publish pipeline.
+"""
+from collections import OrderedDict
+
+from mock import Mock, patch
+
+from xmodule.modulestore import ModuleStoreEnum
+from xmodule.modulestore.tests.django_utils import ModuleStoreTestCase
+from xmodule.modulestore.tests.factories import CourseFactory, ItemFactory
+
+from .. import api
+from ..api import SINGLE_LOAD, PublishConsumersError, get_consumers, publish_consumer, run_consumers, waffle
+from ..tasks import run_publish_pipeline
+
+
+class PublishPipelineTestCase(ModuleStoreTestCase):
+    """
+    Tests for the publish pipeline.
+    """
+    ENABLED_SIGNALS = ['course_published']
+
+    def setUp(self):
+        super(PublishPipelineTestCase, self).setUp()
+        self.course = CourseFactory.create()
+        self.chapter = ItemFactory.create(parent=self.course, category='chapter')
+
+    def patch_consumers(self, consumers):
+        """
+        Returns a context manager which replaces the registered consumers
+        with the given ones.
+        """
+        return patch.multiple(api, _consumers=consumers, _modifying_consumers=OrderedDict())
+
+    def test_registered_consumers(self):
+        consumers = get_consumers()
+        self.assertTrue({u'block_structure', u'bookmarks', u'course_structures'}.issubset(consumers))
+        # The block_structure consumer modifies the course, so it's run last.
+        self.assertEqual(consumers.keys()[-1], u'block_structure')
+
+    def test_run_consumers(self):
+        failing_consumer = Mock(side_effect=Exception)
+        consumer = Mock()
+        with self.patch_consumers(OrderedDict([('failing', failing_consumer), ('test', consumer)])):
+            with self.assertRaises(PublishConsumersError) as context:
+                run_consumers(self.course.id)
+
+        self.assertEqual(context.exception.consumer_names, ['failing'])
+        self.assertEqual(failing_consumer.call_count, 1)
+        self.assertEqual(consumer.call_count, 1)
+        course_key, course = consumer.call_args[0]
+        self.assertEqual(course_key, self.course.id)
+        self.assertIs(course, failing_consumer.call_args[0][1])
+        self.assertEqual([child.location for child in course.get_children()], [self.chapter.location])
+
+    def test_run_consumers_published_only(self):
+        self.store.publish(self.course.location, self.user.id)
+        ItemFactory.create(parent=self.course, category='chapter', publish_item=False)
+        consumer = Mock()
+        with self.patch_consumers(OrderedDict([('test', consumer)])):
+            with self.store.branch_setting(ModuleStoreEnum.Branch.draft_preferred, self.course.id):
+                run_consumers(self.course.id)
+
+        course = consumer.call_args[0][1]
+        self.assertEqual([child.location for child in course.get_children()], [self.chapter.location])
+
+    def test_run_named_consumers(self):
+        consumer = Mock()
+        other_consumer = Mock()
+        with self.patch_consumers(OrderedDict([('test', consumer), ('other', other_consumer)])):
+            timings = run_consumers(self.course.id, ['test'])
+
+        self.assertEqual(timings.keys(), [u'load', 'test'])
+        self.assertEqual(consumer.call_count, 1)
+        self.assertFalse(other_consumer.called)
+
+    @patch.multiple(api, _consumers=OrderedDict(), _modifying_consumers=OrderedDict())
+    def test_modifying_consumers_run_last(self):
+        seen_group_access = []
+
+        @publish_consumer(u'modifying', modifies_course=True)
+        def modifying_consumer(course_key, course):  # pylint: disable=unused-argument, unused-variable
+            """
+            Sets the group_access of the course's chapter.
+            """
+            course.get_children()[0].group_access = {0: [1]}
+
+        @publish_consumer(u'reading')
+        def reading_consumer(course_key, course):  # pylint: disable=unused-argument, unused-variable
+            """
+            Records the group_access of the course's chapter.
+            """
+            seen_group_access.append(course.get_children()[0].group_access)
+
+        timings = run_consumers(self.course.id)
+
+        self.assertEqual(timings.keys(), [u'load', u'reading', u'modifying'])
+        self.assertEqual(seen_group_access, [{}])
+
+    def test_retry_failed_consumers(self):
+        failing_consumer = Mock(side_effect=[Exception, None])
+        consumer = Mock()
+        with self.patch_consumers(OrderedDict([('failing', failing_consumer), ('test', consumer)])):
+            run_publish_pipeline.apply(kwargs=dict(course_id=unicode(self.course.id)))
+
+        self.assertEqual(failing_consumer.call_count, 2)
+        self.assertEqual(consumer.call_count, 1)
+
+    @patch('openedx.core.djangoapps.content.course_structures.tasks.update_course_structure.apply_async')
+    def test_publish(self, mock_update_course_structure):
+        consumer = Mock()
+        with self.patch_consumers(OrderedDict([('test', consumer)])):
+            with waffle().override(SINGLE_LOAD, active=True):
+                self.store.update_item(self.course, self.user.id)
+
+        self.assertEqual(consumer.call_count, 1)
+        self.assertFalse(mock_update_course_structure.called)
@@ -2,10 +2,9 @@
 from __future__ import unicode_literals
 
 from django.conf import settings
-from edx_rest_api_client.client import EdxRestApiClient
 
 from openedx.core.djangoapps.credentials.models import CredentialsApiConfig
-from openedx.core.lib.edx_api_utils import get_edx_api_data
+from openedx.core.lib.edx_api_utils import create_api_client, get_edx_api_data
 from openedx.core.lib.token_utils import JwtBuilder
 
 
@@ -15,7 +14,7 @@ def get_credentials_api_client(user):
     scopes = ['email', 'profile']
     expires_in = settings.OAUTH_ID_TOKEN_EXPIRATION
     jwt = JwtBuilder(user).build_token(scopes, expires_in)
-    return EdxRestApiClient(CredentialsApiConfig.current().internal_api_url, jwt=jwt)
+    return create_api_client(CredentialsApiConfig.current().internal_api_url, jwt)
 
 
 def get_credentials(user, program_uuid=None):
@@ -46,5 +45,6 @@ def get_credentials(user, program_uuid=None):
     api = get_credentials_api_client(user)
 
     return get_edx_api_data(
-        credential_configuration, 'credentials', api=api, querystring=querystring, cache_key=cache_key
+        credential_configuration, 'credentials', api=api, querystring=querystring, cache_key=cache_key,
+        stale_while_revalidate=True
     )
@@ -8,12 +8,12 @@ from django.contrib.auth.models import User
 from django.contrib.sites.models import Site
 from django.core.exceptions import ImproperlyConfigured
 from edx_rest_api_client import exceptions
-from edx_rest_api_client.client import EdxRestApiClient
 from provider.oauth2.models import Client
 
 from openedx.core.djangoapps.credentials.models import CredentialsApiConfig
 from openedx.core.djangoapps.credentials.utils import get_credentials
 from openedx.core.djangoapps.programs.utils import ProgramProgressMeter
+from openedx.core.lib.edx_api_utils import create_api_client
 from openedx.core.lib.token_utils import JwtBuilder
 
 
@@ -53,7 +53,7 @@ def get_api_client(api_config, student):
     expires_in = settings.OAUTH_ID_TOKEN_EXPIRATION
     jwt = JwtBuilder(student, secret=client.client_secret).build_token(scopes, expires_in, aud=client.client_id)
 
-    return EdxRestApiClient(api_config.internal_api_url, jwt=jwt)
+    return create_api_client(api_config.internal_api_url, jwt)
 
 
 def get_completed_programs(site, student):
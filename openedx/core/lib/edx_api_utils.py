@@ -2,18 +2,60 @@
 from __future__ import unicode_literals
 
 import logging
+import math
+import threading
+import time
+from multiprocessing.pool import ThreadPool
+from urlparse import urlparse
 
+import requests
 from django.conf import settings
 from django.core.cache import cache
 from django.core.exceptions import ImproperlyConfigured
 from edx_rest_api_client.client import EdxRestApiClient
 from provider.oauth2.models import Client
+from requests.adapters import HTTPAdapter
 
 from openedx.core.lib.cache_utils import zpickle, zunpickle
 from openedx.core.lib.token_utils import JwtBuilder
 
 log = logging.getLogger(__name__)
 
+# How long, in seconds, a background refresh of stale cached data may take
+# before another one can be started.
+REVALIDATION_LOCK_TIMEOUT = 60
+
+# The HTTP adapters holding the keep-alive connections shared by the API
+# clients of each service, keyed by the scheme and host of the service.
+_http_adapters = {}
+_http_adapters_lock = threading.Lock()
+
+
+def get_pooled_session(url):
+    """
+    Returns a new requests session which takes its connections to the
+    service at url from a pool shared by all the sessions of this process
+    for that service.
+
+    Sessions hold the credentials of their user, so they are never shared
+    themselves.  A service which is served at a different URL for each site
+    gets a separate pool for each of them.
+    """
+    session = requests.Session()
+    if settings.EDX_API_POOL_CONNECTIONS:
+        parsed_url = urlparse(url)
+        prefix = '{}://{}/'.format(parsed_url.scheme, parsed_url.netloc)
+        with _http_adapters_lock:
+            if prefix not in _http_adapters:
+                _http_adapters[prefix] = HTTPAdapter(pool_maxsize=settings.EDX_API_POOL_MAXSIZE)
+        session.mount(prefix, _http_adapters[prefix])
+    return session
+
+
+def create_api_client(url, jwt):
+    """Returns an API client for the service at url, authenticated with jwt, using pooled connections."""
+    return EdxRestApiClient(url, jwt=jwt, session=get_pooled_session(url))
+
 
 def get_fields(fields, response):
     """Extracts desired fields from the API response"""
@@ -24,7 +66,7 @@ def get_fields(fields, response):
 
 
 def get_edx_api_data(api_config, resource, api, resource_id=None, querystring=None, cache_key=None, many=True,
-                     traverse_pagination=True, fields=None):
+                     traverse_pagination=True, fields=None, stale_while_revalidate=False):
     """GET data from an edX REST API.
 
     DRY utility for handling caching and pagination.
@@ -42,6 +84,9 @@ def get_edx_api_data(api_config, resource, api, resource_id=None, querystring=No
         many (bool): Whether the resource requested is a collection of objects, or a single object.
             If false, an empty dict will be returned in cases of failure rather than the default empty list.
         traverse_pagination (bool): Whether to traverse pagination or return paginated response..
+        stale_while_revalidate (bool): Whether cached data which is older than the cache TTL of the
+            configuration may still be returned, for EDX_API_STALE_CACHE_TTL more seconds, while it is
+            refreshed in the background.
 
     Returns:
         Data returned by the API. When hitting a list endpoint, extracts "results" (list of dict)
@@ -53,48 +98,130 @@ def get_edx_api_data(api_config, resource, api, resource_id=None, querystring=No
         log.warning('%s configuration is disabled.', api_config.API_NAME)
         return no_data
 
+    def fetch():
+        """Retrieves the data from the API."""
+        return _fetch_edx_api_data(api, resource, resource_id, querystring, traverse_pagination, fields, no_data)
+
+    stale_while_revalidate = stale_while_revalidate and api_config.cache_ttl > 0
     if cache_key:
         cache_key = '{}.{}'.format(cache_key, resource_id) if resource_id is not None else cache_key
-        cache_key += '.zpickled'
+        cache_key += '.swr.zpickled' if stale_while_revalidate else '.zpickled'
 
         cached = cache.get(cache_key)
-        if cached:
+        if cached and stale_while_revalidate:
+            fresh_until, results = zunpickle(cached)
+            if time.time() >= fresh_until:
+                _revalidate_in_background(api_config, cache_key, fetch)
+            return results
+        elif cached:
             return zunpickle(cached)
 
     try:
-        endpoint = getattr(api, resource)
-        querystring = querystring if querystring else {}
-        response = endpoint(resource_id).get(**querystring)
-
-        if resource_id is not None:
-            if fields:
-                results = get_fields(fields, response)
-            else:
-                results = response
-        elif traverse_pagination:
-            results = _traverse_pagination(response, endpoint, querystring, no_data)
-        else:
-            results = response
+        results = fetch()
     except:  # pylint: disable=bare-except
         log.exception('Failed to retrieve data from the %s API.', api_config.API_NAME)
         return no_data
 
     if cache_key:
+        _cache_edx_api_data(api_config, cache_key, results, stale_while_revalidate)
+
+    return results
+
+
+def _fetch_edx_api_data(api, resource, resource_id, querystring, traverse_pagination, fields, no_data):
+    """Retrieves data from an edX REST API, see get_edx_api_data."""
+    endpoint = getattr(api, resource)
+    querystring = querystring if querystring else {}
+    response = endpoint(resource_id).get(**querystring)
+
+    if resource_id is not None:
+        if fields:
+            return get_fields(fields, response)
+        return response
+    elif traverse_pagination:
+        return _traverse_pagination(response, endpoint, querystring, no_data)
+    return response
+
+
+def _cache_edx_api_data(api_config, cache_key, results, stale_while_revalidate):
+    """Caches data retrieved from an edX REST API, see get_edx_api_data."""
+    if stale_while_revalidate:
+        zdata = zpickle((time.time() + api_config.cache_ttl, results))
+        cache.set(cache_key, zdata, api_config.cache_ttl + settings.EDX_API_STALE_CACHE_TTL)
+    else:
         zdata = zpickle(results)
         cache.set(cache_key, zdata, api_config.cache_ttl)
 
-    return results
+
+def _revalidate_in_background(api_config, cache_key, fetch):
+    """
+    Refreshes the stale data cached at cache_key in a background thread,
+    unless another refresh of it is already in progress.
+    """
+    lock_key = cache_key + '.revalidating'
+    if not cache.add(lock_key, True, REVALIDATION_LOCK_TIMEOUT):
+        return
+
+    def revalidate():
+        """Retrieves and caches the data, the stale data is kept on failures."""
+        try:
+            _cache_edx_api_data(api_config, cache_key, fetch(), stale_while_revalidate=True)
+        except:  # pylint: disable=bare-except
+            log.exception('Failed to refresh data from the %s API.', api_config.API_NAME)
+        finally:
+            cache.delete(lock_key)
+
+    _run_in_background(revalidate)
+
+
+def _run_in_background(func):
+    """Calls func in a daemon thread."""
+    thread = threading.Thread(target=func)
+    thread.daemon = True
+    thread.start()
+
+
+def _page_count(response):
+    """
+    Returns the number of pages of a paginated API response, or None if the
+    response doesn't tell.
+    """
+    if response.get('num_pages'):
+        return response['num_pages']
+    count, results = response.get('count'), response.get('results')
+    if count and results:
+        return int(math.ceil(float(count) / len(results)))
+    return None
 
 
 def _traverse_pagination(response, endpoint, querystring, no_data):
     """Traverse a paginated API response.
 
     Extracts and concatenates "results" (list of dict) returned by DRF-powered APIs.
+
+    When the first page tells how many pages there are, the others are
+    retrieved concurrently by up to EDX_API_PAGINATION_WORKERS threads.
     """
     results = response.get('results', no_data)
 
-    page = 1
     next_page = response.get('next')
+    page_count = _page_count(response) if next_page else None
+    workers = settings.EDX_API_PAGINATION_WORKERS
+    if page_count and page_count > 1 and workers > 1:
+        pool = ThreadPool(min(workers, page_count - 1))
+        try:
+            responses = pool.map(
+                lambda page: endpoint.get(**dict(querystring, page=page)),
+                range(2, page_count + 1)
+            )
+        finally:
+            pool.close()
+            pool.join()
+        for response in responses:
+            results += response.get('results', no_data)
+        return results
+
+    page = 1
     while next_page:
         page += 1
         querystring['page'] = page
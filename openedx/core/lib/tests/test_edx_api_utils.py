@@ -2,9 +2,12 @@
 # pylint: disable=missing-docstring
 import json
 
+from multiprocessing.pool import ThreadPool
+
 import httpretty
 import mock
 from django.core.cache import cache
+from django.test.utils import override_settings
 from nose.plugins.attrib import attr
 
 from openedx.core.djangoapps.catalog.models import CatalogIntegration
@@ -12,7 +15,7 @@ from openedx.core.djangoapps.catalog.tests.mixins import CatalogIntegrationMixin
 from openedx.core.djangoapps.catalog.utils import create_catalog_api_client
 from openedx.core.djangoapps.credentials.tests.mixins import CredentialsApiConfigMixin
 from openedx.core.djangolib.testing.utils import CacheIsolationTestCase, skip_unless_lms
-from openedx.core.lib.edx_api_utils import get_edx_api_data
+from openedx.core.lib.edx_api_utils import get_edx_api_data, get_pooled_session
 from student.tests.factories import UserFactory
 
 UTILITY_MODULE = 'openedx.core.lib.edx_api_utils'
@@ -96,6 +99,36 @@ class TestGetEdxApiData(CatalogIntegrationMixin, CredentialsApiConfigMixin, Cach
 
         self._assert_num_requests(len(expected_collection))
 
+    @override_settings(EDX_API_PAGINATION_WORKERS=4)
+    def test_get_paginated_data_concurrently(self):
+        """Verify that the pages of paginated data are retrieved concurrently when their count is known."""
+        catalog_integration = self.create_catalog_integration()
+        api = create_catalog_api_client(self.user)
+
+        expected_collection = ['some', 'test', 'data']
+        url = CatalogIntegration.current().get_internal_api_url().strip('/') + '/programs/'
+
+        for page, record in enumerate(expected_collection, start=1):
+            data = {
+                'count': len(expected_collection),
+                'next': '{}?page={}'.format(url, page + 1) if page < len(expected_collection) else None,
+                'results': [record],
+            }
+            httpretty.register_uri(
+                httpretty.GET,
+                '{}?page={}'.format(url, page) if page > 1 else url,
+                body=json.dumps(data),
+                content_type='application/json',
+                match_querystring=True,
+            )
+
+        with mock.patch(UTILITY_MODULE + '.ThreadPool', wraps=ThreadPool) as mock_pool:
+            actual_collection = get_edx_api_data(catalog_integration, 'programs', api=api)
+
+        self.assertEqual(actual_collection, expected_collection)
+        mock_pool.assert_called_with(2)
+        self._assert_num_requests(len(expected_collection))
+
     def test_get_paginated_data_do_not_traverse_pagination(self):
         """
         Verify that pagination is not traversed if traverse_pagination=False is passed as argument.
@@ -222,6 +255,41 @@ class TestGetEdxApiData(CatalogIntegrationMixin, CredentialsApiConfigMixin, Cach
         # Verify that only two requests were made, not four.
         self._assert_num_requests(2)
 
+    @mock.patch(UTILITY_MODULE + '._run_in_background', side_effect=lambda func: func())
+    @mock.patch(UTILITY_MODULE + '.time')
+    def test_stale_while_revalidate(self, mock_time, mock_run_in_background):
+        """Verify that stale cached data is returned while it is refreshed in the background."""
+        catalog_integration = self.create_catalog_integration(cache_ttl=5)
+        api = create_catalog_api_client(self.user)
+        cache_key = CatalogIntegration.current().CACHE_KEY
+
+        self._mock_catalog_api([
+            httpretty.Response(body=json.dumps({'next': None, 'results': results}), content_type='application/json')
+            for results in (['stale'], ['fresh'])
+        ])
+
+        def get_data(now):
+            """Get the data at the given time."""
+            mock_time.time.return_value = now
+            return get_edx_api_data(
+                catalog_integration, 'programs', api=api, cache_key=cache_key, stale_while_revalidate=True
+            )
+
+        self.assertEqual(get_data(0), ['stale'])
+
+        # Within the cache TTL, the cached data is fresh.
+        self.assertEqual(get_data(4), ['stale'])
+        self.assertFalse(mock_run_in_background.called)
+        self._assert_num_requests(1)
+
+        # Past the cache TTL, the stale data is returned and refreshed.
+        self.assertEqual(get_data(6), ['stale'])
+        self.assertTrue(mock_run_in_background.called)
+        self._assert_num_requests(2)
+
+        self.assertEqual(get_data(6), ['fresh'])
+        self._assert_num_requests(2)
+
     @mock.patch(UTILITY_MODULE + '.log.warning')
     def test_api_config_disabled(self, mock_warning):
         """Verify that no data is retrieved if the provided config model is disabled."""
@@ -282,3 +350,28 @@ class TestGetEdxApiData(CatalogIntegrationMixin, CredentialsApiConfigMixin, Cach
         )
         self.assertTrue(mock_exception.called)
         self.assertEqual(actual, {})
+
+
+@attr(shard=2)
+class TestGetPooledSession(CacheIsolationTestCase):
+    """Tests for the pooling of the connections of edX API clients."""
+
+    @override_settings(EDX_API_POOL_CONNECTIONS=True)
+    def test_connections_pooled_per_service(self):
+        session = get_pooled_session(TEST_API_URL)
+        other_session = get_pooled_session(TEST_API_URL + '/v2/')
+        other_service_session = get_pooled_session('https://other.example.com/api')
+
+        self.assertIsNot(session, other_session)
+        self.assertIs(session.get_adapter(TEST_API_URL), other_session.get_adapter(TEST_API_URL))
+        self.assertIsNot(
+            session.get_adapter(TEST_API_URL),
+            other_service_session.get_adapter('https://other.example.com/api')
+        )
+
+    @override_settings(EDX_API_POOL_CONNECTIONS=False)
+    def test_connections_not_pooled(self):
+        self.assertIsNot(
+            get_pooled_session(TEST_API_URL).get_adapter(TEST_API_URL),
+            get_pooled_session(TEST_API_URL).get_adapter(TEST_API_URL)
+        )